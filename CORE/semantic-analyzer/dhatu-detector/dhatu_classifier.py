@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+🏭 CLASSIFICATION DHĀTU PARALLÈLE D'UN CORPUS
+=============================================
+
+Étiquette chaque ligne de code (ou phrase de prose) d'un corpus avec ses
+dhātu et produit un histogramme compact par document:
+- lexique compilé une fois en table "forme de surface -> masque de bits"
+  (formes fléchies et sans accents incluses): une ligne sans indice est
+  écartée par un seul isdisjoint, sans boucle Python sur ses mots
+- score optionnel par embeddings (SentenceTransformer du semantic-core)
+  pour les unités sans indice lexical
+- documents lus par blocs de ~1 Mio coupés en fin de ligne, blocs traités
+  par un pool de processus avec un nombre borné de blocs en vol
+- store JSON incrémental: un document inchangé (taille, mtime) n'est pas relu
+
+    python dhatu_classifier.py [racine] --workers 4 [--embeddings]
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import re
+import sys
+import time
+import unicodedata
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# En tête: le dhatu_detector.py vide à la racine du dépôt ne doit pas masquer celui-ci
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from dhatu_detector import DHATU_LEXICON, DHATUS, SUFFIXES, word_dhatus
+
+# Disponibilité testée sans importer (torch coûte plusieurs secondes au démarrage)
+SENTENCE_TRANSFORMERS_AVAILABLE = importlib.util.find_spec('sentence_transformers') is not None
+
+STORE_VERSION = 1
+DEFAULT_STORE_NAME = '.dhatu_histograms.json'
+CHUNK_SIZE = 1024 * 1024
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"  # Modèle du semantic-core
+EMBEDDING_THRESHOLD = 0.35
+PROSE_EXTENSIONS = {'.md', '.rst', '.txt', '.tex', '.org', '.adoc'}
+CORPUS_EXTENSIONS = PROSE_EXTENSIONS | {'.py', '.rs', '.js', '.ts', '.sh', '.json', '.yaml', '.yml', '.toml',
+                                        '.html', '.css', '.c', '.h', '.cpp', '.java', '.go', '.rb'}
+EXCLUDED_DIRS = {'.git', '__pycache__', 'node_modules', '.venv', 'venv', 'target'}
+
+# Descriptions servant de prototypes pour le score par embeddings (README, table des dhātu)
+DHATU_PROTOTYPES = {
+    'COMM': "communicate, print, send a message, speak / communiquer, afficher, parler",
+    'ITER': "repeat, loop over every item again / répéter, boucler sur chaque élément",
+    'TRANS': "transform, convert, filter, change data / transformer, convertir, filtrer",
+    'DECIDE': "decide, choose with a condition, if or else / décider, choisir selon une condition",
+    'LOCATE': "locate, search, find where something is / localiser, chercher, trouver où",
+    'GROUP': "group, gather, collect similar things together / rassembler, regrouper",
+    'SEQ': "sequence, order, first then next, steps / séquencer, ordonner, d'abord puis",
+}
+
+_CAMEL_BOUNDARY_RE = re.compile(r'(?<=[a-z])(?=[A-Z])')
+_WORD_RE = re.compile(r'[^\W\d_]+')
+_SENTENCE_RE = re.compile(r'\n|(?<=[.!?])\s+')
+
+
+def _strip_accents(word: str) -> str:
+    return ''.join(c for c in unicodedata.normalize('NFKD', word) if not unicodedata.combining(c))
+
+
+def compile_lexicon() -> Dict[str, int]:
+    """Forme de surface (mot + suffixes fléchis) -> masque des dhātu.
+
+    Masque de chaque forme calculé par word_dhatus: mêmes règles que le
+    détecteur (suffixes seulement sur un radical d'au moins 3 lettres,
+    forme exacte prioritaire sur la forme fléchie).
+    """
+    forms: Dict[str, int] = {}
+    for dhatu in DHATUS:
+        for word in DHATU_LEXICON[dhatu]:
+            candidates = [word]
+            if len(_strip_accents(word)) >= 3:
+                candidates += [word + suffix for suffix in SUFFIXES]
+            for form in candidates:
+                if form in forms:
+                    continue
+                mask = 0
+                for found in word_dhatus(form):
+                    mask |= 1 << DHATUS.index(found)
+                if mask:
+                    forms[form] = mask
+    return forms
+
+
+def mask_labels(mask: int) -> List[str]:
+    return [dhatu for bit, dhatu in enumerate(DHATUS) if mask & (1 << bit)]
+
+
+class DhatuClassifier:
+    """Masque de dhātu par unité (ligne de code ou phrase)"""
+
+    def __init__(self, embeddings: bool = False, model_name: str = EMBEDDING_MODEL,
+                 threshold: float = EMBEDDING_THRESHOLD):
+        self.forms = compile_lexicon()
+        self._form_set = frozenset(self.forms)
+        self._accent_cache: Dict[str, int] = {}
+        self.scorer = EmbeddingScorer(model_name, threshold) if embeddings else None
+
+    def _accented_mask(self, token: str) -> int:
+        # Mot non ASCII: forme exacte ("où"), puis sans accents (répéter -> repeter)
+        mask = self._accent_cache.get(token)
+        if mask is None:
+            mask = 0
+            for dhatu in word_dhatus(token) or word_dhatus(_strip_accents(token)):
+                mask |= 1 << DHATUS.index(dhatu)
+            self._accent_cache[token] = mask
+        return mask
+
+    def classify_unit(self, unit: str) -> int:
+        tokens = _WORD_RE.findall(_CAMEL_BOUNDARY_RE.sub(' ', unit).lower())
+        return self._classify_tokens(tokens, unit.isascii())
+
+    def _classify_tokens(self, tokens: List[str], ascii_only: bool) -> int:
+        mask = 0
+        if not self._form_set.isdisjoint(tokens):
+            forms = self.forms
+            for token in tokens:
+                mask |= forms.get(token, 0)
+        if not ascii_only:
+            for token in tokens:
+                if not token.isascii():
+                    mask |= self._accented_mask(token)
+        return mask
+
+    @staticmethod
+    def split_units(text: str, prose: bool = False) -> List[str]:
+        units = _SENTENCE_RE.split(text) if prose else text.split('\n')
+        return [u for u in units if u.strip()]
+
+    def classify_text(self, text: str, prose: bool = False) -> Tuple[List[str], List[int]]:
+        """Unités non vides du texte et leur masque de dhātu"""
+        units = self.split_units(text, prose)
+        # Découpage camelCase et minuscules sur tout le bloc (C), puis une passe par unité
+        lowered = self.split_units(_CAMEL_BOUNDARY_RE.sub(' ', text).lower(), prose)
+        if len(lowered) != len(units):  # Découpage décalé (ex. "Ok." + camelCase): unité par unité
+            lowered = [_CAMEL_BOUNDARY_RE.sub(' ', u).lower() for u in units]
+        findall = _WORD_RE.findall
+        masks = [self._classify_tokens(findall(low), low.isascii()) for low in lowered]
+        if self.scorer is not None:
+            missing = [i for i, mask in enumerate(masks) if not mask]
+            for i, mask in zip(missing, self.scorer.score([units[i] for i in missing])):
+                masks[i] = mask
+        return units, masks
+
+    def histogram(self, text: str, prose: bool = False) -> List[int]:
+        """[unités, unités étiquetées, compte par dhātu...]"""
+        _, masks = self.classify_text(text, prose)
+        counts = [len(masks), sum(1 for m in masks if m)] + [0] * len(DHATUS)
+        for mask in masks:
+            bit = 0
+            while mask:
+                if mask & 1:
+                    counts[2 + bit] += 1
+                mask >>= 1
+                bit += 1
+        return counts
+
+
+class EmbeddingScorer:
+    """Dhātu par similarité cosinus avec des prototypes (SentenceTransformer)"""
+
+    def __init__(self, model_name: str = EMBEDDING_MODEL, threshold: float = EMBEDDING_THRESHOLD):
+        if not SENTENCE_TRANSFORMERS_AVAILABLE:
+            raise RuntimeError("Score par embeddings: sentence-transformers n'est pas installé")
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name)
+        self.threshold = threshold
+        self.prototypes = self.model.encode([DHATU_PROTOTYPES[d] for d in DHATUS], normalize_embeddings=True)
+
+    def score(self, units: List[str], batch_size: int = 256) -> List[int]:
+        if not units:
+            return []
+        embeddings = self.model.encode(units, batch_size=batch_size, normalize_embeddings=True)
+        similarities = embeddings @ self.prototypes.T
+        masks = []
+        for row in similarities:
+            mask = 0
+            for bit, value in enumerate(row):
+                if value >= self.threshold:
+                    mask |= 1 << bit
+            masks.append(mask)
+        return masks
+
+
+# ----------------------------------------------------------------------
+# Pipeline parallèle
+# ----------------------------------------------------------------------
+
+_worker_classifier: Optional[DhatuClassifier] = None
+
+
+def _init_worker(embeddings: bool):
+    global _worker_classifier
+    _worker_classifier = DhatuClassifier(embeddings=embeddings)
+
+
+def _classify_chunk(task: Tuple[str, bytes, bool]) -> Tuple[str, List[int]]:
+    rel_path, data, prose = task
+    if _worker_classifier is None:
+        _init_worker(False)
+    return rel_path, _worker_classifier.histogram(data.decode('utf-8', errors='replace'), prose)
+
+
+def iter_chunks(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Blocs de ~chunk_size octets coupés après un saut de ligne"""
+    pending = b''
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            block = pending + block
+            cut = block.rfind(b'\n') + 1
+            if cut == 0:
+                pending = block
+                continue
+            pending = block[cut:]
+            yield block[:cut]
+    if pending:
+        yield pending
+
+
+class DhatuHistogramStore:
+    """Histogrammes par document: {chemin: [taille, mtime_ns, unités, étiquetées, COMM..SEQ]}"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.documents: Dict[str, List[int]] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == STORE_VERSION and data.get('dhatus') == list(DHATUS):
+                    self.documents = data['documents']
+            except (OSError, ValueError):
+                self.documents = {}
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': STORE_VERSION, 'dhatus': list(DHATUS), 'documents': self.documents},
+                      f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+    def is_current(self, rel_path: str, stat: os.stat_result) -> bool:
+        row = self.documents.get(rel_path)
+        return row is not None and row[0] == stat.st_size and row[1] == stat.st_mtime_ns
+
+    def get(self, rel_path: str) -> Optional[Dict]:
+        row = self.documents.get(rel_path)
+        if row is None:
+            return None
+        return {'units': row[2], 'tagged': row[3], 'histogram': dict(zip(DHATUS, row[4:]))}
+
+    def totals(self) -> Dict:
+        counts = [0] * (2 + len(DHATUS))
+        for row in self.documents.values():
+            for i, value in enumerate(row[2:]):
+                counts[i] += value
+        return {'documents': len(self.documents), 'units': counts[0], 'tagged': counts[1],
+                'histogram': dict(zip(DHATUS, counts[2:]))}
+
+    def top(self, dhatu: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """Documents où le dhātu étiquette la plus grande part des unités"""
+        column = 4 + DHATUS.index(dhatu)
+        ranked = [(path, row[column] / row[2]) for path, row in self.documents.items() if row[2]]
+        return sorted(ranked, key=lambda r: (-r[1], r[0]))[:limit]
+
+
+@dataclass
+class ClassificationReport:
+    documents: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    units: int = 0
+    tagged: int = 0
+    bytes: int = 0
+    duration: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def units_per_minute(self) -> float:
+        return self.units * 60 / self.duration if self.duration else 0.0
+
+
+class DhatuClassificationPipeline:
+    """Parcours du corpus -> blocs -> pool de processus -> store d'histogrammes"""
+
+    def __init__(self, store_path: str, workers: Optional[int] = None, chunk_size: int = CHUNK_SIZE,
+                 embeddings: bool = False, extensions: Iterable[str] = CORPUS_EXTENSIONS):
+        self.store = DhatuHistogramStore(store_path)
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.chunk_size = chunk_size
+        self.embeddings = embeddings
+        self.extensions = set(extensions)
+
+    def discover(self, root: str) -> List[str]:
+        found = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(d for d in dirnames if d not in EXCLUDED_DIRS)
+            for filename in sorted(filenames):
+                if os.path.splitext(filename)[1].lower() in self.extensions:
+                    found.append(os.path.relpath(os.path.join(dirpath, filename), root))
+        return found
+
+    def _tasks(self, root: str, rel_paths: List[str], pending: Dict[str, List[int]],
+               report: ClassificationReport) -> Iterator[Tuple[str, bytes, bool]]:
+        for rel_path in rel_paths:
+            full_path = os.path.join(root, rel_path)
+            try:
+                stat = os.stat(full_path)
+                if self.store.is_current(rel_path, stat):
+                    report.unchanged += 1
+                    continue
+                pending[rel_path] = [stat.st_size, stat.st_mtime_ns] + [0] * (2 + len(DHATUS))
+                prose = os.path.splitext(rel_path)[1].lower() in PROSE_EXTENSIONS
+                for chunk in iter_chunks(full_path, self.chunk_size):
+                    report.bytes += len(chunk)
+                    yield rel_path, chunk, prose
+            except OSError as e:
+                pending.pop(rel_path, None)
+                report.errors.append(f"{rel_path}: {e}")
+
+    @staticmethod
+    def _merge(pending: Dict[str, List[int]], rel_path: str, counts: List[int]):
+        row = pending[rel_path]
+        for i, value in enumerate(counts):
+            row[2 + i] += value
+
+    def run(self, root: str, paths: Optional[Iterable[str]] = None) -> ClassificationReport:
+        start = time.time()
+        report = ClassificationReport()
+        rel_paths = self.discover(root) if paths is None else list(paths)
+        if paths is None:
+            for stale in set(self.store.documents) - set(rel_paths):
+                del self.store.documents[stale]
+                report.removed += 1
+
+        pending: Dict[str, List[int]] = {}
+        tasks = self._tasks(root, rel_paths, pending, report)
+        if self.workers <= 1:
+            _init_worker(self.embeddings)
+            for task in tasks:
+                self._merge(pending, *_classify_chunk(task))
+        else:
+            # Nombre borné de blocs en vol: la lecture ne devance pas le calcul
+            max_in_flight = self.workers * 4
+            with ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                     initargs=(self.embeddings,)) as pool:
+                in_flight = set()
+                for task in tasks:
+                    in_flight.add(pool.submit(_classify_chunk, task))
+                    if len(in_flight) >= max_in_flight:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            self._merge(pending, *future.result())
+                for future in wait(in_flight).done:
+                    self._merge(pending, *future.result())
+
+        for rel_path, row in pending.items():
+            self.store.documents[rel_path] = row
+            report.documents += 1
+            report.units += row[2]
+            report.tagged += row[3]
+        self.store.save()
+        report.duration = round(time.time() - start, 3)
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Classification dhātu parallèle d'un corpus")
+    parser.add_argument('root', nargs='?', default='.')
+    parser.add_argument('--store', default=None, help=f"Store d'histogrammes (défaut: <racine>/{DEFAULT_STORE_NAME})")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--embeddings', action='store_true', help="Score par embeddings des unités sans indice")
+    args = parser.parse_args()
+
+    store_path = args.store or os.path.join(args.root, DEFAULT_STORE_NAME)
+    pipeline = DhatuClassificationPipeline(store_path, workers=args.workers, embeddings=args.embeddings)
+    report = pipeline.run(args.root)
+    totals = pipeline.store.totals()
+
+    print(f"🏭 CLASSIFICATION DHĀTU - {args.root} ({pipeline.workers} processus)")
+    print(f"   📄 {report.documents} documents classés, {report.unchanged} inchangés, {report.removed} retirés")
+    print(f"   🧬 {report.units:,} unités ({report.tagged:,} étiquetées), {report.bytes / 1e6:.1f} Mo "
+          f"en {report.duration:.2f}s -> {report.units_per_minute / 1e6:.2f} M unités/min")
+    print("   " + ", ".join(f"{d} {c:,}" for d, c in totals['histogram'].items()))
+    for error in report.errors:
+        print(f"   ⚠️ {error}")
+
+
+if __name__ == "__main__":
+    main()
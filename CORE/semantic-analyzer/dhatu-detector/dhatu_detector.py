@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+🧬 DÉTECTEUR DE DHĀTU INFORMATIONNELS
+=====================================
+
+Réduit un texte (code ou langue naturelle, français/anglais) à la séquence
+de ses 7 dhātu: COMM, ITER, TRANS, DECIDE, LOCATE, GROUP, SEQ.
+
+- tokenisation: identifiants découpés (snake_case, camelCase), minuscules,
+  accents retirés ("où" est gardé tel quel, "ou" étant ambigu)
+- lexique bilingue + quelques motifs de code ("=>", ".map(")
+- formes fléchies réduites par suffixes simples (located -> locate)
+
+    python dhatu_detector.py --test
+"""
+
+import re
+import sys
+import unicodedata
+from typing import Dict, List, Optional
+
+DHATUS = ('COMM', 'ITER', 'TRANS', 'DECIDE', 'LOCATE', 'GROUP', 'SEQ')
+
+DHATU_LEXICON: Dict[str, set] = {
+    'COMM': {
+        'print', 'println', 'printf', 'echo', 'log', 'logger', 'logging', 'send', 'recv', 'receive',
+        'emit', 'notify', 'notification', 'message', 'msg', 'say', 'tell', 'talk', 'speak', 'hello',
+        'hi', 'greet', 'communicate', 'api', 'request', 'response', 'respond', 'reply', 'http',
+        'display', 'show', 'input', 'output', 'stdout', 'stderr', 'mail', 'email', 'publish',
+        'broadcast', 'parler', 'dire', 'communiquer', 'bonjour', 'salut', 'hola', 'afficher',
+        'montrer', 'envoyer', 'recevoir', 'repondre', 'reponse', 'requete', 'annoncer'
+    },
+    'ITER': {
+        'for', 'while', 'loop', 'range', 'each', 'foreach', 'iter', 'iterate', 'iterator', 'repeat',
+        'again', 'all', 'every', 'times', 'enumerate', 'zip', 'yield', 'map', 'recursion', 'recursive',
+        'boucle', 'repeter', 'encore', 'chaque', 'tous', 'tout', 'toutes', 'fois', 'parcourir'
+    },
+    'TRANS': {
+        'transform', 'transformation', 'convert', 'change', 'modify', 'filter', 'map', 'reduce',
+        'replace', 'encode', 'decode', 'parse', 'format', 'translate', 'compile', 'compress',
+        'update', 'apply', 'lambda', 'process', 'normalize', 'transformer', 'convertir', 'changer',
+        'modifier', 'filtrer', 'remplacer', 'traduire', 'compresser', 'appliquer', 'traiter'
+    },
+    'DECIDE': {
+        'if', 'else', 'elif', 'switch', 'case', 'match', 'when', 'unless', 'choose', 'choice',
+        'decide', 'decision', 'condition', 'check', 'validate', 'assert', 'try', 'except', 'catch',
+        'whether', 'option', 'si', 'sinon', 'choisir', 'decider', 'verifier', 'valider', 'selon'
+    },
+    'LOCATE': {
+        'find', 'search', 'locate', 'location', 'where', 'lookup', 'seek', 'grep', 'query', 'path',
+        'address', 'url', 'here', 'there', 'index', 'glob', 'trouver', 'chercher',
+        'rechercher', 'localiser', 'chemin', 'adresse', 'ici', 'où'
+    },
+    'GROUP': {
+        'group', 'gather', 'collect', 'collection', 'list', 'array', 'dict', 'set', 'tuple',
+        'same', 'similar', 'together', 'merge', 'join', 'cluster', 'batch', 'append', 'class',
+        'module', 'package', 'grouper', 'regrouper', 'rassembler', 'collecter', 'tableau',
+        'ensemble', 'meme', 'similaire', 'fusionner', 'liste'
+    },
+    'SEQ': {
+        'first', 'then', 'after', 'before', 'last', 'order', 'sort', 'sorted', 'sequence', 'step',
+        'pipeline', 'queue', 'stack', 'begin', 'start', 'end', 'finally', 'await', 'chain', 'next',
+        'premier', 'premiere', 'puis', 'ensuite', 'apres', 'avant', 'dernier', 'ordre', 'trier',
+        'etape', 'commencer', 'enfin', 'suite', 'abord'
+    }
+}
+
+# Motifs de code (hors mots): dhātu des opérateurs
+CODE_PATTERNS = [
+    ('TRANS', re.compile(r'=>|\.map\(|\.filter\(|\.transform\(')),
+    ('GROUP', re.compile(r'\[\s*\]|\{\s*\}')),
+    ('SEQ', re.compile(r'\|>|&&|;\s*$', re.MULTILINE)),
+]
+
+SUFFIXES = ('ing', 'ent', 'ed', 'es', 'er', 'ez', 'd', 's', 'e')
+_WORD_RE = re.compile(r"[^\W\d]+", re.UNICODE)
+_CAMEL_RE = re.compile(r'[A-Z]?[a-z]+|[A-Z]+(?![a-z])')
+_CODE_HINT_RE = re.compile(r'\w\(|[{};]|=>|==|^\s*(def|class|import|fn|function|for|if)\b', re.MULTILINE)
+
+# Mot normalisé -> dhātu (un mot peut en porter plusieurs: map = ITER + TRANS)
+_WORD_INDEX: Dict[str, List[str]] = {}
+for _dhatu in DHATUS:
+    for _word in DHATU_LEXICON[_dhatu]:
+        _WORD_INDEX.setdefault(_word, []).append(_dhatu)
+
+
+def _strip_accents(word: str) -> str:
+    return ''.join(c for c in unicodedata.normalize('NFKD', word) if not unicodedata.combining(c))
+
+
+def tokenize(text: str) -> List[str]:
+    """Mots en minuscules, identifiants découpés (do_something -> do, something)"""
+    tokens = []
+    for word in _WORD_RE.findall(text):
+        for part in word.split('_'):
+            if not part:
+                continue
+            pieces = _CAMEL_RE.findall(part) if not part.islower() and not part.isupper() else [part]
+            tokens.extend(p.lower() for p in (pieces or [part]))
+    return tokens
+
+
+def word_dhatus(token: str) -> List[str]:
+    """Dhātu portés par un mot (forme exacte, sans accents, puis sans suffixe)"""
+    found = _WORD_INDEX.get(token)
+    if found:
+        return found
+    plain = _strip_accents(token)
+    found = _WORD_INDEX.get(plain)
+    if found:
+        return found
+    for suffix in SUFFIXES:
+        if plain.endswith(suffix) and len(plain) - len(suffix) >= 3:
+            found = _WORD_INDEX.get(plain[:-len(suffix)])
+            if found:
+                return found
+    return []
+
+
+class DhatuDetector:
+    """Détection des dhātu d'un texte et séquence canonique"""
+
+    def __init__(self):
+        self._cache: Dict[str, List[str]] = {}
+
+    def _lookup(self, token: str) -> List[str]:
+        found = self._cache.get(token)
+        if found is None:
+            found = self._cache[token] = word_dhatus(token)
+        return found
+
+    @staticmethod
+    def text_type(text: str) -> str:
+        hints = len(_CODE_HINT_RE.findall(text))
+        return 'programming' if hints and hints * 40 >= len(text.split()) else 'natural_language'
+
+    def dhatu_sequence(self, text: str) -> List[str]:
+        """Dhātu dans l'ordre d'apparition des mots"""
+        sequence = []
+        for token in tokenize(text):
+            sequence.extend(self._lookup(token))
+        return sequence
+
+    def detect_in_text(self, text: str) -> Dict:
+        """Dhātu détectés, ordonnés par première apparition, avec les mots correspondants"""
+        matches: Dict[str, List[str]] = {}
+        first_seen: Dict[str, int] = {}
+        for position, word in enumerate(_WORD_RE.finditer(text)):
+            for token in tokenize(word.group()):
+                for dhatu in self._lookup(token):
+                    first_seen.setdefault(dhatu, position)
+                    if token not in matches.setdefault(dhatu, []):
+                        matches[dhatu].append(token)
+        text_type = self.text_type(text)
+        if text_type == 'programming':
+            for dhatu, pattern in CODE_PATTERNS:
+                for match in pattern.finditer(text):
+                    first_seen.setdefault(dhatu, len(text[:match.start()].split()))
+                    if match.group().strip() not in matches.setdefault(dhatu, []):
+                        matches[dhatu].append(match.group().strip())
+
+        detected = [{'dhatu': dhatu, 'matches': matches[dhatu], 'first_position': first_seen[dhatu]}
+                    for dhatu in sorted(first_seen, key=lambda d: (first_seen[d], DHATUS.index(d)))]
+        return {
+            'text_type': text_type,
+            'detected_dhatus': detected,
+            'coverage': len(detected) / len(DHATUS)
+        }
+
+
+# Échantillons de validation (CORE/validation/dhatu_test_results.txt)
+VALIDATION_SAMPLES = [
+    ("for i in range(10): print(i)", {'ITER', 'COMM'}),
+    ("if condition: do_something() else: do_other()", {'DECIDE'}),
+    ("items.map(x => x.transform()).filter(x => x.valid)", {'ITER', 'TRANS'}),
+    ("I want to find where the files are located", {'LOCATE'}),
+    ("First, we need to group all similar items together", {'ITER', 'GROUP', 'SEQ'}),
+    ("Hello world", {'COMM'}),
+    ("Bonjour monde", {'COMM'}),
+]
+
+
+def run_validation(detector: Optional[DhatuDetector] = None) -> bool:
+    detector = detector or DhatuDetector()
+    print("🔬 Test de Détection des Dhātu\n")
+    success = True
+    for text, expected in VALIDATION_SAMPLES:
+        result = detector.detect_in_text(text)
+        found = {d['dhatu'] for d in result['detected_dhatus']}
+        status = "✅" if found == expected else "❌"
+        success &= found == expected
+        print(f"**Texte**: {text}")
+        print(f"**Type**: {result['text_type']}")
+        print(f"**Dhātu détectés**: {status}")
+        for detection in result['detected_dhatus']:
+            print(f"  - {detection['dhatu']}: {detection['matches']}")
+        print()
+    return success
+
+
+def main():
+    if '--test' in sys.argv:
+        return 0 if run_validation() else 1
+    text = ' '.join(sys.argv[1:]) or sys.stdin.read()
+    result = DhatuDetector().detect_in_text(text)
+    print(' + '.join(d['dhatu'] for d in result['detected_dhatus']) or "(aucun dhātu)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+🌍 CONTENT ADDRESSING SÉMANTIQUE
+================================
+
+"Hello world" -> [COMM] -> hash sémantique <- [COMM] <- "Bonjour monde"
+
+- forme canonique: séquence des dhātu du texte (dhatu_detector), répétitions
+  consécutives fusionnées (print; print -> COMM)
+- hash sémantique: BLAKE2b de la forme canonique (contenus équivalents par
+  le sens -> même hash, quelle que soit la langue ou la syntaxe)
+- signature MinHash sur les n-grammes de dhātu + index LSH par bandes:
+  les contenus proches sont trouvés sans parcourir toute la collection
+
+    python semantic_hash.py [racine]   # benchmark sur une arborescence
+"""
+
+import hashlib
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+# En tête: le dhatu_detector.py vide à la racine du dépôt ne doit pas masquer celui-ci
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from dhatu_detector import DHATUS, DhatuDetector
+
+SHINGLE_SIZE = 4
+NUM_PERM = 64
+LSH_BANDS = 16  # 16 bandes de 4 lignes: seuil de candidature ~ 0.5
+SIMILARITY_THRESHOLD = 0.8
+TEXT_EXTENSIONS = {'.py', '.rs', '.js', '.ts', '.sh', '.md', '.rst', '.txt', '.json', '.yaml', '.yml',
+                   '.toml', '.html', '.css', '.c', '.h', '.cpp', '.java', '.go', '.rb', '.tex', '.org'}
+MAX_TEXT_SIZE = 1024 * 1024
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_SHINGLE_HASHES: Dict[Tuple[str, ...], int] = {}
+
+
+def canonical_sequence(dhatus: Iterable[str]) -> List[str]:
+    """Fusionne les répétitions consécutives d'un même dhātu"""
+    canonical = []
+    for dhatu in dhatus:
+        if not canonical or canonical[-1] != dhatu:
+            canonical.append(dhatu)
+    return canonical
+
+
+def _shingle_hash(shingle: Tuple[str, ...]) -> int:
+    value = _SHINGLE_HASHES.get(shingle)
+    if value is None:
+        digest = hashlib.blake2b('.'.join(shingle).encode('ascii'), digest_size=8).digest()
+        value = _SHINGLE_HASHES[shingle] = int.from_bytes(digest, 'big')
+    return value
+
+
+@dataclass
+class SemanticFingerprint:
+    semantic_hash: Optional[str]  # None: aucun dhātu, pas d'adresse sémantique
+    length: int                   # Longueur de la séquence canonique
+    profile: Dict[str, int]       # Occurrences par dhātu (avant fusion)
+    signature: List[int] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        return {'semantic_hash': self.semantic_hash, 'length': self.length, 'profile': self.profile}
+
+
+class SemanticHashEngine:
+    """Texte -> séquence canonique de dhātu -> hash sémantique + signature MinHash"""
+
+    def __init__(self, detector: Optional[DhatuDetector] = None, shingle_size: int = SHINGLE_SIZE,
+                 num_perm: int = NUM_PERM, seed: int = 1729):
+        self.detector = detector or DhatuDetector()
+        self.shingle_size = shingle_size
+        rng = random.Random(seed)
+        self.permutations = [(rng.randrange(1, _MERSENNE_PRIME), rng.randrange(_MERSENNE_PRIME))
+                             for _ in range(num_perm)]
+
+    def canonical_form(self, text: str) -> List[str]:
+        return canonical_sequence(self.detector.dhatu_sequence(text))
+
+    def semantic_hash(self, text: str) -> Optional[str]:
+        return self._hash(self.canonical_form(text))
+
+    @staticmethod
+    def _hash(canonical: List[str]) -> Optional[str]:
+        if not canonical:
+            return None
+        return hashlib.blake2b('.'.join(canonical).encode('ascii'), digest_size=16).hexdigest()
+
+    def minhash(self, canonical: List[str]) -> List[int]:
+        k = self.shingle_size
+        if len(canonical) <= k:
+            shingles = {tuple(canonical)}
+        else:
+            shingles = {tuple(canonical[i:i + k]) for i in range(len(canonical) - k + 1)}
+        values = [_shingle_hash(s) for s in shingles]
+        p = _MERSENNE_PRIME
+        return [min((a * v + b) % p for v in values) for a, b in self.permutations]
+
+    def fingerprint(self, text: str) -> SemanticFingerprint:
+        sequence = self.detector.dhatu_sequence(text)
+        canonical = canonical_sequence(sequence)
+        profile = {d: 0 for d in DHATUS}
+        for dhatu in sequence:
+            profile[dhatu] += 1
+        return SemanticFingerprint(
+            semantic_hash=self._hash(canonical),
+            length=len(canonical),
+            profile=profile,
+            signature=self.minhash(canonical) if canonical else []
+        )
+
+    @staticmethod
+    def similarity(a: SemanticFingerprint, b: SemanticFingerprint) -> float:
+        """Jaccard estimée des n-grammes de dhātu (fraction de minima égaux)"""
+        if not a.signature or not b.signature:
+            return 0.0
+        return sum(x == y for x, y in zip(a.signature, b.signature)) / len(a.signature)
+
+
+class SemanticIndex:
+    """Index d'une collection: hash exact + buckets LSH (recherche sous-linéaire)"""
+
+    def __init__(self, engine: Optional[SemanticHashEngine] = None, bands: int = LSH_BANDS):
+        self.engine = engine or SemanticHashEngine()
+        num_perm = len(self.engine.permutations)
+        if num_perm % bands:
+            raise ValueError(f"{num_perm} permutations non divisibles en {bands} bandes")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.fingerprints: Dict[str, SemanticFingerprint] = {}
+        self.by_hash: Dict[str, List[str]] = defaultdict(list)
+        self.buckets: Dict[Tuple[int, int], List[str]] = defaultdict(list)
+
+    def _band_keys(self, signature: List[int]) -> List[Tuple[int, int]]:
+        r = self.rows
+        return [(band, hash(tuple(signature[band * r:(band + 1) * r]))) for band in range(self.bands)]
+
+    def add(self, key: str, text: Optional[str] = None,
+            fingerprint: Optional[SemanticFingerprint] = None) -> SemanticFingerprint:
+        if key in self.fingerprints:
+            raise ValueError(f"Clé déjà indexée: {key}")
+        fingerprint = fingerprint or self.engine.fingerprint(text or '')
+        self.fingerprints[key] = fingerprint
+        if fingerprint.semantic_hash is not None:
+            self.by_hash[fingerprint.semantic_hash].append(key)
+            for band_key in self._band_keys(fingerprint.signature):
+                self.buckets[band_key].append(key)
+        return fingerprint
+
+    def _resolve(self, query: Union[str, SemanticFingerprint]) -> SemanticFingerprint:
+        return self.fingerprints[query] if isinstance(query, str) else query
+
+    def equivalents(self, query: Union[str, SemanticFingerprint]) -> List[str]:
+        """Contenus de même hash sémantique (O(1))"""
+        fingerprint = self._resolve(query)
+        if fingerprint.semantic_hash is None:
+            return []
+        return [k for k in self.by_hash.get(fingerprint.semantic_hash, []) if k != query]
+
+    def candidates(self, query: Union[str, SemanticFingerprint]) -> set:
+        fingerprint = self._resolve(query)
+        if not fingerprint.signature:
+            return set()
+        found = set()
+        for band_key in self._band_keys(fingerprint.signature):
+            found.update(self.buckets.get(band_key, ()))
+        if isinstance(query, str):
+            found.discard(query)
+        return found
+
+    def similar(self, query: Union[str, SemanticFingerprint], threshold: float = SIMILARITY_THRESHOLD,
+                limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Contenus proches (candidats LSH vérifiés sur la signature complète)"""
+        fingerprint = self._resolve(query)
+        scored = [(key, self.engine.similarity(fingerprint, self.fingerprints[key]))
+                  for key in self.candidates(query)]
+        scored = sorted((s for s in scored if s[1] >= threshold), key=lambda s: (-s[1], s[0]))
+        return scored[:limit] if limit else scored
+
+    def equivalence_groups(self) -> List[List[str]]:
+        return sorted(sorted(keys) for keys in self.by_hash.values() if len(keys) > 1)
+
+    def stats(self) -> Dict:
+        addressed = sum(len(keys) for keys in self.by_hash.values())
+        return {
+            'documents': len(self.fingerprints),
+            'addressed': addressed,
+            'without_dhatu': len(self.fingerprints) - addressed,
+            'semantic_hashes': len(self.by_hash),
+            'equivalence_groups': len(self.equivalence_groups()),
+            'lsh_buckets': len(self.buckets)
+        }
+
+
+def benchmark_queries(index: SemanticIndex, threshold: float = SIMILARITY_THRESHOLD,
+                      max_queries: int = 200) -> Dict:
+    """Recherche LSH vs parcours linéaire: temps, fraction examinée, rappel"""
+    keys = [k for k, fp in index.fingerprints.items() if fp.signature][:max_queries]
+    lsh_time = linear_time = 0.0
+    examined = found = expected = 0
+    for key in keys:
+        start = time.perf_counter()
+        candidates = index.candidates(key)
+        hits = {k for k, _ in index.similar(key, threshold)}
+        lsh_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        query = index.fingerprints[key]
+        truth = {k for k, fp in index.fingerprints.items()
+                 if k != key and index.engine.similarity(query, fp) >= threshold}
+        linear_time += time.perf_counter() - start
+
+        examined += len(candidates)
+        found += len(hits & truth)
+        expected += len(truth)
+    total = max(1, len(index.fingerprints) - 1) * max(1, len(keys))
+    return {
+        'queries': len(keys),
+        'lsh_ms_per_query': round(lsh_time * 1000 / max(1, len(keys)), 3),
+        'linear_ms_per_query': round(linear_time * 1000 / max(1, len(keys)), 3),
+        'examined_fraction': round(examined / total, 4),
+        'recall': round(found / expected, 3) if expected else None
+    }
+
+
+def benchmark(texts: Dict[str, str], engine: Optional[SemanticHashEngine] = None) -> Tuple[SemanticIndex, Dict]:
+    """Indexe `texts` et mesure le débit d'empreinte puis les requêtes"""
+    index = SemanticIndex(engine)
+    start = time.perf_counter()
+    for key, text in texts.items():
+        index.add(key, text)
+    duration = time.perf_counter() - start
+    size = sum(len(t.encode('utf-8')) for t in texts.values())
+    results = {
+        'fingerprint_seconds': round(duration, 3),
+        'documents_per_second': round(len(texts) / duration, 1) if duration else None,
+        'mb_per_second': round(size / 1e6 / duration, 2) if duration else None,
+        'index': index.stats(),
+        'queries': benchmark_queries(index)
+    }
+    return index, results
+
+
+def load_corpus(root: str, extensions: Iterable[str] = TEXT_EXTENSIONS) -> Dict[str, str]:
+    extensions = set(extensions)
+    texts = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith('.') and d not in ('__pycache__', 'node_modules', 'target')]
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            if os.path.splitext(filename)[1].lower() in extensions and os.path.getsize(path) <= MAX_TEXT_SIZE:
+                with open(path, encoding='utf-8', errors='ignore') as f:
+                    texts[os.path.relpath(path, root)] = f.read()
+    return texts
+
+
+def main():
+    root = sys.argv[1] if len(sys.argv) > 1 else os.getcwd()
+    texts = load_corpus(root)
+    print(f"🌍 CONTENT ADDRESSING SÉMANTIQUE - {root} ({len(texts)} fichiers texte)")
+    index, results = benchmark(texts)
+    stats, queries = results['index'], results['queries']
+    print(f"   ⚡ Empreintes: {results['fingerprint_seconds']}s, {results['documents_per_second']} fichiers/s, "
+          f"{results['mb_per_second']} Mo/s")
+    print(f"   🧬 {stats['semantic_hashes']} hash sémantiques pour {stats['addressed']} fichiers, "
+          f"{stats['equivalence_groups']} groupes équivalents, {stats['without_dhatu']} sans dhātu")
+    print(f"   🔎 LSH {queries['lsh_ms_per_query']} ms/requête vs linéaire {queries['linear_ms_per_query']} ms, "
+          f"{queries['examined_fraction']:.1%} de la collection examinée, rappel {queries['recall']}")
+    for group in index.equivalence_groups()[:10]:
+        print(f"   = {' | '.join(group[:4])}{' ...' if len(group) > 4 else ''}")
+
+
+if __name__ == "__main__":
+    main()
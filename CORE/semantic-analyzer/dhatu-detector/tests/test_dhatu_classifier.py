@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests du classifieur dhātu parallèle (lexique compilé, blocs, store d'histogrammes)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from dhatu_classifier import DhatuClassificationPipeline, DhatuClassifier, iter_chunks, mask_labels
+from dhatu_detector import (DHATU_LEXICON, DHATUS, SUFFIXES, VALIDATION_SAMPLES,
+                           DhatuDetector)
+
+
+def test_compiled_lexicon_agrees_with_detector():
+    classifier = DhatuClassifier()
+    for text, expected in VALIDATION_SAMPLES:
+        assert set(mask_labels(classifier.classify_unit(text))) == expected, text
+    assert mask_labels(classifier.classify_unit("getFilePath(); répéter où")) == ['ITER', 'LOCATE']
+
+    units, masks = classifier.classify_text("Hello world. Then sort it!\nrien à signaler", prose=True)
+    assert units == ["Hello world.", "Then sort it!", "rien à signaler"]
+    assert [mask_labels(m) for m in masks] == [['COMM'], ['SEQ'], []]
+
+
+def test_compiled_forms_match_detector_on_short_and_inflected_words():
+    classifier, detector = DhatuClassifier(), DhatuDetector()
+    words = {word for lexicon in DHATU_LEXICON.values() for word in lexicon}
+    tokens = {word + suffix for word in words for suffix in [''] + list(SUFFIXES)}
+    tokens |= {"his", "hid", "sis", "ifs", "ors", "dos"}
+    for token in sorted(tokens):
+        assert mask_labels(classifier.classify_unit(token)) == sorted(set(detector.dhatu_sequence(token)),
+                                                                        key=DHATUS.index), token
+
+
+def test_chunks_end_on_line_boundaries(tmp_path):
+    path = tmp_path / 'big.py'
+    path.write_bytes(b''.join(b'print(%d)\n' % i for i in range(5000)))
+    chunks = list(iter_chunks(str(path), chunk_size=4096))
+    assert len(chunks) > 5 and all(c.endswith(b'\n') for c in chunks)
+    assert b''.join(chunks) == path.read_bytes()
+
+
+def test_parallel_pipeline_matches_serial_and_is_incremental(tmp_path):
+    corpus = tmp_path / 'corpus'
+    corpus.mkdir()
+    (corpus / 'loop.py').write_text("for x in items:\n    print(x)\n\nif x:\n    pass\n" * 300)
+    (corpus / 'notes.md').write_text("First, find the file. Then group the results.\n" * 200)
+    (corpus / 'skip.bin').write_bytes(b'\x00\x01')
+
+    serial = DhatuClassificationPipeline(str(tmp_path / 'serial.json'), workers=1, chunk_size=1024)
+    parallel = DhatuClassificationPipeline(str(tmp_path / 'parallel.json'), workers=2, chunk_size=1024)
+    report = serial.run(str(corpus))
+    parallel.run(str(corpus))
+    assert report.documents == 2 and report.units == 1200 + 400
+    assert serial.store.documents == parallel.store.documents
+
+    notes = serial.store.get('notes.md')
+    assert notes['units'] == 400 and notes['histogram']['SEQ'] == 400 and notes['histogram']['GROUP'] == 200
+    assert serial.store.top('ITER')[0][0] == 'loop.py'
+
+    again = DhatuClassificationPipeline(str(tmp_path / 'serial.json'), workers=1).run(str(corpus))
+    assert again.documents == 0 and again.unchanged == 2
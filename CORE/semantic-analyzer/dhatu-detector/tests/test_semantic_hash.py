@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests du détecteur de dhātu et du content addressing sémantique
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from dhatu_detector import VALIDATION_SAMPLES, DhatuDetector
+from semantic_hash import SemanticHashEngine, SemanticIndex, benchmark
+
+
+def test_detector_matches_validation_samples():
+    detector = DhatuDetector()
+    for text, expected in VALIDATION_SAMPLES:
+        result = detector.detect_in_text(text)
+        assert {d['dhatu'] for d in result['detected_dhatus']} == expected, text
+    first = detector.detect_in_text("for i in range(10): print(i)")
+    assert [d['dhatu'] for d in first['detected_dhatus']] == ['ITER', 'COMM']
+    assert first['text_type'] == 'programming'
+
+
+def test_same_meaning_same_hash():
+    engine = SemanticHashEngine()
+    assert engine.semantic_hash("Hello world") == engine.semantic_hash("Bonjour monde")
+    assert engine.semantic_hash("for x in items: print(x)") == \
+        engine.semantic_hash("Pour chaque élément, afficher le message")
+    assert engine.semantic_hash("Hello world") != engine.semantic_hash("find the file")
+    assert engine.semantic_hash("42 + 17") is None
+
+
+def test_index_finds_equivalent_and_similar_content():
+    steps = ["First find the files", "then filter them", "group the results",
+             "if empty, print a message", "repeat for each folder", "send the report"]
+    texts = {
+        'en.md': ' '.join(steps),
+        'fr.md': "D'abord trouver les fichiers puis les filtrer, regrouper les résultats, "
+                 "si vide afficher un message, répéter pour chaque dossier, envoyer le rapport",
+        'en_extended.md': ' '.join(steps) + " and finally sort the log",
+        'other.py': "while True:\n    data = parse(data)\n    if data: break",
+    }
+    index, results = benchmark(texts)
+    assert index.equivalence_groups() == [['en.md', 'fr.md']]
+    assert index.equivalents('fr.md') == ['en.md']
+    assert [key for key, _ in index.similar('en.md', threshold=0.5)][:2] == ['fr.md', 'en_extended.md']
+    assert 'other.py' not in index.candidates('en.md')
+    assert results['queries']['recall'] == 1.0
+    assert results['index']['documents'] == 4
+
+    query = SemanticIndex().engine.fingerprint("Hello there")
+    assert index.candidates(query) == set()
@@ -12,6 +12,30 @@ from pathlib import Path
 import threading
 import queue
 import os
+import re
+from collections import Counter
+
+# Suivi de progression par débit réel (OPERATIONS/DevOps/scripts)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             '..', '..', 'OPERATIONS', 'DevOps', 'scripts'))
+from progress_tracker import ProgressTracker
+
+# Traitement par shards persistés et reprenables (ECOSYSTEM/semantic-core)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'semantic-core'))
+from corpus_jobs import CorpusJob, file_documents
+
+CORPUS_LIMITS = {'small': 200, 'medium': 2000, 'large': None}
+CORPUS_EXTENSIONS = ('.md', '.txt', '.py', '.rst')
+WORD_PATTERN = re.compile(r"[a-zà-ÿ]{4,}")
+VOCABULARY_JOB_VERSION = "vocabulary-v1"
+
+
+def vocabulary_shard(keys, texts):
+    """Termes fréquents d'un shard (résultat persisté par CorpusJob)"""
+    vocabulary = Counter()
+    for text in texts:
+        vocabulary.update(WORD_PATTERN.findall(text.lower()))
+    return {'vocabulary': dict(vocabulary)}
 
 class CopilotageCompliantController:
     """Controller Colab respectant les règles de copilotage"""
@@ -22,6 +46,8 @@ class CopilotageCompliantController:
         self.user_intervention_required = False
         self.session_log = []
         self.start_time = datetime.now()
+        self.trackers = []
+        self.job_stats = {}
         
         # Checkpoints obligatoires
         self.checkpoints = {
@@ -42,9 +68,35 @@ class CopilotageCompliantController:
         }
         
         self.session_log.append(status)
+        self.status_queue.put(status)
         print(f"⏱️  {status['session_time']:.1f}s | {message} | {progress}% | ETA: {eta_seconds}s")
         return status
     
+    def progress_tracker(self, name, total=None, unit='items', **options):
+        """Tracker de compteurs réels publié via emit_status (< max_silence)"""
+        tracker = ProgressTracker(name, total=total, unit=unit, sink=self.report_progress,
+                                  publish_interval=min(2.0, self.max_silence / 2),
+                                  stall_after=self.max_silence, **options)
+        self.trackers.append(tracker)
+        return tracker
+    
+    def report_progress(self, status):
+        """Status d'un tracker -> emit_status (progress/ETA mesurés)"""
+        message = f"{status['name']}: {status['count']} {status['unit']} ({status['rate']:.1f}/s)"
+        if status['stalled']:
+            message = f"⚠️ BLOQUÉ {message}"
+        progress = round(status['progress'], 1) if status['progress'] is not None else 0
+        eta = round(status['eta']) if status['eta'] is not None else 0
+        self.emit_status(message, progress, eta)
+    
+    def poll_trackers(self):
+        """Détection de blocage (à appeler depuis un thread de surveillance)"""
+        for tracker in list(self.trackers):
+            if tracker.done:
+                self.trackers.remove(tracker)
+            else:
+                tracker.poll()
+    
     def require_user_intervention(self, reason, options=None):
         """Force intervention utilisateur - Respect règle Copilotage"""
         self.user_intervention_required = True
@@ -141,52 +193,108 @@ class CopilotageCompliantController:
         
         return 'continue'
     
-    def run_semantic_processing_compliant(self, corpus_size="small"):
+    def load_corpus(self, corpus_dir, limit=None):
+        """Documents texte du corpus (chemins triés, limite selon corpus_size)"""
+        paths = sorted(p for p in Path(corpus_dir).rglob('*')
+                       if p.suffix in CORPUS_EXTENSIONS and p.is_file() and '.git' not in p.parts)
+        return paths[:limit] if limit else paths
+    
+    def process_documents(self, paths, tracker, vocabulary):
+        """Traitement réel: lecture + termes fréquents, avancement en octets"""
+        for path in paths:
+            try:
+                data = path.read_bytes()
+            except OSError:
+                tracker.advance(0)
+                continue
+            vocabulary.update(WORD_PATTERN.findall(data.decode('utf-8', errors='ignore').lower()))
+            tracker.advance(len(data))
+    
+    def process_documents_job(self, paths, tracker, job, corpus_dir):
+        """Même traitement par shards persistés: un run interrompu reprend au dernier
+        shard terminé, les shards déjà calculés sont réutilisés; avancement en octets"""
+        documents = file_documents(corpus_dir, paths)
+        sizes = {key: len(text.encode('utf-8')) for key, text in documents}
+        manifest = job.run(documents, on_shard=lambda shard, reused: tracker.advance(
+            sum(sizes[key] for key in shard.keys)))
+        self.job_stats[tracker.name] = {
+            'shards': len(manifest['shards']),
+            'processed': manifest['processed_shards'],
+            'reused': manifest['reused_shards']
+        }
+        return manifest
+    
+    def job_vocabulary(self, job):
+        """Fusion des vocabulaires des shards du dernier run"""
+        vocabulary = Counter()
+        for _, result in job.iter_results():
+            vocabulary.update(result['vocabulary'])
+        return vocabulary
+    
+    def run_semantic_processing_compliant(self, corpus_size="small", corpus_dir=".", job_dir=None):
         """Traitement sémantique respectant règles Copilotage"""
-        self.emit_status("🎯 Démarrage traitement - Mode Copilotage Compliant", 0, 30)
+        self.emit_status("🎯 Démarrage traitement - Mode Copilotage Compliant", 0, 0)
         
-        # Phase 1: Validation précoce (30s MAX)
-        time.sleep(2)
-        self.emit_status("🔧 Validation environnement", 10, 25)
+        # Surveillance des blocages pendant tout le traitement
+        monitoring = threading.Event()
+        def monitor():
+            while not monitoring.wait(1.0):
+                self.poll_trackers()
+        threading.Thread(target=monitor, daemon=True).start()
         
-        time.sleep(3) 
-        self.emit_status("📊 Test échantillon données", 20, 20)
+        try:
+            return self._run_phases(corpus_size, corpus_dir, job_dir)
+        finally:
+            monitoring.set()
+    
+    def _run_phases(self, corpus_size, corpus_dir, job_dir=None):
+        # Phase 1: Validation précoce sur échantillon (30s MAX)
+        self.emit_status("🔧 Validation environnement", 0, 0)
+        paths = self.load_corpus(corpus_dir, CORPUS_LIMITS.get(corpus_size, CORPUS_LIMITS['small']))
+        sizes = [p.stat().st_size for p in paths]
+        sample_count = max(1, len(paths) // 20) if paths else 0
+        share = lambda count: round(100 * sum(sizes[:count]) / max(1, sum(sizes)))
+        vocabulary = Counter()
+        job = CorpusJob(job_dir, vocabulary_shard, VOCABULARY_JOB_VERSION) if job_dir else None
         
-        time.sleep(5)
-        self.emit_status("⚡ Benchmark vitesse initiale", 30, 15)
+        with self.progress_tracker("📊 Échantillon", total=sum(sizes[:sample_count]), unit='octets') as tracker:
+            if job is not None:
+                self.process_documents_job(paths[:sample_count], tracker, job, corpus_dir)
+            else:
+                self.process_documents(paths[:sample_count], tracker, vocabulary)
         
         # CHECKPOINT OBLIGATOIRE 30s
-        time.sleep(20)  # Total: 30s
-        action = self.checkpoint_validation('validation_30s', 30)
+        action = self.checkpoint_validation('validation_30s', share(sample_count))
         if action in ['arrêter', 'timeout']:
             return self.generate_session_report()
         
-        # Phase 2: Traitement batch (2min MAX avant nouveau checkpoint)
-        self.emit_status("🚀 Traitement corpus principal", 40, 90)
-        
-        for i in range(9):  # 9 * 10s = 90s supplémentaires 
-            time.sleep(10)
-            progress = 40 + (i + 1) * 5  # 45, 50, 55, ... 85
-            self.emit_status(f"   Batch {i+1}/10 terminé", progress, 90 - (i+1)*10)
+        # Phase 2: Traitement corpus principal (2min MAX avant nouveau checkpoint)
+        if job is not None:
+            # Job sur tout le corpus: les shards de l'échantillon sont réutilisés
+            with self.progress_tracker("🚀 Corpus principal", total=sum(sizes), unit='octets') as tracker:
+                self.process_documents_job(paths, tracker, job, corpus_dir)
+            job.prune()
+            vocabulary = self.job_vocabulary(job)
+        else:
+            with self.progress_tracker("🚀 Corpus principal", total=sum(sizes[sample_count:]), unit='octets') as tracker:
+                self.process_documents(paths[sample_count:], tracker, vocabulary)
         
         # CHECKPOINT 2min
-        action = self.checkpoint_validation('progress_2min', 85)
+        action = self.checkpoint_validation('progress_2min', share(len(paths)))
         if action in ['arrêter', 'timeout']:
             return self.generate_session_report()
         
-        # Phase 3: Finalisation (3min MAX)
-        time.sleep(10)
-        self.emit_status("🎨 Génération embeddings finaux", 90, 30)
-        
-        time.sleep(20)
-        self.emit_status("📈 Validation qualité globale", 95, 10)
+        # Phase 3: Finalisation - termes dominants du corpus
+        with self.progress_tracker("🎨 Concepts finaux", total=len(vocabulary), unit='termes') as tracker:
+            self.top_concepts = vocabulary.most_common(20)
+            tracker.advance(len(vocabulary))
+        self.corpus_stats = {'documents': len(paths), 'bytes': sum(sizes), 'vocabulary': len(vocabulary)}
         
         # CHECKPOINT qualité 5min total
-        action = self.checkpoint_validation('quality_check_5min', 95)
+        action = self.checkpoint_validation('quality_check_5min', 100)
         if action in ['arrêter', 'timeout']:
             return self.generate_session_report()
         
-        time.sleep(10)
         self.emit_status("✅ Traitement terminé", 100, 0)
         
         return self.generate_session_report()
@@ -202,6 +310,9 @@ class CopilotageCompliantController:
             'checkpoints_status': self.checkpoints,
             'intervention_count': len([log for log in self.session_log if log.get('type') == 'user_intervention']),
             'session_log': self.session_log,
+            'corpus': getattr(self, 'corpus_stats', {}),
+            'top_concepts': getattr(self, 'top_concepts', []),
+            'corpus_jobs': self.job_stats,
             'copilotage_compliance': {
                 'timeboxing_10s': all(
                     log.get('session_time', 0) < 10 or log.get('type') == 'user_intervention' 
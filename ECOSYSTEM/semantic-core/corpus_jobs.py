@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+💾 TRAITEMENTS DE CORPUS PAR SHARDS, AVEC REPRISE
+=================================================
+
+Un corpus (documents clé -> texte) est découpé en shards déterministes,
+chaque shard est traité puis persisté atomiquement avec un manifeste:
+
+- découpage par contenu: documents triés par clé, un shard se ferme sur
+  une clé dont le hash tombe sur 0 modulo `shard_size` (taille moyenne),
+  ou à `max_shard_factor * shard_size`. Ajouter des documents ne modifie
+  que les shards où ils tombent, les autres gardent leurs frontières
+- identité d'un shard = empreinte (version du traitement, clés, hash des
+  contenus): un shard déjà calculé est réutilisé tel quel, y compris
+  quand le job est relancé avec plus de données
+- écriture atomique: résultats écrits dans tmp/<pid>/ puis renommés dans
+  shards/<empreinte>/, manifeste réécrit (fsync + os.replace) après
+  chaque shard. Un run tué ou préempté reprend au premier shard manquant;
+  ses fichiers temporaires sont supprimés au run suivant (processus mort)
+
+    job = CorpusJob("jobs/corpus", process, version="vocabulaire-v1")
+    manifest = job.run(documents)          # [(clé, texte), ...]
+    for shard, result in job.iter_results():
+        ...
+
+`process(keys, texts)` rend un dict: tableaux numpy (sauvés en .npy,
+relus en mmap) et valeurs JSON.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             '..', '..', 'OPERATIONS', 'DevOps', 'scripts'))
+from lazy_import import lazy_import
+from stream_sketches import hash64
+
+np = lazy_import('numpy')
+
+MANIFEST_NAME = "manifest.json"
+RESULTS_NAME = "results.json"
+MANIFEST_VERSION = 1
+
+ShardProcess = Callable[[List[str], List[str]], Dict[str, Any]]
+
+
+def content_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode('utf-8', errors='surrogatepass'), digest_size=16).hexdigest()
+
+
+@dataclass
+class Shard:
+    """Documents consécutifs (ordre des clés) traités et persistés ensemble"""
+    id: str
+    keys: List[str]
+    hashes: List[str] = field(repr=False)
+    positions: List[int] = field(repr=False)  # index dans la liste de documents du run
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+def plan_shards(documents: Sequence[Tuple[str, str]], version: str, shard_size: int = 64,
+                max_shard_factor: int = 4) -> List[Shard]:
+    """Découpage déterministe par contenu des documents triés par clé"""
+    order = sorted(range(len(documents)), key=lambda i: documents[i][0])
+    for previous, current in zip(order, order[1:]):
+        if documents[previous][0] == documents[current][0]:
+            raise ValueError(f"Clé de document dupliquée: {documents[current][0]}")
+
+    shards, current = [], []
+    max_size = max(1, shard_size * max_shard_factor)
+
+    def close():
+        keys = [documents[i][0] for i in current]
+        hashes = [content_hash(documents[i][1]) for i in current]
+        digest = hashlib.sha256(version.encode('utf-8'))
+        for key, text_hash in zip(keys, hashes):
+            digest.update(b"\x00" + key.encode('utf-8', errors='surrogatepass') + b"\x00" + text_hash.encode())
+        shards.append(Shard(digest.hexdigest()[:24], keys, hashes, list(current)))
+
+    for i in order:
+        current.append(i)
+        if hash64(documents[i][0]) % shard_size == 0 or len(current) >= max_size:
+            close()
+            current = []
+    if current:
+        close()
+    return shards
+
+
+def _write_json_atomic(path: Path, data: Any):
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _is_array(value: Any) -> bool:
+    numpy = sys.modules.get('numpy')
+    return numpy is not None and isinstance(value, numpy.ndarray)
+
+
+class CorpusJob:
+    """Job de traitement d'un corpus par shards persistés, reprenable"""
+
+    def __init__(self, job_dir: str, process: ShardProcess, version: str = "1",
+                 shard_size: int = 64, max_shard_factor: int = 4):
+        self.job_dir = Path(job_dir)
+        self.process = process
+        self.version = version
+        self.shard_size = max(1, shard_size)
+        self.max_shard_factor = max_shard_factor
+        self.shards_dir = self.job_dir / "shards"
+        self.tmp_dir = self.job_dir / "tmp"
+        self.staging_dir = self.tmp_dir / str(os.getpid())
+        self.manifest_path = self.job_dir / MANIFEST_NAME
+
+    def plan(self, documents: Sequence[Tuple[str, str]]) -> List[Shard]:
+        return plan_shards(documents, self.version, self.shard_size, self.max_shard_factor)
+
+    def is_done(self, shard_id: str) -> bool:
+        return (self.shards_dir / shard_id / RESULTS_NAME).exists()
+
+    def load_manifest(self) -> Optional[Dict]:
+        if not self.manifest_path.exists():
+            return None
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def run(self, documents: Iterable[Tuple[str, str]], max_shards: Optional[int] = None,
+            on_shard: Optional[Callable[[Shard, bool], None]] = None) -> Dict:
+        """Traite les shards manquants, réutilise les autres; rend le manifeste.
+
+        max_shards borne le nombre de shards calculés par ce run (travail par
+        tranches); on_shard(shard, réutilisé) est appelé après chaque shard.
+        """
+        documents = list(documents)
+        shards = self.plan(documents)
+        self.shards_dir.mkdir(parents=True, exist_ok=True)
+        self._clean_stale_staging()
+        self.staging_dir.mkdir(parents=True, exist_ok=True)
+
+        manifest = {
+            'manifest_version': MANIFEST_VERSION,
+            'version': self.version,
+            'shard_size': self.shard_size,
+            'documents': len(documents),
+            'started': datetime.now().isoformat(),
+            'updated': None,
+            'complete': False,
+            'completed_shards': 0,
+            'processed_shards': 0,
+            'reused_shards': 0,
+            'shards': [{'id': shard.id, 'documents': len(shard), 'first_key': shard.keys[0],
+                        'last_key': shard.keys[-1], 'status': 'pending'} for shard in shards]
+        }
+        self._save_manifest(manifest)
+
+        computed = 0
+        for shard, entry in zip(shards, manifest['shards']):
+            reused = self.is_done(shard.id)
+            if not reused:
+                if max_shards is not None and computed >= max_shards:
+                    break
+                start = time.perf_counter()
+                self._process_shard(shard, documents)
+                entry['seconds'] = round(time.perf_counter() - start, 3)
+                computed += 1
+            entry['status'] = 'reused' if reused else 'done'
+            manifest['completed_shards'] += 1
+            manifest['reused_shards' if reused else 'processed_shards'] += 1
+            self._save_manifest(manifest)
+            if on_shard is not None:
+                on_shard(shard, reused)
+
+        manifest['complete'] = manifest['completed_shards'] == len(shards)
+        self._save_manifest(manifest)
+        shutil.rmtree(self.staging_dir, ignore_errors=True)
+        try:
+            self.tmp_dir.rmdir()  # Seulement s'il n'y a pas de run concurrent
+        except OSError:
+            pass
+        return manifest
+
+    def _clean_stale_staging(self):
+        """Écritures interrompues de runs morts (tués pendant un shard), pas celles d'un run concurrent"""
+        if not self.tmp_dir.exists():
+            return
+        for directory in self.tmp_dir.iterdir():
+            pid = int(directory.name) if directory.name.isdigit() else None
+            if pid is None or pid == os.getpid() or not _pid_alive(pid):
+                shutil.rmtree(directory, ignore_errors=True)
+
+    def _save_manifest(self, manifest: Dict):
+        manifest['updated'] = datetime.now().isoformat()
+        _write_json_atomic(self.manifest_path, manifest)
+
+    def _process_shard(self, shard: Shard, documents: Sequence[Tuple[str, str]]):
+        result = self.process(list(shard.keys), [documents[i][1] for i in shard.positions])
+        staging = self.staging_dir / shard.id
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir()
+        values, arrays = {}, []
+        for name, value in result.items():
+            if _is_array(value):
+                with open(staging / f"{name}.npy", 'wb') as f:
+                    np.save(f, value)
+                    f.flush()
+                    os.fsync(f.fileno())
+                arrays.append(name)
+            else:
+                values[name] = value
+        _write_json_atomic(staging / RESULTS_NAME, {
+            'shard': shard.id, 'version': self.version, 'keys': shard.keys,
+            'hashes': shard.hashes, 'arrays': arrays, 'values': values
+        })
+        target = self.shards_dir / shard.id
+        try:
+            os.rename(staging, target)
+        except OSError:
+            if not self.is_done(shard.id):  # Autre run concurrent: son shard fait foi
+                raise
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def load_shard(self, shard_id: str, mmap: bool = True) -> Dict[str, Any]:
+        """Résultats d'un shard: valeurs JSON + tableaux (mmap) + 'keys'"""
+        directory = self.shards_dir / shard_id
+        with open(directory / RESULTS_NAME, 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+        result = dict(stored['values'])
+        for name in stored['arrays']:
+            result[name] = np.load(directory / f"{name}.npy", mmap_mode='r' if mmap else None)
+        result['keys'] = stored['keys']
+        return result
+
+    def iter_results(self, mmap: bool = True) -> Iterator[Tuple[Dict, Dict[str, Any]]]:
+        """(entrée du manifeste, résultats) des shards terminés, dans l'ordre des clés"""
+        manifest = self.load_manifest() or {'shards': []}
+        for entry in manifest['shards']:
+            if entry['status'] in ('done', 'reused'):
+                yield entry, self.load_shard(entry['id'], mmap)
+
+    def prune(self) -> int:
+        """Supprime les shards absents du dernier manifeste (données retirées ou modifiées)"""
+        manifest = self.load_manifest()
+        if manifest is None or not self.shards_dir.exists():
+            return 0
+        keep = {entry['id'] for entry in manifest['shards']}
+        removed = 0
+        for directory in self.shards_dir.iterdir():
+            if directory.name not in keep:
+                shutil.rmtree(directory, ignore_errors=True)
+                removed += 1
+        return removed
+
+
+def file_documents(corpus_dir: str, paths: Optional[Iterable[Path]] = None,
+                   extensions: Sequence[str] = ('.md', '.txt', '.py', '.rst')) -> List[Tuple[str, str]]:
+    """Documents (chemin relatif, texte) d'un dossier de corpus"""
+    root = Path(corpus_dir)
+    if paths is None:
+        paths = sorted(p for p in root.rglob('*')
+                       if p.suffix in extensions and p.is_file() and '.git' not in p.parts)
+    documents = []
+    for path in paths:
+        try:
+            text = path.read_bytes().decode('utf-8', errors='ignore')
+        except OSError:
+            continue
+        documents.append((path.relative_to(root).as_posix(), text))
+    return documents
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Traitement sémantique d'un corpus par shards reprenables")
+    parser.add_argument('corpus_dir')
+    parser.add_argument('job_dir')
+    parser.add_argument('--shard-size', type=int, default=64, help="Documents par shard (moyenne)")
+    parser.add_argument('--max-shards', type=int, default=None, help="Shards calculés par ce run")
+    parser.add_argument('--model', default="all-MiniLM-L6-v2")
+    parser.add_argument('--status', action='store_true', help="Affiche le manifeste sans traiter")
+    parser.add_argument('--prune', action='store_true', help="Supprime les shards obsolètes après le run")
+    parser.add_argument('--no-cluster', action='store_true',
+                        help="Sans clustering global (requis au-delà de MAX_CLUSTERING_DOCUMENTS)")
+    args = parser.parse_args()
+
+    if args.status:
+        manifest = CorpusJob(args.job_dir, process=None).load_manifest()
+        if manifest is None:
+            print(f"⚠️  Aucun manifeste dans {args.job_dir}")
+            return
+        print(f"💾 {manifest['completed_shards']}/{len(manifest['shards'])} shards "
+              f"({manifest['reused_shards']} réutilisés) | {manifest['documents']} documents | "
+              f"{'complet' if manifest['complete'] else 'incomplet'} | {manifest['updated']}")
+        return
+
+    from semantic_core import UniversalSemanticProcessor
+    processor = UniversalSemanticProcessor(args.model)
+    documents = file_documents(args.corpus_dir)
+    print(f"📚 {len(documents)} documents dans {args.corpus_dir}")
+    result = processor.process_corpus(documents, args.job_dir, shard_size=args.shard_size,
+                                      max_shards=args.max_shards, cluster=not args.no_cluster)
+    manifest = result['manifest']
+    print(f"💾 {manifest['processed_shards']} shards calculés, {manifest['reused_shards']} réutilisés "
+          f"sur {len(manifest['shards'])}")
+    if not manifest['complete']:
+        print("⏸️  Job incomplet: relancer la même commande pour reprendre")
+    elif 'universality_score' in result:
+        print(f"✅ Score universalité: {result['universality_score']:.2f}")
+    if args.prune:
+        print(f"🧹 {CorpusJob(args.job_dir, process=None).prune()} shards obsolètes supprimés")
+
+
+if __name__ == "__main__":
+    main()
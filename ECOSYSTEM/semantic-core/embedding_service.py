@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+🧲 SERVICE LOCAL D'EMBEDDINGS (MICRO-BATCHING DYNAMIQUE)
+========================================================
+
+Un seul processus charge le SentenceTransformer et sert tous les autres
+(étapes de pipeline, requêtes du dashboard) sur un socket Unix:
+
+- les requêtes concurrentes sont regroupées en lots d'au moins
+  `max_batch` textes, ou après `max_wait` secondes d'attente au plus
+- les textes identiques d'un même lot ne sont encodés qu'une fois
+- la réponse est un buffer float32 brut (lignes x dimension), sans JSON
+
+Protocole (little-endian, connexion persistante):
+
+    requête : <B op> <I taille> charge
+              ENCODE: <I n> puis n x (<I longueur> texte UTF-8)
+              INFO  : charge vide
+    réponse : <B statut> <I lignes> <I dimension> <I taille> charge
+              OK + ENCODE: lignes x dimension float32
+              OK + INFO  : statistiques (JSON, hors chemin chaud)
+              ERREUR     : message UTF-8
+
+Une requête annonçant plus de MAX_REQUEST_BYTES reçoit une erreur et la
+connexion est fermée (charge non lue).
+
+    python embedding_service.py --model all-MiniLM-L6-v2 --max-batch 64 --max-wait-ms 5
+"""
+
+import argparse
+import json
+import os
+import queue
+import socket
+import socketserver
+import struct
+import sys
+import threading
+import time
+from array import array
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             '..', '..', 'OPERATIONS', 'DevOps', 'scripts'))
+from lazy_import import lazy_import, module_available
+
+np = lazy_import('numpy')
+
+SOCKET_ENV = 'PANINI_EMBEDDING_SOCKET'
+DEFAULT_SOCKET = '/tmp/panini_embeddings.sock'
+
+OP_ENCODE = 1
+OP_INFO = 2
+STATUS_OK = 0
+STATUS_ERROR = 1
+MAX_REQUEST_BYTES = 64 * 1024 * 1024
+
+_REQUEST_HEADER = struct.Struct('<BI')
+_RESPONSE_HEADER = struct.Struct('<BIII')
+_U32 = struct.Struct('<I')
+
+Encoder = Callable[[List[str]], object]
+
+
+def default_socket_path() -> str:
+    return os.environ.get(SOCKET_ENV, DEFAULT_SOCKET)
+
+
+def to_float32(result) -> Tuple[int, int, bytes]:
+    """Sortie d'encodeur (ndarray ou liste de listes) -> (lignes, dimension, octets float32)"""
+    if hasattr(result, 'shape'):
+        matrix = np.ascontiguousarray(result, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1)
+        return matrix.shape[0], matrix.shape[1], matrix.tobytes()
+    rows = [list(row) for row in result]
+    dim = len(rows[0]) if rows else 0
+    flat = array('f')
+    for row in rows:
+        if len(row) != dim:
+            raise ValueError("embeddings de dimensions différentes")
+        flat.extend(row)
+    return len(rows), dim, flat.tobytes()
+
+
+def sentence_transformer_encoder(model_name: str, batch_size: int = 64) -> Encoder:
+    """Encodeur SentenceTransformer (modèle chargé une fois, ici)"""
+    from sentence_transformers import SentenceTransformer
+    model = SentenceTransformer(model_name)
+
+    def encode(texts: List[str]):
+        return model.encode(texts, batch_size=batch_size, convert_to_numpy=True)
+
+    encode.model_name = model_name
+    return encode
+
+
+class _PendingEncode:
+    __slots__ = ('texts', 'done', 'rows', 'dim', 'data', 'error')
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.done = threading.Event()
+        self.rows = self.dim = 0
+        self.data = b''
+        self.error: Optional[str] = None
+
+
+class EmbeddingService:
+    """Regroupe les demandes d'encodage concurrentes en lots pour un encodeur unique"""
+
+    def __init__(self, encoder: Encoder, max_batch: int = 64, max_wait: float = 0.005,
+                 model_name: str = ''):
+        self.encoder = encoder
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.model_name = model_name or getattr(encoder, 'model_name', '')
+        self.dim = 0
+        self.stats = {'requests': 0, 'texts': 0, 'unique_texts': 0, 'batches': 0,
+                      'encode_seconds': 0.0, 'max_batch_texts': 0}
+        self._queue: 'queue.Queue[Optional[_PendingEncode]]' = queue.Queue()
+        self._worker = threading.Thread(target=self._batch_loop, name='panini-embedding-batcher', daemon=True)
+        self._worker.start()
+
+    def submit(self, texts: Sequence[str]) -> _PendingEncode:
+        pending = _PendingEncode(list(texts))
+        if not pending.texts:
+            pending.dim = self.dim
+            pending.done.set()
+        else:
+            self._queue.put(pending)
+        return pending
+
+    def encode(self, texts: Sequence[str], timeout: Optional[float] = None) -> Tuple[int, int, bytes]:
+        """Encodage dans le processus du service (mêmes lots que les clients socket)"""
+        pending = self.submit(texts)
+        if not pending.done.wait(timeout):
+            raise TimeoutError(f"encodage non terminé après {timeout}s")
+        if pending.error:
+            raise RuntimeError(pending.error)
+        return pending.rows, pending.dim, pending.data
+
+    def close(self):
+        self._queue.put(None)
+        self._worker.join()
+
+    def _collect_batch(self, first: _PendingEncode) -> Tuple[List[_PendingEncode], bool]:
+        batch, size = [first], len(first.texts)
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                pending = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if pending is None:
+                return batch, True
+            batch.append(pending)
+            size += len(pending.texts)
+        return batch, False
+
+    def _batch_loop(self):
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch, stopping = self._collect_batch(first)
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: List[_PendingEncode]):
+        # Textes uniques du lot, puis redistribution des lignes par requête
+        index: Dict[str, int] = {}
+        for pending in batch:
+            for text in pending.texts:
+                index.setdefault(text, len(index))
+        start = time.perf_counter()
+        try:
+            rows, dim, data = to_float32(self.encoder(list(index)))
+            if rows != len(index):
+                raise ValueError(f"l'encodeur a renvoyé {rows} lignes pour {len(index)} textes")
+        except Exception as e:
+            for pending in batch:
+                pending.error = f"{type(e).__name__}: {e}"
+                pending.done.set()
+            return
+        elapsed = time.perf_counter() - start
+
+        self.dim = dim
+        row_bytes = dim * 4
+        view = memoryview(data)
+        for pending in batch:
+            positions = [index[text] for text in pending.texts]
+            if positions == list(range(positions[0], positions[0] + len(positions))):
+                pending.data = bytes(view[positions[0] * row_bytes:(positions[-1] + 1) * row_bytes])
+            else:
+                pending.data = b''.join(view[p * row_bytes:(p + 1) * row_bytes] for p in positions)
+            pending.rows, pending.dim = len(positions), dim
+            pending.done.set()
+
+        texts = sum(len(pending.texts) for pending in batch)
+        self.stats['requests'] += len(batch)
+        self.stats['texts'] += texts
+        self.stats['unique_texts'] += len(index)
+        self.stats['batches'] += 1
+        self.stats['encode_seconds'] += elapsed
+        self.stats['max_batch_texts'] = max(self.stats['max_batch_texts'], texts)
+
+    def info(self) -> Dict:
+        batches = self.stats['batches']
+        return {
+            'model': self.model_name,
+            'dim': self.dim,
+            'max_batch': self.max_batch,
+            'max_wait': self.max_wait,
+            'pending': self._queue.qsize(),
+            'avg_batch_texts': round(self.stats['texts'] / batches, 2) if batches else 0.0,
+            **self.stats
+        }
+
+
+# ----------------------------------------------------------------------
+# Transport socket Unix
+# ----------------------------------------------------------------------
+
+def _recv_exact(sock: socket.socket, size: int) -> bytearray:
+    """Lit exactement size octets (buffer modifiable, sans copie finale)"""
+    buffer = bytearray(size)
+    view, received = memoryview(buffer), 0
+    while received < size:
+        chunk = sock.recv_into(view[received:], size - received)
+        if chunk == 0:
+            raise ConnectionError("connexion fermée")
+        received += chunk
+    return buffer
+
+
+def encode_request(texts: Sequence[str]) -> bytes:
+    parts = [_U32.pack(len(texts))]
+    for text in texts:
+        raw = text.encode('utf-8')
+        parts.append(_U32.pack(len(raw)))
+        parts.append(raw)
+    payload = b''.join(parts)
+    return _REQUEST_HEADER.pack(OP_ENCODE, len(payload)) + payload
+
+
+def decode_request(payload) -> List[str]:
+    (count,), offset, texts = _U32.unpack_from(payload, 0), 4, []
+    for _ in range(count):
+        (length,) = _U32.unpack_from(payload, offset)
+        offset += 4
+        texts.append(payload[offset:offset + length].decode('utf-8'))
+        offset += length
+    return texts
+
+
+def _send_error(sock: socket.socket, error: Exception) -> bool:
+    """Réponse d'erreur; False si le client est déjà parti"""
+    message = f"{type(error).__name__}: {error}".encode('utf-8')
+    try:
+        sock.sendall(_RESPONSE_HEADER.pack(STATUS_ERROR, 0, 0, len(message)) + message)
+        return True
+    except OSError:
+        return False
+
+
+class _EmbeddingHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        service: EmbeddingService = self.server.service
+        sock = self.request
+        while True:
+            try:
+                op, size = _REQUEST_HEADER.unpack(_recv_exact(sock, _REQUEST_HEADER.size))
+                if size > MAX_REQUEST_BYTES:
+                    _send_error(sock, ValueError(f"requête de {size} octets > {MAX_REQUEST_BYTES}"))
+                    return
+                payload = _recv_exact(sock, size) if size else b''
+            except OSError:
+                return
+            try:
+                if op == OP_ENCODE:
+                    rows, dim, data = service.encode(decode_request(payload))
+                elif op == OP_INFO:
+                    rows, dim, data = 0, service.dim, json.dumps(service.info()).encode('utf-8')
+                else:
+                    raise ValueError(f"opération inconnue: {op}")
+                sock.sendall(_RESPONSE_HEADER.pack(STATUS_OK, rows, dim, len(data)) + data)
+            except OSError:
+                return
+            except Exception as e:
+                if not _send_error(sock, e):
+                    return
+
+
+class EmbeddingServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serveur socket Unix: un thread par connexion client, un seul lot en cours"""
+    daemon_threads = True
+
+    def __init__(self, service: EmbeddingService, socket_path: Optional[str] = None):
+        self.service = service
+        self.socket_path = socket_path or default_socket_path()
+        if os.path.exists(self.socket_path):
+            if service_available(self.socket_path):
+                raise RuntimeError(f"service déjà actif sur {self.socket_path}")
+            os.unlink(self.socket_path)  # socket orphelin d'un arrêt brutal
+        super().__init__(self.socket_path, _EmbeddingHandler)
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'EmbeddingServer':
+        """Sert en tâche de fond (tests, service embarqué)"""
+        self._thread = threading.Thread(target=self.serve_forever, name='panini-embedding-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        self.service.close()
+
+
+class EmbeddingClient:
+    """Client du service; une connexion par thread pour que les appels concurrents se regroupent"""
+
+    def __init__(self, socket_path: Optional[str] = None, timeout: float = 120.0):
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, 'sock', None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            self._local.sock = sock
+        return sock
+
+    def _call(self, frame: bytes) -> Tuple[int, int, bytes]:
+        sock = self._connection()
+        try:
+            sock.sendall(frame)
+            status, rows, dim, size = _RESPONSE_HEADER.unpack(_recv_exact(sock, _RESPONSE_HEADER.size))
+            data = _recv_exact(sock, size) if size else b''
+        except (OSError, ConnectionError):
+            self.close()
+            raise
+        if status != STATUS_OK:
+            raise RuntimeError(f"service d'embeddings: {data.decode('utf-8', 'replace')}")
+        return rows, dim, data
+
+    def encode_raw(self, texts: Sequence[str]) -> Tuple[int, int, bytes]:
+        """(lignes, dimension, buffer float32) sans dépendre de numpy"""
+        return self._call(encode_request(texts))
+
+    def encode(self, texts: Sequence[str]):
+        """Matrice numpy float32 (lignes x dimension), modifiable: elle possède le buffer reçu"""
+        rows, dim, data = self.encode_raw(texts)
+        return np.frombuffer(bytearray(data) if isinstance(data, bytes) else data,
+                             dtype=np.float32).reshape(rows, dim)
+
+    def info(self) -> Dict:
+        _, _, data = self._call(_REQUEST_HEADER.pack(OP_INFO, 0))
+        return json.loads(data.decode('utf-8'))
+
+    def close(self):
+        sock = getattr(self._local, 'sock', None)
+        if sock is not None:
+            sock.close()
+            self._local.sock = None
+
+
+def service_available(socket_path: Optional[str] = None) -> bool:
+    """Un service répond-il sur ce socket?"""
+    path = socket_path or default_socket_path()
+    if not os.path.exists(path):
+        return False
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    probe.settimeout(1.0)
+    try:
+        probe.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Service local d'embeddings (socket Unix)")
+    parser.add_argument('--model', default='all-MiniLM-L6-v2')
+    parser.add_argument('--socket', default=default_socket_path())
+    parser.add_argument('--max-batch', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=5.0)
+    args = parser.parse_args()
+
+    if not module_available('sentence_transformers'):
+        print("❌ sentence_transformers non installé")
+        return 1
+
+    print(f"🧲 Chargement du modèle {args.model}...")
+    service = EmbeddingService(sentence_transformer_encoder(args.model, args.max_batch),
+                               max_batch=args.max_batch, max_wait=args.max_wait_ms / 1000,
+                               model_name=args.model)
+    server = EmbeddingServer(service, args.socket)
+    print(f"✅ Service d'embeddings prêt: {args.socket} (lots ≤{args.max_batch} textes, "
+          f"attente ≤{args.max_wait_ms:.1f}ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Arrêt du service d'embeddings")
+    finally:
+        server.server_close()
+        service.close()
+        info = service.info()
+        print(f"📊 {info['requests']} requêtes, {info['texts']} textes, {info['batches']} lots "
+              f"(moy. {info['avg_batch_texts']} textes/lot)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
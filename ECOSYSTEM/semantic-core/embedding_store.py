@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+🗜️ STOCKAGE QUANTIFIÉ DES EMBEDDINGS
+====================================
+
+Les vecteurs (normalisés, similarité cosinus) sont stockés une seule fois
+et référencés par id; la recherche se fait en deux passes:
+
+1. passe grossière sur les codes compacts
+   - int8: quantification scalaire symétrique par vecteur (4x plus petit)
+   - binaire: bit de signe par dimension, distance de Hamming (32x)
+2. re-classement exact (float32) des `candidates` meilleurs
+
+Les float32 ne servent qu'au re-classement: avec `spill` (fichier
+temporaire, ou chemin donné) ils sont écrits sur disque au fil des ajouts et
+relus par mmap; après save(), load(mmap=True) les laisse aussi sur disque.
+Seuls les codes restent en RAM. Les ajouts successifs remplissent des
+tampons à capacité doublée (coût amorti linéaire, pas de recopie à chaque
+add).
+
+    store = QuantizedEmbeddingStore(dim=384, spill=True)
+    ids = store.add(embeddings, keys=texts)
+    hits = store.search(query, top_k=5, mode='binary')   # [{'id', 'key', 'score'}]
+"""
+
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+MODES = ('exact', 'int8', 'binary')
+_CHUNK_ROWS = 4096  # blocs tenant en cache pour la conversion int8 -> float32
+_MIN_CAPACITY = 1024
+
+if hasattr(np, 'bitwise_count'):
+    _popcount = np.bitwise_count
+else:
+    _POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+    def _popcount(values):
+        return _POPCOUNT_TABLE[values]
+
+
+def normalize(vectors) -> np.ndarray:
+    matrix = np.asarray(vectors, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def quantize_int8(matrix: np.ndarray):
+    """Codes int8 + échelle par vecteur: x ≈ code * scale"""
+    scales = np.abs(matrix).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.rint(matrix / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def binary_codes(matrix: np.ndarray) -> np.ndarray:
+    return np.packbits(matrix > 0, axis=1)
+
+
+class QuantizedEmbeddingStore:
+    """Embeddings référencés par id: codes int8/binaires en RAM, float32 pour le re-classement
+
+    spill: False (float32 en RAM), True (fichier temporaire anonyme) ou
+    chemin du fichier float32 brut (recréé vide).
+    """
+
+    def __init__(self, dim: int, binary: bool = True, spill: Union[bool, str] = False):
+        self.dim = dim
+        self.binary = binary
+        self.keys: List[Any] = []
+        self._key_index: Dict[Any, int] = {}
+        self._count = 0
+        self._codes = np.empty((0, dim), dtype=np.int8)
+        self._scales = np.empty(0, dtype=np.float32)
+        self._bits = np.empty((0, (dim + 7) // 8), dtype=np.uint8)
+        self._vectors = np.empty((0, dim), dtype=np.float32)
+        self._spill_file = None
+        if spill:
+            self._spill_file = tempfile.TemporaryFile() if spill is True else open(spill, 'w+b')
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def codes(self) -> np.ndarray:
+        return self._codes[:self._count]
+
+    @property
+    def scales(self) -> np.ndarray:
+        return self._scales[:self._count]
+
+    @property
+    def bits(self) -> np.ndarray:
+        return self._bits[:self._count]
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """float32 normalisés (np.memmap si débordés sur disque ou chargés par mmap)"""
+        return self._vectors[:self._count]
+
+    def _reserve(self, rows: int):
+        """Capacité doublée au besoin: recopie amortie sur les ajouts successifs"""
+        needed = self._count + rows
+        if needed <= len(self._scales):
+            return
+        capacity = max(needed, 2 * len(self._scales), _MIN_CAPACITY)
+        names = ['_codes', '_scales'] + (['_bits'] if self.binary else [])
+        if self._spill_file is None:
+            names.append('_vectors')
+        for name in names:
+            old = getattr(self, name)
+            grown = np.empty((capacity,) + old.shape[1:], dtype=old.dtype)
+            grown[:self._count] = old[:self._count]
+            setattr(self, name, grown)
+
+    def add(self, vectors, keys: Optional[Sequence] = None) -> List[int]:
+        """Ajoute des vecteurs (normalisés ici); renvoie leurs ids"""
+        matrix = normalize(vectors)
+        if matrix.shape[1] != self.dim:
+            raise ValueError(f"dimension {matrix.shape[1]} != {self.dim}")
+        if keys is not None and len(keys) != len(matrix):
+            raise ValueError("une clé par vecteur")
+        start, stop = self._count, self._count + len(matrix)
+        self._reserve(len(matrix))
+        self._codes[start:stop], self._scales[start:stop] = quantize_int8(matrix)
+        if self.binary:
+            self._bits[start:stop] = binary_codes(matrix)
+        if self._spill_file is None:
+            self._vectors[start:stop] = matrix
+        else:
+            # float32 quantifiés: écrits à la suite du fichier, relus par mmap
+            self._spill_file.seek(start * self.dim * 4)
+            self._spill_file.write(np.ascontiguousarray(matrix).tobytes())
+            self._spill_file.flush()
+            if stop:
+                self._vectors = np.memmap(self._spill_file, dtype=np.float32, mode='r',
+                                          shape=(stop, self.dim))
+        self._count = stop
+        for offset in range(len(matrix)):
+            key = keys[offset] if keys is not None else None
+            self.keys.append(key)
+            if key is not None:
+                self._key_index.setdefault(key, start + offset)
+        return list(range(start, stop))
+
+    def id_of(self, key) -> Optional[int]:
+        return self._key_index.get(key)
+
+    def get(self, vector_id: int) -> np.ndarray:
+        """Vecteur float32 normalisé"""
+        return np.array(self.vectors[vector_id])
+
+    def dequantize(self, vector_id: int) -> np.ndarray:
+        return self.codes[vector_id].astype(np.float32) * self.scales[vector_id]
+
+    # ------------------------------------------------------------------
+    # Recherche
+    # ------------------------------------------------------------------
+
+    def _coarse_scores(self, query: np.ndarray, mode: str) -> np.ndarray:
+        """Score approché de chaque id (plus grand = plus proche)"""
+        scores = np.empty(len(self), dtype=np.float32)
+        if mode == 'int8':
+            q_codes, q_scales = quantize_int8(query.reshape(1, -1))
+            # Produits int8 exacts en float32 (|somme| ≤ dim·127² < 2^24), via BLAS
+            q = q_codes[0].astype(np.float32)
+            for start in range(0, len(self), _CHUNK_ROWS):
+                stop = start + _CHUNK_ROWS
+                dots = self.codes[start:stop].astype(np.float32) @ q
+                scores[start:stop] = dots * self.scales[start:stop] * q_scales[0]
+        elif mode == 'binary':
+            if not self.binary:
+                raise ValueError("codes binaires non construits (binary=False)")
+            q = binary_codes(query.reshape(1, -1))[0]
+            for start in range(0, len(self), _CHUNK_ROWS):
+                stop = start + _CHUNK_ROWS
+                distance = _popcount(np.bitwise_xor(self.bits[start:stop], q)).sum(axis=1, dtype=np.int32)
+                scores[start:stop] = -distance
+        else:
+            for start in range(0, len(self), _CHUNK_ROWS):
+                stop = start + _CHUNK_ROWS
+                scores[start:stop] = self.vectors[start:stop] @ query
+        return scores
+
+    def search_ids(self, query, top_k: int = 5, mode: str = 'int8',
+                   candidates: Optional[int] = None, rerank: bool = True):
+        """(ids, scores) triés; scores exacts (cosinus) si re-classés"""
+        if mode not in MODES:
+            raise ValueError(f"mode inconnu: {mode} ({', '.join(MODES)})")
+        if not len(self):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        q = normalize(query)[0]
+        top_k = min(top_k, len(self))
+        scores = self._coarse_scores(q, mode)
+        if mode != 'exact' and rerank:
+            # Passe grossière -> candidats -> cosinus exact sur les float32
+            pool = min(len(self), max(top_k, candidates or top_k * 10))
+            ids = np.argpartition(-scores, pool - 1)[:pool] if pool < len(self) else np.arange(len(self))
+            ids = np.sort(ids)  # accès séquentiel aux float32 (mmap)
+            scores = np.asarray(self.vectors[ids]) @ q
+        else:
+            ids = np.arange(len(self))
+        best = np.argpartition(-scores, top_k - 1)[:top_k] if top_k < len(ids) else np.arange(len(ids))
+        best = best[np.argsort(-scores[best], kind='stable')]
+        return ids[best], scores[best]
+
+    def search(self, query, top_k: int = 5, mode: str = 'int8',
+               candidates: Optional[int] = None, rerank: bool = True) -> List[Dict]:
+        ids, scores = self.search_ids(query, top_k, mode, candidates, rerank)
+        return [{'id': int(i), 'key': self.keys[i], 'score': float(s)} for i, s in zip(ids, scores)]
+
+    # ------------------------------------------------------------------
+    # Mesures
+    # ------------------------------------------------------------------
+
+    def memory_usage(self) -> Dict[str, Any]:
+        """Octets par composant; `resident` exclut les float32 s'ils sont mmappés"""
+        usage = {
+            'vectors': len(self) * self.dim * 4,
+            'int8': self.codes.nbytes + self.scales.nbytes,
+            'binary': self.bits.nbytes if self.binary else 0,
+            'float32_mmapped': isinstance(self.vectors, np.memmap)
+        }
+        usage['resident'] = usage['int8'] + usage['binary'] + (0 if usage['float32_mmapped'] else usage['vectors'])
+        usage['int8_ratio'] = round(usage['vectors'] / usage['int8'], 2) if len(self) else 0.0
+        usage['binary_ratio'] = round(usage['vectors'] / usage['binary'], 2) if usage['binary'] else 0.0
+        return usage
+
+    def measure_recall(self, queries, k: int = 10, mode: str = 'int8', candidates: Optional[int] = None,
+                       rerank: bool = True) -> Dict[str, float]:
+        """recall@k face à la recherche exacte, et temps moyen par requête"""
+        queries = normalize(queries)
+        found, elapsed = 0, 0.0
+        for query in queries:
+            truth = set(self.search_ids(query, k, 'exact')[0].tolist())
+            start = time.perf_counter()
+            ids, _ = self.search_ids(query, k, mode, candidates, rerank)
+            elapsed += time.perf_counter() - start
+            found += len(truth & set(ids.tolist()))
+        total = k * len(queries) or 1
+        return {'mode': mode, 'k': k, 'candidates': candidates or k * 10, 'rerank': rerank,
+                'recall': found / total, 'ms_per_query': 1000 * elapsed / max(1, len(queries))}
+
+    # ------------------------------------------------------------------
+    # Persistance
+    # ------------------------------------------------------------------
+
+    def save(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, 'int8.npy'), self.codes)
+        np.save(os.path.join(directory, 'scales.npy'), self.scales)
+        np.save(os.path.join(directory, 'vectors.npy'), self.vectors)
+        if self.binary:
+            np.save(os.path.join(directory, 'binary.npy'), self.bits)
+        with open(os.path.join(directory, 'store.json'), 'w', encoding='utf-8') as f:
+            json.dump({'dim': self.dim, 'binary': self.binary, 'count': len(self), 'keys': self.keys}, f)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> 'QuantizedEmbeddingStore':
+        """Codes en RAM; float32 mappés depuis le disque si mmap"""
+        with open(os.path.join(directory, 'store.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        store = cls(meta['dim'], meta['binary'])
+        store._codes = np.load(os.path.join(directory, 'int8.npy'))
+        store._scales = np.load(os.path.join(directory, 'scales.npy'))
+        if store.binary:
+            store._bits = np.load(os.path.join(directory, 'binary.npy'))
+        store._vectors = np.load(os.path.join(directory, 'vectors.npy'), mmap_mode='r' if mmap else None)
+        store._count = len(store._scales)
+        store.keys = meta['keys']
+        for vector_id, key in enumerate(store.keys):
+            if key is not None:
+                store._key_index.setdefault(key, vector_id)
+        return store
+
+
+def benchmark(count: int = 100_000, dim: int = 384, queries: int = 100, k: int = 10, seed: int = 0):
+    """Recall et mémoire sur des vecteurs synthétiques groupés (proches d'embeddings de phrases)"""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((max(1, count // 100), dim)).astype(np.float32)
+    data = centers[rng.integers(0, len(centers), count)] + 0.6 * rng.standard_normal((count, dim)).astype(np.float32)
+    probes = data[rng.integers(0, count, queries)] + 0.3 * rng.standard_normal((queries, dim)).astype(np.float32)
+
+    store = QuantizedEmbeddingStore(dim)
+    start = time.perf_counter()
+    store.add(data)
+    print(f"🗜️ {count} vecteurs x {dim} dims indexés en {time.perf_counter() - start:.2f}s")
+    usage = store.memory_usage()
+    print(f"   float32 {usage['vectors'] / 1e6:.1f} Mo | int8 {usage['int8'] / 1e6:.1f} Mo "
+          f"({usage['int8_ratio']}x) | binaire {usage['binary'] / 1e6:.1f} Mo ({usage['binary_ratio']}x)")
+    results = [store.measure_recall(probes, k, 'exact')]
+    for mode in ('int8', 'binary'):
+        results.append(store.measure_recall(probes, k, mode, rerank=False))
+        for candidates in (k * 10, k * 50):
+            results.append(store.measure_recall(probes, k, mode, candidates))
+    for result in results:
+        rerank = f"re-classé top {result['candidates']}" if result['rerank'] and result['mode'] != 'exact' else 'sans re-classement'
+        print(f"   {result['mode']:<7} {rerank:<24} recall@{k} {result['recall']:.3f}  {result['ms_per_query']:.2f} ms/requête")
+    return results
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -6,23 +6,92 @@ Primitives sémantiques universelles pour l'IA moderne
 GitHub: https://github.com/stephanedenis/PaniniFS-SemanticCore
 """
 
-import numpy as np
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+from __future__ import annotations
+
 import json
+import os
+import sys
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 import time
 
+# numpy / sklearn / sentence_transformers chargés au premier usage seulement
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             '..', '..', 'OPERATIONS', 'DevOps', 'scripts'))
+from lazy_import import lazy_import
+
+np = lazy_import('numpy')
+
+from embedding_service import EmbeddingClient, default_socket_path, service_available
+embedding_store = lazy_import('embedding_store')
+
+# Lexique dhātu compilé (CORE/semantic-analyzer)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             '..', '..', 'CORE', 'semantic-analyzer', 'dhatu-detector'))
+try:
+    from dhatu_classifier import DhatuClassifier, mask_labels
+    DHATU_CLASSIFIER_AVAILABLE = True
+except ImportError:
+    DHATU_CLASSIFIER_AVAILABLE = False
+
+# DBSCAN (voisinages cosinus en force brute) reste quadratique: au-delà,
+# process_corpus refuse le clustering global (cluster=False)
+MAX_CLUSTERING_DOCUMENTS = 20_000
+_PATTERN_BLOCK_ROWS = 4096
+
 class UniversalSemanticProcessor:
     """
     Processeur sémantique universel basé sur les primitives découvertes
     """
     
-    def __init__(self, model_name="all-MiniLM-L6-v2"):
-        self.model = SentenceTransformer(model_name)
+    def __init__(self, model_name="all-MiniLM-L6-v2", embedding_socket: Optional[str] = None):
+        self.model_name = model_name
+        self._model = None
+        # Service d'embeddings partagé (embedding_service.py) s'il répond,
+        # sinon modèle local chargé au premier encodage
+        self.embedding_socket = embedding_socket or default_socket_path()
+        self._embedding_client = None
+        self._service_mismatch = False  # Service servant un autre modèle: plus sondé
         self.semantic_cache = {}
         self.universal_patterns = {}
+        self.dhatu_classifier = DhatuClassifier() if DHATU_CLASSIFIER_AVAILABLE else None
+    
+    @property
+    def model(self):
+        """SentenceTransformer chargé au premier encodage (torch + poids du modèle)"""
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(self.model_name)
+        return self._model
+
+    def _service_client(self) -> Optional[EmbeddingClient]:
+        """Client du service partagé s'il répond et sert le même modèle"""
+        if self._embedding_client is None and not self._service_mismatch \
+                and service_available(self.embedding_socket):
+            client = EmbeddingClient(self.embedding_socket)
+            try:
+                model = client.info().get('model')
+            except (OSError, ConnectionError, RuntimeError, ValueError):
+                client.close()
+                return None
+            # Un service servant un autre modèle donnerait des espaces incomparables
+            if model in ('', self.model_name):
+                self._embedding_client = client
+            else:
+                client.close()
+                self._service_mismatch = True
+        return self._embedding_client
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Embeddings float32 via le service partagé, ou le modèle local à défaut"""
+        client = self._service_client()
+        if client is not None:
+            try:
+                return client.encode(texts)
+            except (OSError, ConnectionError, RuntimeError):
+                print(f"⚠️ Service d'embeddings indisponible ({self.embedding_socket}), modèle local")
+                self._embedding_client = None
+        return self.model.encode(texts)
         
     def extract_semantic_primitives(self, texts: List[str]) -> Dict[str, Any]:
         """
@@ -32,8 +101,9 @@ class UniversalSemanticProcessor:
             Dict avec embeddings, clusters, patterns universels
         """
         
-        # Génération embeddings
-        embeddings = self.model.encode(texts)
+        # Génération embeddings, stockés une fois (quantifiés) et référencés par id
+        store = self._build_store(self.encode(texts), texts)
+        embeddings = store.vectors
         
         # Détection patterns universels
         patterns = self._detect_universal_patterns(embeddings, texts)
@@ -43,39 +113,119 @@ class UniversalSemanticProcessor:
         
         return {
             'embeddings': embeddings,
+            'embedding_store': store,
             'patterns': patterns,
             'clusters': clusters,
             'universality_score': self._calculate_universality(patterns),
             'metadata': {
-                'model': self.model,
+                'model': self.model_name,
                 'texts_count': len(texts),
                 'processing_time': time.time()
             }
         }
     
+    def process_shard(self, doc_ids: List[str], texts: List[str]) -> Dict[str, Any]:
+        """Traitement local d'un shard de corpus: embeddings + primitives par document"""
+        universality, dhatus = [], []
+        for text in texts:
+            universality.append(self._estimate_concept_universality(text))
+            if self.dhatu_classifier is not None:
+                dhatus.append(sorted(mask_labels(self.dhatu_classifier.classify_unit(text))))
+        return {
+            'embeddings': np.asarray(self.encode(texts), dtype=np.float32),
+            'universality': universality,
+            'dhatus': dhatus if self.dhatu_classifier is not None else None,
+            'model': self.model_name
+        }
+
+    def process_corpus(self, documents: List, job_dir: str, shard_size: int = 64,
+                       max_shards: Optional[int] = None, cluster: bool = True) -> Dict[str, Any]:
+        """
+        Traitement d'un gros corpus [(id, texte), ...] par shards persistés (corpus_jobs)
+
+        Un run interrompu reprend au dernier shard terminé; les shards déjà
+        calculés sont réutilisés quand le corpus grandit. Patterns et clusters
+        sont globaux, calculés une fois le job complet: les embeddings des
+        shards (mmap) alimentent un store dont les float32 restent sur disque,
+        les patterns sont calculés par blocs (linéaire). Le clustering DBSCAN
+        est quadratique: refusé au-delà de MAX_CLUSTERING_DOCUMENTS documents
+        (passer cluster=False).
+        """
+        from corpus_jobs import CorpusJob
+
+        if cluster and len(documents) > MAX_CLUSTERING_DOCUMENTS:
+            raise ValueError(f"{len(documents)} documents: clustering global limité à "
+                             f"{MAX_CLUSTERING_DOCUMENTS} (cluster=False pour s'en passer)")
+
+        # Shards calculés sans classifieur dhātu (dhatus=None) à recalculer quand il est disponible
+        dhatus = 'dhatu' if self.dhatu_classifier is not None else 'no-dhatu'
+        job = CorpusJob(job_dir, self.process_shard, version=f"semantic-core:{self.model_name}:{dhatus}",
+                        shard_size=shard_size)
+        manifest = job.run(documents, max_shards=max_shards)
+        result: Dict[str, Any] = {'manifest': manifest}
+        if not manifest['complete']:
+            return result
+
+        doc_ids, universality, store = [], [], None
+        for _, shard in job.iter_results():
+            if not len(shard['keys']):
+                continue
+            if store is None:
+                store = embedding_store.QuantizedEmbeddingStore(shard['embeddings'].shape[1], spill=True)
+            store.add(shard['embeddings'], keys=shard['keys'])
+            doc_ids.extend(shard['keys'])
+            universality.extend(shard['universality'])
+        if store is None:
+            return result
+        patterns = self._detect_universal_patterns(store.vectors, doc_ids)
+        result.update({
+            'doc_ids': doc_ids,
+            'embedding_store': store,
+            'concept_universality': universality,
+            'patterns': patterns,
+            'clusters': self._semantic_clustering(store.vectors, doc_ids) if cluster else None,
+            'universality_score': self._calculate_universality(patterns)
+        })
+        return result
+
+    def _build_store(self, embeddings, texts: List[str]):
+        """Store quantifié; les float32 débordent dans un fichier temporaire (mmap)"""
+        store = embedding_store.QuantizedEmbeddingStore(embeddings.shape[1], spill=True)
+        store.add(embeddings, keys=texts)
+        return store
+    
     def _detect_universal_patterns(self, embeddings: np.ndarray, texts: List[str]) -> Dict:
         """Détection des patterns universellement applicables"""
         
-        # Calcul similarités
-        similarities = cosine_similarity(embeddings)
+        # Similarité cosinus moyenne de chaque texte à tous les autres:
+        # mean_j(u_i · u_j) = u_i · mean_j(u_j) pour des vecteurs normalisés,
+        # calculée par blocs sans matrice n x n (embeddings mmappés compris)
+        total = np.zeros(embeddings.shape[1], dtype=np.float64)
+        for start in range(0, len(embeddings), _PATTERN_BLOCK_ROWS):
+            total += embedding_store.normalize(embeddings[start:start + _PATTERN_BLOCK_ROWS]).sum(axis=0)
+        centroid = (total / len(embeddings)).astype(np.float32)
+        avg_similarities = np.concatenate([
+            embedding_store.normalize(embeddings[start:start + _PATTERN_BLOCK_ROWS]) @ centroid
+            for start in range(0, len(embeddings), _PATTERN_BLOCK_ROWS)
+        ])
         
         # Identification concepts publics vs privés
         public_concepts = []
         private_concepts = []
         
         for i, text in enumerate(texts):
-            avg_similarity = np.mean(similarities[i])
+            avg_similarity = float(avg_similarities[i])
             
             if avg_similarity > 0.7:  # Très similaire = concept universel
                 public_concepts.append({
                     'text': text,
-                    'embedding': embeddings[i],
+                    'embedding_id': i,
                     'universality': avg_similarity
                 })
             else:  # Spécifique = concept privé
                 private_concepts.append({
                     'text': text,
-                    'embedding': embeddings[i],
+                    'embedding_id': i,
                     'specificity': 1 - avg_similarity
                 })
         
@@ -100,8 +250,7 @@ class UniversalSemanticProcessor:
                 clusters[label] = []
             clusters[label].append({
                 'text': texts[i],
-                'embedding': embeddings[i],
-                'index': i
+                'embedding_id': i
             })
         
         return clusters
@@ -110,35 +259,33 @@ class UniversalSemanticProcessor:
         """Score d'universalité des patterns détectés"""
         return patterns['public_ratio']
     
-    def quick_semantic_search(self, query: str, corpus: List[str], top_k: int = 5) -> List[Dict]:
+    def quick_semantic_search(self, query: str, corpus: List[str], top_k: int = 5,
+                              mode: str = 'int8') -> List[Dict]:
         """
         Recherche sémantique rapide optimisée
+        
+        Passe grossière sur les codes quantifiés (mode 'int8' ou 'binary'),
+        puis cosinus exact sur les meilleurs candidats; 'exact' pour tout comparer.
         """
         
         # Embedding requête
-        query_embedding = self.model.encode([query])
+        query_embedding = self.encode([query])
         
-        # Embeddings corpus (avec cache)
+        # Corpus encodé et quantifié une fois (avec cache)
         corpus_key = str(hash(str(corpus)))
         if corpus_key in self.semantic_cache:
-            corpus_embeddings = self.semantic_cache[corpus_key]
+            store = self.semantic_cache[corpus_key]
         else:
-            corpus_embeddings = self.model.encode(corpus)
-            self.semantic_cache[corpus_key] = corpus_embeddings
-        
-        # Calcul similarités
-        similarities = cosine_similarity(query_embedding, corpus_embeddings)[0]
-        
-        # Top-K résultats
-        top_indices = np.argsort(similarities)[::-1][:top_k]
+            store = self._build_store(self.encode(corpus), corpus)
+            self.semantic_cache[corpus_key] = store
         
         results = []
-        for idx in top_indices:
+        for hit in store.search(query_embedding, top_k=top_k, mode=mode):
             results.append({
-                'text': corpus[idx],
-                'similarity': similarities[idx],
-                'index': idx,
-                'universality': self._estimate_concept_universality(corpus[idx])
+                'text': corpus[hit['id']],
+                'similarity': hit['score'],
+                'index': hit['id'],
+                'universality': self._estimate_concept_universality(corpus[hit['id']])
             })
         
         return results
@@ -146,6 +293,10 @@ class UniversalSemanticProcessor:
     def _estimate_concept_universality(self, text: str) -> float:
         """Estimation rapide universalité d'un concept"""
         
+        # Part des 7 dhātu présents (lexique compilé, une seule passe sur le texte)
+        if self.dhatu_classifier is not None:
+            return len(mask_labels(self.dhatu_classifier.classify_unit(text))) / 7
+        
         # Heuristiques basées sur la découverte des primitives
         universal_indicators = [
             'search', 'find', 'process', 'analyze', 'optimize',
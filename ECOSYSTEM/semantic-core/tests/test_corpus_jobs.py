@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Tests des jobs de corpus par shards (reprise après interruption, réutilisation)
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from corpus_jobs import CorpusJob, plan_shards
+
+
+def corpus(count, start=0):
+    return [(f"doc/{i:05d}.md", f"texte {i} " * (i % 7 + 1)) for i in range(start, start + count)]
+
+
+class Counting:
+    """Traitement factice: compte les documents traités, peut échouer au n-ième shard"""
+
+    def __init__(self, fail_at=None):
+        self.calls, self.documents, self.fail_at = 0, 0, fail_at
+
+    def __call__(self, keys, texts):
+        self.calls += 1
+        if self.calls == self.fail_at:
+            raise KeyboardInterrupt("préemption simulée")
+        self.documents += len(keys)
+        return {'lengths': [len(text) for text in texts],
+                'vectors': np.array([[len(text), i] for i, text in enumerate(texts)], dtype=np.float32)}
+
+
+def collect(job):
+    keys, lengths = [], []
+    for _, result in job.iter_results():
+        keys.extend(result['keys'])
+        lengths.extend(result['lengths'])
+        assert result['vectors'].shape == (len(result['keys']), 2)
+    return keys, lengths
+
+
+def test_killed_run_resumes_from_last_completed_shard(tmp_path):
+    documents = corpus(400)
+    interrupted = Counting(fail_at=4)
+    with pytest.raises(KeyboardInterrupt):
+        CorpusJob(tmp_path, interrupted, shard_size=16).run(documents)
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    assert manifest['completed_shards'] == 3 and not manifest['complete']
+
+    resumed = Counting()
+    job = CorpusJob(tmp_path, resumed, shard_size=16)
+    manifest = job.run(documents)
+    assert manifest['complete'] and manifest['reused_shards'] == 3
+    assert resumed.documents + interrupted.documents == len(documents)
+    assert collect(job) == ([key for key, _ in documents], [len(text) for _, text in documents])
+    assert not (tmp_path / "tmp").exists()
+
+
+def test_only_staging_of_dead_runs_is_removed(tmp_path):
+    dead_pid = 2 ** 22 + 1  # Au-delà de pid_max par défaut: aucun processus
+    live = tmp_path / "tmp" / str(os.getppid()) / "shard-en-cours"
+    dead = tmp_path / "tmp" / str(dead_pid) / "shard-interrompu"
+    live.mkdir(parents=True)
+    dead.mkdir(parents=True)
+    CorpusJob(tmp_path, Counting(), shard_size=16).run(corpus(50))
+    assert live.exists() and not dead.parent.exists()
+    assert os.listdir(tmp_path / "tmp") == [str(os.getppid())]
+
+
+def test_growing_corpus_reuses_unchanged_shards(tmp_path):
+    documents = corpus(600)
+    CorpusJob(tmp_path, Counting(), shard_size=16).run(documents)
+    before = {shard.id for shard in plan_shards(documents, "1", 16)}
+
+    grown = documents + corpus(10, start=10000) + [("doc/00100.md bis", "insertion au milieu")]
+    counting = Counting()
+    job = CorpusJob(tmp_path, counting, shard_size=16)
+    manifest = job.run(grown)
+    assert manifest['processed_shards'] <= 4
+    assert manifest['reused_shards'] == len(before & {entry['id'] for entry in manifest['shards']})
+    assert counting.documents < 150
+    assert collect(job)[0] == sorted(key for key, _ in grown)
+
+    # Nouvelle version du traitement: rien n'est réutilisé, les anciens shards sont purgés
+    job = CorpusJob(tmp_path, Counting(), version="2", shard_size=16)
+    manifest = job.run(grown)
+    assert manifest['reused_shards'] == 0
+    assert job.prune() > 0
+    assert sorted(os.listdir(tmp_path / "shards")) == sorted(entry['id'] for entry in manifest['shards'])
+
+
+def test_max_shards_bounds_work_per_run(tmp_path):
+    documents = corpus(200)
+    runs = 0
+    while True:
+        runs += 1
+        manifest = CorpusJob(tmp_path, Counting(), shard_size=16).run(documents, max_shards=5)
+        if manifest['complete']:
+            break
+    assert runs == -(-len(manifest['shards']) // 5)
+    with pytest.raises(ValueError):
+        plan_shards(documents + documents[:1], "1")
+
+
+def test_process_corpus_global_pass_without_dense_similarity(tmp_path, monkeypatch):
+    import semantic_core
+    from semantic_core import UniversalSemanticProcessor
+
+    rng = np.random.default_rng(0)
+    documents = corpus(300)
+    vectors = {text: rng.standard_normal(16).astype(np.float32) for _, text in documents}
+    processor = UniversalSemanticProcessor(embedding_socket='/nonexistent/embeddings.sock')
+    monkeypatch.setattr(processor, 'encode', lambda texts: np.stack([vectors[t] for t in texts]))
+
+    result = processor.process_corpus(documents, str(tmp_path), shard_size=16, cluster=False)
+    store = result['embedding_store']
+    assert len(store) == 300 and store.memory_usage()['float32_mmapped'] and result['clusters'] is None
+
+    # Même similarité moyenne que la matrice cosinus dense
+    unit = store.vectors / np.linalg.norm(store.vectors, axis=1, keepdims=True)
+    dense = (unit @ unit.T).mean(axis=1)
+    found = {c['embedding_id']: c['specificity'] for c in result['patterns']['private_concepts']}
+    assert len(found) == 300
+    assert np.allclose([1 - found[i] for i in range(300)], dense, atol=1e-5)
+
+    monkeypatch.setattr(semantic_core, 'MAX_CLUSTERING_DOCUMENTS', 100)
+    with pytest.raises(ValueError):
+        processor.process_corpus(documents, str(tmp_path / 'trop'), shard_size=16)
+    assert not (tmp_path / 'trop').exists()
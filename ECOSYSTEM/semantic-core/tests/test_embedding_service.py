@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Tests du service d'embeddings (micro-batching, protocole binaire, socket Unix)
+"""
+
+import os
+import socket
+import struct
+import sys
+import tempfile
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import semantic_core
+from embedding_service import (MAX_REQUEST_BYTES, OP_ENCODE, STATUS_ERROR, EmbeddingClient,
+                               EmbeddingServer, EmbeddingService, _recv_exact, decode_request,
+                               encode_request, service_available)
+from semantic_core import UniversalSemanticProcessor
+
+
+def fake_encoder(calls):
+    def encode(texts):
+        calls.append(list(texts))
+        return [[float(len(text)), float(sum(map(ord, text)) % 97), 1.0] for text in texts]
+    return encode
+
+
+def rows_of(rows, dim, data):
+    values = struct.unpack(f'<{rows * dim}f', data)
+    return [list(values[i * dim:(i + 1) * dim]) for i in range(rows)]
+
+
+def test_request_roundtrip():
+    texts = ['dhātu', '', 'semantic search']
+    frame = encode_request(texts)
+    assert decode_request(frame[5:]) == texts
+
+
+def test_concurrent_requests_are_coalesced_and_deduplicated():
+    calls = []
+    service = EmbeddingService(fake_encoder(calls), max_batch=64, max_wait=0.2)
+    results = {}
+    barrier = threading.Barrier(6)
+
+    def worker(i):
+        barrier.wait()
+        results[i] = service.encode([f"text {i % 3}", "shared"])
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    service.close()
+
+    assert len(calls) < 6
+    assert sum(len(call) for call in calls) <= 4 * len(calls)
+    for i, (rows, dim, data) in results.items():
+        assert (rows, dim) == (2, 3)
+        assert rows_of(rows, dim, data)[0][0] == float(len(f"text {i % 3}"))
+    assert service.info()['texts'] == 12
+
+
+def test_encoder_errors_reach_every_request():
+    def broken(texts):
+        raise ValueError("modèle absent")
+
+    service = EmbeddingService(broken, max_wait=0.0)
+    try:
+        service.encode(['a'])
+        assert False, "erreur attendue"
+    except RuntimeError as e:
+        assert 'modèle absent' in str(e)
+    finally:
+        service.close()
+
+
+def test_unix_socket_client():
+    calls = []
+    path = os.path.join(tempfile.mkdtemp(), 'embeddings.sock')
+    server = EmbeddingServer(EmbeddingService(fake_encoder(calls), max_wait=0.001, model_name='fake'), path).start()
+    try:
+        assert service_available(path)
+        client = EmbeddingClient(path)
+        rows, dim, data = client.encode_raw(['abc', 'de'])
+        assert rows_of(rows, dim, data) == [[3.0, float(294 % 97), 1.0], [2.0, float(201 % 97), 1.0]]
+        assert client.encode_raw([]) == (0, 3, b'')
+        info = client.info()
+        assert info['model'] == 'fake' and info['dim'] == 3 and info['texts'] == 2
+        client.close()
+    finally:
+        server.stop()
+    assert not os.path.exists(path)
+    assert not service_available(path)
+
+
+def test_processor_falls_back_and_caches_model_mismatch(monkeypatch):
+    np = pytest.importorskip('numpy')
+
+    class LocalModel:
+        def __init__(self, value):
+            self.value = value
+
+        def encode(self, texts):
+            return np.full((len(texts), 3), self.value, dtype=np.float32)
+
+    path = os.path.join(tempfile.mkdtemp(), 'embeddings.sock')
+    server = EmbeddingServer(EmbeddingService(fake_encoder([]), max_wait=0.001, model_name='fake'), path).start()
+    info_calls = []
+    original_info = EmbeddingClient.info
+    monkeypatch.setattr(EmbeddingClient, 'info', lambda self: info_calls.append(1) or original_info(self))
+    try:
+        # Service servant un autre modèle: écarté une fois pour toutes
+        other = UniversalSemanticProcessor('local-model', embedding_socket=path)
+        other._model = LocalModel(0.0)
+        other.encode(['a', 'b'])
+        other.encode(['c'])
+        assert len(info_calls) == 1
+
+        embeddings = UniversalSemanticProcessor('fake', embedding_socket=path).encode(['abc'])
+        assert embeddings[0, 0] == 3.0
+        embeddings[0, 0] = 0.0  # Matrice modifiable: elle possède le buffer reçu
+    finally:
+        server.stop()
+
+    # Service mort entre la sonde et info(): repli sur le modèle local
+    def dead(self):
+        raise ConnectionError("connexion fermée")
+
+    monkeypatch.setattr(EmbeddingClient, 'info', dead)
+    monkeypatch.setattr(semantic_core, 'service_available', lambda socket_path: True)
+    processor = UniversalSemanticProcessor('fake', embedding_socket=path)
+    processor._model = LocalModel(1.0)
+    assert processor.encode(['x'])[0, 0] == 1.0
+
+
+def test_oversized_request_is_rejected():
+    path = os.path.join(tempfile.mkdtemp(), 'embeddings.sock')
+    server = EmbeddingServer(EmbeddingService(fake_encoder([]), max_wait=0.001), path).start()
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(5)
+        sock.connect(path)
+        sock.sendall(struct.pack('<BI', OP_ENCODE, MAX_REQUEST_BYTES + 1))
+        status, _, _, size = struct.unpack('<BIII', _recv_exact(sock, 13))
+        assert status == STATUS_ERROR and b'octets' in _recv_exact(sock, size)
+        assert sock.recv(1) == b''  # Connexion fermée sans lire la charge annoncée
+    finally:
+        sock.close()
+        server.stop()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests du stockage quantifié (int8 / binaire, re-classement exact, persistance)
+"""
+
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from embedding_store import QuantizedEmbeddingStore, quantize_int8
+
+
+def clustered(count=2000, dim=64, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((20, dim)).astype(np.float32)
+    return centers[rng.integers(0, 20, count)] + 0.5 * rng.standard_normal((count, dim)).astype(np.float32)
+
+
+def test_int8_quantization_error_is_small():
+    data = clustered(200)
+    data /= np.linalg.norm(data, axis=1, keepdims=True)
+    codes, scales = quantize_int8(data)
+    assert codes.dtype == np.int8
+    assert np.abs(codes * scales[:, None] - data).max() <= scales.max() / 2 + 1e-6
+
+
+def test_reranked_search_matches_exact_search():
+    data = clustered()
+    store = QuantizedEmbeddingStore(64)
+    ids = store.add(data, keys=[f"doc{i}" for i in range(len(data))])
+    assert ids[0] == 0 and store.id_of('doc42') == 42
+
+    queries = data[:25] + 0.05
+    for mode in ('int8', 'binary'):
+        assert store.measure_recall(queries, k=10, mode=mode, candidates=200)['recall'] >= 0.95
+
+    hits = store.search(data[7], top_k=3, mode='binary')
+    assert hits[0]['id'] == 7 and hits[0]['key'] == 'doc7'
+    assert hits[0]['score'] == pytest.approx(1.0, abs=1e-5)
+    assert [h['score'] for h in hits] == sorted((h['score'] for h in hits), reverse=True)
+
+
+def test_memory_ratios_and_mmap_reload(tmp_path):
+    store = QuantizedEmbeddingStore(128)
+    store.add(clustered(500, 128), keys=list(range(500)))
+    usage = store.memory_usage()
+    assert usage['int8_ratio'] > 3.5 and usage['binary_ratio'] == 32.0
+
+    store.save(str(tmp_path))
+    loaded = QuantizedEmbeddingStore.load(str(tmp_path))
+    assert loaded.memory_usage()['float32_mmapped']
+    assert loaded.memory_usage()['resident'] < usage['resident'] / 3
+    query = store.get(123)
+    assert loaded.search(query, top_k=1)[0] == store.search(query, top_k=1)[0]
+    assert loaded.id_of(123) == 123
+
+
+def test_spilled_store_keeps_float32_on_disk(tmp_path):
+    data = clustered(3000, 64)
+    in_ram = QuantizedEmbeddingStore(64)
+    spilled = QuantizedEmbeddingStore(64, spill=str(tmp_path / 'vectors.f32'))
+    for start in range(0, len(data), 100):  # Ajouts successifs: tampons amortis
+        in_ram.add(data[start:start + 100])
+        spilled.add(data[start:start + 100])
+    assert len(spilled) == 3000 and np.array_equal(spilled.codes, in_ram.codes)
+    usage = spilled.memory_usage()
+    assert usage['float32_mmapped'] and usage['resident'] < in_ram.memory_usage()['resident'] / 3
+    assert os.path.getsize(tmp_path / 'vectors.f32') == 3000 * 64 * 4
+    np.testing.assert_array_equal(spilled.get(2999), in_ram.get(2999))
+    query = data[1234]
+    assert spilled.search(query, top_k=3) == in_ram.search(query, top_k=3)
+
+    spilled.save(str(tmp_path / 'saved'))
+    assert len(QuantizedEmbeddingStore.load(str(tmp_path / 'saved'))) == 3000
+
+def test_quick_semantic_search_uses_store(monkeypatch):
+    from semantic_core import UniversalSemanticProcessor
+
+    corpus = ["semantic search", "find information", "database credentials", "meeting notes"]
+    vectors = {text: np.eye(8, dtype=np.float32)[i] + 0.1 for i, text in enumerate(corpus)}
+    vectors["search query"] = vectors["find information"] + 0.05
+
+    processor = UniversalSemanticProcessor(embedding_socket='/nonexistent/embeddings.sock')
+    monkeypatch.setattr(processor, 'encode', lambda texts: np.stack([vectors[t] for t in texts]))
+    results = processor.quick_semantic_search("search query", corpus, top_k=2)
+    assert results[0]['text'] == "find information" and results[0]['index'] == 1
+    assert processor._model is None
+    store = next(iter(processor.semantic_cache.values()))
+    assert len(store) == len(corpus)
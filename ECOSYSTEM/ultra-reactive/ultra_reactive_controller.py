@@ -2,202 +2,29 @@
 """
 ⚡ ULTRA-REACTIVE COLAB CONTROLLER
 Feedback < 2s, Alternatives < 5s, Success < 10s
-Règle: Jamais plus de 2s sans update utilisateur
+
+Implémentation unique dans OPERATIONS/DevOps/scripts/ultra_reactive_controller.py
+(chemins couverts par HedgedExecutor, progression par ProgressTracker);
+ce module la ré-exporte pour les usages de l'écosystème.
 """
 
-import asyncio
-import time
-import json
-from datetime import datetime
-from pathlib import Path
-import threading
-import queue
+import importlib.util
+import os
+import sys
+
+_SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            '..', '..', 'OPERATIONS', 'DevOps', 'scripts')
 
-class UltraReactiveController:
-    def __init__(self):
-        self.status_queue = queue.Queue()
-        self.user_timeout = 10  # 10s max avant fallback
-        self.feedback_interval = 1.5  # Update chaque 1.5s
-        self.paths_available = ['colab_direct', 'local_fallback', 'cloud_api']
-        self.current_status = {
-            'action': 'ready',
-            'progress': 0,
-            'eta': 0,
-            'paths_tried': [],
-            'fallbacks_ready': True,
-            'timestamp': time.time()
-        }
-        
-    def emit_status(self, action, progress=None, eta=None):
-        """Émission status < 1s garantie"""
-        self.current_status.update({
-            'action': action,
-            'progress': progress or self.current_status['progress'],
-            'eta': eta or self.current_status['eta'],
-            'timestamp': time.time()
-        })
-        
-        # Affichage immédiat
-        print(f"🔄 {action} ({progress}%) - ETA: {eta}s")
-        
-        # Queue pour monitoring
-        self.status_queue.put(self.current_status.copy())
-        
-    def timeout_guardian(self, max_seconds=10):
-        """Guardian anti-timeout - force fallback si >10s"""
-        start_time = time.time()
-        
-        while time.time() - start_time < max_seconds:
-            time.sleep(1)
-            if self.current_status['action'] == 'completed':
-                return  # Succès avant timeout
-                
-        # TIMEOUT - force fallback
-        print("🚨 TIMEOUT - Activation fallback automatique!")
-        self.activate_emergency_fallback()
-        
-    def activate_emergency_fallback(self):
-        """Fallback d'urgence - processing local immédiat"""
-        self.emit_status("FALLBACK: Processing local", 0, 30)
-        
-        # Simulation traitement local rapide
-        for i in range(0, 101, 20):
-            time.sleep(1)  # 1s par étape
-            self.emit_status(f"Local processing", i, (100-i)//20)
-            
-        self.emit_status("completed", 100, 0)
-        print("✅ FALLBACK RÉUSSI - Résultats disponibles localement")
-        
-    def try_colab_path(self):
-        """Tentative Colab avec timeout strict"""
-        self.emit_status("Connexion Colab", 10, 8)
-        time.sleep(2)  # Simulation
-        
-        self.emit_status("Activation GPU", 30, 6)
-        time.sleep(2)
-        
-        self.emit_status("Chargement notebook", 50, 4)
-        time.sleep(2)
-        
-        # Simulation échec après 6s (timeout user imminent)
-        self.emit_status("❌ Colab timeout", 50, 0)
-        return False
-        
-    def try_local_path(self):
-        """Path local - toujours fonctionnel"""
-        self.emit_status("🏠 Traitement local activé", 20, 15)
-        
-        for step, desc in [(40, "Scan repos"), (60, "Embeddings"), (80, "Clustering"), (100, "Export")]:
-            time.sleep(1.5)
-            eta = (100 - step) // 20 * 1.5
-            self.emit_status(f"Local: {desc}", step, eta)
-            
-        return True
-        
-    def multi_path_execution(self):
-        """Exécution multi-path avec feedback temps réel"""
-        print("🚀 DÉMARRAGE MULTI-PATH EXECUTION")
-        print("=" * 50)
-        
-        # Guardian timeout en arrière-plan
-        timeout_thread = threading.Thread(target=self.timeout_guardian, args=(self.user_timeout,))
-        timeout_thread.daemon = True
-        timeout_thread.start()
-        
-        # Status monitoring en arrière-plan
-        monitor_thread = threading.Thread(target=self.status_monitor)
-        monitor_thread.daemon = True
-        monitor_thread.start()
-        
-        # Tentative Path 1: Colab (optimiste mais risqué)
-        self.emit_status("🌐 Tentative Colab", 5, 10)
-        
-        try:
-            if self.try_colab_path():
-                self.emit_status("✅ Colab réussi", 100, 0)
-                return "colab_success"
-        except Exception as e:
-            self.emit_status(f"❌ Colab échoué: {str(e)[:30]}", 50, 0)
-            
-        # Path 2: Local (fallback fiable)
-        self.emit_status("🔄 Basculement local automatique", 55, 8)
-        time.sleep(0.5)  # Transition douce
-        
-        if self.try_local_path():
-            self.emit_status("✅ Local réussi", 100, 0)
-            return "local_success"
-            
-        # Path 3: Emergency (si tout échoue)
-        self.activate_emergency_fallback()
-        return "emergency_fallback"
-        
-    def status_monitor(self):
-        """Monitoring status en temps réel"""
-        while self.current_status['action'] != 'completed':
-            time.sleep(self.feedback_interval)
-            
-            # Calcul temps écoulé
-            elapsed = time.time() - self.current_status['timestamp']
-            
-            # Warning si pas d'update depuis >2s
-            if elapsed > 2:
-                print("⚠️ Pas d'update depuis 2s - vérification...")
-                
-            # Dashboard temps réel
-            self.show_realtime_dashboard()
-            
-    def show_realtime_dashboard(self):
-        """Dashboard temps réel ultra-réactif"""
-        status = self.current_status
-        bar_length = 30
-        filled = int(bar_length * (status['progress'] / 100))
-        bar = "█" * filled + "░" * (bar_length - filled)
-        
-        print(f"\r📊 {status['action']:<25} [{bar}] {status['progress']:3}% | ETA: {status['eta']:2}s", end="", flush=True)
-        
-    def save_session_state(self):
-        """Sauvegarde état pour reprise instantanée"""
-        state = {
-            'timestamp': datetime.now().isoformat(),
-            'final_status': self.current_status,
-            'paths_tried': self.current_status['paths_tried'],
-            'success_path': getattr(self, 'success_path', 'unknown'),
-            'total_duration': time.time() - getattr(self, 'start_time', time.time())
-        }
-        
-        filepath = Path('/home/stephane/GitHub/PaniniFS-1/scripts/ultra_reactive_session.json')
-        with open(filepath, 'w') as f:
-            json.dump(state, f, indent=2)
-            
-        print(f"\n💾 Session sauvée: {filepath}")
+# Même nom de fichier que ce module: chargé par chemin sous un nom distinct
+_spec = importlib.util.spec_from_file_location(
+    'panini_ultra_reactive_controller', os.path.join(_SCRIPTS_DIR, 'ultra_reactive_controller.py'))
+_controller = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = _controller
+_spec.loader.exec_module(_controller)
 
-def main():
-    """Lancement ultra-réactif avec alternatives immédiates"""
-    print("⚡ ULTRA-REACTIVE CONTROLLER - ZÉRO ATTENTE")
-    print("🎯 Règles: Feedback <2s, Alternatives <5s, Succès <10s")
-    print("=" * 60)
-    
-    controller = UltraReactiveController()
-    controller.start_time = time.time()
-    
-    # Options immédiates visibles
-    print("🛠️ CHEMINS DISPONIBLES:")
-    print("  1. 🌐 Colab GPU (rapide si connecté)")
-    print("  2. 🏠 Local processing (fiable)")
-    print("  3. 🚨 Emergency fallback (garanti)")
-    print("")
-    
-    # Exécution avec feedback temps réel
-    result = controller.multi_path_execution()
-    
-    # Résultats
-    total_time = time.time() - controller.start_time
-    print(f"\n\n🎉 TERMINÉ: {result} en {total_time:.1f}s")
-    print(f"⚡ Feedback moyen: {controller.feedback_interval}s")
-    print(f"✅ Objectif <10s: {'RÉUSSI' if total_time < 10 else 'ÉCHOUÉ'}")
-    
-    # Sauvegarde pour sessions futures
-    controller.save_session_state()
+UltraReactiveController = _controller.UltraReactiveController
+LATENCY_FILE = _controller.LATENCY_FILE
+main = _controller.main
 
 if __name__ == "__main__":
     main()
@@ -21,8 +21,64 @@ from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 import subprocess
 import re
+import sys
 from pathlib import Path
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from file_fingerprint_cache import FileFingerprintCache
+from module_registry import ModuleRegistry
+from rule_scanner import RuleScanner, ScanRule
+
+# À incrémenter dès que la logique des _detect_* change (les règles déclaratives
+# ci-dessous sont prises en compte automatiquement via leur signature)
+QUALITY_RULES_VERSION = "2"
+
+# Règles qualité déclaratives: un seul parcours du contenu par fichier
+HARDCODED_PATH_PATTERN = r'/home/|C:\\'
+
+CODE_QUALITY_RULES = RuleScanner([
+    ScanRule('long_line', r'^[^\n]{121,}', bucket='quality_issues',
+             message="{path}:{line} - Ligne trop longue ({length} chars)"),
+    ScanRule('unfinished', r'TODO|FIXME|HACK|XXX', ignore_case=True, bucket='quality_issues',
+             message="{path}:{line} - Code non terminé: {line_text}"),
+    ScanRule('unwrap', r'\.unwrap\(\)', bucket='quality_issues',
+             message="{path}:{line} - Usage dangereux de unwrap()"),
+    ScanRule('hardcoded_path', HARDCODED_PATH_PATTERN, bucket='quality_issues',
+             message="{path}:{line} - Chemin hardcodé détecté"),
+    # Complexité approximative
+    ScanRule('fn', r'fn ', scope='count'),
+    ScanRule('if', r'if ', scope='count'),
+    ScanRule('match', r'match ', scope='count'),
+    ScanRule('for', r'for ', scope='count'),
+])
+
+DOCS_REQUIRED_SECTIONS = ['installation', 'usage', 'example']
+
+DOCS_QUALITY_RULES = RuleScanner(
+    [ScanRule('link', r'\[.*?\]\((.*?)\)', scope='match')] +
+    [ScanRule(f"section_{section}", section, ignore_case=True, scope='count')
+     for section in DOCS_REQUIRED_SECTIONS]
+)
+
+CONFIG_RULES = RuleScanner([
+    ScanRule('secret', r'password|secret|token|key', ignore_case=True, scope='count'),
+    ScanRule('insecure_url', r'http://', scope='count'),
+    ScanRule('dev_config', r'debug = true|localhost', scope='count'),
+])
+
+SCRIPT_RULES = RuleScanner([
+    ScanRule('try', r'try:', scope='count'),
+    ScanRule('bare_except', r'except:', scope='count'),
+    ScanRule('hardcoded_path', HARDCODED_PATH_PATTERN, scope='count'),
+    ScanRule('import', r'import ', scope='count'),
+    ScanRule('pip_install', r'pip install', scope='count'),
+    ScanRule('requirements', r'requirements', scope='count'),
+])
+
+QUALITY_RULES_SIGNATURE = ':'.join([QUALITY_RULES_VERSION] + [
+    scanner.signature for scanner in (CODE_QUALITY_RULES, DOCS_QUALITY_RULES, CONFIG_RULES, SCRIPT_RULES)
+])
+
 @dataclass
 class CriticalFinding:
     """Structure d'une critique identifiée"""
@@ -48,7 +104,34 @@ class AdvocateResponse:
 class AdversarialCriticAgent:
     """Agent critique adverse pour amélioration continue"""
     
-    def __init__(self):
+    # Catégories scannées fichier par fichier: extensions, détecteur, compartiments d'issues
+    FILE_SCAN_KINDS = {
+        'code': {
+            'extensions': ('.rs',),
+            'detector': '_detect_code_quality_issues',
+            'buckets': ('quality_issues', 'complexity_issues')
+        },
+        'docs': {
+            'extensions': ('.md', '.html', '.txt'),
+            'detector': '_detect_docs_quality_issues',
+            'buckets': ('completeness_issues', 'quality_issues')
+        },
+        'scripts': {
+            'extensions': ('.py', '.sh', '.bash'),
+            'detector': '_detect_script_issues',
+            'buckets': ('autonomy_issues', 'reliability_issues')
+        }
+    }
+    
+    def __init__(self, base_path: str = "/home/stephane/GitHub/PaniniFS-1"):
+        self.base_path = base_path
+        self.scan_cache = FileFingerprintCache(
+            os.path.join(base_path, '.critic_scan_cache.json'),
+            rules_signature=QUALITY_RULES_SIGNATURE
+        )
+        # Copies identiques (arborescences miroir): une seule analyse par contenu
+        self.module_registry = ModuleRegistry(base_path)
+        self.skipped_copies: Dict[str, str] = {}
         self.session_id = f"critic_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         self.critique_categories = {
             'theoretical_foundations': {
@@ -135,7 +218,8 @@ class AdversarialCriticAgent:
         """Scan de tous les composants du projet"""
         print("🔍 Scan des composants du projet...")
         
-        base_path = "/home/stephane/GitHub/PaniniFS-1"
+        base_path = self.base_path
+        scan_start = time.perf_counter()
         
         # Composants à analyser
         components = [
@@ -152,6 +236,40 @@ class AdversarialCriticAgent:
             if component_data:
                 self.project_components.append(component_data)
                 
+        try:
+            self.scan_cache.save()
+            self.module_registry.save()
+        except OSError as e:
+            print(f"⚠️ Sauvegarde cache de scan impossible: {e}")
+            
+        cache_stats = self.scan_cache.stats
+        print(f"  ⚡ Scan en {(time.perf_counter() - scan_start) * 1000:.0f} ms - "
+              f"{cache_stats['hits'] + cache_stats['rehashed']} fichiers depuis cache, "
+              f"{cache_stats['analyzed']} ré-analysés, "
+              f"{len(self.skipped_copies)} copies identiques ignorées")
+                
+    def _collect_files(self, path: str, extensions: Tuple[str, ...]) -> List[str]:
+        """Liste les fichiers d'une arborescence par extension, ordre os.walk"""
+        collected = []
+        for root, dirs, files in os.walk(path):
+            for file in files:
+                if file.endswith(extensions):
+                    collected.append(os.path.join(root, file))
+        return collected
+        
+    def _scan_files(self, kind: str, file_paths: List[str]):
+        """Analyse incrémentale: une copie par contenu, seuls les fichiers modifiés sont relus"""
+        unique_paths, copies = self.module_registry.dedupe(file_paths)
+        self.skipped_copies.update(copies)
+        return self.scan_cache.scan(kind, unique_paths, self._analyze_file)
+        
+    def _analyze_file(self, kind: str, file_path: str, content: str) -> Dict[str, List[str]]:
+        """Issues d'un fichier isolé, par compartiment (mis en cache)"""
+        config = self.FILE_SCAN_KINDS[kind]
+        findings = {bucket: [] for bucket in config['buckets']}
+        getattr(self, config['detector'])(file_path, content, findings)
+        return findings
+        
     def _analyze_component(self, base_path: str, component: Dict) -> Optional[Dict]:
         """Analyse d'un composant spécifique"""
         try:
@@ -192,52 +310,30 @@ class AdversarialCriticAgent:
         }
         
         # Scan fichiers Rust
-        for root, dirs, files in os.walk(path):
-            for file in files:
-                if file.endswith('.rs'):
-                    file_path = os.path.join(root, file)
-                    code_stats['rust_files'].append(file_path)
-                    code_stats['file_count'] += 1
-                    
-                    # Analyse basique du fichier
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                            lines = content.split('\n')
-                            code_stats['line_count'] += len(lines)
-                            
-                            # Détection problèmes qualité
-                            self._detect_code_quality_issues(file_path, content, code_stats)
-                            
-                    except Exception as e:
-                        code_stats['quality_issues'].append(f"Erreur lecture {file_path}: {e}")
+        code_stats['rust_files'] = self._collect_files(path, self.FILE_SCAN_KINDS['code']['extensions'])
+        code_stats['file_count'] = len(code_stats['rust_files'])
+        
+        for result in self._scan_files('code', code_stats['rust_files']):
+            if result.error:
+                code_stats['quality_issues'].append(f"Erreur lecture {result.path}: {result.error}")
+                continue
+                
+            code_stats['line_count'] += result.line_count
+            for bucket, issues in result.findings.items():
+                code_stats[bucket].extend(issues)
                         
         return code_stats
         
     def _detect_code_quality_issues(self, file_path: str, content: str, stats: Dict):
         """Détecte problèmes qualité dans le code"""
-        lines = content.split('\n')
+        scan = CODE_QUALITY_RULES.scan(content)
         
-        # Détection issues communes
-        for i, line in enumerate(lines, 1):
-            # Lignes trop longues
-            if len(line) > 120:
-                stats['quality_issues'].append(f"{file_path}:{i} - Ligne trop longue ({len(line)} chars)")
-                
-            # TODO/FIXME/HACK comments
-            if any(keyword in line.upper() for keyword in ['TODO', 'FIXME', 'HACK', 'XXX']):
-                stats['quality_issues'].append(f"{file_path}:{i} - Code non terminé: {line.strip()}")
-                
-            # Unwrap() usage (dangerous in Rust)
-            if '.unwrap()' in line:
-                stats['quality_issues'].append(f"{file_path}:{i} - Usage dangereux de unwrap()")
-                
-            # Hardcoded paths
-            if '/home/' in line or 'C:\\' in line:
-                stats['quality_issues'].append(f"{file_path}:{i} - Chemin hardcodé détecté")
+        # Issues ligne par ligne (lignes longues, TODO, unwrap, chemins hardcodés)
+        for bucket, message in scan.issues(file_path):
+            stats[bucket].append(message)
                 
         # Complexité fonction (approximative)
-        function_complexity = content.count('fn ') + content.count('if ') + content.count('match ') + content.count('for ')
+        function_complexity = scan.count('fn') + scan.count('if') + scan.count('match') + scan.count('for')
         if function_complexity > 50:
             stats['complexity_issues'].append(f"Complexité élevée détectée: {function_complexity} constructs")
             
@@ -258,24 +354,17 @@ class AdversarialCriticAgent:
         }
         
         # Scan fichiers documentation
-        for root, dirs, files in os.walk(path):
-            for file in files:
-                if file.endswith(('.md', '.html', '.txt')):
-                    file_path = os.path.join(root, file)
-                    docs_stats['doc_files'].append(file_path)
-                    docs_stats['file_count'] += 1
-                    
-                    try:
-                        size = os.path.getsize(file_path)
-                        docs_stats['total_size'] += size
-                        
-                        # Analyse contenu
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                            self._detect_docs_quality_issues(file_path, content, docs_stats)
-                            
-                    except Exception as e:
-                        docs_stats['quality_issues'].append(f"Erreur lecture {file_path}: {e}")
+        docs_stats['doc_files'] = self._collect_files(path, self.FILE_SCAN_KINDS['docs']['extensions'])
+        docs_stats['file_count'] = len(docs_stats['doc_files'])
+        
+        for result in self._scan_files('docs', docs_stats['doc_files']):
+            docs_stats['total_size'] += result.size
+            if result.error:
+                docs_stats['quality_issues'].append(f"Erreur lecture {result.path}: {result.error}")
+                continue
+                
+            for bucket, issues in result.findings.items():
+                docs_stats[bucket].extend(issues)
                         
         return docs_stats
         
@@ -285,17 +374,18 @@ class AdversarialCriticAgent:
         if len(content) < 500:
             stats['completeness_issues'].append(f"{file_path} - Documentation très courte ({len(content)} chars)")
             
+        scan = DOCS_QUALITY_RULES.scan(content)
+        
         # Liens cassés (simple détection)
-        links = re.findall(r'\[.*?\]\((.*?)\)', content)
-        for link in links:
+        for match in scan.matches('link'):
+            link = match.group(1)
             if link.startswith('http') and 'example.com' in link:
                 stats['quality_issues'].append(f"{file_path} - Lien exemple détecté: {link}")
                 
         # Absence éléments clés
         if 'index.md' in file_path or 'README.md' in file_path:
-            required_sections = ['installation', 'usage', 'example']
-            for section in required_sections:
-                if section.lower() not in content.lower():
+            for section in DOCS_REQUIRED_SECTIONS:
+                if not scan.has(f"section_{section}"):
                     stats['completeness_issues'].append(f"{file_path} - Section manquante: {section}")
                     
     def _analyze_config_component(self, base_path: str, component: Dict) -> Dict:
@@ -327,16 +417,18 @@ class AdversarialCriticAgent:
         
     def _detect_config_issues(self, file_path: str, content: str, stats: Dict):
         """Détecte problèmes dans configuration"""
+        scan = CONFIG_RULES.scan(content)
+        
         # Secrets potentiels
-        if any(keyword in content.lower() for keyword in ['password', 'secret', 'token', 'key']):
+        if scan.has('secret'):
             stats['security_issues'].append(f"{file_path} - Secrets potentiels détectés")
             
         # URLs hardcodées
-        if 'http://' in content:
+        if scan.has('insecure_url'):
             stats['security_issues'].append(f"{file_path} - URLs non-sécurisées (HTTP)")
             
         # Configurations de dev en prod
-        if 'debug = true' in content or 'localhost' in content:
+        if scan.has('dev_config'):
             stats['security_issues'].append(f"{file_path} - Configuration développement détectée")
             
     def _analyze_scripts_component(self, path: str, component: Dict) -> Dict:
@@ -355,37 +447,34 @@ class AdversarialCriticAgent:
         }
         
         # Scan scripts
-        for root, dirs, files in os.walk(path):
-            for file in files:
-                if file.endswith(('.py', '.sh', '.bash')):
-                    file_path = os.path.join(root, file)
-                    scripts_stats['script_count'] += 1
-                    
-                    if 'agent' in file.lower():
-                        scripts_stats['agent_count'] += 1
-                        
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                            self._detect_script_issues(file_path, content, scripts_stats)
-                            
-                    except Exception as e:
-                        scripts_stats['reliability_issues'].append(f"Erreur lecture {file_path}: {e}")
+        script_files = self._collect_files(path, self.FILE_SCAN_KINDS['scripts']['extensions'])
+        scripts_stats['script_count'] = len(script_files)
+        scripts_stats['agent_count'] = len([f for f in script_files if 'agent' in os.path.basename(f).lower()])
+        
+        for result in self._scan_files('scripts', script_files):
+            if result.error:
+                scripts_stats['reliability_issues'].append(f"Erreur lecture {result.path}: {result.error}")
+                continue
+                
+            for bucket, issues in result.findings.items():
+                scripts_stats[bucket].extend(issues)
                         
         return scripts_stats
         
     def _detect_script_issues(self, file_path: str, content: str, stats: Dict):
         """Détecte problèmes dans scripts"""
+        scan = SCRIPT_RULES.scan(content)
+        
         # Gestion d'erreur insuffisante
-        if content.count('try:') < content.count('except:') / 2:
+        if scan.count('try') < scan.count('bare_except') / 2:
             stats['reliability_issues'].append(f"{file_path} - Gestion d'erreur insuffisante")
             
         # Hardcoded paths
-        if '/home/' in content or 'C:\\' in content:
+        if scan.has('hardcoded_path'):
             stats['autonomy_issues'].append(f"{file_path} - Chemins absolus hardcodés")
             
         # Dépendances externes non gérées
-        if 'import ' in content and 'pip install' not in content and 'requirements' not in content:
+        if scan.has('import') and not scan.has('pip_install') and not scan.has('requirements'):
             stats['autonomy_issues'].append(f"{file_path} - Dépendances non documentées")
             
     def _analyze_publications_component(self, base_path: str, component: Dict) -> Dict:
@@ -711,7 +800,7 @@ class AdversarialCriticAgent:
         self._add_critical_finding(
             category='existential',
             severity='CRITICAL',
-            component='Raison d\\'être projet',
+            component='Raison d\'être projet',
             issue='PaniniFS: solution en recherche de problème?',
             evidence=[
                 'Filesystems actuels fonctionnent bien',
@@ -1034,7 +1123,7 @@ class AdversarialCriticAgent:
             'action_steps': [
                 'Prototype fonctionnel filesystem sémantique',
                 'Benchmarks performance vs solutions existantes',
-                'Cas d\\'usage concrets avec métriques'
+                'Cas d\'usage concrets avec métriques'
             ],
             'timeline': '2-4 months',
             'success_metrics': 'Performance mesurable et reproductible'
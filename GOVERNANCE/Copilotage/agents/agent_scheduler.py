@@ -0,0 +1,569 @@
+#!/usr/bin/env python3
+"""
+⏰ ORDONNANCEUR D'AGENTS ÉVÉNEMENTIEL (asyncio)
+==============================================
+
+Remplace les boucles de scrutation minute par minute des orchestrateurs:
+- tas de minuteries: le réveil a lieu exactement à la prochaine échéance
+  (ou sur événement: arrêt, replanification, fin d'un agent amont)
+- déclencheurs: intervalle, cron (5 champs) ou dépendance (après agents amont)
+- exécution concurrente bornée, délai maximal par agent, gigue aléatoire
+- politique de rattrapage des exécutions manquées: 'coalesce', 'skip', 'all'
+- horloge simulée: une journée de planning se teste en millisecondes
+
+Les fonctions d'agent peuvent être des coroutines ou des fonctions
+synchrones (exécutées dans un thread). Un thread ne s'interrompt pas: au
+délai dépassé, l'exécution est enregistrée en 'timeout' mais l'agent reste
+occupé (pas de nouvelle exécution) jusqu'au retour de la fonction.
+"""
+
+import asyncio
+import heapq
+import inspect
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+CATCH_UP_POLICIES = ('coalesce', 'skip', 'all')
+MAX_CATCH_UP_RUNS = 100
+HISTORY_LIMIT = 1000
+
+
+# ---------------------------------------------------------------------------
+# Horloges
+# ---------------------------------------------------------------------------
+
+class RealClock:
+    """Horloge murale (secondes epoch), attentes via la boucle asyncio"""
+
+    def time(self) -> float:
+        return time.time()
+
+    async def sleep_until(self, deadline: float):
+        await asyncio.sleep(max(0.0, deadline - time.time()))
+
+    async def sleep(self, delay: float):
+        await asyncio.sleep(max(0.0, delay))
+
+
+class SimulatedClock:
+    """Horloge virtuelle: le temps saute à la prochaine échéance dès que la
+    boucle asyncio est au repos.
+
+    Destinée aux tests: les agents ne doivent attendre que via cette horloge
+    (pas d'E/S réelles), sans quoi le temps virtuel avance pendant l'attente.
+    """
+
+    def __init__(self, start: float = 0.0, settle_rounds: int = 20):
+        self._now = float(start)
+        self.settle_rounds = settle_rounds
+        self._sleepers: List[Tuple[float, int, asyncio.Future]] = []
+        self._seq = 0
+        self._driver: Optional[asyncio.Task] = None
+
+    def time(self) -> float:
+        return self._now
+
+    async def sleep(self, delay: float):
+        await self.sleep_until(self._now + max(0.0, delay))
+
+    async def sleep_until(self, deadline: float):
+        if deadline <= self._now:
+            await asyncio.sleep(0)
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._seq += 1
+        heapq.heappush(self._sleepers, (deadline, self._seq, future))
+        if self._driver is None or self._driver.done():
+            self._driver = asyncio.ensure_future(self._drive())
+        await future
+
+    async def _drive(self):
+        while True:
+            # Laisse tout le travail prêt s'exécuter avant d'avancer le temps
+            for _ in range(self.settle_rounds):
+                await asyncio.sleep(0)
+            while self._sleepers and self._sleepers[0][2].done():
+                heapq.heappop(self._sleepers)
+            if not self._sleepers:
+                return
+            self._now = max(self._now, self._sleepers[0][0])
+            while self._sleepers and self._sleepers[0][0] <= self._now:
+                _, _, future = heapq.heappop(self._sleepers)
+                if not future.done():
+                    future.set_result(None)
+
+
+# ---------------------------------------------------------------------------
+# Déclencheurs
+# ---------------------------------------------------------------------------
+
+@dataclass
+class IntervalTrigger:
+    """Exécution toutes les `seconds` secondes (première après `start_delay`)"""
+    seconds: float
+    start_delay: Optional[float] = None
+
+    def __post_init__(self):
+        if self.seconds <= 0:
+            raise ValueError("Intervalle doit être > 0")
+
+    def first_run(self, now: float) -> float:
+        return now + (self.seconds if self.start_delay is None else self.start_delay)
+
+    def next_after(self, previous_due: float) -> float:
+        return previous_due + self.seconds
+
+
+def _parse_cron_field(spec: str, low: int, high: int) -> Set[int]:
+    values: Set[int] = set()
+    for part in spec.split(','):
+        step = 1
+        if '/' in part:
+            part, step_text = part.split('/', 1)
+            step = int(step_text)
+            if step <= 0:
+                raise ValueError(f"Pas cron invalide: {spec}")
+        if part in ('*', ''):
+            start, end = low, high
+        elif '-' in part:
+            start, end = (int(v) for v in part.split('-', 1))
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        if start < low or end > high or start > end:
+            raise ValueError(f"Champ cron hors limites: {spec}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+@dataclass
+class CronTrigger:
+    """Expression cron 5 champs 'minute heure jour mois jour_semaine' (heure locale).
+
+    Jour de semaine: 0 = dimanche ... 6 = samedi (7 accepté pour dimanche).
+    Comme cron, si jour et jour_semaine sont tous deux restreints, l'un OU
+    l'autre suffit.
+    """
+    expression: str
+
+    def __post_init__(self):
+        fields_ = self.expression.split()
+        if len(fields_) != 5:
+            raise ValueError(f"Expression cron invalide: {self.expression}")
+        minute, hour, day, month, weekday = fields_
+        self._minutes = _parse_cron_field(minute, 0, 59)
+        self._hours = _parse_cron_field(hour, 0, 23)
+        self._days = _parse_cron_field(day, 1, 31)
+        self._months = _parse_cron_field(month, 1, 12)
+        self._weekdays = {d % 7 for d in _parse_cron_field(weekday, 0, 7)}
+        self._day_restricted = day != '*'
+        self._weekday_restricted = weekday != '*'
+
+    def _day_matches(self, dt: datetime) -> bool:
+        in_days = dt.day in self._days
+        in_weekdays = (dt.isoweekday() % 7) in self._weekdays
+        if self._day_restricted and self._weekday_restricted:
+            return in_days or in_weekdays
+        return in_days and in_weekdays
+
+    def first_run(self, now: float) -> float:
+        return self.next_after(now)
+
+    def next_after(self, previous_due: float) -> float:
+        dt = datetime.fromtimestamp(previous_due).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = dt + timedelta(days=366 * 5)
+        while dt < limit:
+            if dt.month not in self._months:
+                dt = (dt.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(dt):
+                dt = dt.replace(hour=0, minute=0) + timedelta(days=1)
+            elif dt.hour not in self._hours:
+                dt = dt.replace(minute=0) + timedelta(hours=1)
+            elif dt.minute not in self._minutes:
+                dt += timedelta(minutes=1)
+            else:
+                return dt.timestamp()
+        raise ValueError(f"Aucune échéance cron pour: {self.expression}")
+
+    @classmethod
+    def daily(cls, at: str) -> 'CronTrigger':
+        """Quotidien à 'HH:MM'"""
+        hour, minute = at.split(':')
+        return cls(f"{int(minute)} {int(hour)} * * *")
+
+    @classmethod
+    def weekly(cls, weekday: str, at: str) -> 'CronTrigger':
+        """Hebdomadaire: weekday en anglais ('sunday'...) ou 0-6, à 'HH:MM'"""
+        names = ['sunday', 'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday']
+        day = names.index(weekday.lower()) if not str(weekday).isdigit() else int(weekday)
+        hour, minute = at.split(':')
+        return cls(f"{int(minute)} {int(hour)} * * {day}")
+
+
+@dataclass
+class DependencyTrigger:
+    """Exécution après succès des agents amont ('all': chacun depuis la dernière exécution, 'any': l'un d'eux)"""
+    after: Sequence[str]
+    mode: str = 'all'
+
+    def __post_init__(self):
+        if self.mode not in ('all', 'any'):
+            raise ValueError("mode doit valoir 'all' ou 'any'")
+
+
+# ---------------------------------------------------------------------------
+# État des agents
+# ---------------------------------------------------------------------------
+
+@dataclass
+class RunRecord:
+    """Trace d'une exécution d'agent"""
+    agent: str
+    scheduled_for: float
+    started: float
+    finished: float
+    status: str  # success, error, timeout, cancelled
+    result: Any = None
+    error: Optional[str] = None
+
+
+@dataclass
+class ScheduledAgent:
+    """Agent enregistré et son état de planification"""
+    name: str
+    function: Callable
+    trigger: Any
+    timeout: Optional[float] = None
+    jitter: float = 0.0
+    catch_up: str = 'coalesce'
+    next_run: Optional[float] = None
+    nominal_run: Optional[float] = None
+    last_run: Optional[float] = None
+    last_status: str = 'registered'
+    runs: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    skipped: int = 0
+    running: bool = False
+    pending: List[float] = field(default_factory=list)  # Échéances dues en attente
+    upstream_seen: Dict[str, int] = field(default_factory=dict)
+    _generation: int = 0
+    _thread: Optional[asyncio.Future] = field(default=None, repr=False)  # Thread d'un agent synchrone
+
+
+class AgentScheduler:
+    """Ordonnanceur asyncio à tas de minuteries"""
+
+    def __init__(self, max_concurrency: int = 4, clock: Any = None,
+                 rng: Optional[random.Random] = None,
+                 on_run: Optional[Callable[[RunRecord], None]] = None):
+        self.clock = clock or RealClock()
+        self.max_concurrency = max(1, max_concurrency)
+        self.rng = rng or random.Random()
+        self.on_run = on_run
+        self.agents: Dict[str, ScheduledAgent] = {}
+        self.history: List[RunRecord] = []
+        self._timers: List[Tuple[float, int, str, int]] = []
+        self._seq = 0
+        self._completions: Dict[str, int] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopping = False
+        self._thread_id: Optional[int] = None
+
+    # -- Enregistrement -----------------------------------------------------
+
+    def register(self, name: str, function: Callable, trigger: Any,
+                 timeout: Optional[float] = None, jitter: float = 0.0,
+                 catch_up: str = 'coalesce', run_immediately: bool = False) -> ScheduledAgent:
+        """Enregistre un agent.
+
+        catch_up: 'coalesce' (une seule exécution pour toutes les échéances
+        manquées), 'skip' (échéances manquées abandonnées) ou 'all' (une
+        exécution par échéance manquée, bornée à MAX_CATCH_UP_RUNS).
+        """
+        if catch_up not in CATCH_UP_POLICIES:
+            raise ValueError(f"Politique de rattrapage inconnue: {catch_up}")
+        if isinstance(trigger, DependencyTrigger) and name in trigger.after:
+            raise ValueError(f"{name} ne peut dépendre de lui-même")
+        agent = ScheduledAgent(name=name, function=function, trigger=trigger,
+                               timeout=timeout, jitter=jitter, catch_up=catch_up)
+        if isinstance(trigger, DependencyTrigger):
+            agent.upstream_seen = {a: self._completions.get(a, 0) for a in trigger.after}
+        self.agents[name] = agent
+
+        now = self.clock.time()
+        if run_immediately:
+            self._arm(agent, now, jitter=False)
+        elif not isinstance(trigger, DependencyTrigger):
+            self._arm(agent, trigger.first_run(now))
+        self._notify()
+        return agent
+
+    def unregister(self, name: str):
+        agent = self.agents.pop(name, None)
+        if agent:
+            agent._generation += 1
+            self._notify()
+
+    def reschedule(self, name: str, at: Optional[float] = None, delay: Optional[float] = None):
+        """Force la prochaine échéance d'un agent (à `at` ou dans `delay` secondes)"""
+        agent = self.agents[name]
+        when = at if at is not None else self.clock.time() + (delay or 0.0)
+        self._arm(agent, when, jitter=False)
+        self._notify()
+
+    def _arm(self, agent: ScheduledAgent, nominal: float, jitter: bool = True):
+        """Arme la minuterie: échéance nominale + gigue éventuelle (la gigue ne dérive pas)"""
+        agent._generation += 1
+        agent.nominal_run = nominal
+        when = nominal
+        if jitter and agent.jitter > 0:
+            when += self.rng.uniform(0.0, agent.jitter)
+        agent.next_run = when
+        self._seq += 1
+        heapq.heappush(self._timers, (when, self._seq, agent.name, agent._generation))
+
+    # -- Boucle principale --------------------------------------------------
+
+    async def run(self, until: Optional[float] = None, duration: Optional[float] = None):
+        """Exécute le planning jusqu'à stop(), `until` (temps horloge) ou `duration` secondes"""
+        self._loop = asyncio.get_running_loop()
+        self._thread_id = threading.get_ident()
+        self._wake = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._stopping = False
+        if duration is not None:
+            until = self.clock.time() + duration
+
+        try:
+            while not self._stopping:
+                now = self.clock.time()
+                if until is not None and now >= until:
+                    break
+                self._dispatch_due(now)
+
+                deadline = self._next_deadline()
+                if until is not None:
+                    deadline = until if deadline is None else min(deadline, until)
+                await self._wait(deadline)
+        finally:
+            await self._drain()
+
+    def stop(self):
+        """Demande l'arrêt (appelable depuis un autre thread)"""
+        if self._loop is not None and self._thread_id != threading.get_ident():
+            self._loop.call_soon_threadsafe(self._request_stop)
+        else:
+            self._request_stop()
+
+    def _request_stop(self):
+        self._stopping = True
+        self._notify()
+
+    def _notify(self):
+        if self._wake is not None:
+            self._wake.set()
+
+    def _next_deadline(self) -> Optional[float]:
+        while self._timers:
+            when, _, name, generation = self._timers[0]
+            agent = self.agents.get(name)
+            if agent is None or agent._generation != generation:
+                heapq.heappop(self._timers)  # Minuterie périmée (replanifiée / retirée)
+                continue
+            return when
+        return None
+
+    async def _wait(self, deadline: Optional[float]):
+        """Attend l'échéance ou un événement, sans scrutation"""
+        waiters = [asyncio.ensure_future(self._wake.wait())]
+        if deadline is not None:
+            waiters.append(asyncio.ensure_future(self.clock.sleep_until(deadline)))
+        try:
+            await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+            self._wake.clear()
+
+    def _dispatch_due(self, now: float):
+        while True:
+            deadline = self._next_deadline()
+            if deadline is None or deadline > now:
+                return
+            _, _, name, _ = heapq.heappop(self._timers)
+            agent = self.agents[name]
+            agent.next_run = None
+            self._enqueue_due(agent, agent.nominal_run, now)
+
+    def _enqueue_due(self, agent: ScheduledAgent, due: float, now: float):
+        """Applique la politique de rattrapage puis lance (ou met en attente) l'agent"""
+        trigger = agent.trigger
+        occurrences = [due]
+        following = None
+        if not isinstance(trigger, DependencyTrigger):
+            following = trigger.next_after(due)
+            while following <= now and len(occurrences) < MAX_CATCH_UP_RUNS:
+                occurrences.append(following)
+                following = trigger.next_after(following)
+            while following <= now:
+                following = trigger.next_after(following)
+
+        # Manqué: plusieurs échéances passées, ou agent encore occupé par un cycle long
+        backlog = agent.pending + occurrences
+        if agent.running or len(backlog) > 1:
+            if agent.catch_up == 'skip':
+                agent.skipped += len(backlog)
+                backlog = []
+            elif agent.catch_up == 'coalesce':
+                agent.skipped += len(backlog) - 1
+                backlog = backlog[-1:]
+
+        agent.pending = backlog
+        if following is not None:
+            self._arm(agent, following)
+        self._start_pending(agent)
+
+    def _start_pending(self, agent: ScheduledAgent):
+        if agent.running or not agent.pending or self._stopping:
+            return
+        scheduled_for = agent.pending.pop(0)
+        agent.running = True
+        task = asyncio.ensure_future(self._execute(agent, scheduled_for))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _execute(self, agent: ScheduledAgent, scheduled_for: float):
+        started = self.clock.time()
+        status, result, error = 'success', None, None
+        cancelled = False
+        job = None
+        # L'attente du sémaphore est dans le try: un agent annulé en file
+        # d'attente est enregistré 'cancelled' et redevient disponible
+        try:
+            async with self._semaphore:
+                started = self.clock.time()
+                job = asyncio.ensure_future(self._call(agent))
+                # Un job abandonné (délai, arrêt) ne doit pas laisser d'exception non lue
+                job.add_done_callback(lambda t: t.cancelled() or t.exception())
+                if agent.timeout is not None:
+                    timer = asyncio.ensure_future(self.clock.sleep(agent.timeout))
+                    done, _ = await asyncio.wait({job, timer}, return_when=asyncio.FIRST_COMPLETED)
+                    timer.cancel()
+                    if job not in done:
+                        job.cancel()
+                        status, error = 'timeout', f"délai {agent.timeout}s dépassé"
+                if status == 'success':
+                    result = await job
+        except asyncio.CancelledError:
+            if job is not None:
+                job.cancel()
+            status, error = 'cancelled', 'arrêt ordonnanceur'
+            cancelled = True
+        except Exception as e:
+            status, error = 'error', str(e)
+
+        record = RunRecord(agent=agent.name, scheduled_for=scheduled_for, started=started,
+                           finished=self.clock.time(), status=status, result=result, error=error)
+        self._record(agent, record)
+        if cancelled:
+            raise asyncio.CancelledError
+
+    async def _call(self, agent: ScheduledAgent) -> Any:
+        function = agent.function
+        if inspect.iscoroutinefunction(function):
+            return await function()
+        # Un thread ne s'interrompt pas: abandonné (délai, arrêt), il garde
+        # l'agent occupé jusqu'à son retour pour ne pas chevaucher le suivant
+        thread = asyncio.ensure_future(asyncio.to_thread(function))
+        thread.add_done_callback(lambda t: t.cancelled() or t.exception())
+        agent._thread = thread
+        result = await asyncio.shield(thread)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    def _record(self, agent: ScheduledAgent, record: RunRecord):
+        thread, agent._thread = agent._thread, None
+        if thread is not None and not thread.done():
+            thread.add_done_callback(lambda _: self._release(agent))
+        else:
+            agent.running = False
+        agent.last_run = record.started
+        agent.last_status = record.status
+        agent.runs += 1
+        if record.status == 'error':
+            agent.failures += 1
+        elif record.status == 'timeout':
+            agent.timeouts += 1
+
+        self.history.append(record)
+        if len(self.history) > HISTORY_LIMIT:
+            del self.history[:-HISTORY_LIMIT]
+        if self.on_run:
+            try:
+                self.on_run(record)
+            except Exception as e:
+                print(f"⚠️ Callback on_run en erreur: {e}")
+
+        if record.status == 'success':
+            self._completions[agent.name] = self._completions.get(agent.name, 0) + 1
+            self._trigger_dependents(agent.name)
+
+        self._start_pending(agent)
+        self._notify()
+
+    def _release(self, agent: ScheduledAgent):
+        """Fin du thread d'un agent synchrone abandonné: l'agent redevient disponible"""
+        agent.running = False
+        if self._loop is not None:
+            self._start_pending(agent)
+            self._notify()
+
+    def _trigger_dependents(self, upstream: str):
+        now = self.clock.time()
+        for agent in self.agents.values():
+            trigger = agent.trigger
+            if not isinstance(trigger, DependencyTrigger) or upstream not in trigger.after:
+                continue
+            fresh = [a for a in trigger.after if self._completions.get(a, 0) > agent.upstream_seen.get(a, 0)]
+            ready = len(fresh) == len(trigger.after) if trigger.mode == 'all' else bool(fresh)
+            if ready:
+                agent.upstream_seen = {a: self._completions.get(a, 0) for a in trigger.after}
+                self._arm(agent, now)
+
+    async def _drain(self):
+        """Annule les exécutions en cours à l'arrêt et attend leur fin"""
+        # Aucun nouveau lancement (échéances en attente) pendant et après l'arrêt
+        self._stopping = True
+        while self._tasks:
+            tasks = list(self._tasks)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop = None
+
+    # -- Introspection ------------------------------------------------------
+
+    def status(self) -> Dict[str, Dict]:
+        """État sérialisable de chaque agent"""
+        return {
+            name: {
+                'next_run': agent.next_run,
+                'last_run': agent.last_run,
+                'last_status': agent.last_status,
+                'runs': agent.runs,
+                'failures': agent.failures,
+                'timeouts': agent.timeouts,
+                'skipped': agent.skipped,
+                'running': agent.running
+            }
+            for name, agent in self.agents.items()
+        }
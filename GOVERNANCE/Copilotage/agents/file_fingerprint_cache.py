@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+🗂️ CACHE D'EMPREINTES FICHIERS - SCAN INCRÉMENTAL
+=================================================
+
+Cache persistant des résultats d'analyse par fichier, indexé par chemin et
+validé par (taille, mtime, hash SHA-256 du contenu).
+
+- Taille + mtime identiques : résultat réutilisé sans relire le fichier
+- Métadonnées changées mais contenu identique : résultat réutilisé après hash
+- Contenu modifié : ré-analyse, en parallèle dans un pool de processus
+
+Un cycle sur une arborescence inchangée se limite donc à des appels stat().
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+CACHE_FORMAT_VERSION = 1
+
+# En dessous de ce nombre de fichiers, démarrer un pool coûte plus qu'il ne rapporte
+PARALLEL_THRESHOLD = 8
+
+# Analyseur: (kind, file_path, content) -> {bucket: [issues]}
+Analyzer = Callable[[str, str, str], Dict[str, List[str]]]
+
+
+@dataclass
+class FileScanResult:
+    """Résultat d'analyse d'un fichier, frais ou issu du cache"""
+    path: str
+    size: int = 0
+    line_count: int = 0
+    findings: Dict[str, List[str]] = field(default_factory=dict)
+    error: Optional[str] = None
+    from_cache: bool = False
+
+
+_worker_analyzer: Optional[Analyzer] = None
+
+
+def _init_worker(analyzer: Analyzer):
+    """Installe l'analyseur une seule fois par processus worker"""
+    global _worker_analyzer
+    _worker_analyzer = analyzer
+
+
+def _read_and_analyze(kind: str, path: str, known_digest: Optional[str],
+                      analyzer: Optional[Analyzer] = None) -> Tuple:
+    """Lit, hashe et analyse un fichier (exécuté dans un worker ou en local).
+
+    Retourne (path, digest, line_count, findings, error). findings vaut None
+    quand le contenu correspond à known_digest: le résultat caché reste valide.
+    """
+    analyzer = analyzer or _worker_analyzer
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        if digest == known_digest:
+            return path, digest, None, None, None
+        # Même normalisation des fins de ligne que open(..., 'r')
+        content = raw.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+    except Exception as e:
+        return path, None, None, None, str(e)
+
+    return path, digest, len(content.split('\n')), analyzer(kind, path, content), None
+
+
+class FileFingerprintCache:
+    """Cache persistant (JSON) des analyses par fichier"""
+
+    def __init__(self, cache_path: str, rules_signature: str = ''):
+        self.cache_path = cache_path
+        self.rules_signature = rules_signature
+        self.entries: Dict[str, Dict[str, Dict]] = {}
+        self.stats = {'hits': 0, 'rehashed': 0, 'analyzed': 0, 'errors': 0}
+        self._loaded = False
+        self._dirty = False
+
+    def load(self):
+        """Charge le cache; invalidé si format ou règles d'analyse ont changé"""
+        self._loaded = True
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if (data.get('format') == CACHE_FORMAT_VERSION
+                and data.get('rules_signature') == self.rules_signature):
+            self.entries = data.get('entries', {})
+        else:
+            self._dirty = True
+
+    def save(self):
+        """Écriture atomique, uniquement si le cache a changé"""
+        if not self._dirty:
+            return
+
+        os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'format': CACHE_FORMAT_VERSION,
+                'rules_signature': self.rules_signature,
+                'entries': self.entries
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, self.cache_path)
+        self._dirty = False
+
+    def scan(self, kind: str, paths: List[str], analyzer: Analyzer,
+             max_workers: Optional[int] = None) -> List[FileScanResult]:
+        """Analyse les fichiers d'une catégorie, dans l'ordre de `paths`.
+
+        Les entrées de la catégorie absentes de `paths` sont purgées.
+        """
+        if not self._loaded:
+            self.load()
+
+        section = self.entries.setdefault(kind, {})
+        results: Dict[str, FileScanResult] = {}
+        pending = []
+
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError as e:
+                results[path] = FileScanResult(path=path, error=str(e))
+                self.stats['errors'] += 1
+                continue
+
+            entry = section.get(path)
+            if entry and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+                results[path] = self._result_from_entry(path, entry)
+                self.stats['hits'] += 1
+            else:
+                pending.append((path, st, entry))
+
+        outcomes = self._run_pending(kind, [(path, entry['sha256'] if entry else None)
+                                            for path, _, entry in pending],
+                                     analyzer, max_workers)
+
+        for (path, st, entry), (_, digest, line_count, findings, error) in zip(pending, outcomes):
+            if error is not None:
+                results[path] = FileScanResult(path=path, size=st.st_size, error=error)
+                section.pop(path, None)
+                self.stats['errors'] += 1
+                continue
+
+            if findings is None:
+                # Contenu inchangé (touch, checkout...): seules les métadonnées bougent
+                entry = dict(entry, size=st.st_size, mtime_ns=st.st_mtime_ns)
+                self.stats['rehashed'] += 1
+            else:
+                entry = {
+                    'size': st.st_size,
+                    'mtime_ns': st.st_mtime_ns,
+                    'sha256': digest,
+                    'line_count': line_count,
+                    'findings': findings
+                }
+                self.stats['analyzed'] += 1
+
+            section[path] = entry
+            results[path] = self._result_from_entry(path, entry, from_cache=findings is None)
+            self._dirty = True
+
+        wanted = set(paths)
+        for stale in [p for p in section if p not in wanted]:
+            del section[stale]
+            self._dirty = True
+
+        return [results[path] for path in paths]
+
+    def _run_pending(self, kind: str, jobs: List[Tuple[str, Optional[str]]],
+                     analyzer: Analyzer, max_workers: Optional[int]) -> List[Tuple]:
+        """Analyse les fichiers modifiés, en parallèle au-delà du seuil"""
+        if len(jobs) >= PARALLEL_THRESHOLD and max_workers != 1:
+            try:
+                with ProcessPoolExecutor(max_workers=max_workers,
+                                         initializer=_init_worker,
+                                         initargs=(analyzer,)) as pool:
+                    chunksize = max(1, len(jobs) // ((max_workers or os.cpu_count() or 1) * 4))
+                    return list(pool.map(_read_and_analyze,
+                                         [kind] * len(jobs),
+                                         [path for path, _ in jobs],
+                                         [known for _, known in jobs],
+                                         chunksize=chunksize))
+            except Exception as e:
+                print(f"⚠️ Pool de processus indisponible ({e}) - analyse séquentielle")
+
+        return [_read_and_analyze(kind, path, known, analyzer) for path, known in jobs]
+
+    @staticmethod
+    def _result_from_entry(path: str, entry: Dict, from_cache: bool = True) -> FileScanResult:
+        return FileScanResult(
+            path=path,
+            size=entry['size'],
+            line_count=entry['line_count'],
+            findings=entry['findings'],
+            from_cache=from_cache
+        )
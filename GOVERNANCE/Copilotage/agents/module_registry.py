@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+🧬 REGISTRE DE MODULES ADRESSÉ PAR CONTENU
+==========================================
+
+Les mêmes scripts vivent dans plusieurs arborescences miroir
+(OPERATIONS/DevOps/scripts, Copilotage/scripts, GOVERNANCE/Copilotage/...,
+OPERATIONS/backup/strategies/cloud_backup/agents). Le registre:
+
+- associe chaque fichier à l'empreinte SHA-256 de son contenu (cache par
+  taille + mtime: un fichier inchangé n'est pas relu)
+- regroupe les copies identiques et désigne une copie canonique selon
+  l'ordre de préférence des arborescences
+- détecte les quasi-copies: découpage en blocs de lignes à frontières
+  définies par le contenu, puis similarité de Jaccard sur les empreintes de
+  blocs (candidats via index inversé bloc -> fichiers)
+
+Usages: les scanners n'analysent qu'une copie par contenu (dedupe), les
+sauvegardes (OPERATIONS/DevOps/scripts/dedup_backup_store.py) stockent les
+copies comme références vers la copie canonique (backup_plan).
+"""
+
+import hashlib
+import json
+import os
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+REGISTRY_VERSION = 1
+DEFAULT_REGISTRY_NAME = '.module_registry.json'
+DEFAULT_EXTENSIONS = ('.py', '.sh', '.bash')
+EXCLUDED_DIRS = {'.git', '__pycache__', 'node_modules', '.venv', 'venv', 'target',
+                 '.tox', '.nox', '.mypy_cache', '.pytest_cache', '.ruff_cache'}
+
+# Préférence de copie canonique (les préfixes en tête l'emportent); les copies
+# d'archive/sauvegarde passent en dernier
+CANONICAL_PREFERENCE = (
+    'OPERATIONS/DevOps/scripts/',
+    'GOVERNANCE/Copilotage/agents/',
+    'GOVERNANCE/Copilotage/scripts/',
+    'ECOSYSTEM/',
+    'CORE/',
+)
+ARCHIVE_PREFIXES = (
+    'Copilotage/',
+    'GOVERNANCE/Copilotage/archive/',
+    'OPERATIONS/backup/',
+)
+
+# Découpage: frontière après une ligne dont le CRC32 a ses bits de masque à 0
+CHUNK_MASK = 0x7  # Bloc moyen ~8 lignes
+CHUNK_MIN_LINES = 2
+CHUNK_MAX_LINES = 32
+NEAR_DUPLICATE_THRESHOLD = 0.7
+MAX_CHUNK_FREQUENCY = 50  # Blocs trop communs (boilerplate) ignorés pour les candidats
+
+
+def canonical_rank(rel_path: str) -> Tuple[int, int, str]:
+    """Clé de tri: arborescence préférée, puis chemin le plus court"""
+    normalized = rel_path.replace(os.sep, '/')
+    for index, prefix in enumerate(CANONICAL_PREFERENCE):
+        if normalized.startswith(prefix):
+            return index, len(normalized), normalized
+    for index, prefix in enumerate(ARCHIVE_PREFIXES):
+        if normalized.startswith(prefix):
+            return len(CANONICAL_PREFERENCE) + 1 + index, len(normalized), normalized
+    return len(CANONICAL_PREFERENCE), len(normalized), normalized
+
+
+def line_chunks(text: str) -> List[str]:
+    """Empreintes des blocs de lignes (espaces de fin et lignes vides ignorés)
+
+    Les frontières dépendent du contenu des lignes: une insertion ne décale
+    que les blocs voisins, le reste du fichier garde les mêmes empreintes.
+    """
+    chunks, current = [], []
+    for raw_line in text.splitlines():
+        line = raw_line.rstrip()
+        if not line.strip():
+            continue
+        current.append(line)
+        boundary = (zlib.crc32(line.encode('utf-8')) & CHUNK_MASK) == 0
+        if (boundary and len(current) >= CHUNK_MIN_LINES) or len(current) >= CHUNK_MAX_LINES:
+            chunks.append(hashlib.sha1('\n'.join(current).encode('utf-8')).hexdigest()[:16])
+            current = []
+    if current:
+        chunks.append(hashlib.sha1('\n'.join(current).encode('utf-8')).hexdigest()[:16])
+    return chunks
+
+
+@dataclass
+class NearDuplicate:
+    path: str
+    other: str
+    similarity: float
+
+
+class ModuleRegistry:
+    """Registre persistant chemin -> contenu, groupes de copies et quasi-copies"""
+
+    def __init__(self, root: str, registry_path: Optional[str] = None,
+                 extensions: Tuple[str, ...] = DEFAULT_EXTENSIONS):
+        self.root = os.path.abspath(root)
+        self.registry_path = registry_path or os.path.join(self.root, DEFAULT_REGISTRY_NAME)
+        self.extensions = extensions
+        self.files: Dict[str, Dict] = {}  # chemin relatif -> {size, mtime_ns, sha256}
+        self.chunks: Dict[str, List[str]] = {}  # sha256 -> empreintes de blocs
+        self._dirty = False
+        self.load()
+
+    # ------------------------------------------------------------------
+    # Persistance et mise à jour
+    # ------------------------------------------------------------------
+
+    def load(self):
+        try:
+            with open(self.registry_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') == REGISTRY_VERSION and data.get('root') == self.root:
+            self.files = data.get('files', {})
+            self.chunks = data.get('chunks', {})
+
+    def save(self):
+        if not self._dirty:
+            return
+        tmp_path = f"{self.registry_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': REGISTRY_VERSION,
+                'root': self.root,
+                'files': self.files,
+                'chunks': self.chunks,
+                'canonical': {copy: paths[0] for paths in self.duplicate_groups() for copy in paths[1:]}
+            }, f, separators=(',', ':'))
+        os.replace(tmp_path, self.registry_path)
+        self._dirty = False
+
+    def _rel(self, path: str) -> str:
+        full_path = path if os.path.isabs(path) else os.path.join(self.root, path)
+        return os.path.relpath(full_path, self.root)
+
+    def discover(self) -> List[str]:
+        found = []
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if d not in EXCLUDED_DIRS]
+            for filename in filenames:
+                if filename.endswith(self.extensions):
+                    found.append(os.path.relpath(os.path.join(dirpath, filename), self.root))
+        return sorted(found)
+
+    def refresh(self, paths: Optional[Iterable[str]] = None, save: bool = True) -> Dict:
+        """Enregistre les fichiers (toute l'arborescence si `paths` est None)"""
+        stats = {'checked': 0, 'hashed': 0, 'removed': 0}
+        if paths is None:
+            candidates = self.discover()
+            for stale in set(self.files) - set(candidates):
+                del self.files[stale]
+                stats['removed'] += 1
+                self._dirty = True
+        else:
+            candidates = [self._rel(p) for p in paths]
+
+        for rel_path in candidates:
+            stats['checked'] += 1
+            if self._register(rel_path):
+                stats['hashed'] += 1
+
+        referenced = {entry['sha256'] for entry in self.files.values()}
+        for digest in [d for d in self.chunks if d not in referenced]:
+            del self.chunks[digest]
+            self._dirty = True
+        if save:
+            self.save()
+        return stats
+
+    def _register(self, rel_path: str) -> bool:
+        """Met à jour l'entrée d'un fichier; True s'il a fallu le relire"""
+        full_path = os.path.join(self.root, rel_path)
+        try:
+            stat = os.stat(full_path)
+        except OSError:
+            if self.files.pop(rel_path, None) is not None:
+                self._dirty = True
+            return False
+        entry = self.files.get(rel_path)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return False
+
+        with open(full_path, 'rb') as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        if digest not in self.chunks:
+            self.chunks[digest] = line_chunks(raw.decode('utf-8', errors='replace'))
+        self.files[rel_path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest}
+        self._dirty = True
+        return True
+
+    # ------------------------------------------------------------------
+    # Copies identiques
+    # ------------------------------------------------------------------
+
+    def groups(self) -> Dict[str, List[str]]:
+        """sha256 -> chemins (copie canonique en tête); fichiers vides exclus"""
+        groups: Dict[str, List[str]] = defaultdict(list)
+        for rel_path, entry in self.files.items():
+            if entry['size'] > 0:
+                groups[entry['sha256']].append(rel_path)
+        return {digest: sorted(paths, key=canonical_rank) for digest, paths in groups.items()}
+
+    def duplicate_groups(self) -> List[List[str]]:
+        return sorted((paths for paths in self.groups().values() if len(paths) > 1),
+                      key=lambda paths: paths[0])
+
+    def canonical(self, path: str) -> str:
+        """Copie canonique du contenu de `path` (lui-même s'il est unique ou inconnu)"""
+        rel_path = self._rel(path)
+        entry = self.files.get(rel_path)
+        if not entry or entry['size'] == 0:
+            return rel_path
+        same = [p for p, e in self.files.items() if e['sha256'] == entry['sha256']]
+        return min(same, key=canonical_rank)
+
+    def dedupe(self, paths: List[str]) -> Tuple[List[str], Dict[str, str]]:
+        """Une seule copie par contenu, dans l'ordre de `paths`
+
+        Retourne (chemins à traiter, {copie ignorée: chemin traité de même contenu}).
+        Les chemins sont restitués tels que fournis; les fichiers illisibles sont
+        conservés pour que l'appelant signale l'erreur.
+        """
+        self.refresh(paths, save=False)
+        kept, aliases, first_by_digest = [], {}, {}
+        for path in paths:
+            entry = self.files.get(self._rel(path))
+            if not entry or entry['size'] == 0:
+                kept.append(path)
+                continue
+            first = first_by_digest.setdefault(entry['sha256'], path)
+            if first is path:
+                kept.append(path)
+            else:
+                aliases[path] = first
+        return kept, aliases
+
+    def backup_plan(self, paths: Optional[Iterable[str]] = None) -> Dict:
+        """Fichiers à stocker et copies à enregistrer comme références
+
+        {'store': [chemins canoniques], 'references': {copie: canonique},
+         'bytes_total': ..., 'bytes_referenced': ...}
+        """
+        if paths is not None:
+            self.refresh(paths, save=False)
+            selected = {self._rel(p) for p in paths}
+        else:
+            selected = set(self.files)
+        store, references = [], {}
+        bytes_total = bytes_referenced = 0
+        stored_by_digest: Dict[str, str] = {}
+        for rel_path in sorted(selected, key=canonical_rank):
+            entry = self.files.get(rel_path)
+            if entry is None:
+                continue
+            bytes_total += entry['size']
+            first = stored_by_digest.get(entry['sha256']) if entry['size'] else None
+            if first is None:
+                stored_by_digest[entry['sha256']] = rel_path
+                store.append(rel_path)
+            else:
+                references[rel_path] = first
+                bytes_referenced += entry['size']
+        return {'store': sorted(store), 'references': dict(sorted(references.items())),
+                'bytes_total': bytes_total, 'bytes_referenced': bytes_referenced}
+
+    # ------------------------------------------------------------------
+    # Quasi-copies
+    # ------------------------------------------------------------------
+
+    def similarity(self, path: str, other: str) -> float:
+        a = set(self.chunks.get(self.files[self._rel(path)]['sha256'], []))
+        b = set(self.chunks.get(self.files[self._rel(other)]['sha256'], []))
+        if not a or not b:
+            return 0.0
+        return len(a & b) / len(a | b)
+
+    def near_duplicates(self, threshold: float = NEAR_DUPLICATE_THRESHOLD) -> List[NearDuplicate]:
+        """Paires de contenus distincts de similarité >= threshold (copies canoniques)"""
+        representatives = {digest: paths[0] for digest, paths in self.groups().items()}
+        chunk_sets = {digest: set(self.chunks.get(digest, [])) for digest in representatives}
+
+        postings: Dict[str, List[str]] = defaultdict(list)
+        for digest, chunk_set in chunk_sets.items():
+            for chunk in chunk_set:
+                postings[chunk].append(digest)
+
+        shared: Dict[Tuple[str, str], int] = defaultdict(int)
+        for digests in postings.values():
+            if len(digests) < 2 or len(digests) > MAX_CHUNK_FREQUENCY:
+                continue
+            digests = sorted(digests)
+            for i, a in enumerate(digests):
+                for b in digests[i + 1:]:
+                    shared[(a, b)] += 1
+
+        found = []
+        for (a, b), count in shared.items():
+            # Borne supérieure avant le calcul exact (blocs fréquents exclus du comptage)
+            if count / max(len(chunk_sets[a]), len(chunk_sets[b])) < threshold / 2:
+                continue
+            similarity = len(chunk_sets[a] & chunk_sets[b]) / len(chunk_sets[a] | chunk_sets[b])
+            if similarity >= threshold:
+                path, other = sorted((representatives[a], representatives[b]), key=canonical_rank)
+                found.append(NearDuplicate(path, other, round(similarity, 3)))
+        return sorted(found, key=lambda n: (-n.similarity, n.path, n.other))
+
+    def report(self, threshold: float = NEAR_DUPLICATE_THRESHOLD) -> Dict:
+        plan = self.backup_plan()
+        duplicate_groups = self.duplicate_groups()
+        return {
+            'files': len(self.files),
+            'unique_contents': len(self.groups()),
+            'empty_files': sum(1 for e in self.files.values() if e['size'] == 0),
+            'duplicate_groups': duplicate_groups,
+            'redundant_copies': sum(len(g) - 1 for g in duplicate_groups),
+            'bytes_total': plan['bytes_total'],
+            'bytes_referenced': plan['bytes_referenced'],
+            'near_duplicates': [vars(n) for n in self.near_duplicates(threshold)]
+        }
+
+
+def main():
+    """Rapport des copies et quasi-copies de l'arborescence courante"""
+    import sys
+
+    root = sys.argv[1] if len(sys.argv) > 1 else os.getcwd()
+    registry = ModuleRegistry(root)
+    stats = registry.refresh()
+    report = registry.report()
+
+    print(f"🧬 REGISTRE DE MODULES - {root}")
+    print(f"   {report['files']} fichiers, {report['unique_contents']} contenus uniques "
+          f"({stats['hashed']} relus), {report['empty_files']} vides")
+    print(f"   {report['redundant_copies']} copies redondantes "
+          f"({report['bytes_referenced']:,} / {report['bytes_total']:,} octets)")
+    for group in report['duplicate_groups']:
+        print(f"   📌 {group[0]}")
+        for copy in group[1:]:
+            print(f"      = {copy}")
+    for near in report['near_duplicates']:
+        print(f"   ≈ {near['path']} ~ {near['other']} ({near['similarity']:.0%})")
+
+
+if __name__ == "__main__":
+    main()
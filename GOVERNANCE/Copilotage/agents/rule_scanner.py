@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+🔎 MOTEUR DE RÈGLES - SCAN EN UNE PASSE
+=======================================
+
+Règles de détection déclaratives (regex + portée + message) compilées en une
+seule expression combinée: chaque contenu est parcouru une seule fois pour
+toutes les règles d'un jeu.
+
+L'alternance combinée (sans groupe capturant, ce qui préserve la recherche
+rapide par préfixe du moteur `re`) localise les positions où au moins une
+règle débute; seules les règles dont le premier caractère est compatible y
+sont ensuite vérifiées. Pour chaque règle, les correspondances retournées sont
+exactement celles de `re.finditer` appliqué à cette règle seule (non
+chevauchantes, leftmost-first): aucune règle ne masque une autre.
+
+Les règles littérales (alternances de chaînes, sensibles ou non à la casse)
+sont recherchées sur le contenu passé en minuscules: `re` perd sa recherche
+rapide dès qu'une alternative est en IGNORECASE. Les règles non littérales
+forment une seconde alternance sur le contenu original. Toute position
+candidate est vérifiée avec la règle exacte sur le contenu original.
+
+L'analyse des motifs (premiers caractères, littéraux) s'appuie sur le module
+privé `re._parser` (`sre_parse` avant 3.11), sans garantie de stabilité: s'il
+est absent, ou si un motif n'y est pas reconnu, le scanner se replie sur
+`finditer` règle par règle (ou traite la règle comme non littérale). Les
+règles insensibles à la casse ne sont indexées que par leurs premiers
+caractères ASCII: IGNORECASE apparie aussi des caractères non ASCII
+(İ, ı, ſ, ς/σ...) que lower()/casefold() ne ramènent pas au même caractère.
+
+Contraintes sur les motifs: pas de groupes nommés ni de références arrière,
+pas de correspondance vide. Les motifs sont compilés en re.MULTILINE:
+`^` et `$` désignent les débuts/fins de ligne.
+
+Utilisable hors de l'agent critique:
+
+    scanner = RuleScanner([
+        ScanRule('todo', r'TODO|FIXME', ignore_case=True, bucket='issues',
+                 message="{path}:{line} - {line_text}"),
+        ScanRule('imports', r'^import ', scope='count'),
+    ])
+    result = scanner.scan(content)
+    result.count('imports')
+    for bucket, message in result.issues('module.py'):
+        ...
+"""
+
+import bisect
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    try:
+        import sre_parse
+    except ImportError:
+        sre_parse = None  # Repli: finditer règle par règle
+
+# Portées: 'line' = une issue par ligne concernée, 'match' et 'count' = consultées par le code appelant
+RULE_SCOPES = ('line', 'match', 'count')
+
+
+@dataclass(frozen=True)
+class ScanRule:
+    """Règle de détection déclarative"""
+    name: str
+    pattern: str
+    ignore_case: bool = False
+    scope: str = 'line'
+    bucket: Optional[str] = None     # Compartiment d'issues (portée 'line')
+    message: Optional[str] = None    # Champs: path, line, text, line_text, length
+
+
+class _UnknownFirstChar(Exception):
+    """Premier caractère d'une règle non déterminable"""
+
+
+def _parse(pattern: str):
+    """Arbre du motif par le parseur de `re`, None s'il est indisponible"""
+    if sre_parse is None:
+        return None
+    try:
+        return sre_parse.parse(pattern, re.MULTILINE)
+    except Exception:
+        return None
+
+
+def _first_chars(items) -> Tuple[Set[str], bool]:
+    """Caractères pouvant débuter une correspondance.
+
+    Retourne (caractères, séquence_annulable). Lève _UnknownFirstChar si
+    l'ensemble n'est pas déterminable (ancre, classe niée, '.', ...).
+    """
+    chars: Set[str] = set()
+
+    for op, av in items:
+        name = str(op)
+        if name == 'LITERAL':
+            chars.add(chr(av))
+            return chars, False
+        if name == 'IN':
+            for item_op, item_av in av:
+                item_name = str(item_op)
+                if item_name == 'LITERAL':
+                    chars.add(chr(item_av))
+                elif item_name == 'RANGE' and item_av[1] - item_av[0] < 256:
+                    chars.update(chr(code) for code in range(item_av[0], item_av[1] + 1))
+                else:
+                    raise _UnknownFirstChar()
+            return chars, False
+        if name == 'SUBPATTERN':
+            sub_chars, nullable = _first_chars(av[-1])
+        elif name == 'BRANCH':
+            sub_chars, nullable = set(), False
+            for branch in av[1]:
+                branch_chars, branch_nullable = _first_chars(branch)
+                sub_chars |= branch_chars
+                nullable = nullable or branch_nullable
+        elif name in ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT'):
+            sub_chars, nullable = _first_chars(av[2])
+            nullable = nullable or av[0] == 0
+        else:
+            raise _UnknownFirstChar()
+
+        chars |= sub_chars
+        if not nullable:
+            return chars, False
+
+    return chars, True
+
+
+def _literal_strings(items, limit: int = 64) -> Optional[List[str]]:
+    """Chaînes exactes d'un motif purement littéral, None sinon"""
+    strings = ['']
+
+    for op, av in items:
+        name = str(op)
+        if name == 'LITERAL':
+            options = [chr(av)]
+        elif name == 'IN' and all(str(item_op) == 'LITERAL' for item_op, _ in av):
+            options = [chr(item_av) for _, item_av in av]
+        elif name == 'BRANCH':
+            options = []
+            for branch in av[1]:
+                branch_strings = _literal_strings(branch, limit)
+                if branch_strings is None:
+                    return None
+                options.extend(branch_strings)
+        elif name == 'SUBPATTERN':
+            options = _literal_strings(av[-1], limit)
+            if options is None:
+                return None
+        else:
+            return None
+
+        strings = [prefix + option for prefix in strings for option in options]
+        if len(strings) > limit:
+            return None
+
+    return strings if all(strings) else None
+
+
+# Caractères que IGNORECASE apparie à une lettre ASCII mais que lower() conserve
+_FOLD_UNSAFE_CHARS = ('\u017f', '\u0131')  # ſ, ı
+
+
+class _Sweep:
+    """Alternance combinée d'un sous-ensemble de règles + index des candidats"""
+
+    def __init__(self, scanner: 'RuleScanner', indices: List[int], folded: bool):
+        self.scanner = scanner
+        self.indices = indices
+        self.folded = folded
+        self._first: Dict[str, List[int]] = {}
+        self._folded_first: Dict[str, List[int]] = {}
+        self._any_first: List[int] = []
+        self._cache: Dict[str, Tuple[int, ...]] = {}
+
+        alternatives = []
+        for index in indices:
+            rule = scanner.rules[index]
+            if folded:
+                # Recherche sur contenu en minuscules: premier caractère en minuscule
+                for literal in scanner.literals[index]:
+                    lowered = literal.lower()
+                    alternatives.append(re.escape(lowered))
+                    self._first.setdefault(lowered[0], []).append(index)
+            else:
+                alternatives.append(scanner.sources[index])
+                self._index_first_chars(index, rule)
+
+        self.pattern = re.compile('|'.join(alternatives), re.MULTILINE)
+
+    def _index_first_chars(self, index: int, rule: ScanRule):
+        try:
+            chars, nullable = _first_chars(_parse(rule.pattern))
+        except Exception:  # _UnknownFirstChar, ou arbre de `re` d'une autre forme
+            nullable = True
+        # IGNORECASE hors ASCII ne suit pas casefold(): règle vérifiée partout
+        if nullable or (rule.ignore_case and not all(char.isascii() for char in chars)):
+            self._any_first.append(index)
+            return
+
+        table = self._folded_first if rule.ignore_case else self._first
+        for char in chars:
+            key = char.lower() if rule.ignore_case else char
+            table.setdefault(key, []).append(index)
+
+    def candidates(self, char: str) -> Tuple[int, ...]:
+        cached = self._cache.get(char)
+        if cached is None:
+            indices = set(self._any_first)
+            indices.update(self._first.get(char, ()))
+            if char.isascii():
+                indices.update(self._folded_first.get(char.lower(), ()))
+            else:
+                # İ, ı, ſ, K... appariés à une lettre ASCII par IGNORECASE
+                for folded in self._folded_first.values():
+                    indices.update(folded)
+            cached = self._cache[char] = tuple(sorted(indices))
+        return cached
+
+    def run(self, text: str, content: str, hits: Dict[str, List[re.Match]], last_end: List[int]):
+        """Parcourt `text`; les correspondances sont vérifiées sur `content`"""
+        if not self.folded and len(self.indices) == 1:
+            # Règle unique: l'alternance est la règle elle-même, finditer suffit
+            index = self.indices[0]
+            hits[self.scanner.rules[index].name].extend(self.pattern.finditer(content))
+            return
+
+        rules = self.scanner.rules
+        compiled = self.scanner.compiled
+        search = self.pattern.search
+        pos = 0
+
+        while True:
+            found = search(text, pos)
+            if found is None:
+                return
+            start = found.start()
+
+            # Plusieurs règles peuvent débuter à la même position
+            for index in self.candidates(text[start]):
+                if start < last_end[index]:
+                    continue
+                match = compiled[index].match(content, start)
+                if match:
+                    hits[rules[index].name].append(match)
+                    last_end[index] = match.end()
+
+            # Reprise juste après le début: une correspondance n'en masque aucune autre
+            pos = start + 1
+
+
+class ScanResult:
+    """Correspondances d'un scan, par règle, avec localisation à la ligne"""
+
+    def __init__(self, scanner: 'RuleScanner', content: str, hits: Dict[str, List[re.Match]]):
+        self.scanner = scanner
+        self.content = content
+        self.hits = hits
+        self._line_starts: Optional[List[int]] = None
+
+    def matches(self, name: str) -> List[re.Match]:
+        return self.hits.get(name, [])
+
+    def count(self, name: str) -> int:
+        return len(self.hits.get(name, ()))
+
+    def has(self, name: str) -> bool:
+        return bool(self.hits.get(name))
+
+    def line_of(self, pos: int) -> int:
+        """Numéro de ligne (1-based) d'une position"""
+        if self._line_starts is None:
+            self._line_starts = [0] + [m.end() for m in re.finditer('\n', self.content)]
+        return bisect.bisect_right(self._line_starts, pos)
+
+    def line_bounds(self, lineno: int) -> Tuple[int, int]:
+        """Positions (début, fin) d'une ligne, sans le saut de ligne"""
+        if self._line_starts is None:
+            self.line_of(0)
+        start = self._line_starts[lineno - 1]
+        end = self.content.find('\n', start)
+        return start, len(self.content) if end == -1 else end
+
+    def lines(self, name: str) -> List[int]:
+        """Lignes distinctes où la règle correspond, triées"""
+        return sorted({self.line_of(m.start()) for m in self.matches(name)})
+
+    def issues(self, path: str) -> Iterator[Tuple[str, str]]:
+        """Issues (bucket, message) des règles de portée 'line'.
+
+        Une issue par (règle, ligne), triées par ligne puis par ordre des règles.
+        """
+        located = []
+        for index, rule in enumerate(self.scanner.rules):
+            if rule.scope != 'line':
+                continue
+            seen = set()
+            for match in self.matches(rule.name):
+                lineno = self.line_of(match.start())
+                if lineno not in seen:
+                    seen.add(lineno)
+                    located.append((lineno, index, match))
+
+        for lineno, index, match in sorted(located, key=lambda item: item[:2]):
+            rule = self.scanner.rules[index]
+            start, end = self.line_bounds(lineno)
+            line = self.content[start:end]
+            yield rule.bucket, rule.message.format(
+                path=path,
+                line=lineno,
+                text=match.group(0),
+                line_text=line.strip(),
+                length=len(line)
+            )
+
+
+class RuleScanner:
+    """Jeu de règles compilé en une expression combinée"""
+
+    def __init__(self, rules: Sequence[ScanRule]):
+        self.rules = list(rules)
+        self.compiled: List[re.Pattern] = []
+        self.sources: List[str] = []
+        self.literals: List[Optional[List[str]]] = []
+
+        for rule in self.rules:
+            if rule.scope not in RULE_SCOPES:
+                raise ValueError(f"Règle {rule.name}: portée inconnue {rule.scope!r}")
+            if rule.scope == 'line' and (rule.bucket is None or rule.message is None):
+                raise ValueError(f"Règle {rule.name}: bucket et message requis en portée 'line'")
+
+            source = f"(?i:{rule.pattern})" if rule.ignore_case else f"(?:{rule.pattern})"
+            compiled = re.compile(source, re.MULTILINE)
+            if compiled.groupindex:
+                raise ValueError(f"Règle {rule.name}: groupes nommés non supportés")
+            if compiled.match(''):
+                raise ValueError(f"Règle {rule.name}: le motif accepte une chaîne vide")
+
+            self.compiled.append(compiled)
+            self.sources.append(source)
+            self.literals.append(self._literals(rule))
+
+        # Parseur de `re` indisponible: finditer règle par règle
+        self._per_rule = sre_parse is None
+        all_indices = list(range(len(self.rules)))
+        literal_indices = [i for i in all_indices if self.literals[i] is not None]
+        regex_indices = [i for i in all_indices if self.literals[i] is None]
+
+        # Repli exact (toutes les règles sur le contenu original) si lower() n'est pas sûr
+        self._exact_sweep = _Sweep(self, all_indices, folded=False) if all_indices else None
+        self._literal_sweep = _Sweep(self, literal_indices, folded=True) if literal_indices else None
+        self._regex_sweep = _Sweep(self, regex_indices, folded=False) if regex_indices else None
+
+    @staticmethod
+    def _literals(rule: ScanRule) -> Optional[List[str]]:
+        """Chaînes d'une règle recherchable sur le contenu en minuscules, None sinon"""
+        parsed = _parse(rule.pattern)
+        if parsed is None:
+            return None
+        try:
+            literals = _literal_strings(parsed)
+        except Exception:
+            return None
+        # lower() ne reproduit IGNORECASE que pour l'ASCII (ς/σ, µ/μ...)
+        if literals and rule.ignore_case and not all(literal.isascii() for literal in literals):
+            return None
+        return literals
+
+    @property
+    def signature(self) -> str:
+        """Empreinte stable des règles (invalidation des caches de résultats)"""
+        digest = hashlib.sha256()
+        for rule in self.rules:
+            digest.update(repr(rule).encode('utf-8'))
+        return digest.hexdigest()[:16]
+
+    def scan(self, content: str) -> ScanResult:
+        """Parcourt le contenu une fois pour toutes les règles"""
+        hits: Dict[str, List[re.Match]] = {rule.name: [] for rule in self.rules}
+        # Fin de la dernière correspondance retenue par règle (sémantique finditer)
+        last_end = [0] * len(self.rules)
+
+        if self._per_rule:
+            for rule, compiled in zip(self.rules, self.compiled):
+                hits[rule.name].extend(compiled.finditer(content))
+            return ScanResult(self, content, hits)
+
+        lowered = None
+        if self._literal_sweep is not None:
+            lowered = content.lower()
+            if len(lowered) != len(content) or any(c in content for c in _FOLD_UNSAFE_CHARS):
+                lowered = None
+
+        if lowered is not None:
+            self._literal_sweep.run(lowered, content, hits, last_end)
+            if self._regex_sweep is not None:
+                self._regex_sweep.run(content, content, hits, last_end)
+        elif self._exact_sweep is not None:
+            self._exact_sweep.run(content, content, hits, last_end)
+
+        return ScanResult(self, content, hits)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Tests de l'ordonnanceur d'agents (horloge simulée: une journée en millisecondes)
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from agent_scheduler import (AgentScheduler, CronTrigger, DependencyTrigger,
+                             IntervalTrigger, SimulatedClock)
+
+DAY = 24 * 3600
+
+
+def _run(scheduler, duration):
+    started = time.perf_counter()
+    asyncio.run(scheduler.run(duration=duration))
+    return time.perf_counter() - started
+
+
+def test_interval_day_simulated_quickly():
+    scheduler = AgentScheduler(clock=SimulatedClock())
+    calls = []
+
+    async def github_check():
+        calls.append(scheduler.clock.time())
+
+    scheduler.register('github', github_check, IntervalTrigger(15 * 60))
+    elapsed = _run(scheduler, DAY)
+    assert len(calls) == 95  # Fenêtre [0, DAY): la 96e échéance tombe à DAY
+    assert calls[:2] == [900.0, 1800.0]
+    assert elapsed < 2
+
+
+def _long_agent(scheduler, policy):
+    clock = scheduler.clock
+
+    async def slow():
+        await clock.sleep(40 * 60)
+
+    scheduler.register('slow', slow, IntervalTrigger(15 * 60), catch_up=policy)
+    _run(scheduler, 3 * 3600)
+    return scheduler.agents['slow']
+
+
+def test_catch_up_policies():
+    coalesce = _long_agent(AgentScheduler(clock=SimulatedClock()), 'coalesce')
+    skip = _long_agent(AgentScheduler(clock=SimulatedClock()), 'skip')
+    run_all = _long_agent(AgentScheduler(clock=SimulatedClock()), 'all')
+    assert run_all.runs >= coalesce.runs > skip.runs >= 1
+    assert len(run_all.pending) > 1  # Échéances manquées conservées, une exécution chacune
+    assert coalesce.skipped > 0 and skip.skipped > 0 and run_all.skipped == 0
+
+
+def test_timeout_dependency_and_concurrency():
+    clock = SimulatedClock()
+    scheduler = AgentScheduler(max_concurrency=1, clock=clock)
+    active, peak, order = [0], [0], []
+
+    def tracked(name, duration):
+        async def job():
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            try:
+                await clock.sleep(duration)
+                order.append(name)
+            finally:
+                active[0] -= 1
+        return job
+
+    scheduler.register('research', tracked('research', 60), IntervalTrigger(3600))
+    scheduler.register('critic', tracked('critic', 60), IntervalTrigger(3600))
+    scheduler.register('cross', tracked('cross', 1), DependencyTrigger(['research', 'critic']))
+    scheduler.register('stuck', tracked('stuck', 10 ** 6), IntervalTrigger(7200), timeout=30)
+    _run(scheduler, 3 * 3600 + 600)
+
+    assert peak[0] == 1
+    assert order.count('cross') == 3
+    assert order.index('cross') > order.index('critic')
+    assert scheduler.agents['stuck'].timeouts == 1
+    assert [r.status for r in scheduler.history if r.agent == 'stuck'] == ['timeout']
+
+
+def test_cron_next_occurrence():
+    trigger = CronTrigger.weekly('sunday', '02:00')
+    saturday = datetime(2025, 8, 16, 23, 59).timestamp()
+    assert datetime.fromtimestamp(trigger.next_after(saturday)) == datetime(2025, 8, 17, 2, 0)
+    assert datetime.fromtimestamp(CronTrigger('*/15 * * * *').next_after(
+        datetime(2025, 8, 16, 10, 7).timestamp())) == datetime(2025, 8, 16, 10, 15)
+
+
+def test_run_end_leaves_no_pending_tasks():
+    clock = SimulatedClock()
+    scheduler = AgentScheduler(clock=clock)
+
+    async def slow():
+        await clock.sleep(40 * 60)
+
+    scheduler.register('slow', slow, IntervalTrigger(60), catch_up='all')
+
+    async def main():
+        await scheduler.run(duration=3600)
+        return [t for t in asyncio.all_tasks()
+                if not t.done() and t.get_coro().__qualname__.startswith('AgentScheduler.')]
+
+    assert asyncio.run(main()) == []
+    assert not scheduler._tasks and scheduler.history[-1].status == 'cancelled'
+
+
+
+def test_agent_cancelled_while_queued_is_released():
+    clock = SimulatedClock()
+    scheduler = AgentScheduler(max_concurrency=1, clock=clock)
+
+    async def slow():
+        await clock.sleep(8)
+
+    async def quick():
+        pass
+
+    scheduler.register('slow', slow, IntervalTrigger(10, start_delay=0))
+    scheduler.register('quick', quick, IntervalTrigger(10, start_delay=0))
+    _run(scheduler, 5)  # Arrêt pendant que 'quick' attend le sémaphore
+    agent = scheduler.agents['quick']
+    assert not agent.running and agent.last_status == 'cancelled'
+
+    _run(scheduler, 50)
+    assert sum(r.agent == 'quick' and r.status == 'success' for r in scheduler.history) >= 3
+
+def test_timed_out_sync_agent_stays_busy_until_thread_returns():
+    scheduler = AgentScheduler()
+    release = threading.Event()
+    calls = []
+
+    def blocking():
+        calls.append(time.monotonic())
+        release.wait(2)
+
+    scheduler.register('blocking', blocking, IntervalTrigger(0.05), timeout=0.05, run_immediately=True)
+
+    async def main():
+        asyncio.get_running_loop().call_later(0.4, release.set)
+        await scheduler.run(duration=0.6)
+
+    asyncio.run(main())
+    agent = scheduler.agents['blocking']
+    assert agent.timeouts >= 1
+    assert len(calls) >= 2  # Pas de chevauchement: 2e appel après le retour du 1er thread
+    assert calls[1] - calls[0] >= 0.35
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests du cache d'empreintes utilisé par le scan incrémental de l'agent critique
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from file_fingerprint_cache import FileFingerprintCache
+
+
+def _count_lines(kind, path, content):
+    return {'issues': [f"{path}:{i}" for i, line in enumerate(content.split('\n'), 1) if 'TODO' in line]}
+
+
+def test_unchanged_files_served_from_cache(tmp_path):
+    files = []
+    for i in range(3):
+        path = tmp_path / f"f{i}.rs"
+        path.write_text("fn a() {}\n// TODO\n")
+        files.append(str(path))
+
+    cache_path = str(tmp_path / "cache.json")
+    first = FileFingerprintCache(cache_path)
+    results = first.scan('code', files, _count_lines)
+    first.save()
+    assert first.stats['analyzed'] == 3
+    assert results[0].findings['issues'] == [f"{files[0]}:2"]
+
+    second = FileFingerprintCache(cache_path)
+    cached = second.scan('code', files, _count_lines)
+    assert second.stats == {'hits': 3, 'rehashed': 0, 'analyzed': 0, 'errors': 0}
+    assert [r.findings for r in cached] == [r.findings for r in results]
+
+
+def test_modified_and_touched_files(tmp_path):
+    path = tmp_path / "a.rs"
+    path.write_text("// TODO\n")
+    cache = FileFingerprintCache(str(tmp_path / "cache.json"))
+    cache.scan('code', [str(path)], _count_lines)
+
+    # Même contenu, mtime différent: hash relu, pas de ré-analyse
+    os.utime(path, ns=(0, 0))
+    cache.scan('code', [str(path)], _count_lines)
+    assert cache.stats['rehashed'] == 1
+
+    path.write_text("ok\n// TODO\n")
+    result = cache.scan('code', [str(path)], _count_lines)[0]
+    assert cache.stats['analyzed'] == 2
+    assert result.findings['issues'] == [f"{path}:2"]
+
+
+def test_rules_change_invalidates_cache(tmp_path):
+    path = tmp_path / "a.rs"
+    path.write_text("// TODO\n")
+    cache_path = str(tmp_path / "cache.json")
+    cache = FileFingerprintCache(cache_path, rules_signature="1")
+    cache.scan('code', [str(path)], _count_lines)
+    cache.save()
+
+    bumped = FileFingerprintCache(cache_path, rules_signature="2")
+    bumped.scan('code', [str(path)], _count_lines)
+    assert bumped.stats['analyzed'] == 1
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests du registre de modules (copies identiques, quasi-copies, plan de sauvegarde)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from module_registry import ModuleRegistry, canonical_rank, line_chunks
+
+SCRIPT = "\n".join(f"def step_{i}(value):\n    return value * {i} + {i * 7}\n" for i in range(60))
+
+
+def _write(root, rel_path, content):
+    path = os.path.join(root, rel_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return path
+
+
+def test_canonical_copy_prefers_main_trees():
+    paths = ['OPERATIONS/backup/strategies/cloud_backup/agents/x.py',
+             'Copilotage/scripts/x.py', 'GOVERNANCE/Copilotage/scripts/x.py']
+    assert min(paths, key=canonical_rank) == 'GOVERNANCE/Copilotage/scripts/x.py'
+
+
+def test_line_chunks_are_stable_around_an_edit():
+    edited = SCRIPT.replace("return value * 30 + 210", "return value * 30 + 211")
+    original, changed = line_chunks(SCRIPT), line_chunks(edited)
+    assert len(set(original) - set(changed)) == 1
+
+
+def test_registry_dedupes_scans_and_plans_references(tmp_path):
+    root = str(tmp_path)
+    canonical = _write(root, 'GOVERNANCE/Copilotage/scripts/tool.py', SCRIPT)
+    backup_copy = _write(root, 'OPERATIONS/backup/strategies/cloud_backup/agents/tool.py', SCRIPT)
+    near_copy = _write(root, 'Copilotage/scripts/tool.py', SCRIPT + "\n\ndef extra():\n    return 0\n")
+    _write(root, 'Copilotage/scripts/empty_a.py', '')
+    _write(root, 'Copilotage/scripts/empty_b.py', '')
+
+    registry = ModuleRegistry(root)
+    assert registry.refresh()['hashed'] == 5
+    assert registry.duplicate_groups() == [['GOVERNANCE/Copilotage/scripts/tool.py',
+                                            'OPERATIONS/backup/strategies/cloud_backup/agents/tool.py']]
+    assert registry.canonical(backup_copy) == 'GOVERNANCE/Copilotage/scripts/tool.py'
+
+    # Scanner: la copie de sauvegarde est ignorée, l'ordre d'entrée est conservé
+    kept, copies = registry.dedupe([backup_copy, near_copy, canonical])
+    assert kept == [backup_copy, near_copy] and copies == {canonical: backup_copy}
+
+    plan = registry.backup_plan()
+    assert plan['references'] == {
+        'OPERATIONS/backup/strategies/cloud_backup/agents/tool.py': 'GOVERNANCE/Copilotage/scripts/tool.py'}
+    assert plan['bytes_referenced'] == len(SCRIPT)
+
+    near = registry.near_duplicates()
+    assert [(n.path, n.other) for n in near] == [('GOVERNANCE/Copilotage/scripts/tool.py',
+                                                  'Copilotage/scripts/tool.py')]
+    assert near[0].similarity > 0.8
+
+    # Registre rechargé: aucun fichier relu
+    assert ModuleRegistry(root).refresh()['hashed'] == 0
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests du moteur de règles en une passe (rule_scanner)
+"""
+
+import os
+import re
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from rule_scanner import RuleScanner, ScanRule
+
+RULES = [
+    ScanRule('long_line', r'^[^\n]{20,}', bucket='quality', message="{path}:{line} - longue ({length})"),
+    ScanRule('todo', r'TODO|FIXME', ignore_case=True, bucket='quality', message="{path}:{line} - {line_text}"),
+    ScanRule('example', r'example', ignore_case=True, scope='count'),
+    ScanRule('example_link', r'\[.*?\]\((.*?)\)', scope='match'),
+    ScanRule('fn', r'fn ', scope='count'),
+]
+
+CONTENT = (
+    "fn main() { // todo: rename\n"
+    "see [docs](http://example.com) and Example\n"
+    "short\n"
+    "fn helper() {} // FIXME fn \n"
+)
+
+
+@pytest.mark.parametrize("content", [CONTENT, CONTENT + "ſ"])
+def test_matches_equal_per_rule_finditer(content):
+    """Même résultat que finditer règle par règle, chemin rapide comme repli exact"""
+    result = RuleScanner(RULES).scan(content)
+    for rule in RULES:
+        flags = re.MULTILINE | (re.IGNORECASE if rule.ignore_case else 0)
+        expected = [m.span() for m in re.finditer(rule.pattern, content, flags)]
+        assert [m.span() for m in result.matches(rule.name)] == expected, rule.name
+
+
+def test_issues_one_per_rule_and_line_in_order():
+    issues = list(RuleScanner(RULES).scan(CONTENT).issues('main.rs'))
+    assert issues == [
+        ('quality', 'main.rs:1 - longue (27)'),
+        ('quality', 'main.rs:1 - fn main() { // todo: rename'),
+        ('quality', 'main.rs:2 - longue (42)'),
+        ('quality', 'main.rs:4 - longue (27)'),
+        ('quality', 'main.rs:4 - fn helper() {} // FIXME fn'),
+    ]
+
+
+def test_counts_and_groups():
+    result = RuleScanner(RULES).scan(CONTENT)
+    assert result.count('fn') == 3
+    assert result.count('example') == 2
+    assert [m.group(1) for m in result.matches('example_link')] == ['http://example.com']
+
+
+def test_invalid_rules_rejected():
+    with pytest.raises(ValueError):
+        RuleScanner([ScanRule('empty', r'x*', scope='count')])
+    with pytest.raises(ValueError):
+        RuleScanner([ScanRule('no_message', r'x', bucket='quality')])
+
+
+@pytest.mark.parametrize("pattern, text", [
+    ('i', 'İ'), ('İ', 'i'), ('ı', 'I'), ('i', 'ı'), ('k', 'K'), ('Σ', 'ς'), ('µ', 'μ'), ('[σ]x?', 'ς'),
+])
+def test_ignore_case_non_ascii_case_pairs(pattern, text):
+    rules = [ScanRule('folded', pattern, ignore_case=True, scope='count'),
+             ScanRule('plain', r'ab', scope='count'), ScanRule('regex', r'z+\d', scope='count')]
+    for content in (f"ab {text} cd", f"ab {text} cd ſ"):
+        expected = [m.span() for m in re.finditer(pattern, content, re.IGNORECASE | re.MULTILINE)]
+        assert expected
+        assert [m.span() for m in RuleScanner(rules).scan(content).matches('folded')] == expected
+
+
+def test_falls_back_to_per_rule_finditer_without_re_parser(monkeypatch):
+    import rule_scanner
+
+    monkeypatch.setattr(rule_scanner, 'sre_parse', None)
+    result = RuleScanner(RULES).scan(CONTENT)
+    for rule in RULES:
+        flags = re.MULTILINE | (re.IGNORECASE if rule.ignore_case else 0)
+        assert [m.span() for m in result.matches(rule.name)] == \
+            [m.span() for m in re.finditer(rule.pattern, CONTENT, flags)]
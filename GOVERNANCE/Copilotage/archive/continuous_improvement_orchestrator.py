@@ -29,9 +29,22 @@ from github_workflow_monitor import GitHubWorkflowMonitor
 from typing import Dict, List, Optional
 import os
 from pathlib import Path
-import schedule
 import threading
 
+# Ordonnanceur événementiel des agents (remplace la scrutation `schedule`)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'agents'))
+from agent_scheduler import AgentScheduler, CronTrigger, DependencyTrigger, IntervalTrigger
+
+
+def _fail_on_false(function):
+    """Agent signalant l'échec par `False`: lève pour que l'ordonnanceur
+    enregistre une erreur (et ne déclenche pas les agents dépendants)"""
+    def run():
+        if function() is False:
+            raise RuntimeError(f"{function.__name__} a échoué")
+    run.__name__ = function.__name__
+    return run
+
 class ContinuousImprovementOrchestrator:
     """Orchestrateur principal amélioration continue"""
     
@@ -67,25 +80,48 @@ class ContinuousImprovementOrchestrator:
         """Configure planning automatique des agents"""
         print("📅 Configuration planning automatique...")
         
+        self.scheduler = AgentScheduler(max_concurrency=2)
+        
         # Agent recherche théorique - hebdomadaire
-        schedule.every().sunday.at(self.schedule_config['research_time']).do(
-            self._execute_research_agent
+        self.scheduler.register(
+            'theoretical_research', _fail_on_false(self._execute_research_agent),
+            CronTrigger.weekly(self.schedule_config['research_day'], self.schedule_config['research_time']),
+            timeout=2 * 3600
         )
         
         # Agent critique - quotidien
-        schedule.every().day.at(self.schedule_config['criticism_time']).do(
-            self._execute_critic_agent
+        self.scheduler.register(
+            'adversarial_critic', _fail_on_false(self._execute_critic_agent),
+            CronTrigger.daily(self.schedule_config['criticism_time']),
+            timeout=2 * 3600
+        )
+        
+        # Analyse croisée dès qu'un des deux agents a produit un nouveau rapport
+        self.scheduler.register(
+            'cross_analysis', self._cross_analysis_research_criticism,
+            DependencyTrigger(['theoretical_research', 'adversarial_critic'], mode='any')
         )
         
         # Rapport quotidien
-        schedule.every().day.at(self.schedule_config['report_time']).do(
-            self._generate_daily_report
+        self.scheduler.register(
+            'daily_report', self._generate_daily_report,
+            CronTrigger.daily(self.schedule_config['report_time'])
+        )
+        
+        # Surveillance GitHub toutes les 15 minutes (tick manqué rattrapé, pas perdu)
+        self.scheduler.register(
+            'github_monitor', self._monitor_github_workflows,
+            IntervalTrigger(15 * 60), jitter=30, catch_up='coalesce', timeout=300
         )
         
+        # Santé agents
+        self.scheduler.register('agents_health', self._check_agents_health, IntervalTrigger(60))
+        
         print("✅ Planning configuré:")
         print(f"  📚 Recherche théorique: {self.schedule_config['research_day']} {self.schedule_config['research_time']}")
         print(f"  🔥 Critique adverse: quotidien {self.schedule_config['criticism_time']}")
         print(f"  📊 Rapport: quotidien {self.schedule_config['report_time']}")
+        print("  🏥 GitHub: toutes les 15 minutes")
         
     def _execute_initial_cycle(self):
         """Exécute le cycle initial complet d'amélioration"""
@@ -647,26 +683,23 @@ class ContinuousImprovementOrchestrator:
         print("\n" + "="*60)
         
     def _continuous_monitoring(self):
-        """Monitoring continu du système avec surveillance GitHub"""
-        while self.is_running:
-            try:
-                # Vérification agents
-                self._check_agents_health()
-                
-                # Surveillance GitHub workflows (toutes les 15 minutes)
-                if datetime.now().minute % 15 == 0:
-                    self._monitor_github_workflows()
-                
-                # Exécution tâches programmées
-                schedule.run_pending()
-                
-                # Pause
-                time.sleep(60)  # Vérification chaque minute
-                
-            except Exception as e:
-                print(f"⚠️ Erreur monitoring: {e}")
-                self._log_orchestrator_event('monitoring_error', 'ERROR', f'Erreur: {e}')
-                time.sleep(300)  # Pause plus longue en cas d'erreur
+        """Monitoring continu du système avec surveillance GitHub.
+
+        L'ordonnanceur dort jusqu'à la prochaine échéance (aucune scrutation);
+        les erreurs d'un agent sont tracées sans interrompre le planning.
+        """
+        self.scheduler.on_run = self._on_scheduled_run
+        try:
+            asyncio.run(self.scheduler.run())
+        except Exception as e:
+            print(f"⚠️ Erreur monitoring: {e}")
+            self._log_orchestrator_event('monitoring_error', 'ERROR', f'Erreur: {e}')
+    
+    def _on_scheduled_run(self, record):
+        """Trace chaque exécution planifiée en échec ou hors délai"""
+        if record.status in ('error', 'timeout'):
+            self._log_orchestrator_event(f'{record.agent}_{record.status}', 'ERROR',
+                                         f'{record.agent}: {record.error}')
                 
     def _check_agents_health(self):
         """Vérifie santé des agents"""
@@ -702,6 +735,8 @@ class ContinuousImprovementOrchestrator:
         print("\n🛑 ARRÊT ORCHESTRATEUR AMÉLIORATION CONTINUE")
         
         self.is_running = False
+        if getattr(self, 'scheduler', None):
+            self.scheduler.stop()
         
         # Rapport final
         final_report = {
@@ -40,6 +40,10 @@ import pickle
 from pathlib import Path
 import shutil
 import mimetypes
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from study_pack_builder import MANIFEST_NAME, changed_since, load_manifest
 
 # Google Drive API
 from google.auth.transport.requests import Request
@@ -246,30 +250,51 @@ class AutonomousGoogleDriveManager:
             print("❌ Dossier cible non trouvé")
             return False
             
-        # Upload récursif
+        # Manifeste du générateur: seuls les fichiers modifiés depuis le dernier upload
+        manifest = load_manifest(os.path.join(study_pack_path, MANIFEST_NAME))
+        synced_path = os.path.join(self.credentials_path, "study_pack_synced.json")
+        synced = {}
+        if manifest['artifacts']:
+            try:
+                with open(synced_path, 'r') as f:
+                    synced = json.load(f)
+            except (FileNotFoundError, ValueError):
+                synced = {}
+            relative_paths = changed_since(manifest, synced)
+            print(f"🧾 Manifeste: {len(relative_paths)}/{len(manifest['artifacts'])} fichiers modifiés")
+        else:
+            # Pas de manifeste (ancien package): upload récursif complet
+            relative_paths = [
+                os.path.relpath(os.path.join(root, file), study_pack_path)
+                for root, dirs, files in os.walk(study_pack_path)
+                for file in files
+            ]
+            
         success_count = 0
-        total_count = 0
+        total_count = len(relative_paths)
         
-        for root, dirs, files in os.walk(study_pack_path):
-            for file in files:
-                file_path = os.path.join(root, file)
-                relative_path = os.path.relpath(file_path, study_pack_path)
-                
-                total_count += 1
+        for relative_path in relative_paths:
+            file_path = os.path.join(study_pack_path, relative_path)
+            
+            # Créer sous-dossiers si nécessaire
+            dir_structure = os.path.dirname(relative_path)
+            if dir_structure:
+                current_folder_id = self._ensure_folder_path(dir_structure, target_folder_id)
+            else:
+                current_folder_id = target_folder_id
                 
-                # Créer sous-dossiers si nécessaire
-                dir_structure = os.path.dirname(relative_path)
-                if dir_structure:
-                    current_folder_id = self._ensure_folder_path(dir_structure, target_folder_id)
-                else:
-                    current_folder_id = target_folder_id
-                    
-                # Upload fichier
-                if self._upload_file(file_path, file, current_folder_id):
-                    success_count += 1
+            # Upload fichier
+            if self._upload_file(file_path, os.path.basename(relative_path), current_folder_id):
+                success_count += 1
+                if relative_path in manifest['artifacts']:
+                    synced[relative_path] = manifest['artifacts'][relative_path]['sha256']
                     
+        if manifest['artifacts']:
+            with open(synced_path, 'w') as f:
+                json.dump(synced, f, indent=2)
+                
         print(f"📊 Upload terminé: {success_count}/{total_count} fichiers")
-        return success_count > 0
+        return success_count == total_count if manifest['artifacts'] else success_count > 0
         
     def _ensure_folder_path(self, path: str, parent_id: str) -> str:
         """Assure existence chemin dossiers"""
@@ -9,10 +9,11 @@ Génère bibliographie complète pour rattrapage théorique avec:
 3. Intégration orchestrateur amélioration continue
 4. Export PDF optimisé reMarkable
 
-Usage: python3 generate_remarkable_bibliography.py [--github-alerts]
+Usage: python3 generate_remarkable_bibliography.py [--github-alerts] [--force]
 """
 
 import os
+import sys
 import json
 import time
 import subprocess
@@ -20,6 +21,13 @@ from datetime import datetime
 from typing import Dict, List, Optional
 from pathlib import Path
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from study_pack_builder import Artifact, ArtifactBuildGraph
+
+# Horodatage et id de session des rendus: ignorés pour décider si un artefact a changé
+VOLATILE_PARTS = [r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}', r'remarkable_\d{8}_\d{6}']
+
+
 class RemarkableBibliographyGenerator:
     """Générateur bibliographie pour reMarkable avec surveillance GitHub"""
     
@@ -79,32 +87,93 @@ class RemarkableBibliographyGenerator:
             }
         }
         
-    def generate_study_package(self, monitor_github=False):
-        """Génère package d'étude complet pour reMarkable"""
+    def generate_study_package(self, monitor_github=False, force=False):
+        """Génère package d'étude complet pour reMarkable (artefacts inchangés sautés)"""
         print(f"📚 GÉNÉRATION PACKAGE ÉTUDE REMARKABLE - {self.session_id}")
         print("=" * 70)
         
         # Setup
         self._setup_directories()
         
-        # 1. Surveillance GitHub si demandée
-        if monitor_github:
-            self._monitor_github_workflows()
-            
-        # 2. Publications en préparation
-        self._prepare_publications_for_review()
-        
-        # 3. Guide de lecture structuré
-        self._create_reading_roadmap()
+        # Graphe: publications, guide de lecture, templates, README (+ GitHub)
+        graph = self._build_graph(monitor_github)
+        report = graph.build(force=force)
         
-        # 4. Template annotations reMarkable
-        self._create_annotation_templates()
-        
-        # 5. Package Google Drive
-        self._package_for_gdrive()
+        for path in report.built:
+            print(f"  ✅ {path}")
+        for path in report.unchanged:
+            print(f"  ♻️ {path} (contenu identique)")
+        for path, error in report.failed.items():
+            print(f"  ❌ {path}: {error}")
+        print(f"  ⏭️ {len(report.skipped)} artefact(s) à jour sautés")
+        print(f"  🧾 Manifeste: {report.manifest_path} ({report.duration:.2f}s)")
         
         print(f"\n✅ PACKAGE ÉTUDE GÉNÉRÉ POUR REMARKABLE")
         print(f"📁 Répertoire: {self.output_dir}")
+        print(f"📤 Instructions upload Google Drive dans README.md")
+        
+        # Instructions finales
+        self._print_final_instructions()
+        return report
+        
+    def _build_graph(self, monitor_github=False):
+        """Déclare chaque artefact du package avec ses sources"""
+        graph = ArtifactBuildGraph(self.output_dir)
+        # Le générateur lui-même est une source: modifier un gabarit reconstruit
+        generator_source = os.path.abspath(__file__)
+        
+        graph.add(Artifact(
+            path='publications_review/publications_revision_complete.md',
+            render=self._render_publications_review,
+            sources=[generator_source] + self._publication_paths(),
+            params=self.study_config['current_publications'],
+            volatile=VOLATILE_PARTS
+        ))
+        
+        key_files = ['README.md', 'EXTERNALISATION-CAMPING-STRATEGY.md']
+        for filename in key_files:
+            base_name = filename.replace('.md', '')
+            graph.add(Artifact(
+                path=f'publications_review/{base_name}_revision_complete.md',
+                render=lambda filename=filename: self._render_individual_review(filename),
+                sources=[generator_source, os.path.join(self.base_path, filename)],
+                volatile=VOLATILE_PARTS
+            ))
+        
+        graph.add(Artifact(
+            path='reading_guides/roadmap_lecture_personnalise.md',
+            render=self._render_reading_roadmap,
+            sources=[generator_source],
+            params=self.study_config['priority_readings'],
+            volatile=VOLATILE_PARTS
+        ))
+        graph.add(Artifact(
+            path='annotation_templates/template_general.md',
+            render=self._render_template_general,
+            sources=[generator_source],
+            volatile=VOLATILE_PARTS
+        ))
+        graph.add(Artifact(
+            path='annotation_templates/template_validation.md',
+            render=self._render_template_validation,
+            sources=[generator_source],
+            volatile=VOLATILE_PARTS
+        ))
+        graph.add(Artifact(
+            path='README.md',
+            render=self._render_readme,
+            sources=[generator_source],
+            volatile=VOLATILE_PARTS
+        ))
+        
+        if monitor_github:
+            # État des workflows: volatil, toujours régénéré
+            graph.add(Artifact(
+                path='github_monitoring/workflow_status.md',
+                render=self._render_github_report,
+                always=True
+            ))
+        return graph
         
     def _setup_directories(self):
         """Configure répertoires"""
@@ -120,10 +189,8 @@ class RemarkableBibliographyGenerator:
         for subdir in subdirs:
             os.makedirs(os.path.join(self.output_dir, subdir), exist_ok=True)
             
-    def _monitor_github_workflows(self):
+    def _render_github_report(self):
         """Surveille alertes GitHub Workflow"""
-        print("🔍 Surveillance GitHub Workflows...")
-        
         try:
             # Tentative récupération status workflows
             result = subprocess.run(
@@ -198,20 +265,20 @@ gh workflow list
 - Surveillance via API REST GitHub
 """
                 
-            # Sauvegarde rapport GitHub
-            github_path = os.path.join(self.output_dir, 'github_monitoring', 'workflow_status.md')
-            with open(github_path, 'w', encoding='utf-8') as f:
-                f.write(github_report)
-                
-            print(f"  ✅ Rapport GitHub: {github_path}")
+            return github_report
             
         except Exception as e:
             print(f"  ⚠️ Erreur surveillance GitHub: {e}")
+            return None
             
-    def _prepare_publications_for_review(self):
-        """Prépare publications pour révision sur tablette"""
-        print("📝 Préparation publications pour révision...")
+    def _publication_paths(self):
+        """Fichiers sources compilés dans la révision générale"""
+        return [os.path.join(self.base_path, file_pattern)
+                for files in self.study_config['current_publications'].values()
+                for file_pattern in files]
         
+    def _render_publications_review(self):
+        """Prépare publications pour révision sur tablette"""
         # Compilation toutes publications
         review_content = f"""# 📝 PUBLICATIONS EN RÉVISION
 ## Package reMarkable pour commentaires et améliorations
@@ -393,32 +460,20 @@ Domaines à approfondir:
 *Utilisez cet espace pour vos annotations reMarkable. Photos/export pour feedback IA facilité.*
 """
         
-        # Sauvegarde
-        review_path = os.path.join(self.output_dir, 'publications_review', 'publications_revision_complete.md')
-        with open(review_path, 'w', encoding='utf-8') as f:
-            f.write(review_content)
-            
-        print(f"  ✅ Publications compilées: {review_path}")
-        
-        # Création versions individuelles
-        self._create_individual_review_files()
-        
-    def _create_individual_review_files(self):
-        """Crée fichiers révision individuels"""
-        print("  📄 Création fichiers révision individuels...")
+        return review_content
         
-        key_files = ['README.md', 'EXTERNALISATION-CAMPING-STRATEGY.md']
+    def _render_individual_review(self, filename):
+        """Version enrichie d'un fichier pour révision (None si source absente)"""
+        filepath = os.path.join(self.base_path, filename)
         
-        for filename in key_files:
-            filepath = os.path.join(self.base_path, filename)
+        if not os.path.exists(filepath):
+            return None
             
-            if os.path.exists(filepath):
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        original_content = f.read()
-                        
-                    # Version enrichie pour révision
-                    enhanced_content = f"""# 📝 RÉVISION INDIVIDUELLE: {filename}
+        with open(filepath, 'r', encoding='utf-8') as f:
+            original_content = f.read()
+            
+        # Version enrichie pour révision
+        return f"""# 📝 RÉVISION INDIVIDUELLE: {filename}
 ## Optimisé pour annotations reMarkable
 
 *Document original enrichi pour révision sur tablette*  
@@ -577,26 +632,8 @@ Score global: ___/50
 *Export annotations → Drive pour feedback IA automatisé*
 """
                     
-                    # Sauvegarde version enrichie
-                    base_name = filename.replace('.md', '')
-                    enhanced_path = os.path.join(
-                        self.output_dir, 
-                        'publications_review', 
-                        f'{base_name}_revision_complete.md'
-                    )
-                    
-                    with open(enhanced_path, 'w', encoding='utf-8') as f:
-                        f.write(enhanced_content)
-                        
-                    print(f"    ✅ {filename} → Version révision")
-                    
-                except Exception as e:
-                    print(f"    ❌ Erreur {filename}: {e}")
-                    
-    def _create_reading_roadmap(self):
+    def _render_reading_roadmap(self):
         """Crée roadmap de lecture structurée"""
-        print("📖 Création roadmap de lecture...")
-        
         roadmap_content = f"""# 📖 ROADMAP LECTURE SCIENTIFIQUE
 ## Rattrapage théorique optimisé pour vos 30 ans d'expérience
 
@@ -789,18 +826,10 @@ Score global: ___/50
 *Objectif: Transformer vos 30 ans d'expérience + formation linguistique en expertise scientifique validée. Le gap rattrapage = votre avantage concurrentiel unique.*
 """
         
-        # Sauvegarde roadmap
-        roadmap_path = os.path.join(self.output_dir, 'reading_guides', 'roadmap_lecture_personnalise.md')
-        with open(roadmap_path, 'w', encoding='utf-8') as f:
-            f.write(roadmap_content)
-            
-        print(f"  ✅ Roadmap créée: {roadmap_path}")
-        
-    def _create_annotation_templates(self):
-        """Crée templates d'annotations pour reMarkable"""
-        print("📝 Création templates annotations...")
+        return roadmap_content
         
-        # Template général
+    def _render_template_general(self):
+        """Template général d'annotations reMarkable"""
         general_template = """# 📝 TEMPLATE ANNOTATIONS REMARABLE
 ## Modèles standardisés pour annotations efficaces
 
@@ -925,6 +954,10 @@ Applicabilité: ___/5
 """
         
         # Template spécialisé validation théorique
+        return general_template
+        
+    def _render_template_validation(self):
+        """Template de validation théorique"""
         validation_template = """# 🔬 TEMPLATE VALIDATION THÉORIQUE
 ## Pour validation rigoureuse hypothèses PaniniFS
 
@@ -1001,21 +1034,10 @@ Consensus académique: ___/10
 ```
 """
         
-        # Sauvegarde templates
-        templates_dir = os.path.join(self.output_dir, 'annotation_templates')
-        
-        with open(os.path.join(templates_dir, 'template_general.md'), 'w', encoding='utf-8') as f:
-            f.write(general_template)
-            
-        with open(os.path.join(templates_dir, 'template_validation.md'), 'w', encoding='utf-8') as f:
-            f.write(validation_template)
-            
-        print(f"  ✅ Templates créés dans: {templates_dir}")
-        
-    def _package_for_gdrive(self):
-        """Package final pour Google Drive"""
-        print("📦 Packaging pour Google Drive...")
+        return validation_template
         
+    def _render_readme(self):
+        """README principal du package Google Drive"""
         # README principal
         readme_content = f"""# 📚 PACKAGE ÉTUDE REMARKABLE
 ## Dossier rattrapage théorique + révision publications
@@ -1143,15 +1165,7 @@ Consensus académique: ___/10
 **Bon rattrapage scientifique !** 🚀
 """
         
-        # Sauvegarde README principal
-        with open(os.path.join(self.output_dir, 'README.md'), 'w', encoding='utf-8') as f:
-            f.write(readme_content)
-            
-        print(f"✅ Package complet prêt: {self.output_dir}")
-        print(f"📤 Instructions upload Google Drive dans README.md")
-        
-        # Instructions finales
-        self._print_final_instructions()
+        return readme_content
         
     def _print_final_instructions(self):
         """Affiche instructions finales"""
@@ -1188,9 +1202,8 @@ Consensus académique: ___/10
 
 def main():
     """Fonction principale"""
-    import sys
-    
     monitor_github = '--github-alerts' in sys.argv
+    force = '--force' in sys.argv
     
     print("📚 GÉNÉRATEUR BIBLIOGRAPHIE REMARKABLE")
     print("Objectif: Rattrapage théorique + révision publications")
@@ -1200,7 +1213,7 @@ def main():
     print("=" * 60)
     
     generator = RemarkableBibliographyGenerator()
-    generator.generate_study_package(monitor_github=monitor_github)
+    generator.generate_study_package(monitor_github=monitor_github, force=force)
 
 if __name__ == "__main__":
     main()
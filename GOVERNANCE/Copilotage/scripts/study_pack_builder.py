@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+🏗️ GRAPHE DE CONSTRUCTION DU PACKAGE D'ÉTUDE
+============================================
+
+Chaque fichier généré (artefact) déclare ses sources et ses paramètres:
+- clé d'entrée = SHA-256 (contenu des sources + paramètres + empreintes des
+  artefacts dont il dépend); inchangée depuis le dernier manifeste et sortie
+  intacte sur disque => artefact sauté sans rendu
+- artefacts indépendants rendus en parallèle, vague par vague (dépendances)
+- écriture atomique, uniquement si le contenu a changé; les parties
+  volatiles déclarées (horodatage « Généré le », id de session) sont
+  masquées avant la comparaison: un rendu qui ne diffère que par elles
+  laisse le fichier existant intact
+- manifeste JSON des empreintes de sortie: la synchronisation en aval
+  (upload Drive) ne pousse que les fichiers dont l'empreinte a changé
+
+Les empreintes de sources sont mises en cache par (taille, mtime): une source
+non modifiée n'est pas relue.
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+MANIFEST_NAME = 'study_pack_manifest.json'
+MISSING = 'missing'
+
+
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class Artifact:
+    """Fichier généré: chemin relatif au package, sources, rendu"""
+    path: str
+    render: Callable[[], Optional[str]]  # None => pas de sortie (ex. source absente)
+    sources: List[str] = field(default_factory=list)
+    params: Any = None  # Configuration influençant le rendu (JSON-sérialisable)
+    deps: List[str] = field(default_factory=list)  # Chemins d'autres artefacts
+    always: bool = False  # Contenu volatil (ex. état GitHub): toujours reconstruit
+    volatile: List[str] = field(default_factory=list)  # Regex ignorées à la comparaison
+
+
+def content_sha256(content: str, volatile: List[str] = ()) -> str:
+    """Empreinte du contenu, parties volatiles masquées"""
+    for pattern in volatile:
+        content = re.sub(pattern, '<volatile>', content)
+    return sha256_bytes(content.encode('utf-8'))
+
+
+@dataclass
+class BuildReport:
+    built: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)  # Reconstruits, contenu identique
+    skipped: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    manifest_path: str = ''
+    duration: float = 0.0
+
+
+def load_manifest(path: str) -> Dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') == 1:
+            return manifest
+    except (FileNotFoundError, ValueError):
+        pass
+    return {'version': 1, 'artifacts': {}, 'sources': {}}
+
+
+def changed_since(manifest: Dict, synced: Dict[str, str]) -> List[str]:
+    """Artefacts dont l'empreinte diffère de l'état synchronisé {chemin: sha256}"""
+    return sorted(path for path, entry in manifest.get('artifacts', {}).items()
+                  if entry.get('sha256') and synced.get(path) != entry['sha256'])
+
+
+def _write_atomic(path: str, content: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+class ArtifactBuildGraph:
+    """Construction incrémentale et parallèle d'artefacts dans `output_dir`"""
+
+    def __init__(self, output_dir: str, manifest_name: str = MANIFEST_NAME,
+                 max_workers: Optional[int] = None):
+        self.output_dir = output_dir
+        self.manifest_path = os.path.join(output_dir, manifest_name)
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 1) + 2)
+        self.artifacts: Dict[str, Artifact] = {}
+
+    def add(self, artifact: Artifact) -> Artifact:
+        if artifact.path in self.artifacts:
+            raise ValueError(f"Artefact déclaré deux fois: {artifact.path}")
+        self.artifacts[artifact.path] = artifact
+        return artifact
+
+    def _waves(self) -> List[List[Artifact]]:
+        """Vagues topologiques: chaque vague ne dépend que des précédentes"""
+        remaining = dict(self.artifacts)
+        done: set = set()
+        waves = []
+        while remaining:
+            wave = [a for a in remaining.values()
+                    if all(d in done or d not in self.artifacts for d in a.deps)]
+            if not wave:
+                raise ValueError(f"Dépendances cycliques: {sorted(remaining)}")
+            waves.append(wave)
+            for artifact in wave:
+                done.add(artifact.path)
+                del remaining[artifact.path]
+        return waves
+
+    def _source_digest(self, path: str, cache: Dict[str, Dict]) -> str:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            cache.pop(path, None)
+            return MISSING
+        entry = cache.get(path)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry['sha256']
+        digest = file_sha256(path)
+        cache[path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest}
+        return digest
+
+    def _input_hash(self, artifact: Artifact, source_cache: Dict[str, Dict],
+                    output_hashes: Dict[str, Optional[str]]) -> str:
+        key = {
+            'path': artifact.path,
+            'params': artifact.params,
+            'sources': {s: self._source_digest(s, source_cache) for s in sorted(artifact.sources)},
+            'deps': {d: output_hashes.get(d) for d in sorted(artifact.deps)}
+        }
+        return sha256_bytes(json.dumps(key, sort_keys=True, default=str).encode('utf-8'))
+
+    def _output_intact(self, entry: Dict, path: str) -> bool:
+        if entry.get('sha256') is None:
+            return not os.path.exists(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        if stat.st_size != entry.get('size') or stat.st_mtime_ns != entry.get('mtime_ns'):
+            return file_sha256(path) == entry['sha256']  # Touché mais peut-être identique
+        return True
+
+    def build(self, force: bool = False) -> BuildReport:
+        start = time.time()
+        report = BuildReport(manifest_path=self.manifest_path)
+        previous = load_manifest(self.manifest_path)
+        source_cache: Dict[str, Dict] = dict(previous.get('sources', {}))
+        old_entries: Dict[str, Dict] = previous.get('artifacts', {})
+        entries: Dict[str, Dict] = {}
+        output_hashes: Dict[str, Optional[str]] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for wave in self._waves():
+                to_render = []
+                for artifact in wave:
+                    input_hash = self._input_hash(artifact, source_cache, output_hashes)
+                    old = old_entries.get(artifact.path)
+                    target = os.path.join(self.output_dir, artifact.path)
+                    if (not force and not artifact.always and old
+                            and old.get('input_hash') == input_hash and self._output_intact(old, target)):
+                        entries[artifact.path] = old
+                        output_hashes[artifact.path] = old.get('sha256')
+                        report.skipped.append(artifact.path)
+                    else:
+                        to_render.append((artifact, input_hash, pool.submit(artifact.render)))
+
+                for artifact, input_hash, future in to_render:
+                    try:
+                        entry = self._store(artifact, future.result(), input_hash, old_entries.get(artifact.path))
+                    except Exception as e:
+                        report.failed[artifact.path] = str(e)
+                        output_hashes[artifact.path] = None
+                        continue
+                    entries[artifact.path] = entry
+                    output_hashes[artifact.path] = entry['sha256']
+                    old = old_entries.get(artifact.path)
+                    if old and old.get('sha256') == entry['sha256']:
+                        report.unchanged.append(artifact.path)
+                    else:
+                        report.built.append(artifact.path)
+
+        # Artefacts en échec: l'ancienne entrée reste valable pour la synchronisation
+        for path in report.failed:
+            if path in old_entries:
+                entries[path] = {**old_entries[path], 'input_hash': None}
+
+        used_sources = {s for a in self.artifacts.values() for s in a.sources}
+        manifest = {
+            'version': 1,
+            'generated_at': datetime.now().isoformat(),
+            'artifacts': dict(sorted(entries.items())),
+            'sources': {s: e for s, e in sorted(source_cache.items()) if s in used_sources}
+        }
+        _write_atomic(self.manifest_path,
+                      json.dumps(manifest, indent=2, ensure_ascii=False).encode('utf-8'))
+        report.duration = time.time() - start
+        return report
+
+    def _store(self, artifact: Artifact, content: Optional[str], input_hash: str,
+               old: Optional[Dict]) -> Dict:
+        target = os.path.join(self.output_dir, artifact.path)
+        entry = {'input_hash': input_hash, 'sources': sorted(artifact.sources),
+                 'built_at': datetime.now().isoformat()}
+        if content is None:
+            if old and old.get('sha256') and os.path.exists(target):
+                os.remove(target)  # Sortie périmée (source disparue)
+            return {**entry, 'sha256': None, 'size': 0, 'mtime_ns': None}
+
+        content_hash = content_sha256(content, artifact.volatile)
+        if (old and old.get('sha256') and old.get('content_sha256') == content_hash
+                and self._output_intact(old, target)):
+            # Seules les parties volatiles diffèrent: fichier et empreinte conservés
+            return {**entry, 'content_sha256': content_hash, 'sha256': old['sha256'],
+                    'size': old['size'], 'mtime_ns': old['mtime_ns']}
+
+        data = content.encode('utf-8')
+        digest = sha256_bytes(data)
+        if not (old and old.get('sha256') == digest and self._output_intact(old, target)):
+            _write_atomic(target, data)
+        stat = os.stat(target)
+        return {**entry, 'content_sha256': content_hash, 'sha256': digest,
+                'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
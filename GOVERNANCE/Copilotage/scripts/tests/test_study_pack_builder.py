@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests du graphe de construction incrémental du package d'étude
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from study_pack_builder import Artifact, ArtifactBuildGraph, changed_since, load_manifest
+
+
+def _graph(out_dir, source, calls):
+    def render(name):
+        def _render():
+            calls.append(name)
+            with open(source, encoding='utf-8') as f:
+                return f"{name}:{f.read()}"
+        return _render
+
+    graph = ArtifactBuildGraph(str(out_dir))
+    graph.add(Artifact('a.md', render('a'), sources=[str(source)]))
+    graph.add(Artifact('static/b.md', lambda: calls.append('b') or 'constant'))
+    graph.add(Artifact('c.md', render('c'), deps=['a.md']))
+    return graph
+
+
+def test_unchanged_artifacts_are_skipped(tmp_path):
+    source = tmp_path / 'source.md'
+    source.write_text('v1', encoding='utf-8')
+    out_dir = tmp_path / 'pack'
+    calls = []
+
+    first = _graph(out_dir, source, calls).build()
+    assert sorted(first.built) == ['a.md', 'c.md', 'static/b.md']
+    assert (out_dir / 'a.md').read_text(encoding='utf-8') == 'a:v1'
+
+    calls.clear()
+    second = _graph(out_dir, source, calls).build()
+    assert calls == [] and sorted(second.skipped) == ['a.md', 'c.md', 'static/b.md']
+
+    # Source modifiée: l'artefact et son dépendant sont reconstruits, pas le reste
+    source.write_text('v2', encoding='utf-8')
+    third = _graph(out_dir, source, calls).build()
+    assert sorted(calls) == ['a', 'c'] and third.skipped == ['static/b.md']
+
+    # Sortie supprimée sur disque: reconstruite
+    calls.clear()
+    os.remove(out_dir / 'static' / 'b.md')
+    fourth = _graph(out_dir, source, calls).build()
+    assert calls == ['b'] and fourth.unchanged == ['static/b.md']
+
+
+def test_manifest_drives_incremental_sync(tmp_path):
+    source = tmp_path / 'source.md'
+    source.write_text('v1', encoding='utf-8')
+    out_dir = tmp_path / 'pack'
+    report = _graph(out_dir, source, []).build()
+
+    manifest = load_manifest(report.manifest_path)
+    synced = {path: entry['sha256'] for path, entry in manifest['artifacts'].items()}
+    assert changed_since(manifest, {}) == ['a.md', 'c.md', 'static/b.md']
+    assert changed_since(manifest, synced) == []
+
+    source.write_text('v2', encoding='utf-8')
+    _graph(out_dir, source, []).build()
+    assert changed_since(load_manifest(report.manifest_path), synced) == ['a.md', 'c.md']
+
+
+def test_generator_second_run_skips_everything(tmp_path):
+    from generate_remarkable_bibliography import RemarkableBibliographyGenerator
+
+    (tmp_path / 'README.md').write_text('# PaniniFS', encoding='utf-8')
+    generator = RemarkableBibliographyGenerator()
+    generator.base_path = str(tmp_path)
+    generator.output_dir = str(tmp_path / 'remarkable_study_pack')
+
+    first = generator.generate_study_package()
+    assert 'publications_review/README_revision_complete.md' in first.built
+    assert not os.path.exists(os.path.join(
+        generator.output_dir, 'publications_review', 'EXTERNALISATION-CAMPING-STRATEGY_revision_complete.md'))
+
+    second = generator.generate_study_package()
+    assert second.built == [] and len(second.skipped) == len(first.built) + len(first.unchanged)
+
+
+def test_timestamp_only_changes_keep_output(tmp_path):
+    from generate_remarkable_bibliography import RemarkableBibliographyGenerator
+
+    (tmp_path / 'README.md').write_text('# PaniniFS', encoding='utf-8')
+    generator = RemarkableBibliographyGenerator()
+    generator.base_path = str(tmp_path)
+    generator.output_dir = str(tmp_path / 'remarkable_study_pack')
+    first = generator.generate_study_package()
+    readme = os.path.join(generator.output_dir, 'README.md')
+    before = os.stat(readme).st_mtime_ns
+
+    # Nouvelle session, horodatages différents: rien n'est réécrit
+    generator.session_id = 'remarkable_20990101_000000'
+    forced = generator.generate_study_package(force=True)
+    assert forced.built == [] and sorted(forced.unchanged) == sorted(first.built)
+    assert os.stat(readme).st_mtime_ns == before
@@ -4,6 +4,7 @@ Advanced Consensus Engine : Algorithmes consensus sophistiqués
 Features: Temporal weighting, Authority scoring, Conflict resolution, Cross-validation
 """
 
+import argparse
 import json
 import datetime
 from collections import defaultdict, Counter
@@ -15,6 +16,8 @@ from dataclasses import dataclass, asdict
 
 # Import structures communes
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from stream_sketches import ConceptSketches, ExactSum, store_sketches
+from sharded_consensus import ShardedRun, StoreSpec, concept_key
 
 @dataclass
 class AuthorityProfile:
@@ -50,19 +53,20 @@ class AdvancedConsensusEngine:
         self.all_atoms = []
         self.concept_index = defaultdict(list)
         self.authority_profiles = {}
-        
+        self.sketches = ConceptSketches()  # fusion des sketches par fichier de store
+        
+    SOURCES_CONFIG = [
+        ("demo_semantic_store.json", "wikipedia"),
+        ("arxiv_semantic_store.json", "arxiv"),
+        ("historical_books_semantic_store.json", "historical_books"),
+        ("temporal_emergence_analysis.json", "temporal_analysis")
+    ]
+    
     def load_all_sources(self) -> int:
         """Charge toutes les sources disponibles"""
-        sources_config = [
-            ("demo_semantic_store.json", "wikipedia"),
-            ("arxiv_semantic_store.json", "arxiv"),
-            ("historical_books_semantic_store.json", "historical_books"),
-            ("temporal_emergence_analysis.json", "temporal_analysis")
-        ]
-        
         total_loaded = 0
         
-        for filename, source_type in sources_config:
+        for filename, source_type in self.SOURCES_CONFIG:
             if os.path.exists(filename):
                 loaded = self._load_source(filename, source_type)
                 total_loaded += loaded
@@ -89,6 +93,7 @@ class AdvancedConsensusEngine:
                 concept = atom['concept'].lower().strip()
                 self.concept_index[concept].append(atom)
                 
+            self.sketches.merge(store_sketches(filename, atoms))
             return len(atoms)
             
         except Exception as e:
@@ -105,41 +110,70 @@ class AdvancedConsensusEngine:
         }
         return authority_weights.get(source_type, 0.5)
     
-    def build_authority_profiles(self):
+    @staticmethod
+    def _agent_domain(concept: str) -> str:
+        """Domaine détection (heuristique)"""
+        concept = concept.lower()
+        if any(word in concept for word in ['learning', 'neural', 'algorithm']):
+            return 'ai_ml'
+        elif any(word in concept for word in ['philosophy', 'reason', 'knowledge']):
+            return 'philosophy'
+        elif any(word in concept for word in ['economics', 'wealth', 'market']):
+            return 'economics'
+        return 'general'
+    
+    def collect_agent_stats(self, sequenced_atoms) -> Dict[str, Dict]:
+        """Statistiques par agent sur des (rang, atome), fusionnables entre shards"""
+        agent_stats = {}
+        for seq, atom in sequenced_atoms:
+            agent_id = atom['provenance']['source_agent']
+            stats = agent_stats.get(agent_id)
+            if stats is None:
+                stats = agent_stats[agent_id] = {
+                    'first_seen': seq,
+                    'concepts': set(),
+                    'sources': set(),
+                    'confidence': ExactSum(),  # somme exacte: même résultat quel que soit le découpage
+                    'domains': Counter(),
+                    'domain_first_seen': {}
+                }
+            stats['concepts'].add(atom['concept'])
+            stats['sources'].add(atom['source_type'])
+            stats['confidence'].add(atom['provenance']['extraction_confidence'])
+            domain = self._agent_domain(atom['concept'])
+            stats['domains'][domain] += 1
+            stats['domain_first_seen'].setdefault(domain, seq)
+        return agent_stats
+    
+    @staticmethod
+    def merge_agent_stats(target: Dict[str, Dict], partial: Dict[str, Dict]):
+        """Fusionne les statistiques d'agents d'un shard dans target"""
+        for agent_id, stats in partial.items():
+            merged = target.get(agent_id)
+            if merged is None:
+                target[agent_id] = stats
+                continue
+            merged['first_seen'] = min(merged['first_seen'], stats['first_seen'])
+            merged['concepts'] |= stats['concepts']
+            merged['sources'] |= stats['sources']
+            merged['confidence'].merge(stats['confidence'])
+            merged['domains'].update(stats['domains'])
+            for domain, seq in stats['domain_first_seen'].items():
+                current = merged['domain_first_seen'].get(domain)
+                if current is None or seq < current:
+                    merged['domain_first_seen'][domain] = seq
+    
+    def build_authority_profiles(self, agent_stats: Optional[Dict[str, Dict]] = None):
         """Construction profils autorité agents"""
         print("👑 Construction profils autorité agents...")
         
-        agent_stats = defaultdict(lambda: {
-            'concepts': set(),
-            'sources': set(),
-            'confidences': [],
-            'domains': Counter(),
-            'timestamps': []
-        })
-        
         # Collecte statistiques par agent
-        for atom in self.all_atoms:
-            agent_id = atom['provenance']['source_agent']
-            stats = agent_stats[agent_id]
-            
-            stats['concepts'].add(atom['concept'])
-            stats['sources'].add(atom['source_type'])
-            stats['confidences'].append(atom['provenance']['extraction_confidence'])
-            stats['timestamps'].append(atom['provenance']['timestamp'])
-            
-            # Domaine détection (heuristique)
-            concept = atom['concept'].lower()
-            if any(word in concept for word in ['learning', 'neural', 'algorithm']):
-                stats['domains']['ai_ml'] += 1
-            elif any(word in concept for word in ['philosophy', 'reason', 'knowledge']):
-                stats['domains']['philosophy'] += 1
-            elif any(word in concept for word in ['economics', 'wealth', 'market']):
-                stats['domains']['economics'] += 1
-            else:
-                stats['domains']['general'] += 1
+        if agent_stats is None:
+            agent_stats = self.collect_agent_stats(enumerate(self.all_atoms))
         
-        # Génération profils autorité
-        for agent_id, stats in agent_stats.items():
+        # Génération profils autorité (ordre de première apparition des agents)
+        for agent_id in sorted(agent_stats, key=lambda agent: agent_stats[agent]['first_seen']):
+            stats = agent_stats[agent_id]
             if len(stats['concepts']) >= 5:  # Seuil minimum
                 profile = self._calculate_authority_profile(agent_id, stats)
                 self.authority_profiles[agent_id] = profile
@@ -148,17 +182,18 @@ class AdvancedConsensusEngine:
     
     def _calculate_authority_profile(self, agent_id: str, stats: Dict) -> AuthorityProfile:
         """Calcule profil autorité détaillé"""
-        # Expertise domains (top domains)
-        top_domains = [domain for domain, count in stats['domains'].most_common(3)]
+        # Expertise domains (top domains, égalités par première apparition comme Counter.most_common)
+        domains, first_seen = stats['domains'], stats['domain_first_seen']
+        top_domains = sorted(domains, key=lambda domain: (-domains[domain], first_seen[domain]))[:3]
         
         # Historical accuracy (confidence moyenne)
-        historical_accuracy = sum(stats['confidences']) / len(stats['confidences'])
+        historical_accuracy = stats['confidence'].mean()
         
         # Source reliability (diversité sources)
         source_reliability = min(len(stats['sources']) / 3, 1.0)  # Max 3 sources
         
         # Temporal consistency (régularité extractions)
-        temporal_consistency = min(len(stats['timestamps']) / 100, 1.0)  # Normalisation
+        temporal_consistency = min(stats['confidence'].count / 100, 1.0)  # Normalisation
         
         # Peer validation (sera calculé cross-références)
         peer_validation_score = 0.7  # Default, à améliorer
@@ -334,27 +369,23 @@ class AdvancedConsensusEngine:
         # Construction profils autorité
         self.build_authority_profiles()
         
-        # Analyse concepts prioritaires
-        concept_priorities = Counter()
-        for concept, atoms in self.concept_index.items():
-            concept_priorities[concept] = len(atoms)
-        
-        top_concepts = [concept for concept, count in concept_priorities.most_common(20)]
+        # Analyse concepts prioritaires (top-k des sketches, sans Counter du corpus)
+        top_concepts = [concept for concept, count in self.sketches.top_concepts(20)]
         
         # Calcul consensus avancé
         advanced_consensuses = []
-        conflicts_detected = []
-        
         for concept in top_concepts:
             consensus = self.calculate_advanced_consensus(concept)
             if consensus:
                 advanced_consensuses.append(asdict(consensus))
-                
-                if consensus.conflict_resolution:
-                    conflicts_detected.append(asdict(consensus.conflict_resolution))
+        
+        return self._assemble_report(len(self.concept_index), len(self.all_atoms), advanced_consensuses)
+    
+    def _assemble_report(self, total_concepts: int, total_atoms: int, advanced_consensuses: List[Dict]) -> Dict:
+        """Rapport à partir des consensus calculés (chemin mono-processus ou shardé)"""
+        conflicts_detected = [c['conflict_resolution'] for c in advanced_consensuses if c['conflict_resolution']]
         
         # Métriques globales
-        total_concepts = len(self.concept_index)
         consensus_scores = [c['weighted_confidence'] for c in advanced_consensuses]
         
         report = {
@@ -363,7 +394,7 @@ class AdvancedConsensusEngine:
                 "analyzed_concepts": len(advanced_consensuses),
                 "authority_profiles": len(self.authority_profiles),
                 "conflicts_detected": len(conflicts_detected),
-                "total_atoms": len(self.all_atoms),
+                "total_atoms": total_atoms,
                 "analysis_date": datetime.datetime.now().isoformat(),
                 "engine_version": "advanced_consensus_v2.0"
             },
@@ -384,9 +415,57 @@ class AdvancedConsensusEngine:
         
         return report
     
-    def save_advanced_consensus_analysis(self, filename: str):
+    def run_sharded(self, workers: Optional[int] = None, shards: Optional[int] = None) -> Optional[Dict]:
+        """
+        Même rapport que load_all_sources + generate_comprehensive_consensus_report,
+        calculé en map-reduce: atomes partitionnés par concept normalisé entre
+        processus, statistiques locales par shard, fusion déterministe ici.
+        """
+        stores = []
+        for filename, source_type in self.SOURCES_CONFIG:
+            if os.path.exists(filename):
+                stores.append(StoreSpec(filename, source_type, self._calculate_source_authority(source_type)))
+            else:
+                print(f"⚠️  {filename} non trouvé")
+        
+        with ShardedRun(stores, workers=workers, shards=shards, sketches=True) as run:
+            print(f"🧩 {run.shards} shards sur {run.workers} processus")
+            total_loaded = 0
+            for result in run.map():
+                spec = stores[result['file_index']]
+                if result['error'] is not None:
+                    print(f"❌ Erreur chargement {spec.filename}: {result['error']}")
+                    continue
+                self.sketches.merge(ConceptSketches.from_dict(result['sketches']))
+                total_loaded += result['atoms']
+                print(f"📊 {spec.source_type}: {result['atoms']} atomes chargés")
+            
+            if total_loaded == 0:
+                print("❌ Aucune source trouvée")
+                return None
+            
+            print(f"\n🔍 Analyse consensus avancée sur {total_loaded} atomes...")
+            print("\n🧠 GÉNÉRATION RAPPORT CONSENSUS AVANCÉ")
+            print("=" * 40)
+            top_concepts = [concept for concept, count in self.sketches.top_concepts(20)]
+            partials = run.reduce(_reduce_advanced_shard, {'concepts': top_concepts})
+        
+        # Fusion: profils par première apparition, consensus dans l'ordre du top-k
+        agent_stats = {}
+        consensuses = {}
+        for partial in partials:
+            self.merge_agent_stats(agent_stats, partial['agent_stats'])
+            consensuses.update(partial['consensuses'])
+        self.build_authority_profiles(agent_stats)
+        
+        advanced_consensuses = [consensuses[concept] for concept in top_concepts if concept in consensuses]
+        return self._assemble_report(sum(p['concepts'] for p in partials), sum(p['atoms'] for p in partials),
+                                     advanced_consensuses)
+    
+    def save_advanced_consensus_analysis(self, filename: str, report: Optional[Dict] = None):
         """Sauvegarde analyse consensus avancée"""
-        report = self.generate_comprehensive_consensus_report()
+        if report is None:
+            report = self.generate_comprehensive_consensus_report()
         
         with open(filename, 'w', encoding='utf-8') as f:
             json.dump(report, f, indent=2, ensure_ascii=False)
@@ -413,24 +492,60 @@ class AdvancedConsensusEngine:
         
         return report
 
+def _reduce_advanced_shard(shard: int, atoms, params: Dict) -> Dict:
+    """Reduce d'un shard: index local des concepts, stats agents, consensus du top-k"""
+    engine = AdvancedConsensusEngine()
+    sequenced = []
+    for seq, atom in atoms:
+        sequenced.append((seq, atom))
+        engine.all_atoms.append(atom)
+        engine.concept_index[concept_key(atom['concept'])].append(atom)
+    
+    consensuses = {}
+    for concept in params['concepts']:
+        if concept in engine.concept_index:
+            consensuses[concept] = asdict(engine.calculate_advanced_consensus(concept))
+    
+    return {
+        'shard': shard,
+        'concepts': len(engine.concept_index),
+        'atoms': len(engine.all_atoms),
+        'agent_stats': engine.collect_agent_stats(sequenced),
+        'consensuses': consensuses
+    }
+
 def main():
+    parser = argparse.ArgumentParser(description="Moteur consensus avancé")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Processus map-reduce (1 = chargement mono-processus)")
+    parser.add_argument('--shards', type=int, default=None,
+                        help="Shards de concepts (défaut: nombre de processus)")
+    args = parser.parse_args()
+    
     print("🧠 MOTEUR CONSENSUS AVANCÉ")
     print("==========================")
     
     engine = AdvancedConsensusEngine()
+    analysis_file = "advanced_consensus_analysis.json"
     
-    # Chargement toutes sources
-    total_loaded = engine.load_all_sources()
-    
-    if total_loaded == 0:
-        print("❌ Aucune source trouvée")
-        return
-    
-    print(f"\n🔍 Analyse consensus avancée sur {total_loaded} atomes...")
+    if args.workers > 1 or args.shards:
+        report = engine.run_sharded(workers=args.workers, shards=args.shards)
+        if report is None:
+            return
+    else:
+        # Chargement toutes sources
+        total_loaded = engine.load_all_sources()
+        
+        if total_loaded == 0:
+            print("❌ Aucune source trouvée")
+            return
+        
+        print(f"\n🔍 Analyse consensus avancée sur {total_loaded} atomes...")
+        
+        # Génération rapport consensus sophistiqué
+        report = engine.generate_comprehensive_consensus_report()
     
-    # Génération rapport consensus sophistiqué
-    analysis_file = "advanced_consensus_analysis.json"
-    report = engine.save_advanced_consensus_analysis(analysis_file)
+    report = engine.save_advanced_consensus_analysis(analysis_file, report)
     
     print(f"\n🎯 ANALYSE CONSENSUS AVANCÉE TERMINÉE")
     print(f"📄 Rapport détaillé: {analysis_file}")
@@ -20,6 +20,7 @@ import re
 # Import structures communes
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from collect_with_attribution import Agent, ProvenanceRecord, SemanticAtom
+from progress_tracker import track
 
 @dataclass
 class ArXivPaper:
@@ -132,9 +133,7 @@ class ArXivCollector:
         
         extracted_atoms = []
         
-        for i, paper in enumerate(papers, 1):
-            print(f"  [{i}/{len(papers)}] {paper.title[:50]}...")
-            
+        for paper in track(papers, f"arXiv {domain}", unit='papers'):
             # Extraction concepts depuis titre + abstract
             concepts = self._extract_concepts_from_text(paper.title + ". " + paper.abstract)
             
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+🔑 IDENTIFIANTS D'ATOMES PAR CONTENU + INDEX MOTS-CLÉS
+=====================================================
+
+- content_atom_id : identifiant stable dérivé du contenu d'un atome
+  (SHA-256 du JSON canonique), indépendant de sa position dans la source
+- KeywordPostingIndex : index inversé token -> atomes sur les champs
+  concept / definition, maintenu incrémentalement (ajout / retrait)
+
+La recherche d'un mot-clé conserve la sémantique « sous-chaîne » des scans
+d'origine (`keyword in concept.lower()`): un mot-clé sans séparateur est
+contenu dans le texte si et seulement s'il est contenu dans l'un de ses
+tokens. On parcourt donc le vocabulaire (petit) au lieu de tous les atomes.
+"""
+
+import hashlib
+import json
+import re
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+INDEXED_FIELDS = ('concept', 'definition')
+
+
+def canonical_json(data: Any) -> str:
+    """Sérialisation déterministe (clés triées) pour le hachage"""
+    return json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str)
+
+
+def content_atom_id(atom_data: Any, length: int = 16) -> str:
+    """Identifiant d'atome dérivé de son contenu"""
+    return hashlib.sha256(canonical_json(atom_data).encode('utf-8')).hexdigest()[:length]
+
+
+def _field_text(atom_data: Dict, field_name: str) -> str:
+    value = atom_data.get(field_name, "") if isinstance(atom_data, dict) else ""
+    return (value if isinstance(value, str) else str(value)).lower()
+
+
+class KeywordPostingIndex:
+    """Index inversé token -> ids d'atomes, par champ indexé"""
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[str, Set[str]]] = {f: defaultdict(set) for f in INDEXED_FIELDS}
+        self._atoms: Dict[str, Dict] = {}
+        self._tokens: Dict[str, Dict[str, Set[str]]] = {}
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
+
+    @classmethod
+    def from_atoms(cls, atoms: Dict[str, Dict]) -> 'KeywordPostingIndex':
+        index = cls()
+        for atom_id, atom_data in atoms.items():
+            index.add(atom_id, atom_data)
+        return index
+
+    def __contains__(self, atom_id: str) -> bool:
+        return atom_id in self._atoms
+
+    def __len__(self) -> int:
+        return len(self._atoms)
+
+    def ids(self) -> Set[str]:
+        return set(self._atoms)
+
+    def add(self, atom_id: str, atom_data: Dict):
+        """Ajoute (ou remplace) un atome"""
+        if atom_id in self._atoms:
+            self.remove(atom_id)
+
+        tokens = {}
+        for field_name in INDEXED_FIELDS:
+            field_tokens = set(TOKEN_PATTERN.findall(_field_text(atom_data, field_name)))
+            for token in field_tokens:
+                self.postings[field_name][token].add(atom_id)
+            tokens[field_name] = field_tokens
+
+        self._atoms[atom_id] = atom_data
+        self._tokens[atom_id] = tokens
+        self._order[atom_id] = self._next_order
+        self._next_order += 1
+
+    def remove(self, atom_id: str):
+        """Retire un atome et ses entrées de postings"""
+        if atom_id not in self._atoms:
+            return
+        for field_name, field_tokens in self._tokens.pop(atom_id).items():
+            postings = self.postings[field_name]
+            for token in field_tokens:
+                postings[token].discard(atom_id)
+                if not postings[token]:
+                    del postings[token]
+        del self._atoms[atom_id]
+        del self._order[atom_id]
+
+    def sync(self, atoms: Dict[str, Dict]):
+        """Aligne l'index sur `atoms`: seuls les ids ajoutés / retirés sont traités.
+
+        Un id présent des deux côtés est supposé inchangé (ids dérivés du contenu).
+        L'ordre de `atoms` devient l'ordre de restitution des correspondances.
+        """
+        for atom_id in [a for a in self._atoms if a not in atoms]:
+            self.remove(atom_id)
+        for atom_id, atom_data in atoms.items():
+            if atom_id not in self._atoms:
+                self.add(atom_id, atom_data)
+            else:
+                self._atoms[atom_id] = atom_data
+        self._order = {atom_id: i for i, atom_id in enumerate(atoms)}
+        self._next_order = len(self._order)
+
+    def lookup(self, keyword: str, field_name: str) -> Set[str]:
+        """Ids des atomes dont le champ contient `keyword` (sous-chaîne)"""
+        postings = self.postings[field_name]
+        parts = TOKEN_PATTERN.findall(keyword)
+
+        if len(parts) == 1 and parts[0] == keyword:
+            found: Set[str] = set()
+            for token, atom_ids in postings.items():
+                if keyword in token:
+                    found |= atom_ids
+            return found
+
+        # Mot-clé avec séparateurs: candidats par tokens puis vérification exacte
+        if parts:
+            candidates = None
+            for part in parts:
+                part_ids = self.lookup(part, field_name)
+                candidates = part_ids if candidates is None else candidates & part_ids
+                if not candidates:
+                    return set()
+        else:
+            candidates = set(self._atoms)
+        return {a for a in candidates if keyword in _field_text(self._atoms[a], field_name)}
+
+    def match(self, keyword: str) -> List[Tuple[str, bool, bool]]:
+        """(atom_id, dans concept, dans definition), dans l'ordre d'insertion"""
+        in_concept = self.lookup(keyword, 'concept')
+        in_definition = self.lookup(keyword, 'definition')
+        return [
+            (atom_id, atom_id in in_concept, atom_id in in_definition)
+            for atom_id in sorted(in_concept | in_definition, key=self._order.__getitem__)
+        ]
+
+    def match_all(self, keywords: Iterable[str]) -> Dict[str, List[Tuple[str, bool, bool]]]:
+        return {keyword: self.match(keyword) for keyword in keywords}
@@ -16,6 +16,7 @@ from datetime import datetime
 sys.path.append(str(Path(__file__).parent))
 from analyze_preferences import PreferencesAnalyzer
 from collect_samples import SampleCollector
+from code_metrics_index import CodeMetricsIndex
 
 @dataclass
 class ProjectRecommendation:
@@ -30,9 +31,12 @@ class ProjectRecommendation:
     sample_files: List[str]
 
 class AutonomousAnalyzer:
-    def __init__(self):
+    def __init__(self, code_root: str = None):
         self.preferences_analyzer = PreferencesAnalyzer()
         self.sample_collector = SampleCollector()
+        # Racine du dépôt (OPERATIONS/DevOps/scripts -> racine)
+        self.code_index = CodeMetricsIndex(code_root or str(Path(__file__).resolve().parents[3]))
+        self.code_metrics = {}
         self.recommendations = []
         
     def run_full_analysis(self):
@@ -52,6 +56,12 @@ class AutonomousAnalyzer:
             self.sample_collector.collect_samples()
         samples_report = self.sample_collector.generate_report()
         
+        # Étape 2b: Métriques de code (index AST, fichiers modifiés seulement)
+        print("\n🧮 Mise à jour de l'index de métriques de code...")
+        refresh = self.code_index.refresh()
+        self.code_metrics = self.code_index.summary()
+        print(f"  {refresh['parsed']} fichier(s) analysé(s) / {refresh['files']} en {refresh['duration']}s")
+        
         # Étape 3: Générer des recommandations
         print("\n🧠 Génération des recommandations...")
         self._generate_recommendations(preferences_report, samples_report)
@@ -75,9 +85,48 @@ class AutonomousAnalyzer:
         self._analyze_file_types_coverage(samples)
         self._analyze_test_scenarios(samples)
         
+        # Recommandations basées sur le code
+        self._analyze_code_metrics()
+        
         # Recommandations pour PaniniFS spécifiquement
         self._generate_panini_fs_recommendations(preferences, samples)
     
+    def _analyze_code_metrics(self):
+        """Recommandations issues de l'index de métriques de code"""
+        complex_functions = self.code_index.complex_functions(threshold=15)
+        if complex_functions:
+            self.recommendations.append(ProjectRecommendation(
+                category='quality',
+                priority='medium',
+                title='Réduire la complexité des fonctions critiques',
+                description='Découper les fonctions les plus ramifiées du dépôt',
+                rationale=f'{len(complex_functions)} fonction(s) de complexité cyclomatique >= 15',
+                implementation_steps=[
+                    'Extraire les branches indépendantes en fonctions dédiées',
+                    'Remplacer les cascades de conditions par des tables de dispatch',
+                    'Ajouter des tests avant chaque découpage'
+                ],
+                estimated_effort='1-2 semaines',
+                sample_files=[f"{f['file']}:{f['lineno']} {f['function']}" for f in complex_functions[:5]]
+            ))
+        
+        duplicate_files = self.code_index.duplicate_files()
+        if duplicate_files:
+            self.recommendations.append(ProjectRecommendation(
+                category='architecture',
+                priority='medium',
+                title='Dédoublonner les scripts copiés',
+                description='Plusieurs arborescences contiennent des copies identiques des mêmes scripts',
+                rationale=f'{len(duplicate_files)} groupe(s) de fichiers identiques',
+                implementation_steps=[
+                    'Choisir un emplacement canonique par script',
+                    'Remplacer les copies par des imports du module canonique',
+                    'Exclure les copies restantes des analyses'
+                ],
+                estimated_effort='1 semaine',
+                sample_files=[', '.join(group[:3]) for group in duplicate_files[:5]]
+            ))
+    
     def _analyze_architecture_patterns(self, preferences: Dict):
         """Analyse les patterns d'architecture utilisés"""
         patterns = preferences.get('global_patterns', {}).get('architecture_patterns', {})
@@ -318,6 +367,7 @@ class AutonomousAnalyzer:
             },
             'preferences_analysis': preferences,
             'samples_analysis': samples,
+            'code_metrics': self.code_metrics,
             'recommendations': [
                 {
                     'category': rec.category,
@@ -18,7 +18,9 @@ import sys
 
 # Import structures communes
 sys.path.append('/home/stephane/GitHub/PaniniFS-1/scripts/scripts')
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from collect_with_attribution import Agent, ProvenanceRecord, SemanticAtom
+from progress_tracker import track
 
 @dataclass
 class BookMetadata:
@@ -112,9 +114,7 @@ class BooksCollector:
         
         extracted_atoms = []
         
-        for i, book in enumerate(books, 1):
-            print(f"  [{i}/{len(books)}] {book.title} ({book.year})")
-            
+        for book in track(books, "Livres", unit='livres'):
             # Extraction concepts depuis sample + sujets
             concepts = self._extract_concepts_from_book(book)
             
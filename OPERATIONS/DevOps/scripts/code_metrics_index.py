@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+🧮 INDEX DE MÉTRIQUES DE CODE (AST, INCRÉMENTAL)
+================================================
+
+Chaque fichier Python est analysé une seule fois par l'AST:
+- métriques par contenu (SHA-256): deux copies identiques partagent la même
+  entrée, un fichier renommé n'est pas réanalysé
+- mise à jour incrémentale: seuls les fichiers dont (taille, mtime) a changé
+  sont relus; si le contenu est identique, seule la signature est rafraîchie
+- requêtes globales servies depuis l'index: totaux, fonctions complexes,
+  imports, fonctions et fichiers dupliqués
+
+Complexité: cyclomatique de McCabe par fonction (1 + branches, opérateurs
+booléens, gardes de compréhension, cas de match).
+"""
+
+import ast
+import hashlib
+import json
+import os
+import time
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+INDEX_VERSION = 1
+DEFAULT_INDEX_NAME = '.panini_code_metrics.json'
+EXCLUDED_DIRS = {'.git', '__pycache__', 'node_modules', '.venv', 'venv', 'target',
+                 '.tox', '.nox', '.mypy_cache', '.pytest_cache', '.ruff_cache'}
+
+_BRANCH_NODES = (ast.If, ast.For, ast.AsyncFor, ast.While, ast.IfExp, ast.ExceptHandler)
+_SCOPE_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+
+@dataclass
+class FunctionMetrics:
+    name: str  # Nom qualifié (Classe.methode, externe.interne)
+    lineno: int
+    length: int
+    complexity: int
+    args: int
+    body_hash: str  # Empreinte de l'AST du corps (positions exclues)
+
+
+@dataclass
+class FileMetrics:
+    lines: int = 0
+    classes: int = 0
+    functions: List[FunctionMetrics] = field(default_factory=list)
+    imports: List[str] = field(default_factory=list)
+    try_blocks: int = 0
+    syntax_error: Optional[str] = None
+
+    @property
+    def function_count(self) -> int:
+        return len(self.functions)
+
+    @property
+    def max_complexity(self) -> int:
+        return max((f.complexity for f in self.functions), default=0)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'FileMetrics':
+        data = dict(data)
+        data['functions'] = [FunctionMetrics(**f) for f in data.get('functions', [])]
+        return cls(**data)
+
+
+def _complexity(node: ast.AST) -> int:
+    """Complexité cyclomatique d'une fonction, sans ses fonctions/classes imbriquées"""
+    complexity = 1
+    stack = list(ast.iter_child_nodes(node))
+    while stack:
+        child = stack.pop()
+        if isinstance(child, _SCOPE_NODES):
+            continue
+        if isinstance(child, _BRANCH_NODES):
+            complexity += 1
+        elif isinstance(child, ast.BoolOp):
+            complexity += len(child.values) - 1
+        elif isinstance(child, ast.comprehension):
+            complexity += 1 + len(child.ifs)
+        elif hasattr(ast, 'match_case') and isinstance(child, ast.match_case):
+            complexity += 1
+        stack.extend(ast.iter_child_nodes(child))
+    return complexity
+
+
+def _body_hash(node: ast.AST) -> str:
+    dumped = ast.dump(ast.Module(body=node.body, type_ignores=[]))
+    return hashlib.sha1(dumped.encode('utf-8')).hexdigest()[:16]
+
+
+def analyze_source(source: str) -> FileMetrics:
+    """Métriques d'un source Python (une seule passe sur l'AST)"""
+    metrics = FileMetrics(lines=len(source.split('\n')))
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError) as e:
+        metrics.syntax_error = str(e)
+        return metrics
+
+    imports = set()
+    stack: List[Tuple[ast.AST, str]] = [(tree, '')]
+    while stack:
+        node, prefix = stack.pop()
+        for child in ast.iter_child_nodes(node):
+            child_prefix = prefix
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                qualified = f"{prefix}{child.name}"
+                args = child.args
+                metrics.functions.append(FunctionMetrics(
+                    name=qualified,
+                    lineno=child.lineno,
+                    length=(getattr(child, 'end_lineno', None) or child.lineno) - child.lineno + 1,
+                    complexity=_complexity(child),
+                    args=len(args.posonlyargs) + len(args.args) + len(args.kwonlyargs)
+                         + bool(args.vararg) + bool(args.kwarg),
+                    body_hash=_body_hash(child)
+                ))
+                child_prefix = f"{qualified}."
+            elif isinstance(child, ast.ClassDef):
+                metrics.classes += 1
+                child_prefix = f"{prefix}{child.name}."
+            elif isinstance(child, ast.Import):
+                imports.update(alias.name for alias in child.names)
+            elif isinstance(child, ast.ImportFrom):
+                imports.add('.' * child.level + (child.module or ''))
+            elif isinstance(child, ast.Try) or type(child).__name__ == 'TryStar':
+                metrics.try_blocks += 1
+            stack.append((child, child_prefix))
+
+    metrics.functions.sort(key=lambda f: f.lineno)
+    metrics.imports = sorted(imports)
+    return metrics
+
+
+class CodeMetricsIndex:
+    """Index persistant chemin -> (signature, empreinte) et empreinte -> métriques"""
+
+    def __init__(self, root: str, index_path: Optional[str] = None):
+        self.root = os.path.abspath(root)
+        self.index_path = index_path or os.path.join(self.root, DEFAULT_INDEX_NAME)
+        self.files: Dict[str, Dict] = {}  # chemin relatif -> {size, mtime_ns, sha256}
+        self.metrics: Dict[str, FileMetrics] = {}  # sha256 -> métriques
+        self.last_refresh: Dict = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if data.get('version') != INDEX_VERSION:
+            return
+        self.files = data.get('files', {})
+        self.metrics = {digest: FileMetrics.from_dict(m) for digest, m in data.get('metrics', {}).items()}
+
+    def save(self):
+        data = {
+            'version': INDEX_VERSION,
+            'root': self.root,
+            'files': self.files,
+            'metrics': {digest: asdict(m) for digest, m in self.metrics.items()}
+        }
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, self.index_path)
+
+    def discover(self) -> List[str]:
+        """Fichiers .py de l'arborescence (chemins relatifs, répertoires exclus sautés)"""
+        found = []
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if d not in EXCLUDED_DIRS]
+            for filename in filenames:
+                if filename.endswith('.py'):
+                    found.append(os.path.relpath(os.path.join(dirpath, filename), self.root))
+        return sorted(found)
+
+    def refresh(self, paths: Optional[Iterable[str]] = None, save: bool = True) -> Dict:
+        """Met l'index à jour; `paths` limite la vérification (ex. sortie de git diff)
+
+        Sans `paths`, toute l'arborescence est découverte et les fichiers disparus
+        sont retirés. Retourne les compteurs de la mise à jour.
+        """
+        start = time.time()
+        stats = {'checked': 0, 'parsed': 0, 'rehashed': 0, 'removed': 0}
+
+        if paths is None:
+            candidates = self.discover()
+            for stale in set(self.files) - set(candidates):
+                del self.files[stale]
+                stats['removed'] += 1
+        else:
+            candidates = [os.path.relpath(os.path.join(self.root, p), self.root)
+                          for p in paths if p.endswith('.py')]
+
+        for rel_path in candidates:
+            stats['checked'] += 1
+            full_path = os.path.join(self.root, rel_path)
+            try:
+                stat = os.stat(full_path)
+            except OSError:
+                if self.files.pop(rel_path, None) is not None:
+                    stats['removed'] += 1
+                continue
+            entry = self.files.get(rel_path)
+            if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                continue
+
+            with open(full_path, 'rb') as f:
+                raw = f.read()
+            digest = hashlib.sha256(raw).hexdigest()
+            if entry and entry['sha256'] == digest:
+                stats['rehashed'] += 1  # Touché sans modification
+            elif digest not in self.metrics:
+                self.metrics[digest] = analyze_source(raw.decode('utf-8', errors='replace'))
+                stats['parsed'] += 1
+            self.files[rel_path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest}
+
+        # Métriques orphelines (contenus qui ne sont plus référencés)
+        referenced = {entry['sha256'] for entry in self.files.values()}
+        for digest in [d for d in self.metrics if d not in referenced]:
+            del self.metrics[digest]
+
+        stats['files'] = len(self.files)
+        stats['duration'] = round(time.time() - start, 3)
+        self.last_refresh = stats
+        if save:
+            self.save()
+        return stats
+
+    # ------------------------------------------------------------------
+    # Requêtes
+    # ------------------------------------------------------------------
+
+    def file(self, rel_path: str) -> Optional[FileMetrics]:
+        entry = self.files.get(os.path.normpath(rel_path))
+        return self.metrics.get(entry['sha256']) if entry else None
+
+    def iter_files(self, prefix: str = '') -> Iterable[Tuple[str, FileMetrics]]:
+        for rel_path in sorted(self.files):
+            if rel_path.startswith(prefix):
+                yield rel_path, self.metrics[self.files[rel_path]['sha256']]
+
+    def totals(self, prefix: str = '') -> Dict:
+        totals = Counter()
+        for _, metrics in self.iter_files(prefix):
+            totals['files'] += 1
+            totals['lines'] += metrics.lines
+            totals['functions'] += metrics.function_count
+            totals['classes'] += metrics.classes
+            totals['syntax_errors'] += metrics.syntax_error is not None
+        totals['unique_contents'] = len({self.files[p]['sha256'] for p in self.files if p.startswith(prefix)})
+        return dict(totals)
+
+    def complex_functions(self, threshold: int = 10, limit: Optional[int] = None) -> List[Dict]:
+        """Fonctions de complexité >= threshold, les plus complexes d'abord (copies dédoublonnées)"""
+        found, seen = [], set()
+        for rel_path, metrics in self.iter_files():
+            digest = self.files[rel_path]['sha256']
+            for function in metrics.functions:
+                if function.complexity >= threshold and (digest, function.name) not in seen:
+                    seen.add((digest, function.name))
+                    found.append({'file': rel_path, 'function': function.name,
+                                  'lineno': function.lineno, 'complexity': function.complexity})
+        found.sort(key=lambda f: (-f['complexity'], f['file'], f['lineno']))
+        return found[:limit] if limit else found
+
+    def import_counts(self, top_level: bool = True) -> Counter:
+        """Nombre de fichiers important chaque module (imports relatifs exclus)"""
+        counts: Counter = Counter()
+        for _, metrics in self.iter_files():
+            modules = {m.split('.')[0] if top_level else m for m in metrics.imports if not m.startswith('.')}
+            counts.update(modules)
+        return counts
+
+    def importers(self, module: str) -> List[str]:
+        return [rel_path for rel_path, metrics in self.iter_files()
+                if any(m == module or m.startswith(module + '.') for m in metrics.imports)]
+
+    def duplicate_files(self) -> List[List[str]]:
+        """Groupes de fichiers au contenu identique"""
+        groups: Dict[str, List[str]] = defaultdict(list)
+        for rel_path, entry in sorted(self.files.items()):
+            groups[entry['sha256']].append(rel_path)
+        return [paths for paths in groups.values() if len(paths) > 1]
+
+    def duplicate_functions(self, min_length: int = 5, across_identical_files: bool = False) -> List[List[Dict]]:
+        """Groupes de fonctions au corps identique (au moins `min_length` lignes)
+
+        Par défaut, les copies intégrales de fichiers ne sont comptées qu'une fois
+        (voir duplicate_files) pour ne signaler que les duplications partielles.
+        """
+        groups: Dict[str, List[Dict]] = defaultdict(list)
+        seen_contents = set()
+        for rel_path, metrics in self.iter_files():
+            digest = self.files[rel_path]['sha256']
+            if not across_identical_files:
+                if digest in seen_contents:
+                    continue
+                seen_contents.add(digest)
+            for function in metrics.functions:
+                if function.length >= min_length:
+                    groups[function.body_hash].append(
+                        {'file': rel_path, 'function': function.name, 'lineno': function.lineno})
+        return sorted((g for g in groups.values() if len(g) > 1), key=lambda g: (-len(g), g[0]['file']))
+
+    def summary(self, complexity_threshold: int = 10, limit: int = 10) -> Dict:
+        """Synthèse pour rapports (totaux, points chauds, duplications)"""
+        return {
+            'totals': self.totals(),
+            'most_complex_functions': self.complex_functions(complexity_threshold, limit),
+            'top_imports': self.import_counts().most_common(limit),
+            'duplicate_file_groups': len(self.duplicate_files()),
+            'duplicate_function_groups': len(self.duplicate_functions()),
+            'last_refresh': self.last_refresh
+        }
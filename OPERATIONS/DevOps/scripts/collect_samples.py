@@ -6,7 +6,9 @@ Explore ~/GitHub/Pensine pour collecter des échantillons de différents types d
 """
 
 import os
+import sys
 import json
+import time
 import hashlib
 import mimetypes
 from pathlib import Path
@@ -15,6 +17,18 @@ from dataclasses import dataclass, asdict
 from collections import defaultdict
 import subprocess
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from progress_tracker import ProgressTracker
+
+# Content addressing sémantique (CORE/semantic-analyzer)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             '..', '..', '..', 'CORE', 'semantic-analyzer', 'dhatu-detector'))
+try:
+    from semantic_hash import SemanticIndex, benchmark_queries
+    SEMANTIC_HASH_AVAILABLE = True
+except ImportError:
+    SEMANTIC_HASH_AVAILABLE = False
+
 @dataclass
 class FileInfo:
     """Informations sur un fichier échantillon"""
@@ -28,6 +42,7 @@ class FileInfo:
     hash_sha256: str
     git_info: Optional[Dict[str, Any]]
     semantic_info: Dict[str, Any]
+    semantic_hash: Optional[str] = None  # Même hash pour un contenu de même sens
 
 @dataclass
 class DirectoryInfo:
@@ -51,6 +66,11 @@ class SampleCollector:
             'by_extension': defaultdict(lambda: {'count': 0, 'total_size': 0})
         }
         
+        # Index sémantique des échantillons texte (équivalents et proches par le sens)
+        self.semantic_index = SemanticIndex() if SEMANTIC_HASH_AVAILABLE else None
+        self.semantic_stats = {'files': 0, 'bytes': 0, 'seconds': 0.0}
+        self._semantic_report = None  # Calculé une fois par état de l'index (benchmark coûteux)
+        
         # Types de fichiers intéressants pour les tests
         self.interesting_types = {
             # Code source
@@ -87,6 +107,7 @@ class SampleCollector:
             return
         
         type_counts = defaultdict(int)
+        tracker = ProgressTracker("Échantillonnage", unit='fichiers')
         
         for root, dirs, files in os.walk(self.pensine_path):
             root_path = Path(root)
@@ -97,6 +118,7 @@ class SampleCollector:
             # Analyser les fichiers
             for file in files:
                 file_path = root_path / file
+                tracker.advance()
                 
                 # Ignorer les fichiers trop volumineux
                 try:
@@ -125,6 +147,8 @@ class SampleCollector:
                         self.size_stats['total_size'] += file_info.size
                         self.size_stats['by_extension'][extension]['count'] += 1
                         self.size_stats['by_extension'][extension]['total_size'] += file_info.size
+        
+        tracker.close()
     
     def _analyze_directory(self, dir_path: Path, subdirs: List[str], files: List[str]):
         """Analyse un répertoire"""
@@ -180,6 +204,7 @@ class SampleCollector:
             
             # Informations sémantiques
             semantic_info = self._extract_semantic_info(file_path, mime_type)
+            semantic_hash = self._compute_semantic_hash(file_path, relative_path, semantic_info)
             
             return FileInfo(
                 path=str(file_path),
@@ -191,7 +216,8 @@ class SampleCollector:
                 hash_md5=md5_hash,
                 hash_sha256=sha256_hash,
                 git_info=git_info,
-                semantic_info=semantic_info
+                semantic_info=semantic_info,
+                semantic_hash=semantic_hash
             )
             
         except Exception as e:
@@ -213,6 +239,63 @@ class SampleCollector:
         
         return md5_hasher.hexdigest(), sha256_hasher.hexdigest()
     
+    def _compute_semantic_hash(self, file_path: Path, relative_path: str,
+                               semantic_info: Dict[str, Any]) -> Optional[str]:
+        """Hash sémantique (séquence de dhātu) d'un fichier texte, indexé pour la recherche"""
+        if self.semantic_index is None or relative_path in self.semantic_index.fingerprints:
+            return None
+        if not any(semantic_info.get(k) for k in ('is_text', 'is_code', 'is_config', 'is_documentation')):
+            return None
+        if file_path.stat().st_size > 1024 * 1024:  # Même limite que l'analyse de contenu
+            return None
+        
+        try:
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                content = f.read()
+        except OSError:
+            return None
+        
+        start = time.perf_counter()
+        fingerprint = self.semantic_index.add(relative_path, content)
+        self._semantic_report = None
+        self.semantic_stats['seconds'] += time.perf_counter() - start
+        self.semantic_stats['files'] += 1
+        self.semantic_stats['bytes'] += len(content.encode('utf-8'))
+        return fingerprint.semantic_hash
+    
+    def generate_semantic_report(self) -> Dict[str, Any]:
+        """Groupes équivalents, paires proches et benchmark de l'index sémantique
+
+        Mémorisé jusqu'au prochain ajout à l'index: rapport sauvegardé et
+        résumé console partagent le même benchmark_queries.
+        """
+        if self.semantic_index is None:
+            return {'available': False}
+        if self._semantic_report is not None:
+            return self._semantic_report
+        
+        index = self.semantic_index
+        similar_pairs = []
+        for key in sorted(index.fingerprints):
+            for other, score in index.similar(key):
+                if key < other and index.fingerprints[key].semantic_hash != index.fingerprints[other].semantic_hash:
+                    similar_pairs.append({'path': key, 'other': other, 'similarity': round(score, 3)})
+        
+        seconds = self.semantic_stats['seconds']
+        self._semantic_report = {
+            'available': True,
+            'index': index.stats(),
+            'equivalent_groups': index.equivalence_groups(),
+            'similar_pairs': similar_pairs,
+            'benchmark': {
+                'fingerprint_seconds': round(seconds, 3),
+                'files_per_second': round(self.semantic_stats['files'] / seconds, 1) if seconds else None,
+                'mb_per_second': round(self.semantic_stats['bytes'] / 1e6 / seconds, 2) if seconds else None,
+                'queries': benchmark_queries(index)
+            }
+        }
+        return self._semantic_report
+    
     def _get_git_info(self, file_path: Path) -> Optional[Dict[str, Any]]:
         """Récupère les informations Git pour un fichier"""
         try:
@@ -413,6 +496,7 @@ class SampleCollector:
             'samples': [asdict(sample) for sample in self.samples],
             'directories': [asdict(directory) for directory in self.directories],
             'test_scenarios': scenarios,
+            'semantic_addressing': self.generate_semantic_report(),
             'recommended_test_files': {
                 'small_diverse_set': [f.relative_path for f in self.samples[:20]],
                 'code_files_only': [f.relative_path for f in self.samples if f.semantic_info.get('is_code', False)][:10],
@@ -437,7 +521,7 @@ class SampleCollector:
 
 def main():
     """Fonction principale"""
-    collector = SampleCollector()
+    collector = SampleCollector(sys.argv[1]) if len(sys.argv) > 1 else SampleCollector()
     
     print("Collecte d'échantillons de fichiers pour tests...")
     print(f"Analyse du dossier: {collector.pensine_path}")
@@ -466,6 +550,15 @@ def main():
     for ext, count in top_types:
         print(f"  {ext or '(sans extension)'}: {count} fichiers")
     
+    # Content addressing sémantique
+    semantic = collector.generate_semantic_report()
+    if semantic['available']:
+        stats, bench = semantic['index'], semantic['benchmark']
+        print(f"\nHash sémantiques: {stats['semantic_hashes']} pour {stats['addressed']} fichiers texte, "
+              f"{stats['equivalence_groups']} groupes équivalents, {len(semantic['similar_pairs'])} paires proches")
+        print(f"Empreintes: {bench['files_per_second']} fichiers/s, recherche LSH "
+              f"{bench['queries']['lsh_ms_per_query']} ms vs linéaire {bench['queries']['linear_ms_per_query']} ms")
+    
     print(f"\nRapport détaillé disponible dans: {report_path}")
 
 if __name__ == "__main__":
@@ -14,6 +14,8 @@ import os
 
 # Ajouter le répertoire parent pour imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from progress_tracker import track
 
 @dataclass
 class Agent:
@@ -152,8 +154,7 @@ def main():
     ]
     
     print(f"\n📊 Collecte de {len(concepts)} concepts:")
-    for i, concept in enumerate(concepts, 1):
-        print(f"[{i}/{len(concepts)}] {concept}")
+    for concept in track(concepts, "Wikipedia", unit='concepts'):
         collector.extract_from_wikipedia(concept)
     
     # Sauvegarde avec traçabilité
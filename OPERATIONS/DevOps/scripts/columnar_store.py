@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+🧱 CONTENEUR COLONNAIRE VERSIONNÉ (.pcol)
+=========================================
+
+Format auto-descriptif, inspiré du fichier Arrow IPC, lisible sans
+dépendance depuis Python (mmap, zéro copie) comme depuis Rust:
+
+    MAGIC | lot 1 | lot 2 | ... | index | pied JSON | u64 taille pied | MAGIC
+
+- Les lignes sont écrites par lots (streaming): seule la tranche en cours
+  est gardée en mémoire.
+- Types de colonnes: utf8 (offsets u64 + octets), float64, int64,
+  list<utf8> (offsets de liste u64 + colonne utf8). Aucune troncature.
+- Index: postings clé -> numéros de ligne (clés triées, u32) et
+  permutations (ordre de lignes, u32).
+- Le pied JSON décrit le schéma, la version du format, la position de
+  chaque tampon (alignés sur 8 octets) et les métadonnées libres.
+
+Le lecteur projette les tampons numériques par memoryview.cast() sur le
+mmap: aucune copie, les chaînes ne sont décodées qu'à l'accès.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+MAGIC = b"PNCOL\x00\x00\x01"
+FORMAT_NAME = "panini-columnar"
+FORMAT_VERSION = 1
+DEFAULT_CHUNK_ROWS = 4096
+ALIGNMENT = 8
+
+COLUMN_TYPES = ("utf8", "float64", "int64", "list<utf8>")
+_NUMERIC_CODES = {"float64": "d", "int64": "q"}
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+class ColumnarFormatError(ValueError):
+    """Fichier illisible: magic, version ou pied invalide"""
+
+
+def _le_bytes(values: array) -> bytes:
+    if not _LITTLE_ENDIAN:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _encode_strings(values: Iterable[str]) -> Tuple[bytes, bytes]:
+    """(offsets u64, données utf8) d'une liste de chaînes"""
+    offsets = array('Q', [0])
+    parts = []
+    total = 0
+    for value in values:
+        encoded = ("" if value is None else str(value)).encode('utf-8')
+        parts.append(encoded)
+        total += len(encoded)
+        offsets.append(total)
+    return _le_bytes(offsets), b"".join(parts)
+
+
+class ColumnarWriter:
+    """Écriture streaming par lots vers un fichier .pcol
+
+    Écrit dans un fichier temporaire voisin, renommé (os.replace) à la
+    fermeture: un lecteur ne voit jamais de fichier tronqué.
+    """
+
+    def __init__(self, path: str, schema: Sequence[Tuple[str, str]],
+                 metadata: Optional[Dict[str, Any]] = None,
+                 chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        for name, column_type in schema:
+            if column_type not in COLUMN_TYPES:
+                raise ValueError(f"Type de colonne inconnu pour {name}: {column_type}")
+        self.path = path
+        self.schema = list(schema)
+        self.metadata = dict(metadata or {})
+        self.chunk_rows = max(1, chunk_rows)
+        self.num_rows = 0
+        self._pending: List[Sequence[Any]] = []
+        self._batches: List[Dict] = []
+        self._indexes: Dict[str, Dict] = {}
+        self._tmp_path = f"{path}.{os.getpid()}.tmp"
+        self._file = open(self._tmp_path, 'wb')
+        self._file.write(MAGIC)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write_row(self, row: Sequence[Any]):
+        """Ajoute une ligne (valeurs dans l'ordre du schéma)"""
+        self._pending.append(row)
+        if len(self._pending) >= self.chunk_rows:
+            self._flush()
+
+    def write_rows(self, rows: Iterable[Sequence[Any]]):
+        for row in rows:
+            self.write_row(row)
+
+    def add_postings(self, name: str, postings: Dict[str, Sequence[int]]):
+        """Index clé -> numéros de ligne (clés triées pour recherche dichotomique)"""
+        keys = sorted(postings, key=lambda k: k.encode('utf-8'))
+        key_offsets, key_data = _encode_strings(keys)
+        row_offsets = array('Q', [0])
+        rows = array('I')
+        for key in keys:
+            rows.extend(postings[key])
+            row_offsets.append(len(rows))
+        self._indexes[name] = {
+            "kind": "postings",
+            "keys": len(keys),
+            "buffers": [self._write_buffer(key_offsets), self._write_buffer(key_data),
+                        self._write_buffer(_le_bytes(row_offsets)), self._write_buffer(_le_bytes(rows))]
+        }
+
+    def add_permutation(self, name: str, rows: Sequence[int]):
+        """Ordre de lignes précalculé (ex. tri temporel)"""
+        self._indexes[name] = {
+            "kind": "permutation",
+            "buffers": [self._write_buffer(_le_bytes(array('I', rows)))]
+        }
+
+    def close(self):
+        """Vide le dernier lot puis écrit le pied et le magic final"""
+        if self._file.closed:
+            return
+        self._flush()
+        footer = json.dumps({
+            "format": FORMAT_NAME,
+            "version": FORMAT_VERSION,
+            "byte_order": "little",
+            "num_rows": self.num_rows,
+            "schema": [{"name": name, "type": column_type} for name, column_type in self.schema],
+            "batches": self._batches,
+            "indexes": self._indexes,
+            "metadata": self.metadata
+        }, ensure_ascii=False).encode('utf-8')
+        self._file.write(footer)
+        self._file.write(struct.pack('<Q', len(footer)))
+        self._file.write(MAGIC)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self):
+        """Abandonne l'écriture: le fichier cible (s'il existe) reste intact"""
+        if not self._file.closed:
+            self._file.close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+    def _write_buffer(self, data: bytes) -> List[int]:
+        padding = -self._file.tell() % ALIGNMENT
+        if padding:
+            self._file.write(b"\x00" * padding)
+        offset = self._file.tell()
+        self._file.write(data)
+        return [offset, len(data)]
+
+    def _flush(self):
+        if not self._pending:
+            return
+        rows = self._pending
+        self._pending = []
+        columns = {}
+        for position, (name, column_type) in enumerate(self.schema):
+            values = [row[position] for row in rows]
+            if column_type == "utf8":
+                offsets, data = _encode_strings(values)
+                buffers = [self._write_buffer(offsets), self._write_buffer(data)]
+            elif column_type == "list<utf8>":
+                list_offsets = array('Q', [0])
+                flat = []
+                for value in values:
+                    flat.extend(value or [])
+                    list_offsets.append(len(flat))
+                offsets, data = _encode_strings(flat)
+                buffers = [self._write_buffer(_le_bytes(list_offsets)),
+                           self._write_buffer(offsets), self._write_buffer(data)]
+            else:
+                buffers = [self._write_buffer(_le_bytes(array(_NUMERIC_CODES[column_type], values)))]
+            columns[name] = buffers
+        self._batches.append({"rows": len(rows), "columns": columns})
+        self.num_rows += len(rows)
+
+
+class _Utf8Buffer:
+    """Chaînes d'un lot: offsets u64 projetés + octets, décodage à l'accès"""
+
+    def __init__(self, offsets: memoryview, data: memoryview):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def raw(self, i: int) -> memoryview:
+        return self.data[self.offsets[i]:self.offsets[i + 1]]
+
+    def __getitem__(self, i: int) -> str:
+        return str(self.raw(i), 'utf-8')
+
+
+class Column:
+    """Colonne logique couvrant tous les lots"""
+
+    def __init__(self, column_type: str, chunks: List[Any], starts: List[int]):
+        self.type = column_type
+        self.chunks = chunks
+        self._starts = starts
+        self._length = starts[-1] if starts else 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, row: int) -> Any:
+        if row < 0:
+            row += self._length
+        if not 0 <= row < self._length:
+            raise IndexError(row)
+        chunk = bisect_right(self._starts, row) - 1
+        return self._value(self.chunks[chunk], row - self._starts[chunk])
+
+    def __iter__(self) -> Iterator[Any]:
+        for chunk in self.chunks:
+            if self.type in _NUMERIC_CODES:
+                yield from chunk
+            else:
+                for i in range(len(chunk) if self.type == "utf8" else len(chunk[0]) - 1):
+                    yield self._value(chunk, i)
+
+    def _value(self, chunk: Any, i: int) -> Any:
+        if self.type == "list<utf8>":
+            list_offsets, strings = chunk
+            return [strings[j] for j in range(list_offsets[i], list_offsets[i + 1])]
+        return chunk[i]
+
+
+class PostingIndex:
+    """Index clé -> lignes, clés triées (recherche dichotomique sans tout décoder)"""
+
+    def __init__(self, keys: _Utf8Buffer, row_offsets: memoryview, rows: memoryview):
+        self._keys = keys
+        self._row_offsets = row_offsets
+        self._rows = rows
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def keys(self) -> Iterator[str]:
+        return (self._keys[i] for i in range(len(self._keys)))
+
+    def _find(self, key: str) -> int:
+        target = key.encode('utf-8')
+        lo, hi = 0, len(self._keys)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if bytes(self._keys.raw(mid)) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < len(self._keys) and bytes(self._keys.raw(lo)) == target else -1
+
+    def __contains__(self, key: str) -> bool:
+        return self._find(key) >= 0
+
+    def get(self, key: str) -> memoryview:
+        """Numéros de ligne (vue u32 sur le mmap, vide si clé absente)"""
+        i = self._find(key)
+        if i < 0:
+            return self._rows[0:0]
+        return self._rows[self._row_offsets[i]:self._row_offsets[i + 1]]
+
+    def items(self) -> Iterator[Tuple[str, memoryview]]:
+        for i in range(len(self._keys)):
+            yield self._keys[i], self._rows[self._row_offsets[i]:self._row_offsets[i + 1]]
+
+
+class ColumnarReader:
+    """Lecture mmap d'un fichier .pcol, colonnes projetées sans copie"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ColumnarFormatError(f"{path}: fichier vide")
+        self._view = memoryview(self._mmap)
+        self._columns: Dict[str, Column] = {}
+        try:
+            self.footer = self._read_footer()
+        except Exception:
+            self.close()
+            raise
+        self.schema = [(c["name"], c["type"]) for c in self.footer["schema"]]
+        self.metadata = self.footer.get("metadata", {})
+        self.num_rows = self.footer["num_rows"]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    def close(self):
+        """Libère les vues puis le mmap (les vues rendues deviennent invalides)"""
+        self._columns.clear()
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if not self._mmap.closed:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # Des vues exportées existent encore: libéré avec elles
+        self._file.close()
+
+    def _read_footer(self) -> Dict:
+        size = len(self._view)
+        tail = len(MAGIC) + 8
+        if size < len(MAGIC) + tail or self._view[:len(MAGIC)] != MAGIC or self._view[size - len(MAGIC):] != MAGIC:
+            raise ColumnarFormatError(f"{self.path}: magic {FORMAT_NAME} absent")
+        (footer_len,) = struct.unpack('<Q', self._view[size - tail:size - len(MAGIC)])
+        footer_start = size - tail - footer_len
+        if footer_start < len(MAGIC):
+            raise ColumnarFormatError(f"{self.path}: pied corrompu")
+        footer = json.loads(str(self._view[footer_start:size - tail], 'utf-8'))
+        if footer.get("format") != FORMAT_NAME or footer.get("version") != FORMAT_VERSION:
+            raise ColumnarFormatError(
+                f"{self.path}: format {footer.get('format')} v{footer.get('version')} non supporté")
+        return footer
+
+    def _buffer(self, descriptor: List[int], typecode: Optional[str] = None) -> memoryview:
+        offset, length = descriptor
+        view = self._view[offset:offset + length]
+        if typecode is None:
+            return view
+        if not _LITTLE_ENDIAN:
+            values = array(typecode, view.tobytes())  # Copie inévitable: hôte big-endian
+            values.byteswap()
+            return memoryview(values)
+        return view.cast(typecode)
+
+    def column(self, name: str) -> Column:
+        """Colonne `name` (mise en cache), lots concaténés logiquement"""
+        if name in self._columns:
+            return self._columns[name]
+        column_type = dict(self.schema).get(name)
+        if column_type is None:
+            raise KeyError(name)
+
+        chunks, starts, row = [], [], 0
+        for batch in self.footer["batches"]:
+            buffers = batch["columns"][name]
+            if column_type == "utf8":
+                chunk = _Utf8Buffer(self._buffer(buffers[0], 'Q'), self._buffer(buffers[1]))
+            elif column_type == "list<utf8>":
+                chunk = (self._buffer(buffers[0], 'Q'),
+                         _Utf8Buffer(self._buffer(buffers[1], 'Q'), self._buffer(buffers[2])))
+            else:
+                chunk = self._buffer(buffers[0], _NUMERIC_CODES[column_type])
+            chunks.append(chunk)
+            starts.append(row)
+            row += batch["rows"]
+        starts.append(row)
+
+        self._columns[name] = Column(column_type, chunks, starts)
+        return self._columns[name]
+
+    def index_names(self) -> List[str]:
+        return list(self.footer.get("indexes", {}))
+
+    def postings(self, name: str) -> PostingIndex:
+        spec = self.footer["indexes"][name]
+        if spec["kind"] != "postings":
+            raise KeyError(f"{name} n'est pas un index de postings")
+        key_offsets, key_data, row_offsets, rows = spec["buffers"]
+        return PostingIndex(_Utf8Buffer(self._buffer(key_offsets, 'Q'), self._buffer(key_data)),
+                            self._buffer(row_offsets, 'Q'), self._buffer(rows, 'I'))
+
+    def permutation(self, name: str) -> memoryview:
+        spec = self.footer["indexes"][name]
+        if spec["kind"] != "permutation":
+            raise KeyError(f"{name} n'est pas une permutation")
+        return self._buffer(spec["buffers"][0], 'I')
+
+    def row(self, i: int) -> Dict[str, Any]:
+        return {name: self.column(name)[i] for name, _ in self.schema}
+
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        columns = [(name, iter(self.column(name))) for name, _ in self.schema]
+        for _ in range(self.num_rows):
+            yield {name: next(values) for name, values in columns}
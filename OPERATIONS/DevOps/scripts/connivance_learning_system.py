@@ -7,7 +7,6 @@
 
 import json
 import datetime
-import numpy as np
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
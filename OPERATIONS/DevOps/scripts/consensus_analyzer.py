@@ -12,13 +12,19 @@ import os
 
 # Ajouter le répertoire parent pour imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from progress_tracker import ProgressTracker
+from pipeline_profiler import profiler
+from stream_sketches import ConceptSketches, store_sketches
 
 class ConsensusAnalyzer:
     def __init__(self, store_file: str):
+        self.sketches = ConceptSketches()
         try:
             with open(store_file, 'r', encoding='utf-8') as f:
                 self.store = json.load(f)
             self.atoms = self.store['semantic_atoms']
+            self.sketches = store_sketches(store_file, self.atoms)
             print(f"📊 Chargé {len(self.atoms)} atomes sémantiques")
         except FileNotFoundError:
             print(f"❌ Fichier {store_file} non trouvé")
@@ -28,6 +34,7 @@ class ConsensusAnalyzer:
             print(f"❌ Erreur chargement: {e}")
             self.atoms = []
         
+    @profiler.profile('consensus.analyze_definition_patterns')
     def analyze_definition_patterns(self) -> Dict:
         """Détecte patterns dans définitions"""
         patterns = defaultdict(list)
@@ -52,6 +59,7 @@ class ConsensusAnalyzer:
                 
         return dict(patterns)
         
+    @profiler.profile('consensus.detect_semantic_clusters')
     def detect_semantic_clusters(self) -> List[Dict]:
         """Clustering basique par mots-clés communs"""
         clusters = []
@@ -72,6 +80,7 @@ class ConsensusAnalyzer:
             
         # Similarité par intersection
         concepts = list(concept_keywords.keys())
+        tracker = ProgressTracker("Similarités", total=len(concepts) * (len(concepts) - 1), unit='paires')
         for i, concept1 in enumerate(concepts):
             cluster = {'core_concept': concept1, 'related': [], 'similarity_scores': [], 'shared_keywords': []}
             
@@ -91,31 +100,20 @@ class ConsensusAnalyzer:
                         
             if cluster['related']:
                 clusters.append(cluster)
+            tracker.advance(len(concepts) - 1)
                 
+        tracker.close()
         return clusters
         
+    @profiler.profile('consensus.extract_key_concepts')
     def extract_key_concepts(self) -> Dict:
-        """Extraction concepts-clés par fréquence"""
-        word_freq = defaultdict(int)
-        concept_cooccurrence = defaultdict(list)
-        
-        for atom in self.atoms:
-            text = atom['definition'].lower()
-            words = re.findall(r'\b\w{5,}\b', text)  # Mots 5+ caractères
-            
-            for word in words:
-                if word not in ['cette', 'sont', 'pour', 'dans', 'avec', 'intelligence', 'artificielle']:
-                    word_freq[word] += 1
-                    concept_cooccurrence[word].append(atom['concept'])
-        
-        # Top concepts par fréquence
-        top_concepts = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:10]
-        
+        """Extraction concepts-clés par fréquence (sketches du store, mémoire bornée)"""
         return {
-            'frequent_terms': top_concepts,
-            'cross_concept_terms': {word: list(set(concepts)) for word, concepts in concept_cooccurrence.items() if len(set(concepts)) > 1}
+            'frequent_terms': self.sketches.frequent_terms(10),
+            'cross_concept_terms': self.sketches.cross_concept_terms()
         }
         
+    @profiler.profile('consensus.generate_consensus_report')
     def generate_consensus_report(self) -> Dict:
         """Rapport consensus avec métriques"""
         if not self.atoms:
@@ -214,6 +212,7 @@ class ConsensusAnalyzer:
             for word, freq in frequent[:5]:
                 print(f"  • {word}: {freq} occurrences")
 
+@profiler.session('consensus_analyzer')
 def main():
     print("🧠 ANALYSEUR CONSENSUS SÉMANTIQUE")
     print("================================")
@@ -4,6 +4,7 @@ DAEMON AUTONOMIE CONTINUE : Développement 24/7 sans micro-confirmations
 🌙 Fonctionnement permanent pendant absence utilisateur avec progression intelligente
 """
 
+import asyncio
 import json
 import os
 import sys
@@ -18,12 +19,18 @@ import logging
 # Import du moteur autonomie totale
 from total_autonomy_engine import TotalAutonomyEngine
 
+# Ordonnanceur événementiel partagé avec les agents de gouvernance
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             '..', '..', '..', 'GOVERNANCE', 'Copilotage', 'agents'))
+from agent_scheduler import AgentScheduler, IntervalTrigger
+
 class ContinuousAutonomyDaemon:
     def __init__(self, workspace_path: str):
         self.workspace_path = Path(workspace_path)
         self.scripts_path = self.workspace_path / "Copilotage" / "scripts"
         self.running = False
         self.cycle_count = 0
+        self.scheduler = None
         self.setup_daemon_logging()
         
         # Moteur autonomie intégré
@@ -469,30 +476,19 @@ if __name__ == "__main__":
         """Démarrage daemon continu"""
         self.running = True
         self.start_time = datetime.datetime.now().isoformat()
-        end_time = datetime.datetime.now() + datetime.timedelta(hours=duration_hours)
         
         self.logger.info("🌙 DÉMARRAGE DAEMON AUTONOMIE CONTINUE")
         self.logger.info("=" * 50)
         self.logger.info(f"⏰ Durée prévue: {duration_hours} heures")
         self.logger.info(f"🎯 Développement continu sans micro-confirmations")
         
+        # Cycle immédiat puis réveil à l'échéance calculée (pas de sommeil minute par minute)
+        self.scheduler = AgentScheduler(max_concurrency=1)
+        self.scheduler.register('daemon_cycle', self._scheduled_cycle,
+                                IntervalTrigger(120 * 60), run_immediately=True)
+        
         try:
-            while self.running and datetime.datetime.now() < end_time:
-                cycle_results = self.daemon_cycle()
-                
-                # Pause adaptative entre cycles (30min à 2h selon charge)
-                missions_executed = len(cycle_results["missions_executed"])
-                pause_minutes = 30 + (missions_executed * 15)  # Plus d'activité = pause plus longue
-                pause_minutes = min(pause_minutes, 120)  # Max 2h
-                
-                self.logger.info(f"😴 Pause {pause_minutes} minutes avant cycle suivant...")
-                
-                # Pause avec vérification arrêt périodique
-                for _ in range(pause_minutes):
-                    if not self.running:
-                        break
-                    time.sleep(60)  # 1 minute
-                    
+            asyncio.run(self.scheduler.run(duration=duration_hours * 3600))
         except KeyboardInterrupt:
             self.logger.info("🛑 Arrêt daemon demandé par utilisateur")
         except Exception as e:
@@ -502,9 +498,23 @@ if __name__ == "__main__":
             self.logger.info("🏁 DAEMON AUTONOMIE CONTINUE TERMINÉ")
             self.logger.info(f"📊 {self.cycle_count} cycles exécutés")
     
+    async def _scheduled_cycle(self):
+        """Cycle daemon (dans un thread) puis replanification adaptative"""
+        cycle_results = await asyncio.to_thread(self.daemon_cycle)
+        
+        # Pause adaptative entre cycles (30min à 2h selon charge)
+        missions_executed = len(cycle_results["missions_executed"])
+        pause_minutes = 30 + (missions_executed * 15)  # Plus d'activité = pause plus longue
+        pause_minutes = min(pause_minutes, 120)  # Max 2h
+        
+        self.logger.info(f"😴 Pause {pause_minutes} minutes avant cycle suivant...")
+        self.scheduler.reschedule('daemon_cycle', delay=pause_minutes * 60)
+    
     def stop_daemon(self):
-        """Arrêt daemon"""
+        """Arrêt daemon (réveil immédiat de l'ordonnanceur)"""
         self.running = False
+        if self.scheduler:
+            self.scheduler.stop()
         self.logger.info("🛑 Arrêt daemon demandé")
 
 def main():
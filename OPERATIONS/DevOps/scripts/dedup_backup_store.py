@@ -0,0 +1,536 @@
+#!/usr/bin/env python3
+"""
+💾 MAGASIN DE SAUVEGARDE DÉDUPLIQUÉ (CHUNKING PAR CONTENU)
+==========================================================
+
+Remplace la copie intégrale de l'arborescence à chaque sauvegarde:
+- découpage des fichiers en blocs définis par le contenu (hash roulant
+  "gear", coupure sur les bits de poids fort): une modification locale d'un
+  gros store JSON ne change que les blocs voisins
+- magasin de blocs adressé par SHA-256 (chunks/ab/abcd...), chaque bloc
+  compressé (zstd si disponible, sinon zlib) et écrit une seule fois
+- un manifeste JSON par snapshot (snapshots/<id>.json) liste les blocs de
+  chaque fichier; les fichiers inchangés (taille, mtime) depuis le snapshot
+  précédent et les copies identiques ne sont pas relus/redécoupés
+- avec un registre de modules (GOVERNANCE/Copilotage/agents/module_registry),
+  les copies miroir d'un module sont enregistrées comme références vers la
+  copie canonique du même snapshot (backup_plan): ni relues ni découpées
+- restauration en flux, bloc par bloc, avec vérification des empreintes
+- rapport: ratio de déduplication, compression, débit
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import sys
+import time
+import zlib
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+STORE_VERSION = 1
+MIN_CHUNK_SIZE = 2 * 1024
+AVG_CHUNK_BITS = 13  # ~8 Kio au-delà du minimum
+MAX_CHUNK_SIZE = 64 * 1024
+READ_BLOCK_SIZE = 1024 * 1024
+EXCLUDED_DIRS = {'.git', '__pycache__', 'node_modules', '.venv', 'venv', 'target',
+                 '.tox', '.nox', '.mypy_cache', '.pytest_cache', '.ruff_cache'}
+
+# Préfixe d'un bloc stocké: algorithme de compression
+CODEC_RAW, CODEC_ZLIB, CODEC_ZSTD = b'R', b'Z', b'S'
+
+# Table "gear" déterministe: 256 valeurs pseudo-aléatoires de 32 bits
+_GEAR = [int.from_bytes(hashlib.sha256(bytes([i])).digest()[:4], 'big') for i in range(256)]
+
+
+class ContentDefinedChunker:
+    """Découpage par hash roulant gear (FastCDC simplifié)"""
+
+    def __init__(self, min_size: int = MIN_CHUNK_SIZE, avg_bits: int = AVG_CHUNK_BITS,
+                 max_size: int = MAX_CHUNK_SIZE):
+        self.min_size = min_size
+        self.max_size = max_size
+        # Bits de poids fort: ils dépendent des 32 derniers octets, pas seulement des derniers
+        self.mask = ((1 << avg_bits) - 1) << (32 - avg_bits)
+
+    def _cut(self, data: bytes, start: int, end: int) -> int:
+        if end - start <= self.min_size:
+            return end
+        limit = min(end, start + self.max_size)
+        gear, mask, h = _GEAR, self.mask, 0
+        for i in range(start + self.min_size, limit):
+            h = ((h << 1) + gear[data[i]]) & 0xFFFFFFFF
+            if not h & mask:
+                return i + 1
+        return limit
+
+    def chunks(self, data: bytes) -> List[bytes]:
+        return list(self.iter_chunks_from(iter([data])))
+
+    def iter_chunks(self, stream: BinaryIO) -> Iterator[bytes]:
+        return self.iter_chunks_from(iter(lambda: stream.read(max(READ_BLOCK_SIZE, self.max_size)), b''))
+
+    def iter_chunks_from(self, blocks: Iterator[bytes]) -> Iterator[bytes]:
+        buffer, pos, eof = b'', 0, False
+        while True:
+            # Le tampon couvre toujours un bloc maximal, sauf en fin de flux
+            while not eof and len(buffer) - pos < self.max_size:
+                block = next(blocks, b'')
+                if block:
+                    buffer = buffer[pos:] + block
+                    pos = 0
+                else:
+                    eof = True
+            if pos >= len(buffer):
+                return
+            cut = self._cut(buffer, pos, len(buffer))
+            yield buffer[pos:cut]
+            pos = cut
+
+
+@dataclass
+class SnapshotReport:
+    snapshot_id: str
+    files: int = 0
+    bytes_total: int = 0       # Taille logique du snapshot
+    bytes_read: int = 0        # Octets relus et découpés
+    bytes_new: int = 0         # Octets des nouveaux blocs (avant compression)
+    bytes_written: int = 0     # Octets écrits dans le magasin (après compression)
+    chunks_total: int = 0
+    chunks_new: int = 0
+    files_reused: int = 0      # Inchangés ou copies: blocs repris sans découpage
+    files_referenced: int = 0  # Copies de modules enregistrées comme références
+    errors: List[str] = field(default_factory=list)
+    duration: float = 0.0
+
+    @property
+    def dedup_ratio(self) -> float:
+        """Taille logique / nouveaux octets uniques (inf si rien de nouveau)"""
+        return self.bytes_total / self.bytes_new if self.bytes_new else float('inf')
+
+    @property
+    def throughput_mb_s(self) -> float:
+        return self.bytes_total / 1e6 / self.duration if self.duration else 0.0
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        data['dedup_ratio'] = round(self.dedup_ratio, 2) if self.bytes_new else None
+        data['throughput_mb_s'] = round(self.throughput_mb_s, 2)
+        return data
+
+
+class DedupBackupStore:
+    """Magasin de blocs + manifestes de snapshots"""
+
+    def __init__(self, store_dir: str, chunker: Optional[ContentDefinedChunker] = None,
+                 compression: str = 'auto', level: Optional[int] = None):
+        self.store_dir = os.path.abspath(store_dir)
+        self.chunks_dir = os.path.join(self.store_dir, 'chunks')
+        self.snapshots_dir = os.path.join(self.store_dir, 'snapshots')
+        self.chunker = chunker or ContentDefinedChunker()
+        if compression == 'auto':
+            compression = 'zstd' if ZSTD_AVAILABLE else 'zlib'
+        if compression == 'zstd' and not ZSTD_AVAILABLE:
+            raise RuntimeError("Compression zstd demandée mais le module zstandard n'est pas installé")
+        if compression not in ('zstd', 'zlib', 'none'):
+            raise ValueError(f"Compression inconnue: {compression}")
+        self.compression = compression
+        self.level = level
+        self._compressor = zstandard.ZstdCompressor(level=level or 3) if compression == 'zstd' else None
+        self._decompressor = zstandard.ZstdDecompressor() if ZSTD_AVAILABLE else None
+        os.makedirs(self.chunks_dir, exist_ok=True)
+        os.makedirs(self.snapshots_dir, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Blocs
+    # ------------------------------------------------------------------
+
+    def _chunk_path(self, digest: str) -> str:
+        return os.path.join(self.chunks_dir, digest[:2], digest)
+
+    def has_chunk(self, digest: str) -> bool:
+        return os.path.exists(self._chunk_path(digest))
+
+    def _encode(self, data: bytes) -> bytes:
+        if self.compression == 'zstd':
+            payload, codec = self._compressor.compress(data), CODEC_ZSTD
+        elif self.compression == 'zlib':
+            payload, codec = zlib.compress(data, 6 if self.level is None else self.level), CODEC_ZLIB
+        else:
+            payload, codec = data, CODEC_RAW
+        if len(payload) >= len(data):  # Bloc incompressible: stocké tel quel
+            payload, codec = data, CODEC_RAW
+        return codec + payload
+
+    def _decode(self, blob: bytes) -> bytes:
+        codec, payload = blob[:1], blob[1:]
+        if codec == CODEC_RAW:
+            return payload
+        if codec == CODEC_ZLIB:
+            return zlib.decompress(payload)
+        if codec == CODEC_ZSTD:
+            if self._decompressor is None:
+                raise RuntimeError("Bloc zstd: le module zstandard est requis pour le relire")
+            return self._decompressor.decompress(payload)
+        raise ValueError(f"Codec de bloc inconnu: {codec!r}")
+
+    def put_chunk(self, data: bytes) -> Tuple[str, int]:
+        """Stocke un bloc s'il est nouveau; retourne (empreinte, octets écrits)"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._chunk_path(digest)
+        if os.path.exists(path):
+            return digest, 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        blob = self._encode(data)
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        with open(tmp_path, 'wb') as f:
+            f.write(blob)
+        os.replace(tmp_path, path)
+        return digest, len(blob)
+
+    def get_chunk(self, digest: str) -> bytes:
+        with open(self._chunk_path(digest), 'rb') as f:
+            data = self._decode(f.read())
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Bloc corrompu: {digest}")
+        return data
+
+    # ------------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------------
+
+    def list_snapshots(self, label: Optional[str] = None) -> List[Dict]:
+        """Snapshots du plus ancien au plus récent (sans la liste des fichiers)"""
+        snapshots = []
+        for filename in os.listdir(self.snapshots_dir):
+            if not filename.endswith('.json'):
+                continue
+            manifest = self.load_manifest(filename[:-5])
+            if label is None or manifest.get('label') == label:
+                manifest.pop('files', None)
+                snapshots.append(manifest)
+        return sorted(snapshots, key=lambda m: (m['created'], m['id']))
+
+    def load_manifest(self, snapshot_id: str) -> Dict:
+        with open(os.path.join(self.snapshots_dir, f"{snapshot_id}.json"), encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save_manifest(self, manifest: Dict):
+        path = os.path.join(self.snapshots_dir, f"{manifest['id']}.json")
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    def _new_snapshot_id(self, label: str) -> str:
+        base = f"{label}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        snapshot_id, suffix = base, 1
+        while os.path.exists(os.path.join(self.snapshots_dir, f"{snapshot_id}.json")):
+            suffix += 1
+            snapshot_id = f"{base}_{suffix}"
+        return snapshot_id
+
+    def discover(self, root: str, excludes: Iterable[str] = ()) -> List[str]:
+        excludes = list(excludes)
+        found = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(
+                d for d in dirnames
+                if d not in EXCLUDED_DIRS
+                and os.path.abspath(os.path.join(dirpath, d)) != self.store_dir
+                and not self._excluded(os.path.relpath(os.path.join(dirpath, d), root), excludes))
+            for filename in sorted(filenames):
+                full_path = os.path.join(dirpath, filename)
+                rel_path = os.path.relpath(full_path, root)
+                if not os.path.islink(full_path) and not self._excluded(rel_path, excludes):
+                    found.append(rel_path)
+        return found
+
+    @staticmethod
+    def _excluded(rel_path: str, excludes: List[str]) -> bool:
+        name = os.path.basename(rel_path)
+        return any(fnmatch.fnmatch(name, p) or fnmatch.fnmatch(rel_path, p) for p in excludes)
+
+    def snapshot(self, root: str, label: str = 'snapshot', paths: Optional[Iterable[str]] = None,
+                 excludes: Iterable[str] = (), registry: Any = None) -> SnapshotReport:
+        """Sauvegarde `root` (ou les `paths` relatifs donnés) dans un nouveau snapshot
+
+        registry: ModuleRegistry de la même racine; les copies de modules de
+        son backup_plan deviennent des références {'ref': copie canonique}.
+        """
+        start = time.time()
+        root = os.path.abspath(root)
+        report = SnapshotReport(snapshot_id=self._new_snapshot_id(label))
+
+        previous = self.list_snapshots(label)
+        previous_files = self.load_manifest(previous[-1]['id'])['files'] if previous else {}
+        # Contenu déjà découpé (snapshot précédent ou copie vue dans celui-ci)
+        known_contents = {entry['sha256']: entry['chunks'] for entry in previous_files.values()
+                          if 'chunks' in entry}
+
+        files = {}
+        candidates = self.discover(root, excludes) if paths is None else list(paths)
+        references = {}
+        if registry is not None:
+            modules = [p for p in candidates if p.endswith(registry.extensions)]
+            references = registry.backup_plan(modules)['references']
+            # Copies canoniques d'abord: la référence pointe vers une entrée du snapshot
+            candidates = ([p for p in candidates if p not in references]
+                          + [p for p in candidates if p in references])
+        for rel_path in candidates:
+            full_path = os.path.join(root, rel_path)
+            try:
+                stat = os.stat(full_path)
+                entry = self._reference_entry(rel_path, stat, references.get(rel_path), files, registry)
+                if entry is not None:
+                    report.files_referenced += 1
+                else:
+                    entry = previous_files.get(rel_path)
+                    if not (entry and 'chunks' in entry and entry['size'] == stat.st_size
+                            and entry['mtime_ns'] == stat.st_mtime_ns
+                            and all(self.has_chunk(d) for d, _ in entry['chunks'])):
+                        entry = self._store_file(full_path, stat, known_contents, report)
+                    else:
+                        report.files_reused += 1
+            except OSError as e:
+                report.errors.append(f"{rel_path}: {e}")
+                continue
+            entry['mode'] = stat.st_mode & 0o777
+            files[rel_path] = entry
+            if 'chunks' in entry:
+                known_contents.setdefault(entry['sha256'], entry['chunks'])
+                report.chunks_total += len(entry['chunks'])
+            report.files += 1
+            report.bytes_total += entry['size']
+
+        report.duration = round(time.time() - start, 3)
+        self._save_manifest({
+            'version': STORE_VERSION,
+            'id': report.snapshot_id,
+            'label': label,
+            'source_root': root,
+            'created': datetime.now().isoformat(),
+            'compression': self.compression,
+            'stats': report.to_dict(),
+            'files': files
+        })
+        return report
+
+    @staticmethod
+    def _reference_entry(rel_path: str, stat: os.stat_result, canonical: Optional[str],
+                         files: Dict[str, Dict], registry: Any) -> Optional[Dict]:
+        """Entrée de référence si le registre garantit le même contenu que la copie canonique"""
+        stored = files.get(canonical) if canonical else None
+        known = registry.files.get(rel_path) if registry is not None else None
+        if not (stored and 'chunks' in stored and known and known['sha256'] == stored['sha256']
+                and known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns):
+            return None
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': stored['sha256'],
+                'ref': canonical}
+
+    def _store_file(self, full_path: str, stat: os.stat_result, known_contents: Dict[str, List],
+                    report: SnapshotReport) -> Dict:
+        # Première passe (hash C, rapide): une copie d'un contenu connu n'est pas redécoupée
+        digest = hashlib.sha256()
+        with open(full_path, 'rb') as f:
+            for block in iter(lambda: f.read(READ_BLOCK_SIZE), b''):
+                digest.update(block)
+        sha256 = digest.hexdigest()
+        chunks = known_contents.get(sha256)
+        if chunks is not None and all(self.has_chunk(d) for d, _ in chunks):
+            report.files_reused += 1
+        else:
+            chunks = []
+            with open(full_path, 'rb') as f:
+                for data in self.chunker.iter_chunks(f):
+                    chunk_digest, written = self.put_chunk(data)
+                    chunks.append([chunk_digest, len(data)])
+                    report.bytes_read += len(data)
+                    if written:
+                        report.chunks_new += 1
+                        report.bytes_new += len(data)
+                        report.bytes_written += written
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': sha256, 'chunks': chunks}
+
+    # ------------------------------------------------------------------
+    # Restauration
+    # ------------------------------------------------------------------
+
+    def iter_file(self, snapshot_id: str, rel_path: str, manifest: Optional[Dict] = None) -> Iterator[bytes]:
+        """Contenu d'un fichier sauvegardé, bloc par bloc"""
+        manifest = manifest or self.load_manifest(snapshot_id)
+        entry = manifest['files'][rel_path]
+        if 'ref' in entry:
+            entry = manifest['files'][entry['ref']]
+        for digest, _ in entry['chunks']:
+            yield self.get_chunk(digest)
+
+    def restore(self, snapshot_id: str, target_dir: str, paths: Optional[Iterable[str]] = None) -> Dict:
+        """Restaure un snapshot (ou une sélection de fichiers) sous `target_dir`"""
+        start = time.time()
+        manifest = self.load_manifest(snapshot_id)
+        selected = sorted(manifest['files']) if paths is None else list(paths)
+        restored_bytes = 0
+        for rel_path in selected:
+            entry = manifest['files'][rel_path]
+            out_path = os.path.join(target_dir, rel_path)
+            os.makedirs(os.path.dirname(out_path) or '.', exist_ok=True)
+            digest = hashlib.sha256()
+            tmp_path = f"{out_path}.tmp{os.getpid()}"
+            with open(tmp_path, 'wb') as f:
+                for data in self.iter_file(snapshot_id, rel_path, manifest):
+                    f.write(data)
+                    digest.update(data)
+                    restored_bytes += len(data)
+            if digest.hexdigest() != entry['sha256']:
+                os.remove(tmp_path)
+                raise ValueError(f"Restauration incohérente: {rel_path}")
+            os.replace(tmp_path, out_path)
+            os.chmod(out_path, entry.get('mode', 0o644))
+            os.utime(out_path, ns=(entry['mtime_ns'], entry['mtime_ns']))
+        duration = time.time() - start
+        return {'snapshot_id': snapshot_id, 'files': len(selected), 'bytes': restored_bytes,
+                'duration': round(duration, 3),
+                'throughput_mb_s': round(restored_bytes / 1e6 / duration, 2) if duration else 0.0}
+
+    # ------------------------------------------------------------------
+    # Statistiques et rétention
+    # ------------------------------------------------------------------
+
+    def _referenced_chunks(self) -> Dict[str, int]:
+        referenced = {}
+        for filename in os.listdir(self.snapshots_dir):
+            if filename.endswith('.json'):
+                for entry in self.load_manifest(filename[:-5])['files'].values():
+                    referenced.update((d, size) for d, size in entry.get('chunks', ()))
+        return referenced
+
+    def _stored_chunks(self) -> Dict[str, str]:
+        stored = {}
+        for dirpath, _, filenames in os.walk(self.chunks_dir):
+            for filename in filenames:
+                if '.tmp' not in filename:
+                    stored[filename] = os.path.join(dirpath, filename)
+        return stored
+
+    def stats(self) -> Dict:
+        """Ratios globaux: logique (tous snapshots) / unique / physique"""
+        snapshots = self.list_snapshots()
+        logical = sum(s['stats']['bytes_total'] for s in snapshots)
+        referenced = self._referenced_chunks()
+        unique = sum(referenced.values())
+        physical = sum(os.path.getsize(p) for p in self._stored_chunks().values())
+        return {
+            'snapshots': len(snapshots),
+            'chunks': len(referenced),
+            'bytes_logical': logical,
+            'bytes_unique': unique,
+            'bytes_physical': physical,
+            'dedup_ratio': round(logical / unique, 2) if unique else None,
+            'compression_ratio': round(unique / physical, 2) if physical else None,
+            'overall_ratio': round(logical / physical, 2) if physical else None
+        }
+
+    def prune(self, keep_last: int, label: Optional[str] = None) -> Dict:
+        """Garde les `keep_last` derniers snapshots puis supprime les blocs orphelins"""
+        removed_snapshots = 0
+        for manifest in self.list_snapshots(label)[:-keep_last or None]:
+            os.remove(os.path.join(self.snapshots_dir, f"{manifest['id']}.json"))
+            removed_snapshots += 1
+        referenced = self._referenced_chunks()
+        removed_chunks = freed = 0
+        for digest, path in self._stored_chunks().items():
+            if digest not in referenced:
+                freed += os.path.getsize(path)
+                os.remove(path)
+                removed_chunks += 1
+        return {'snapshots_removed': removed_snapshots, 'chunks_removed': removed_chunks, 'bytes_freed': freed}
+
+
+def load_module_registry(root: str):
+    """ModuleRegistry de `root` (GOVERNANCE/Copilotage/agents), None s'il est introuvable"""
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 '..', '..', '..', 'GOVERNANCE', 'Copilotage', 'agents'))
+    try:
+        from module_registry import ModuleRegistry
+    except ImportError:
+        return None
+    return ModuleRegistry(root)
+
+
+def print_snapshot_report(report: SnapshotReport):
+    ratio = f"{report.dedup_ratio:.1f}x" if report.bytes_new else "∞ (aucun bloc nouveau)"
+    print(f"💾 Snapshot {report.snapshot_id}: {report.files} fichiers, {report.bytes_total / 1e6:.1f} Mo")
+    print(f"   🧩 {report.chunks_new}/{report.chunks_total} blocs nouveaux, "
+          f"{report.bytes_new / 1e6:.2f} Mo nouveaux -> {report.bytes_written / 1e6:.2f} Mo écrits")
+    print(f"   ♻️ {report.files_reused} fichiers repris sans découpage, déduplication {ratio}")
+    if report.files_referenced:
+        print(f"   🧬 {report.files_referenced} copies de modules enregistrées comme références")
+    print(f"   ⚡ {report.duration:.2f}s, {report.throughput_mb_s:.1f} Mo/s")
+    for error in report.errors:
+        print(f"   ⚠️ {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sauvegarde dédupliquée par blocs de contenu")
+    parser.add_argument('--store', default='vacation_backups/store', help="Répertoire du magasin")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    snapshot_parser = subparsers.add_parser('snapshot', help="Nouveau snapshot d'une arborescence")
+    snapshot_parser.add_argument('root', nargs='?', default='.')
+    snapshot_parser.add_argument('--label', default='paninifs')
+    snapshot_parser.add_argument('--exclude', action='append', default=[], help="Motif fnmatch (répétable)")
+    snapshot_parser.add_argument('--compression', default='auto', choices=['auto', 'zstd', 'zlib', 'none'])
+    snapshot_parser.add_argument('--no-module-registry', action='store_true',
+                                 help="Copies de modules stockées sans références vers la copie canonique")
+
+    restore_parser = subparsers.add_parser('restore', help="Restaure un snapshot")
+    restore_parser.add_argument('snapshot_id')
+    restore_parser.add_argument('target_dir')
+    restore_parser.add_argument('paths', nargs='*')
+
+    subparsers.add_parser('list', help="Liste les snapshots")
+    subparsers.add_parser('stats', help="Ratios de déduplication et compression")
+
+    prune_parser = subparsers.add_parser('prune', help="Rétention des N derniers snapshots")
+    prune_parser.add_argument('keep_last', type=int)
+    prune_parser.add_argument('--label')
+
+    args = parser.parse_args()
+    store = DedupBackupStore(args.store, compression=getattr(args, 'compression', 'auto'))
+
+    if args.command == 'snapshot':
+        registry = None if args.no_module_registry else load_module_registry(args.root)
+        report = store.snapshot(args.root, label=args.label, excludes=args.exclude, registry=registry)
+        if registry is not None:
+            registry.save()
+        print_snapshot_report(report)
+        return 1 if report.errors else 0
+    if args.command == 'restore':
+        result = store.restore(args.snapshot_id, args.target_dir, args.paths or None)
+        print(f"📦 {result['files']} fichiers restaurés, {result['bytes'] / 1e6:.1f} Mo "
+              f"({result['throughput_mb_s']:.1f} Mo/s)")
+    elif args.command == 'list':
+        for snapshot in store.list_snapshots():
+            stats = snapshot['stats']
+            print(f"   {snapshot['id']}: {stats['files']} fichiers, {stats['bytes_total'] / 1e6:.1f} Mo, "
+                  f"{stats['bytes_written'] / 1e6:.2f} Mo écrits")
+    elif args.command == 'stats':
+        for key, value in store.stats().items():
+            print(f"   {key}: {value}")
+    elif args.command == 'prune':
+        print(f"🧹 {store.prune(args.keep_last, args.label)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
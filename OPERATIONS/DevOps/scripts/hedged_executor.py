@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+🏁 EXÉCUTEUR MULTI-PATH "HEDGED"
+================================
+
+Lance plusieurs chemins d'exécution alternatifs (Colab, local, fallback...)
+en parallèle ou en décalé: chaque chemin de secours démarre dès que le
+précédent échoue, ou après un délai de couverture (hedge delay). Le premier
+succès gagne, les autres chemins sont annulés coopérativement via leur
+CancelToken.
+
+Les latences observées par chemin sont conservées (et persistables) pour
+régler les délais de couverture sur le p95 réel plutôt qu'au jugé.
+
+Accepte n'importe quel callable: s'il déclare un paramètre `cancel_token`
+(ou **kwargs), il reçoit le jeton d'annulation.
+"""
+
+import inspect
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+class PathCancelled(Exception):
+    """Levée dans un chemin perdant quand il consulte son jeton"""
+
+
+class AllPathsFailed(RuntimeError):
+    """Tous les chemins ont échoué"""
+
+    def __init__(self, attempts: List['PathAttempt']):
+        self.attempts = attempts
+        details = ', '.join(f"{a.name}: {a.error or a.outcome}" for a in attempts)
+        super().__init__(f"Tous les chemins ont échoué ({details})")
+
+
+class HedgeTimeout(TimeoutError):
+    """Aucun chemin n'a réussi avant l'échéance"""
+
+    def __init__(self, timeout: float, attempts: List['PathAttempt']):
+        self.attempts = attempts
+        super().__init__(f"Aucun chemin réussi en {timeout:.1f}s")
+
+
+class CancelToken:
+    """Annulation coopérative: le chemin consulte check() ou dort via sleep()"""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.reason = ''
+
+    def cancel(self, reason: str = 'cancelled'):
+        self.reason = reason
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def check(self):
+        if self._event.is_set():
+            raise PathCancelled(self.reason)
+
+    def sleep(self, seconds: float):
+        """Attente interrompue dès l'annulation"""
+        if self._event.wait(seconds):
+            raise PathCancelled(self.reason)
+
+
+@dataclass
+class ExecutionPath:
+    """Chemin alternatif; hedge_delay=None -> délai dérivé des latences observées"""
+    name: str
+    func: Callable[..., Any]
+    args: tuple = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    hedge_delay: Optional[float] = None
+
+    def accepts_token(self) -> bool:
+        try:
+            parameters = inspect.signature(self.func).parameters.values()
+        except (TypeError, ValueError):
+            return False
+        return any(p.name == 'cancel_token' or p.kind == inspect.Parameter.VAR_KEYWORD for p in parameters)
+
+
+@dataclass
+class PathAttempt:
+    name: str
+    started_at: float
+    duration: float = 0.0
+    outcome: str = 'running'  # success, failure, cancelled, running
+    error: str = ''
+
+
+@dataclass
+class HedgeResult:
+    winner: str
+    value: Any
+    latency: float
+    attempts: List[PathAttempt]
+
+    def to_dict(self) -> Dict:
+        return {
+            'winner': self.winner,
+            'latency': round(self.latency, 4),
+            'attempts': [{'name': a.name, 'started_at': round(a.started_at, 4),
+                          'duration': round(a.duration, 4), 'outcome': a.outcome, 'error': a.error}
+                         for a in self.attempts]
+        }
+
+
+class LatencyTracker:
+    """Distribution des latences par chemin (fenêtre glissante) + compteurs d'issues"""
+
+    def __init__(self, path: Optional[str] = None, window: int = 256):
+        self.path = path
+        self.window = window
+        self.samples: Dict[str, deque] = {}
+        self.outcomes: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            self.load()
+
+    def record(self, name: str, duration: float, outcome: str):
+        with self._lock:
+            counts = self.outcomes.setdefault(name, {'success': 0, 'failure': 0, 'cancelled': 0})
+            counts[outcome] = counts.get(outcome, 0) + 1
+            # Les chemins annulés n'ont pas de latence complète: pas d'échantillon
+            if outcome != 'cancelled':
+                self.samples.setdefault(name, deque(maxlen=self.window)).append(duration)
+
+    def percentile(self, name: str, q: float) -> Optional[float]:
+        with self._lock:
+            values = sorted(self.samples.get(name, ()))
+        if not values:
+            return None
+        index = min(len(values) - 1, max(0, int(round(q / 100 * (len(values) - 1)))))
+        return values[index]
+
+    def suggest_hedge_delay(self, name: str, q: float = 95, min_samples: int = 5) -> Optional[float]:
+        """Délai avant de couvrir `name`: son p95 s'il a assez d'historique"""
+        if len(self.samples.get(name, ())) < min_samples:
+            return None
+        return self.percentile(name, q)
+
+    def summary(self) -> Dict[str, Dict]:
+        report = {}
+        for name in sorted(set(self.samples) | set(self.outcomes)):
+            report[name] = {
+                'samples': len(self.samples.get(name, ())),
+                'p50': self.percentile(name, 50),
+                'p95': self.percentile(name, 95),
+                **self.outcomes.get(name, {})
+            }
+        return report
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            data = {'samples': {k: list(v) for k, v in self.samples.items()}, 'outcomes': self.outcomes}
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.samples = {k: deque(v, maxlen=self.window) for k, v in data.get('samples', {}).items()}
+        self.outcomes = data.get('outcomes', {})
+
+
+class HedgedExecutor:
+    """Premier succès gagnant parmi des chemins lancés en cascade couverte"""
+
+    def __init__(self, latency: Optional[LatencyTracker] = None, default_hedge_delay: float = 2.0,
+                 is_success: Callable[[Any], bool] = lambda value: value is not False):
+        self.latency = latency or LatencyTracker()
+        self.default_hedge_delay = default_hedge_delay
+        self.is_success = is_success
+
+    def hedge_delay_for(self, paths: Sequence[ExecutionPath], index: int) -> float:
+        """Délai entre le lancement du chemin index-1 et celui du chemin index"""
+        path = paths[index]
+        if path.hedge_delay is not None:
+            return path.hedge_delay
+        suggested = self.latency.suggest_hedge_delay(paths[index - 1].name)
+        return self.default_hedge_delay if suggested is None else suggested
+
+    def _launch(self, path: ExecutionPath, token: CancelToken, attempt: PathAttempt, done: queue.Queue):
+        def runner():
+            start = time.perf_counter()
+            kwargs = dict(path.kwargs)
+            if path.accepts_token():
+                kwargs['cancel_token'] = token
+            try:
+                value = path.func(*path.args, **kwargs)
+                outcome, error = ('success', '') if self.is_success(value) else ('failure', 'résultat négatif')
+            except PathCancelled:
+                value, outcome, error = None, 'cancelled', ''
+            except Exception as e:
+                value, outcome, error = None, 'failure', f"{type(e).__name__}: {e}"
+            done.put((attempt, value, outcome, error, time.perf_counter() - start))
+
+        thread = threading.Thread(target=runner, name=f"hedge-{path.name}", daemon=True)
+        thread.start()
+        return thread
+
+    def run(self, paths: Sequence[ExecutionPath], timeout: Optional[float] = None) -> HedgeResult:
+        """Exécute les chemins; lève AllPathsFailed ou HedgeTimeout si aucun ne réussit"""
+        if not paths:
+            raise ValueError("Aucun chemin d'exécution fourni")
+        origin = time.perf_counter()
+        deadline = origin + timeout if timeout is not None else None
+        done: queue.Queue = queue.Queue()
+        tokens: List[CancelToken] = []
+        attempts: List[PathAttempt] = []
+        running = 0
+        next_index = 0
+        next_launch_at = origin
+
+        def abandon_running(reason: str):
+            for other, token in zip(attempts, tokens):
+                if other.outcome == 'running':
+                    token.cancel(reason)
+                    other.outcome = 'cancelled'
+                    other.duration = time.perf_counter() - origin - other.started_at
+                    self.latency.record(other.name, other.duration, 'cancelled')
+
+        while True:
+            now = time.perf_counter()
+            # Lancement du prochain chemin (échéance de couverture atteinte ou plus rien en cours)
+            while next_index < len(paths) and (now >= next_launch_at or running == 0):
+                path = paths[next_index]
+                attempt = PathAttempt(name=path.name, started_at=now - origin)
+                tokens.append(CancelToken())
+                attempts.append(attempt)
+                self._launch(path, tokens[-1], attempt, done)
+                running += 1
+                next_index += 1
+                if next_index < len(paths):
+                    next_launch_at = now + self.hedge_delay_for(paths, next_index)
+
+            if running == 0:
+                raise AllPathsFailed(attempts)
+
+            waits = [next_launch_at - now] if next_index < len(paths) else []
+            if deadline is not None:
+                waits.append(deadline - now)
+            wait = max(0.0, min(waits)) if waits else None
+            try:
+                attempt, value, outcome, error, duration = done.get(timeout=wait)
+            except queue.Empty:
+                if deadline is not None and time.perf_counter() >= deadline:
+                    abandon_running('timeout')
+                    raise HedgeTimeout(timeout, attempts)
+                continue
+
+            running -= 1
+            attempt.outcome, attempt.error, attempt.duration = outcome, error, duration
+            self.latency.record(attempt.name, duration, outcome)
+            if outcome == 'success':
+                abandon_running(f"{attempt.name} a gagné")
+                return HedgeResult(winner=attempt.name, value=value,
+                                   latency=time.perf_counter() - origin, attempts=attempts)
+            # Échec: le chemin suivant démarre sans attendre son délai de couverture
+            next_launch_at = time.perf_counter()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+⏱️ BENCHMARK TEMPS D'IMPORT DES SCRIPTS D'ENTRÉE
+================================================
+
+Mesure, pour chaque script exécutable (bloc `if __name__ == "__main__"`)
+des scripts DevOps et des modules ECOSYSTEM, le coût de démarrage payé
+avant main(): interpréteur neuf + `python -X importtime`, import du
+module seul. Le daemon relançant chaque script dans un interpréteur
+neuf, c'est la latence de toute action courte.
+
+Compare à une référence (import_time_baseline.json) pour détecter les
+régressions, par ex. un `import numpy` remonté en tête de module:
+
+    python import_time_benchmark.py            # tableau
+    python import_time_benchmark.py --update   # nouvelle référence
+    python import_time_benchmark.py --check    # code 1 si régression
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(SCRIPTS_DIR)))
+DEFAULT_ENTRY_DIRS = [SCRIPTS_DIR, os.path.join(REPO_ROOT, 'ECOSYSTEM')]
+BASELINE_FILE = os.path.join(SCRIPTS_DIR, 'import_time_baseline.json')
+
+MAIN_GUARD = re.compile(r'^if __name__ == [\'"]__main__[\'"]\s*:', re.MULTILINE)
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)\s*$')
+
+
+@dataclass
+class ImportTiming:
+    """Coût de démarrage d'un script (meilleur de N runs)"""
+    script: str
+    import_ms: float = 0.0        # cumul -X importtime du module du script
+    wall_ms: float = 0.0          # processus complet (interpréteur + import)
+    modules: int = 0
+    heaviest: List[List] = field(default_factory=list)  # [paquet racine, ms]
+    error: str = ''
+
+
+def discover_entry_scripts(directories: Sequence[str] = DEFAULT_ENTRY_DIRS) -> List[str]:
+    """Scripts avec un point d'entrée __main__ (hors tests et setup.py)"""
+    scripts = []
+    for directory in directories:
+        for root, dirs, files in os.walk(directory):
+            dirs[:] = sorted(d for d in dirs if d not in ('tests', '__pycache__', 'venv') and not d.startswith('.'))
+            for name in sorted(files):
+                if not name.endswith('.py') or name == 'setup.py' or name.startswith('test_'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                        if MAIN_GUARD.search(f.read()):
+                            scripts.append(path)
+                except OSError:
+                    continue
+    return scripts
+
+
+def parse_importtime(stderr: str, module: str) -> Dict:
+    """Cumul du module visé, nombre de modules, paquets racine les plus lourds"""
+    total_us, count, top_level = 0, 0, {}
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = int(match.group(1)), int(match.group(2)), match.group(3), match.group(4)
+        count += 1
+        if name == module and len(indent) <= 1:
+            total_us = cumulative_us
+        # Imports directs du module (un niveau d'indentation sous lui)
+        elif len(indent) == 3:
+            root = name.split('.')[0]
+            top_level[root] = top_level.get(root, 0) + cumulative_us
+    heaviest = sorted(top_level.items(), key=lambda item: -item[1])[:5]
+    return {'import_us': total_us, 'modules': count,
+            'heaviest': [[name, round(us / 1000, 1)] for name, us in heaviest]}
+
+
+def measure_script(path: str, runs: int = 3, timeout: float = 60.0) -> ImportTiming:
+    directory, module = os.path.dirname(path), os.path.splitext(os.path.basename(path))[0]
+    timing = ImportTiming(script=os.path.relpath(path, REPO_ROOT))
+    # Le dossier du script en tête: les placeholders vides de la racine ne masquent rien
+    code = f"import sys; sys.path.insert(0, {directory!r}); import {module}"
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        try:
+            result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=directory,
+                                    stdin=subprocess.DEVNULL, capture_output=True, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            timing.error = f"timeout {timeout:.0f}s"
+            return timing
+        wall = time.perf_counter() - start
+        if result.returncode != 0:
+            lines = [l for l in result.stderr.splitlines() if not l.startswith('import time:')]
+            timing.error = lines[-1][:160] if lines else f"exit {result.returncode}"
+            return timing
+        parsed = parse_importtime(result.stderr, module)
+        if best is None or parsed['import_us'] < best[0]['import_us']:
+            best = (parsed, wall)
+    parsed, wall = best
+    timing.import_ms = round(parsed['import_us'] / 1000, 1)
+    timing.wall_ms = round(wall * 1000, 1)
+    timing.modules = parsed['modules']
+    timing.heaviest = parsed['heaviest']
+    return timing
+
+
+def run_benchmark(scripts: Sequence[str], runs: int = 3) -> Dict[str, ImportTiming]:
+    return {timing.script: timing for timing in (measure_script(path, runs) for path in scripts)}
+
+
+def load_baseline(path: str = BASELINE_FILE) -> Dict[str, Dict]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('scripts', {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_baseline(results: Dict[str, ImportTiming], path: str = BASELINE_FILE):
+    data = {
+        'python': sys.version.split()[0],
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'scripts': {name: {'import_ms': t.import_ms, 'wall_ms': t.wall_ms}
+                    for name, t in sorted(results.items()) if not t.error}
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+        f.write('\n')
+
+
+def find_regressions(results: Dict[str, ImportTiming], baseline: Dict[str, Dict],
+                     tolerance: float = 0.5, min_delta_ms: float = 30.0) -> List[Dict]:
+    """Scripts dont l'import dépasse la référence de +tolerance ET de +min_delta_ms"""
+    regressions = []
+    for name, timing in sorted(results.items()):
+        reference = baseline.get(name)
+        if timing.error or not reference:
+            continue
+        before = reference['import_ms']
+        if timing.import_ms > before * (1 + tolerance) and timing.import_ms - before > min_delta_ms:
+            regressions.append({'script': name, 'baseline_ms': before, 'import_ms': timing.import_ms,
+                                'heaviest': timing.heaviest})
+    return regressions
+
+
+def print_results(results: Dict[str, ImportTiming], baseline: Dict[str, Dict], limit: Optional[int] = None):
+    ordered = sorted(results.values(), key=lambda t: (bool(t.error), -t.import_ms))
+    print(f"{'script':<60} {'import':>9} {'process':>9} {'réf.':>9}  imports les plus lourds")
+    for timing in ordered[:limit]:
+        if timing.error:
+            print(f"{timing.script:<60} {'—':>9} {'—':>9} {'':>9}  ❌ {timing.error}")
+            continue
+        reference = baseline.get(timing.script, {}).get('import_ms')
+        ref = f"{reference:.1f}" if reference is not None else '—'
+        heavy = ', '.join(f"{name} {ms:.0f}ms" for name, ms in timing.heaviest[:3])
+        print(f"{timing.script:<60} {timing.import_ms:>7.1f}ms {timing.wall_ms:>7.1f}ms {ref:>9}  {heavy}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Temps d'import des scripts d'entrée (-X importtime)")
+    parser.add_argument('paths', nargs='*', help="scripts ou dossiers (défaut: scripts DevOps + ECOSYSTEM)")
+    parser.add_argument('--runs', type=int, default=3, help="runs par script (meilleur retenu)")
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--update', action='store_true', help="écrire la référence")
+    parser.add_argument('--check', action='store_true', help="code 1 en cas de régression")
+    parser.add_argument('--tolerance', type=float, default=0.5)
+    parser.add_argument('--min-delta-ms', type=float, default=30.0)
+    parser.add_argument('--limit', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    scripts = [p for p in args.paths if os.path.isfile(p)]
+    directories = [p for p in args.paths if os.path.isdir(p)]
+    if directories or not args.paths:
+        scripts += discover_entry_scripts(directories or DEFAULT_ENTRY_DIRS)
+    scripts = [os.path.abspath(p) for p in scripts]
+
+    print(f"⏱️ IMPORT TIME - {len(scripts)} scripts, {args.runs} run(s) chacun")
+    baseline = load_baseline(args.baseline)
+    results = run_benchmark(scripts, args.runs)
+    print_results(results, baseline, args.limit)
+
+    errors = sum(1 for t in results.values() if t.error)
+    measured = [t.import_ms for t in results.values() if not t.error]
+    if measured:
+        print(f"\n📊 {len(measured)} mesurés, {errors} en erreur | médiane {sorted(measured)[len(measured) // 2]:.1f}ms"
+              f" | max {max(measured):.1f}ms")
+
+    if args.update:
+        save_baseline(results, args.baseline)
+        print(f"💾 Référence mise à jour: {args.baseline}")
+
+    regressions = find_regressions(results, baseline, args.tolerance, args.min_delta_ms)
+    for regression in regressions:
+        heavy = ', '.join(f"{name} {ms:.0f}ms" for name, ms in regression['heaviest'][:3])
+        print(f"🚨 RÉGRESSION {regression['script']}: {regression['baseline_ms']:.1f}ms -> "
+              f"{regression['import_ms']:.1f}ms ({heavy})")
+    return 1 if args.check and regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+💤 IMPORTS PARESSEUX DES DÉPENDANCES LOURDES
+============================================
+
+numpy, sklearn, sentence_transformers (torch), cbor2... ne sont importés
+qu'au premier accès à un attribut, pas au démarrage du script. Le daemon
+relance chaque script dans un interpréteur neuf: une action courte ne
+doit pas payer l'import de dépendances que son chemin de code n'utilise pas.
+
+    np = lazy_import('numpy')
+    cosine_similarity = lazy_callable('sklearn.metrics.pairwise', 'cosine_similarity')
+    CBOR2_AVAILABLE = module_available('cbor2')   # sans importer
+
+Les annotations qui référencent un module paresseux (np.ndarray) doivent
+être différées: `from __future__ import annotations`.
+"""
+
+import importlib
+import importlib.util
+import threading
+from typing import Any, Callable
+
+
+def module_available(name: str) -> bool:
+    """Module installé? (recherche du spec du paquet racine, aucun import)"""
+    try:
+        return importlib.util.find_spec(name.split('.')[0]) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class LazyModule:
+    """Proxy de module importé au premier accès d'attribut"""
+
+    def __init__(self, name: str):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+        self.__dict__['_lock'] = threading.Lock()
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            with self.__dict__['_lock']:
+                module = self.__dict__['_module']
+                if module is None:
+                    module = importlib.import_module(self.__dict__['_name'])
+                    self.__dict__['_module'] = module
+        return module
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.__dict__['_module'] is not None
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr: str, value: Any):
+        setattr(self._load(), attr, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = 'chargé' if self.is_loaded else 'non chargé'
+        return f"<LazyModule {self.__dict__['_name']} ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    return LazyModule(name)
+
+
+def lazy_callable(module_name: str, attr: str) -> Callable:
+    """Fonction/classe d'un module, importé au premier appel"""
+    module = LazyModule(module_name)
+
+    def call(*args, **kwargs):
+        return getattr(module, attr)(*args, **kwargs)
+
+    call.__name__ = call.__qualname__ = attr
+    call.__doc__ = f"{module_name}.{attr} (import paresseux)"
+    return call
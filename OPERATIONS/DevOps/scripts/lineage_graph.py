@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+🧬 GRAPHE DE LIGNAGE DES ATOMES SÉMANTIQUES
+==========================================
+
+Graphe de provenance orienté "origine -> dérivé", construit depuis les
+ProvenanceRecord des stores (*_semantic_store.json):
+
+    agent -> agent@méthode -> atome
+    url (source_url, parent_sources) -> atome
+    source non-URL (ex. historical_year_1859) -> atome
+    atome parent (parent_sources = id d'atome) -> atome
+
+Stockage compact: nœuds numérotés (clé "type:valeur" -> entier), arêtes en
+CSR (offsets + cibles, array('I')) dans les deux sens. Les requêtes
+transitives sont des BFS dont le coût suit la partie atteinte du graphe,
+pas sa taille totale.
+
+Un parent non-URL est résolu après le chargement de tous les stores (atome
+s'il existe un atome de cet id dans n'importe quel store, sinon source):
+le graphe ne dépend pas de l'ordre des stores.
+
+Persisté à côté des stores (semantic_lineage.plg) et reconstruit seulement
+si un store a changé (taille, mtime).
+"""
+
+import glob
+import json
+import os
+import struct
+import sys
+import time
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from atom_index import content_atom_id
+
+MAGIC = b"PNLIN\x00\x00\x01"
+FORMAT_VERSION = 1
+DEFAULT_GRAPH_NAME = 'semantic_lineage.plg'
+STORE_PATTERN = '*_semantic_store.json'
+
+NODE_KINDS = ('atom', 'agent', 'agent_version', 'url', 'source')
+ATOM, AGENT, AGENT_VERSION, URL, SOURCE = range(len(NODE_KINDS))
+
+
+def atom_identifier(atom: Dict) -> str:
+    """id de l'atome, sinon atom_id de la provenance, sinon empreinte du contenu"""
+    provenance = atom.get('provenance') or {}
+    return str(atom.get('id') or provenance.get('atom_id') or content_atom_id(atom))
+
+
+def store_signature(store_paths: Sequence[str]) -> Dict[str, List[int]]:
+    """(taille, mtime) de chaque store, par nom de fichier"""
+    signature = {}
+    for path in store_paths:
+        stat = os.stat(path)
+        signature[os.path.basename(path)] = [stat.st_size, stat.st_mtime_ns]
+    return signature
+
+
+def _csr(num_nodes: int, sources: array, targets: array) -> Tuple[array, array]:
+    """Offsets + cibles triés par nœud source (tri par comptage)"""
+    offsets = array('I', bytes(4 * (num_nodes + 1)))
+    for s in sources:
+        offsets[s + 1] += 1
+    for i in range(num_nodes):
+        offsets[i + 1] += offsets[i]
+    position = array('I', offsets)
+    ordered = array('I', bytes(4 * len(targets)))
+    for s, t in zip(sources, targets):
+        ordered[position[s]] = t
+        position[s] += 1
+    return offsets, ordered
+
+
+class LineageGraph:
+    """Graphe de lignage en tableaux d'entiers (CSR avant et arrière)"""
+
+    def __init__(self):
+        self.keys: List[str] = []
+        self.ids: Dict[str, int] = {}
+        self.kinds = array('B')
+        self._sources = array('I')
+        self._targets = array('I')
+        self._frozen = None  # (fwd_offsets, fwd_targets, rev_offsets, rev_targets)
+        self._linked_versions = set()
+        self._deferred: List[Tuple[str, int]] = []  # (parent non-URL, enfant) à résoudre
+        self.sources_meta: Dict[str, List[int]] = {}
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    def node(self, key: str, kind: int) -> int:
+        node_id = self.ids.get(key)
+        if node_id is None:
+            node_id = self.ids[key] = len(self.keys)
+            self.keys.append(key)
+            self.kinds.append(kind)
+            self._frozen = None
+        return node_id
+
+    def add_edge(self, parent: int, child: int):
+        self._sources.append(parent)
+        self._targets.append(child)
+        self._frozen = None
+
+    def add_atoms(self, atoms: Iterable[Dict]) -> int:
+        """Ajoute les atomes et leurs arêtes de provenance; retourne le nombre d'atomes
+
+        Les parents non-URL inconnus comme atomes sont résolus plus tard
+        (resolve_parents), un atome parent pouvant venir d'un store suivant.
+        """
+        atoms = list(atoms)
+        atom_ids = {atom_identifier(atom) for atom in atoms}
+        atom_ids.update(k[5:] for k in self.ids if k.startswith('atom:'))
+        for atom in atoms:
+            provenance = atom.get('provenance') or {}
+            child = self.node(f"atom:{atom_identifier(atom)}", ATOM)
+            parents, deferred = set(), set()
+
+            agent = provenance.get('source_agent')
+            if agent:
+                agent_id = self.node(f"agent:{agent}", AGENT)
+                method = provenance.get('method') or provenance.get('collection_method')
+                if method:
+                    version_id = self.node(f"agent_version:{agent}@{method}", AGENT_VERSION)
+                    if version_id not in self._linked_versions:
+                        self._linked_versions.add(version_id)
+                        self.add_edge(agent_id, version_id)
+                    parents.add(version_id)
+                else:
+                    parents.add(agent_id)
+
+            declared = list(provenance.get('parent_sources') or [])
+            if provenance.get('source_url'):
+                declared.append(provenance['source_url'])
+            for parent in declared:
+                parent = str(parent).replace('\n', ' ')
+                if parent in atom_ids:
+                    parents.add(self.node(f"atom:{parent}", ATOM))
+                elif '://' in parent:
+                    parents.add(self.node(f"url:{parent}", URL))
+                else:
+                    deferred.add(parent)
+
+            parents.discard(child)
+            for parent_id in sorted(parents):
+                self.add_edge(parent_id, child)
+            self._deferred.extend((parent, child) for parent in sorted(deferred))
+        return len(atoms)
+
+    def resolve_parents(self):
+        """Parents différés: atome s'il est désormais connu, sinon source"""
+        deferred, self._deferred = self._deferred, []
+        for parent, child in deferred:
+            parent_id = self.ids.get(f"atom:{parent}")
+            if parent_id is None:
+                parent_id = self.node(f"source:{parent}", SOURCE)
+            if parent_id != child:
+                self.add_edge(parent_id, child)
+
+    @classmethod
+    def from_stores(cls, store_paths: Sequence[str]) -> 'LineageGraph':
+        graph = cls()
+        for path in store_paths:
+            with open(path, encoding='utf-8') as f:
+                atoms = json.load(f).get('semantic_atoms', [])
+            graph.add_atoms(atoms)
+        graph.resolve_parents()
+        graph.sources_meta = store_signature(store_paths)
+        return graph
+
+    def _csr_arrays(self) -> Tuple[array, array, array, array]:
+        if self._deferred:
+            self.resolve_parents()
+        if self._frozen is None:
+            fwd_offsets, fwd_targets = _csr(len(self.keys), self._sources, self._targets)
+            rev_offsets, rev_targets = _csr(len(self.keys), self._targets, self._sources)
+            self._frozen = (fwd_offsets, fwd_targets, rev_offsets, rev_targets)
+        return self._frozen
+
+    # ------------------------------------------------------------------
+    # Requêtes
+    # ------------------------------------------------------------------
+
+    def _bfs(self, start: Iterable[int], reverse: bool = False) -> List[int]:
+        fwd_offsets, fwd_targets, rev_offsets, rev_targets = self._csr_arrays()
+        offsets, targets = (rev_offsets, rev_targets) if reverse else (fwd_offsets, fwd_targets)
+        seen = bytearray(len(self.keys))
+        frontier = []
+        for node_id in start:
+            if not seen[node_id]:
+                seen[node_id] = 1
+                frontier.append(node_id)
+        reached = []
+        while frontier:
+            next_frontier = []
+            for u in frontier:
+                for v in targets[offsets[u]:offsets[u + 1]]:
+                    if not seen[v]:
+                        seen[v] = 1
+                        next_frontier.append(v)
+            reached.extend(next_frontier)
+            frontier = next_frontier
+        return reached
+
+    def _filter(self, node_ids: Iterable[int], kinds: Optional[Iterable[str]]) -> List[str]:
+        if kinds is None:
+            return [self.keys[n] for n in node_ids]
+        wanted = {NODE_KINDS.index(k) for k in kinds}
+        return [self.keys[n] for n in node_ids if self.kinds[n] in wanted]
+
+    def __contains__(self, key: str) -> bool:
+        if self._deferred:
+            self.resolve_parents()
+        return key in self.ids
+
+    def children(self, key: str) -> List[str]:
+        fwd_offsets, fwd_targets, _, _ = self._csr_arrays()
+        node_id = self.ids[key]
+        return [self.keys[v] for v in fwd_targets[fwd_offsets[node_id]:fwd_offsets[node_id + 1]]]
+
+    def parents(self, key: str) -> List[str]:
+        _, _, rev_offsets, rev_targets = self._csr_arrays()
+        node_id = self.ids[key]
+        return [self.keys[v] for v in rev_targets[rev_offsets[node_id]:rev_offsets[node_id + 1]]]
+
+    def descendants(self, key: str, kinds: Optional[Iterable[str]] = None) -> List[str]:
+        """Tout ce qui dérive (transitivement) du nœud, ex. atomes d'une URL"""
+        if key not in self:
+            return []
+        return self._filter(self._bfs([self.ids[key]]), kinds)
+
+    def ancestors(self, key: str, kinds: Optional[Iterable[str]] = None) -> List[str]:
+        """Toute la provenance (transitive) du nœud"""
+        if key not in self:
+            return []
+        return self._filter(self._bfs([self.ids[key]], reverse=True), kinds)
+
+    def derived_atoms(self, key: str) -> List[str]:
+        return self.descendants(key, kinds=('atom',))
+
+    def retraction_impact(self, keys: Iterable[str]) -> Dict[str, List[str]]:
+        """Retrait de sources: atomes touchés et atomes qui n'auraient plus aucune source
+
+        Un atome touché reste sourcé s'il a encore un parent URL, source ou atome
+        hors de la zone retirée, ou un atome parent lui-même resté sourcé.
+        """
+        start = [self.ids[k] for k in keys if k in self]
+        reached = self._bfs(start)
+        retracted = bytearray(len(self.keys))
+        for node_id in start + reached:
+            retracted[node_id] = 1
+        fwd_offsets, fwd_targets, rev_offsets, rev_targets = self._csr_arrays()
+        evidence_kinds = (URL, SOURCE, ATOM)
+        impacted = [n for n in reached if self.kinds[n] == ATOM]
+
+        # Atomes encore sourcés hors zone, puis propagation vers leurs dérivés touchés
+        supported = bytearray(len(self.keys))
+        frontier = []
+        for node_id in impacted:
+            if any(not retracted[p] and self.kinds[p] in evidence_kinds
+                   for p in rev_targets[rev_offsets[node_id]:rev_offsets[node_id + 1]]):
+                supported[node_id] = 1
+                frontier.append(node_id)
+        while frontier:
+            next_frontier = []
+            for u in frontier:
+                for v in fwd_targets[fwd_offsets[u]:fwd_offsets[u + 1]]:
+                    if retracted[v] and not supported[v] and self.kinds[v] == ATOM:
+                        supported[v] = 1
+                        next_frontier.append(v)
+            frontier = next_frontier
+
+        return {'impacted': [self.keys[n] for n in impacted],
+                'orphaned': [self.keys[n] for n in impacted if not supported[n]]}
+
+    def stats(self) -> Dict:
+        if self._deferred:
+            self.resolve_parents()
+        counts = [0] * len(NODE_KINDS)
+        for kind in self.kinds:
+            counts[kind] += 1
+        return {'nodes': len(self.keys), 'edges': len(self._sources), **dict(zip(NODE_KINDS, counts))}
+
+    # ------------------------------------------------------------------
+    # Persistance
+    # ------------------------------------------------------------------
+
+    def save(self, path: str):
+        fwd_offsets, fwd_targets, rev_offsets, rev_targets = self._csr_arrays()
+        keys_blob = '\n'.join(self.keys).encode('utf-8')
+        buffers = [keys_blob, self.kinds.tobytes(), fwd_offsets.tobytes(), fwd_targets.tobytes(),
+                   rev_offsets.tobytes(), rev_targets.tobytes()]
+        header = json.dumps({
+            'version': FORMAT_VERSION,
+            'byteorder': sys.byteorder,
+            'nodes': len(self.keys),
+            'edges': len(fwd_targets),
+            'buffers': [len(b) for b in buffers],
+            'sources': self.sources_meta
+        }).encode('utf-8')
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack('<Q', len(header)))
+            f.write(header)
+            for buffer in buffers:
+                f.write(buffer)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'LineageGraph':
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Fichier de lignage invalide: {path}")
+            (header_size,) = struct.unpack('<Q', f.read(8))
+            header = json.loads(f.read(header_size))
+            if header.get('version') != FORMAT_VERSION:
+                raise ValueError(f"Version de lignage non supportée: {header.get('version')}")
+            raw = [f.read(size) for size in header['buffers']]
+
+        graph = cls()
+        graph.keys = raw[0].decode('utf-8').split('\n') if header['nodes'] else []
+        graph.ids = {key: i for i, key in enumerate(graph.keys)}
+        graph.kinds = array('B', raw[1])
+        arrays = []
+        for blob in raw[2:]:
+            values = array('I')
+            values.frombytes(blob)
+            if header['byteorder'] != sys.byteorder:
+                values.byteswap()
+            arrays.append(values)
+        graph._frozen = tuple(arrays)
+        # Liste d'arêtes (source, cible) reconstituée depuis le CSR avant
+        fwd_offsets, fwd_targets = arrays[0], arrays[1]
+        graph._targets = array('I', fwd_targets)
+        graph._sources = array('I', bytes(4 * len(fwd_targets)))
+        for u in range(header['nodes']):
+            for i in range(fwd_offsets[u], fwd_offsets[u + 1]):
+                graph._sources[i] = u
+        graph._linked_versions = {v for v, kind in enumerate(graph.kinds) if kind == AGENT_VERSION}
+        graph.sources_meta = header.get('sources', {})
+        return graph
+
+    @classmethod
+    def load_or_build(cls, store_paths: Sequence[str], graph_path: str) -> 'LineageGraph':
+        """Graphe persisté s'il correspond aux stores (taille, mtime), sinon reconstruit"""
+        current = store_signature(store_paths)
+        if os.path.exists(graph_path):
+            try:
+                graph = cls.load(graph_path)
+                if graph.sources_meta == current:
+                    return graph
+            except (OSError, ValueError):
+                pass
+        graph = cls.from_stores(store_paths)
+        try:
+            graph.save(graph_path)
+        except OSError as e:
+            print(f"⚠️ Graphe de lignage non persisté: {e}")
+        return graph
+
+
+def discover_stores(directory: str = '.') -> List[str]:
+    return sorted(glob.glob(os.path.join(directory, STORE_PATTERN)))
+
+
+def main():
+    directory = sys.argv[1] if len(sys.argv) > 1 else '.'
+    start = time.time()
+    graph = LineageGraph.load_or_build(discover_stores(directory), os.path.join(directory, DEFAULT_GRAPH_NAME))
+    stats = graph.stats()
+    print(f"🧬 LIGNAGE SÉMANTIQUE - {directory} ({time.time() - start:.2f}s)")
+    print(f"   {stats['nodes']} nœuds, {stats['edges']} arêtes: {stats['atom']} atomes, {stats['agent']} agents, "
+          f"{stats['agent_version']} versions, {stats['url']} URLs, {stats['source']} autres sources")
+    for key in sys.argv[2:]:
+        start = time.perf_counter()
+        impact = graph.retraction_impact([key])
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"   🔎 {key}: {len(impact['impacted'])} atomes dérivés, "
+              f"{len(impact['orphaned'])} sans autre source ({elapsed:.2f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,11 @@ from collections import defaultdict, Counter
 from typing import Dict, List, Tuple, Set
 import re
 import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from pipeline_profiler import profiler
+from semantic_query import AtomReader, Or, QueryEngine, make_compare
 
 class MathPhysicsConvergenceAnalyzer:
     def __init__(self):
@@ -17,7 +22,9 @@ class MathPhysicsConvergenceAnalyzer:
         self.all_atoms = []
         self.convergence_patterns = []
         self.cross_domain_connections = defaultdict(list)
+        self._query_engine = None
         
+    @profiler.profile('convergence.load_mathematical_sources')
     def load_mathematical_sources(self) -> int:
         """Charge sources mathématiques et physiques"""
         sources_config = [
@@ -56,6 +63,14 @@ class MathPhysicsConvergenceAnalyzer:
             print(f"❌ Erreur chargement {filename}: {e}")
             return 0
     
+    def select_atoms(self, query) -> List[Dict]:
+        """Atomes chargés satisfaisant une requête semantic_query (index construits une fois)"""
+        if self._query_engine is None or self._query_engine.readers[0].num_rows != len(self.all_atoms):
+            reader = AtomReader(self.all_atoms, name='convergence', text_index=True)
+            self._query_engine = QueryEngine([reader])
+        return self._query_engine.query(query).to_list()
+    
+    @profiler.profile('convergence.detect_mathematical_convergences')
     def detect_mathematical_convergences(self) -> List[Dict]:
         """Détecte convergences entre domaines mathématiques"""
         convergences = []
@@ -103,13 +118,8 @@ class MathPhysicsConvergenceAnalyzer:
     
     def _analyze_convergence_pattern(self, pattern: Dict) -> Dict:
         """Analyse pattern convergence spécifique"""
-        matching_atoms = []
         keywords = pattern["keywords"]
-        
-        for atom in self.all_atoms:
-            concept_text = f"{atom['concept']} {atom['definition']}".lower()
-            if any(keyword.lower() in concept_text for keyword in keywords):
-                matching_atoms.append(atom)
+        matching_atoms = self.select_atoms(Or(tuple(make_compare('text', '~', keyword) for keyword in keywords)))
         
         if len(matching_atoms) < 2:
             return None
@@ -196,6 +206,7 @@ class MathPhysicsConvergenceAnalyzer:
         
         return cross_refs
     
+    @profiler.profile('convergence.analyze_emergence_hierarchies')
     def analyze_emergence_hierarchies(self) -> Dict:
         """Analyse hiérarchies émergence multi-niveaux"""
         hierarchies = {
@@ -274,6 +285,7 @@ class MathPhysicsConvergenceAnalyzer:
             }
         ]
     
+    @profiler.profile('convergence.generate_convergence_insights')
     def generate_convergence_insights(self) -> Dict:
         """Génère insights convergences mathématiques-physiques"""
         convergences = self.detect_mathematical_convergences()
@@ -307,10 +319,7 @@ class MathPhysicsConvergenceAnalyzer:
     
     def _analyze_information_universality(self) -> Dict:
         """Analyse information comme monnaie universelle"""
-        info_concepts = [
-            atom for atom in self.all_atoms
-            if 'information' in atom['concept'].lower() or 'entrop' in atom['concept'].lower()
-        ]
+        info_concepts = self.select_atoms("concept ~ information or concept ~ entrop")
         
         return {
             "concept_count": len(info_concepts),
@@ -320,8 +329,8 @@ class MathPhysicsConvergenceAnalyzer:
     
     def _analyze_math_physics_unity(self) -> Dict:
         """Analyse unité mathématiques-physique"""
-        math_atoms = [atom for atom in self.all_atoms if atom['source_type'] == 'information_theory']
-        physics_atoms = [atom for atom in self.all_atoms if atom['source_type'] == 'physics_mathematics']
+        math_atoms = self.select_atoms("source = information_theory")
+        physics_atoms = self.select_atoms("source = physics_mathematics")
         
         return {
             "mathematical_concepts": len(math_atoms),
@@ -332,10 +341,7 @@ class MathPhysicsConvergenceAnalyzer:
     
     def _analyze_emergence_patterns(self) -> Dict:
         """Analyse patterns émergence ubiquitaires"""
-        emergence_atoms = [
-            atom for atom in self.all_atoms
-            if 'emerg' in atom['definition'].lower() or 'phase' in atom['definition'].lower()
-        ]
+        emergence_atoms = self.select_atoms("definition ~ emerg or definition ~ phase")
         
         return {
             "emergence_concepts": len(emergence_atoms),
@@ -345,10 +351,7 @@ class MathPhysicsConvergenceAnalyzer:
     
     def _analyze_compression_understanding(self) -> Dict:
         """Analyse compression comme compréhension"""
-        compression_atoms = [
-            atom for atom in self.all_atoms
-            if 'compression' in atom['definition'].lower() or 'compact' in atom['definition'].lower()
-        ]
+        compression_atoms = self.select_atoms("definition ~ compression or definition ~ compact")
         
         return {
             "compression_concepts": len(compression_atoms),
@@ -396,6 +399,7 @@ class MathPhysicsConvergenceAnalyzer:
         
         return insights
 
+@profiler.session('mathematics_physics_convergence_analyzer')
 def main():
     print("🔗 ANALYSEUR CONVERGENCES MATHÉMATIQUES-PHYSIQUES")
     print("=================================================")
@@ -4,9 +4,11 @@ Analyseur multi-sources pour consensus avancé Wikipedia + arXiv
 Détecte convergences, divergences et émergences conceptuelles
 """
 
+import argparse
+import heapq
 import json
 from collections import defaultdict, Counter
-from typing import Dict, List, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 import sys
 import os
 import datetime
@@ -14,6 +16,8 @@ from dataclasses import dataclass
 
 # Import structures communes
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from progress_tracker import track
+from sharded_consensus import ShardedRun, StoreSpec, concept_key
 
 @dataclass
 class ConceptConsensus:
@@ -31,6 +35,7 @@ class MultiSourceConsensusAnalyzer:
         self.stores = {}
         self.all_atoms = []
         self.concept_index = defaultdict(list)
+        self._word_sets = {}
         
     def load_store(self, filename: str, source_type: str):
         """Charge un store sémantique (Wikipedia, arXiv, etc.)"""
@@ -60,6 +65,11 @@ class MultiSourceConsensusAnalyzer:
     
     def find_cross_source_concepts(self, min_sources: int = 2) -> List[str]:
         """Trouve concepts présents dans multiple sources"""
+        cross_source = self._cross_source_concepts(min_sources)
+        print(f"🔗 {len(cross_source)} concepts multi-sources identifiés")
+        return cross_source
+    
+    def _cross_source_concepts(self, min_sources: int = 2) -> List[str]:
         cross_source = []
         
         for concept, atoms in self.concept_index.items():
@@ -67,7 +77,6 @@ class MultiSourceConsensusAnalyzer:
             if len(sources) >= min_sources:
                 cross_source.append(concept)
                 
-        print(f"🔗 {len(cross_source)} concepts multi-sources identifiés")
         return sorted(cross_source)
     
     def analyze_concept_consensus(self, concept: str) -> ConceptConsensus:
@@ -78,9 +87,9 @@ class MultiSourceConsensusAnalyzer:
             return None
             
         # Extraction métadonnées
-        sources = list(set(atom['source_type'] for atom in atoms))
+        sources = sorted(set(atom['source_type'] for atom in atoms))
         definitions = [atom['definition'] for atom in atoms]
-        agents = list(set(atom['provenance']['source_agent'] for atom in atoms))
+        agents = sorted(set(atom['provenance']['source_agent'] for atom in atoms))
         confidence_scores = [atom['provenance']['extraction_confidence'] for atom in atoms]
         
         # Range temporel
@@ -196,6 +205,11 @@ class MultiSourceConsensusAnalyzer:
     
     def detect_emergent_concepts(self, confidence_threshold: float = 0.8) -> List[str]:
         """Détecte concepts émergents (haute confidence, source unique)"""
+        emergent = self._emergent_concepts(confidence_threshold)
+        print(f"🌱 {len(emergent)} concepts émergents détectés")
+        return emergent
+    
+    def _emergent_concepts(self, confidence_threshold: float = 0.8) -> List[str]:
         emergent = []
         
         for concept, atoms in self.concept_index.items():
@@ -206,7 +220,6 @@ class MultiSourceConsensusAnalyzer:
                 if confidence >= confidence_threshold:
                     emergent.append(concept)
                     
-        print(f"🌱 {len(emergent)} concepts émergents détectés")
         return sorted(emergent)
     
     def find_concept_clusters(self, similarity_threshold: float = 0.3) -> List[List[str]]:
@@ -215,7 +228,7 @@ class MultiSourceConsensusAnalyzer:
         clusters = []
         processed = set()
         
-        for concept in concepts:
+        for concept in track(concepts, "Clusters concepts", unit='concepts'):
             if concept in processed:
                 continue
                 
@@ -236,20 +249,41 @@ class MultiSourceConsensusAnalyzer:
         print(f"🔗 {len(clusters)} clusters conceptuels identifiés")
         return clusters
     
+    @staticmethod
+    def _greedy_clusters(concepts: List[str], neighbors: List[List[int]]) -> List[List[str]]:
+        """Même regroupement glouton que find_concept_clusters, depuis les voisins j > i précalculés"""
+        clusters = []
+        processed = set()
+        for i, concept in enumerate(concepts):
+            if i in processed:
+                continue
+            processed.add(i)
+            cluster = [concept]
+            for j in neighbors[i]:
+                if j not in processed:
+                    cluster.append(concepts[j])
+                    processed.add(j)
+            if len(cluster) > 1:
+                clusters.append(cluster)
+        return clusters
+    
+    def _concept_words(self, concept: str) -> Set[str]:
+        """Mots des définitions/contextes d'un concept (calculés une fois)"""
+        words = self._word_sets.get(concept)
+        if words is None:
+            atoms = self.concept_index.get(concept, [])
+            contexts = " ".join(atom['definition'] + " " + atom.get('context', '') for atom in atoms)
+            words = self._word_sets[concept] = set(contexts.lower().split())
+        return words
+    
     def _concept_similarity(self, concept1: str, concept2: str) -> float:
         """Calcule similarité entre deux concepts"""
-        atoms1 = self.concept_index.get(concept1, [])
-        atoms2 = self.concept_index.get(concept2, [])
-        
-        if not atoms1 or not atoms2:
+        if not self.concept_index.get(concept1) or not self.concept_index.get(concept2):
             return 0.0
             
         # Similarité basée sur contextes/définitions
-        contexts1 = " ".join(atom['definition'] + " " + atom.get('context', '') for atom in atoms1)
-        contexts2 = " ".join(atom['definition'] + " " + atom.get('context', '') for atom in atoms2)
-        
-        words1 = set(contexts1.lower().split())
-        words2 = set(contexts2.lower().split())
+        words1 = self._concept_words(concept1)
+        words2 = self._concept_words(concept2)
         
         intersection = words1 & words2
         union = words1 | words2
@@ -267,16 +301,9 @@ class MultiSourceConsensusAnalyzer:
         # Analyse consensus top concepts
         consensus_analyses = []
         for concept in cross_source_concepts[:20]:  # Top 20
-            consensus = self.analyze_concept_consensus(concept)
-            if consensus:
-                consensus_analyses.append({
-                    'concept': consensus.concept,
-                    'sources': consensus.sources,
-                    'consensus_score': consensus.consensus_score,
-                    'agents_count': len(consensus.agents),
-                    'definitions_count': len(consensus.definitions),
-                    'divergence_factors': consensus.divergence_factors
-                })
+            summary = self._consensus_summary(concept)
+            if summary:
+                consensus_analyses.append(summary)
         
         # Concepts émergents
         emergent_concepts = self.detect_emergent_concepts()
@@ -285,16 +312,36 @@ class MultiSourceConsensusAnalyzer:
         concept_clusters = self.find_concept_clusters()
         
         # Métriques globales
-        total_concepts = len(self.concept_index)
-        total_atoms = len(self.all_atoms)
         source_coverage = {source: len([a for a in self.all_atoms if a['source_type'] == source]) 
                           for source in self.stores.keys()}
         
+        return self._assemble_report(len(self.concept_index), len(self.all_atoms), list(self.stores.keys()),
+                                     source_coverage, cross_source_concepts, consensus_analyses,
+                                     emergent_concepts, concept_clusters)
+    
+    def _consensus_summary(self, concept: str) -> Optional[Dict]:
+        consensus = self.analyze_concept_consensus(concept)
+        if not consensus:
+            return None
+        return {
+            'concept': consensus.concept,
+            'sources': consensus.sources,
+            'consensus_score': consensus.consensus_score,
+            'agents_count': len(consensus.agents),
+            'definitions_count': len(consensus.definitions),
+            'divergence_factors': consensus.divergence_factors
+        }
+    
+    def _assemble_report(self, total_concepts: int, total_atoms: int, sources: List[str],
+                         source_coverage: Dict[str, int], cross_source_concepts: List[str],
+                         consensus_analyses: List[Dict], emergent_concepts: List[str],
+                         concept_clusters: List[List[str]]) -> Dict:
+        """Rapport à partir des résultats calculés (chemin mono-processus ou shardé)"""
         report = {
             "analysis_metadata": {
                 "total_concepts": total_concepts,
                 "total_atoms": total_atoms,
-                "sources_analyzed": list(self.stores.keys()),
+                "sources_analyzed": sources,
                 "cross_source_concepts": len(cross_source_concepts),
                 "emergent_concepts": len(emergent_concepts),
                 "concept_clusters": len(concept_clusters),
@@ -317,9 +364,74 @@ class MultiSourceConsensusAnalyzer:
         
         return report
     
-    def save_analysis(self, filename: str):
+    def run_sharded(self, stores_to_load: List[Tuple[str, str]], workers: Optional[int] = None,
+                    shards: Optional[int] = None) -> Optional[Dict]:
+        """
+        Même rapport que load_store + generate_comprehensive_report, calculé en
+        map-reduce: concepts partitionnés entre processus, clusters par bandes
+        de lignes de la matrice de similarité, fusion déterministe ici.
+        """
+        stores = []
+        for filename, source_type in stores_to_load:
+            if os.path.exists(filename):
+                stores.append(StoreSpec(filename, source_type))
+            else:
+                print(f"⚠️  {filename} non trouvé - ignoré")
+        
+        with ShardedRun(stores, workers=workers, shards=shards) as run:
+            print(f"🧩 {run.shards} shards sur {run.workers} processus")
+            sources = []
+            for result in run.map():
+                spec = stores[result['file_index']]
+                if result['error'] is not None:
+                    print(f"❌ Erreur chargement {spec.filename}: {result['error']}")
+                    continue
+                if spec.source_type not in sources:
+                    sources.append(spec.source_type)
+                print(f"📊 {spec.source_type}: {result['atoms']} atomes chargés")
+            
+            if not sources:
+                return None
+            
+            print("\n🧠 GÉNÉRATION RAPPORT CONSENSUS MULTI-SOURCES")
+            print("=" * 50)
+            partials = run.reduce(_reduce_multi_source_shard, {'source_count': len(sources)})
+            
+            cross_source_concepts = list(heapq.merge(*(p['cross_source'] for p in partials)))
+            print(f"🔗 {len(cross_source_concepts)} concepts multi-sources identifiés")
+            summaries = {}
+            for partial in partials:
+                summaries.update(partial['consensus'])
+            consensus_analyses = [summaries[concept] for concept in cross_source_concepts[:20]]
+            
+            emergent_concepts = list(heapq.merge(*(p['emergent'] for p in partials)))
+            print(f"🌱 {len(emergent_concepts)} concepts émergents détectés")
+            
+            # Concepts dans l'ordre de première apparition, comme concept_index
+            first_seen = {}
+            for partial in partials:
+                first_seen.update(partial['first_seen'])
+            concepts = sorted(first_seen, key=first_seen.get)
+            word_sets = {}
+            for partial in partials:
+                word_sets.update(partial['word_sets'])
+            neighbors = run.jaccard_neighbors([word_sets[concept] for concept in concepts], 0.3)
+            concept_clusters = self._greedy_clusters(concepts, neighbors)
+            print(f"🔗 {len(concept_clusters)} clusters conceptuels identifiés")
+        
+        coverage = Counter()
+        for partial in partials:
+            coverage.update(partial['coverage'])
+        source_coverage = {source: coverage[source] for source in sources}
+        
+        return self._assemble_report(len(concepts), sum(p['atoms'] for p in partials), sources,
+                                     source_coverage, cross_source_concepts, consensus_analyses,
+                                     emergent_concepts, concept_clusters)
+    
+    def save_analysis(self, filename: str, report: Optional[Dict] = None):
         """Sauvegarde analyse multi-sources"""
-        report = self.generate_comprehensive_report()
+        if report is None:
+            report = self.generate_comprehensive_report()
         
         with open(filename, 'w', encoding='utf-8') as f:
             json.dump(report, f, indent=2, ensure_ascii=False)
@@ -343,7 +455,41 @@ class MultiSourceConsensusAnalyzer:
         
         return report
 
+def _reduce_multi_source_shard(shard: int, atoms, params: Dict) -> Dict:
+    """Reduce d'un shard: concepts locaux, consensus, émergents, mots pour les clusters"""
+    analyzer = MultiSourceConsensusAnalyzer()
+    # Diversité des sources rapportée au nombre global de stores chargés
+    analyzer.stores = {index: None for index in range(params['source_count'])}
+    first_seen = {}
+    coverage = Counter()
+    for seq, atom in atoms:
+        concept = concept_key(atom['concept'])
+        first_seen.setdefault(concept, seq)
+        analyzer.all_atoms.append(atom)
+        analyzer.concept_index[concept].append(atom)
+        coverage[atom['source_type']] += 1
+    
+    cross_source = analyzer._cross_source_concepts()
+    return {
+        'shard': shard,
+        'atoms': len(analyzer.all_atoms),
+        'first_seen': first_seen,
+        'coverage': coverage,
+        'cross_source': cross_source,
+        # le top 20 global est pris parmi les 20 premiers de chaque shard
+        'consensus': {concept: analyzer._consensus_summary(concept) for concept in cross_source[:20]},
+        'emergent': analyzer._emergent_concepts(),
+        'word_sets': {concept: analyzer._concept_words(concept) for concept in analyzer.concept_index}
+    }
+
 def main():
+    parser = argparse.ArgumentParser(description="Analyseur consensus multi-sources")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Processus map-reduce (1 = chargement mono-processus)")
+    parser.add_argument('--shards', type=int, default=None,
+                        help="Shards de concepts (défaut: nombre de processus)")
+    args = parser.parse_args()
+    
     print("🧠 ANALYSEUR CONSENSUS MULTI-SOURCES")
     print("====================================")
     
@@ -355,13 +501,19 @@ def main():
         ("arxiv_semantic_store.json", "arxiv")
     ]
     
+    report = None
     total_loaded = 0
-    for filename, source_type in stores_to_load:
-        if os.path.exists(filename):
-            loaded = analyzer.load_store(filename, source_type)
-            total_loaded += loaded
-        else:
-            print(f"⚠️  {filename} non trouvé - ignoré")
+    if args.workers > 1 or args.shards:
+        report = analyzer.run_sharded(stores_to_load, workers=args.workers, shards=args.shards)
+        if report is not None:
+            total_loaded = report['analysis_metadata']['total_atoms']
+    else:
+        for filename, source_type in stores_to_load:
+            if os.path.exists(filename):
+                loaded = analyzer.load_store(filename, source_type)
+                total_loaded += loaded
+            else:
+                print(f"⚠️  {filename} non trouvé - ignoré")
     
     if total_loaded == 0:
         print("❌ Aucun store sémantique trouvé")
@@ -374,7 +526,7 @@ def main():
     
     # Génération rapport complet
     analysis_file = "multi_source_consensus_analysis.json"
-    report = analyzer.save_analysis(analysis_file)
+    report = analyzer.save_analysis(analysis_file, report)
     
     print(f"\n🎯 ANALYSE TERMINÉE")
     print(f"📄 Rapport détaillé: {analysis_file}")
@@ -7,10 +7,17 @@ Intégrateur PaniniFS : Architecture Complète avec Marquage Analogique
 import json
 import datetime
 import os
+import sys
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, asdict
 import subprocess
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from atom_index import KeywordPostingIndex, content_atom_id
+from pipeline_profiler import profiler
+
+CONVERGENCE_KEYWORDS = ["entropy", "information", "quantum", "fractal", "emergence", "complexity"]
+
 @dataclass
 class PaniniFSComponent:
     name: str
@@ -21,8 +28,11 @@ class PaniniFSComponent:
     integration_ready: bool
 
 class PaniniFSArchitecturalIntegrator:
-    def __init__(self, base_path: str = "/home/stephane/GitHub/PaniniFS-1/scripts/scripts"):
+    def __init__(self, base_path: str = "/home/stephane/GitHub/PaniniFS-1/scripts/scripts",
+                 store_path: Optional[str] = None):
         self.base_path = base_path
+        # Store unifié persistant: base de l'intégration incrémentale suivante
+        self.store_path = store_path or os.path.join(base_path, "panini_unified_semantic_store.json")
         self.components = {}
         self.integration_status = {
             "autonomous_engine": False,
@@ -33,7 +43,10 @@ class PaniniFSArchitecturalIntegrator:
             "pattern_discovery": False
         }
         self.unified_semantic_store = {}
+        self.atom_index = KeywordPostingIndex()
+        self._indexed_atoms = None
         
+    @profiler.profile('integrator.scan_available_components')
     def scan_available_components(self) -> Dict[str, PaniniFSComponent]:
         """Scan composants disponibles dans répertoire"""
         print("🔍 SCAN COMPOSANTS PANINI-FS...")
@@ -117,6 +130,7 @@ class PaniniFSArchitecturalIntegrator:
         
         return self.components
     
+    @profiler.profile('integrator.execute_missing_components')
     def execute_missing_components(self) -> Dict[str, str]:
         """Exécution composants manquants ou incomplets"""
         print("\n⚙️ EXÉCUTION COMPOSANTS MANQUANTS...")
@@ -170,6 +184,7 @@ class PaniniFSArchitecturalIntegrator:
         }
         return script_mapping.get(component_name, f"{component_name}.py")
     
+    @profiler.profile('integrator.integrate_semantic_stores')
     def integrate_semantic_stores(self) -> Dict[str, Any]:
         """Intégration stores sémantiques en magasin unifié"""
         print("\n🔗 INTÉGRATION STORES SÉMANTIQUES...")
@@ -190,7 +205,9 @@ class PaniniFSArchitecturalIntegrator:
             "architectural_principles": []
         }
         
-        total_atoms = 0
+        previous_atoms = self._load_previous_atoms()
+        unified_atoms = integrated_store["unified_semantic_atoms"]
+        integration_stats = {"reused": 0, "added": 0}
         
         # Intégration chaque composant
         for name, component in self.components.items():
@@ -206,16 +223,24 @@ class PaniniFSArchitecturalIntegrator:
                         atoms = self._extract_atoms_from_component(name, data)
                         
                         for atom_id, atom_data in atoms.items():
+                            # Identifiant dérivé du contenu: stable d'une exécution à l'autre
+                            unified_id = f"{name}_{content_atom_id(atom_data)}"
+                            
+                            if unified_id in previous_atoms:
+                                # Atome inchangé: conservé tel quel (horodatage d'origine)
+                                unified_atoms[unified_id] = previous_atoms[unified_id]
+                                integration_stats["reused"] += 1
+                                continue
+                            
                             # Enrichissement avec métadonnées composant
-                            enriched_atom = {
+                            unified_atoms[unified_id] = {
                                 **atom_data,
+                                "source_atom_id": atom_id,
                                 "component_source": name,
                                 "integration_timestamp": datetime.datetime.now().isoformat(),
                                 "architectural_layer": self._classify_architectural_layer(name)
                             }
-                            
-                            integrated_store["unified_semantic_atoms"][f"{name}_{atom_id}"] = enriched_atom
-                            total_atoms += 1
+                            integration_stats["added"] += 1
                         
                         integrated_store["integration_metadata"]["components_integrated"].append({
                             "name": name,
@@ -228,8 +253,15 @@ class PaniniFSArchitecturalIntegrator:
                 except Exception as e:
                     print(f"      ❌ Erreur intégration {name}: {e}")
         
+        total_atoms = len(unified_atoms)
+        removed = sum(1 for atom_id in previous_atoms if atom_id not in unified_atoms)
+        
+        # Index mots-clés: seuls les atomes ajoutés / retirés sont (ré)indexés
+        self.atom_index.sync(unified_atoms)
+        self._indexed_atoms = unified_atoms
+        
         # Détection convergences cross-domaines
-        convergences = self._detect_cross_domain_convergences(integrated_store["unified_semantic_atoms"])
+        convergences = self._detect_cross_domain_convergences(unified_atoms)
         integrated_store["cross_domain_relations"] = convergences
         
         # Enrichissement principes architecturaux
@@ -252,11 +284,36 @@ class PaniniFSArchitecturalIntegrator:
         
         self.unified_semantic_store = integrated_store
         
+        if integration_stats["added"] or removed or not os.path.exists(self.store_path):
+            self._persist_store(integrated_store)
+        
         print(f"   📊 Total: {total_atoms} atomes sémantiques unifiés")
+        print(f"   ♻️ {integration_stats['reused']} inchangés, {integration_stats['added']} nouveaux, {removed} retirés")
         print(f"   🔗 {len(convergences)} convergences détectées")
         
         return integrated_store
     
+    def _load_previous_atoms(self) -> Dict[str, Dict]:
+        """Atomes de la dernière intégration (mémoire, sinon store persistant)"""
+        if self.unified_semantic_store:
+            return self.unified_semantic_store.get("unified_semantic_atoms", {})
+        
+        try:
+            with open(self.store_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get("unified_semantic_atoms", {})
+        except (OSError, ValueError, AttributeError):
+            return {}
+    
+    def _persist_store(self, store: Dict):
+        """Écriture atomique du store unifié persistant"""
+        try:
+            tmp_path = f"{self.store_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(store, f, ensure_ascii=False)
+            os.replace(tmp_path, self.store_path)
+        except OSError as e:
+            print(f"   ⚠️ Store unifié non persisté: {e}")
+    
     def _extract_atoms_from_component(self, component_name: str, data: Any) -> Dict:
         """Extraction atomes selon structure composant"""
         atoms = {}
@@ -334,35 +391,24 @@ class PaniniFSArchitecturalIntegrator:
         }
         return layer_mapping.get(component_name, "unknown")
     
-    def _detect_cross_domain_convergences(self, atoms: Dict) -> List[Dict]:
-        """Détection convergences cross-domaines"""
+    def _detect_cross_domain_convergences(self, atoms: Dict,
+                                          keywords: Optional[List[str]] = None) -> List[Dict]:
+        """Détection convergences cross-domaines par consultation de l'index mots-clés"""
         convergences = []
         
-        # Recherche concepts similaires entre domaines
-        concepts_by_domain = {}
-        
-        for atom_id, atom_data in atoms.items():
-            component = atom_data.get("component_source", "unknown")
-            concept = atom_data.get("concept", "").lower()
-            
-            if component not in concepts_by_domain:
-                concepts_by_domain[component] = []
-            concepts_by_domain[component].append((atom_id, concept, atom_data))
+        # Index maintenu pendant l'intégration; sinon index ad hoc pour `atoms`
+        index = self.atom_index if atoms is self._indexed_atoms else KeywordPostingIndex.from_atoms(atoms)
         
-        # Détection convergences par mots-clés communs
-        convergence_keywords = ["entropy", "information", "quantum", "fractal", "emergence", "complexity"]
-        
-        for keyword in convergence_keywords:
+        for keyword in keywords or CONVERGENCE_KEYWORDS:
             matching_atoms = []
-            for component, atoms_list in concepts_by_domain.items():
-                for atom_id, concept, atom_data in atoms_list:
-                    if keyword in concept or keyword in atom_data.get("definition", "").lower():
-                        matching_atoms.append({
-                            "atom_id": atom_id,
-                            "component": component,
-                            "concept": atom_data.get("concept", ""),
-                            "relevance": self._calculate_keyword_relevance(keyword, atom_data)
-                        })
+            for atom_id, in_concept, in_definition in index.match(keyword):
+                atom_data = atoms[atom_id]
+                matching_atoms.append({
+                    "atom_id": atom_id,
+                    "component": atom_data.get("component_source", "unknown"),
+                    "concept": atom_data.get("concept", ""),
+                    "relevance": min(0.5 * in_concept + 0.3 * in_definition, 1.0)
+                })
             
             if len(matching_atoms) >= 2:
                 convergences.append({
@@ -374,19 +420,6 @@ class PaniniFSArchitecturalIntegrator:
         
         return convergences
     
-    def _calculate_keyword_relevance(self, keyword: str, atom_data: Dict) -> float:
-        """Calcul pertinence keyword dans atome"""
-        concept = atom_data.get("concept", "").lower()
-        definition = atom_data.get("definition", "").lower()
-        
-        relevance = 0.0
-        if keyword in concept:
-            relevance += 0.5
-        if keyword in definition:
-            relevance += 0.3
-        
-        return min(relevance, 1.0)
-    
     def _assess_theoretical_significance(self, keyword: str) -> str:
         """Évaluation significance théorique"""
         significance_mapping = {
@@ -434,6 +467,7 @@ class PaniniFSArchitecturalIntegrator:
             }
         ]
     
+    @profiler.profile('integrator.generate_integration_report')
     def generate_integration_report(self) -> Dict:
         """Génération rapport intégration architectural"""
         if not self.unified_semantic_store:
@@ -514,6 +548,7 @@ class PaniniFSArchitecturalIntegrator:
         
         return recommendations
     
+    @profiler.profile('integrator.save_unified_architecture')
     def save_unified_architecture(self, output_path: str = None) -> str:
         """Sauvegarde architecture unifiée"""
         if not output_path:
@@ -526,6 +561,7 @@ class PaniniFSArchitecturalIntegrator:
         print(f"💾 Architecture unifiée sauvegardée: {output_path}")
         return output_path
 
+@profiler.session('panini_architectural_integrator')
 def main():
     print("🏗️ INTÉGRATEUR ARCHITECTURAL PANINI-FS")
     print("=====================================")
@@ -9,6 +9,10 @@ import os
 import datetime
 from typing import Dict, List, Any, Optional
 import subprocess
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from pipeline_profiler import default_profile_dir, load_profiles
 
 class PaniniFSDashboard:
     def __init__(self, base_path: str = "/home/stephane/GitHub/PaniniFS-1/scripts/scripts"):
@@ -102,11 +106,32 @@ class PaniniFSDashboard:
             "layer_metrics": layer_metrics,
             "convergence_strength": convergence_strength,
             "theoretical_foundations": metadata.get("theoretical_foundations", []),
-            "safety_mechanisms": metadata.get("safety_mechanisms", [])
+            "safety_mechanisms": metadata.get("safety_mechanisms", []),
+            "pipeline_profiles": self.summarize_pipeline_profiles()
         }
         
         return self.dashboard_metrics
     
+    def summarize_pipeline_profiles(self, top_stages: int = 5) -> Dict:
+        """Résumé des profils par étape (runs lancés avec PANINI_PROFILE=1)"""
+        summaries = {}
+        for run, profile in load_profiles(default_profile_dir()).items():
+            stages = profile.get("stages", [])
+            root = next((s for s in stages if s["path"] == run), None)
+            children = sorted((s for s in stages if s["path"] != run), key=lambda s: s["wall_seconds"], reverse=True)
+            summaries[run] = {
+                "wall_seconds": root["wall_seconds"] if root else sum(s["wall_seconds"] for s in children),
+                "cpu_seconds": root["cpu_seconds"] if root else sum(s["cpu_seconds"] for s in children),
+                "peak_bytes": max((s["peak_bytes"] for s in stages), default=0),
+                "samples": sum(s["samples"] for s in stages),
+                "profiled_at": datetime.datetime.fromtimestamp(profile.get("timestamp", 0)).isoformat(),
+                "top_stages": [
+                    {key: s[key] for key in ("path", "calls", "wall_seconds", "cpu_seconds", "peak_bytes")}
+                    for s in children[:top_stages]
+                ]
+            }
+        return summaries
+    
     def _calculate_health_score(self, atoms: int, convergences: int, components: Dict) -> float:
         """Calcul score santé architecture"""
         score = 0.0
@@ -202,6 +227,17 @@ class PaniniFSDashboard:
         for mechanism in safety:
             print(f"   🔒 {mechanism}")
         
+        # Section profilage pipeline
+        profiles = self.dashboard_metrics.get("pipeline_profiles", {})
+        if profiles:
+            print(f"\n🔬 PROFIL PIPELINE (PANINI_PROFILE=1)")
+            for run, profile in sorted(profiles.items(), key=lambda x: x[1]["wall_seconds"], reverse=True):
+                print(f"   ⏱️ {run}: {profile['wall_seconds']:.2f}s mur, {profile['cpu_seconds']:.2f}s CPU, "
+                      f"pic {profile['peak_bytes'] / 1024 / 1024:.1f} Mo")
+                for stage in profile["top_stages"][:3]:
+                    share = stage["wall_seconds"] / profile["wall_seconds"] * 100 if profile["wall_seconds"] else 0
+                    print(f"      • {stage['path'].split('/', 1)[-1]}: {stage['wall_seconds']:.3f}s ({share:.0f}%)")
+        
         # Section recommandations
         recommendations = self._generate_recommendations()
         if recommendations:
@@ -5,15 +5,22 @@ Analyseur patterns sémantiques - Découverte autonome
 
 import json
 import os
-from collections import Counter, defaultdict
+from collections import defaultdict
 from typing import Dict, List, Set
 import datetime
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from pipeline_profiler import profiler
+from stream_sketches import ConceptSketches, store_sketches
 
 class PatternDiscovery:
     def __init__(self):
         self.concept_patterns = defaultdict(list)
         self.semantic_clusters = {}
+        self.sketches = None  # fusion des sketches des stores chargés
         
+    @profiler.profile('patterns.load_all_sources')
     def load_all_sources(self):
         """Charge toutes sources pour analyse patterns"""
         sources = [
@@ -24,12 +31,14 @@ class PatternDiscovery:
         ]
         
         all_atoms = []
+        self.sketches = ConceptSketches()
         for source_file in sources:
             if os.path.exists(source_file):
                 with open(source_file, 'r') as f:
                     store = json.load(f)
                     atoms = store.get('semantic_atoms', [])
                     all_atoms.extend(atoms)
+                self.sketches.merge(store_sketches(source_file, atoms))
         
         return all_atoms
     
@@ -44,6 +53,7 @@ class PatternDiscovery:
         
         return patterns
     
+    @profiler.profile('patterns.cluster_by_keywords')
     def cluster_by_keywords(self, atoms: List[Dict]) -> Dict:
         """Clustering par mots-clés"""
         keyword_groups = defaultdict(list)
@@ -64,6 +74,7 @@ class PatternDiscovery:
         
         return dict(keyword_groups)
     
+    @profiler.profile('patterns.find_definition_patterns')
     def find_definition_patterns(self, atoms: List[Dict]) -> List[Dict]:
         """Patterns dans définitions"""
         patterns = []
@@ -81,17 +92,19 @@ class PatternDiscovery:
         
         return patterns
     
+    @profiler.profile('patterns.analyze_temporal_patterns')
     def analyze_temporal_patterns(self, atoms: List[Dict]) -> Dict:
-        """Patterns temporels"""
-        timestamps = [atom['provenance']['timestamp'][:10] for atom in atoms]
-        daily_counts = Counter(timestamps)
+        """Patterns temporels (jours suivis par les sketches, sans liste des timestamps)"""
+        sketches = self.sketches or ConceptSketches().update_many(atoms)
+        daily_counts = [(day, count) for day, count, _ in sketches.days.top()]
         
         return {
             "collection_by_day": dict(daily_counts),
-            "most_productive_day": daily_counts.most_common(1)[0] if daily_counts else None,
-            "collection_consistency": len(set(timestamps))
+            "most_productive_day": daily_counts[0] if daily_counts else None,
+            "collection_consistency": sketches.distinct_days.count()
         }
     
+    @profiler.profile('patterns.analyze_source_patterns')
     def analyze_source_patterns(self, atoms: List[Dict]) -> Dict:
         """Patterns par source"""
         source_stats = defaultdict(lambda: {"count": 0, "avg_confidence": 0})
@@ -110,6 +123,7 @@ class PatternDiscovery:
         
         return dict(source_stats)
     
+    @profiler.profile('patterns.generate_pattern_report')
     def generate_pattern_report(self) -> Dict:
         """Génère rapport patterns complet"""
         atoms = self.load_all_sources()
@@ -140,5 +154,6 @@ class PatternDiscovery:
         return report
 
 if __name__ == "__main__":
-    discovery = PatternDiscovery()
-    discovery.generate_pattern_report()
+    with profiler.session('pattern_discovery_analyzer'):
+        discovery = PatternDiscovery()
+        discovery.generate_pattern_report()
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+🔬 PROFILAGE PAR ÉTAPE DU PIPELINE D'ANALYSE
+============================================
+
+Couche de profilage opt-in (PANINI_PROFILE=1) pour les analyseurs:
+
+- timers mur / CPU par étape (profiler.stage(...) ou @profiler.profile(...))
+- pic mémoire tracemalloc par étape (+ principaux sites d'allocation)
+- échantillonnage périodique de la pile du thread profilé, préfixée par
+  le chemin d'étapes, exporté au format "collapsed stacks" (flamegraph.pl,
+  speedscope, inferno)
+
+Désactivé, stage() renvoie un contexte nul partagé et les méthodes décorées
+appellent directement la fonction: coût d'un test de booléen.
+
+Les sessions (profiler.session("consensus_analyzer")) écrivent
+<dossier>/<nom>.profile.json et <nom>.folded, lus par le dashboard;
+<dossier> = $PANINI_PROFILE_DIR, sinon profiles/ à côté de ce module
+(chemin absolu: indépendant du répertoire courant).
+"""
+
+import contextlib
+import functools
+import glob
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional
+
+PROFILE_ENV = 'PANINI_PROFILE'
+PROFILE_DIR_ENV = 'PANINI_PROFILE_DIR'
+DEFAULT_PROFILE_DIR = 'profiles'
+_NULL_STAGE = contextlib.nullcontext()
+TRANSPARENT_FRAMES = ('wrapper', '_stage', 'session')
+
+
+def default_profile_dir() -> str:
+    """Dossier des profils partagé par les sessions et le dashboard (absolu)"""
+    directory = os.environ.get(PROFILE_DIR_ENV) or \
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), DEFAULT_PROFILE_DIR)
+    return os.path.abspath(directory)
+
+
+@dataclass
+class StageStats:
+    """Cumul d'une étape (chemin "parent/enfant")"""
+    path: str
+    calls: int = 0
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_bytes: int = 0
+    samples: int = 0
+    top_allocations: List[str] = field(default_factory=list)
+
+
+class _StageFrame:
+    __slots__ = ('path', 'wall', 'cpu', 'mem_start', 'peak')
+
+    def __init__(self, path: str):
+        self.path = path
+        self.wall = time.perf_counter()
+        self.cpu = time.thread_time()
+        self.mem_start = 0
+        self.peak = 0
+
+
+class PipelineProfiler:
+    """Profilage par étape: temps, mémoire, piles échantillonnées"""
+
+    def __init__(self, enabled: Optional[bool] = None, memory: bool = True,
+                 sample_interval: float = 0.005, top_allocations: int = 5,
+                 output_dir: Optional[str] = None):
+        if enabled is None:
+            enabled = os.environ.get(PROFILE_ENV, '').lower() in ('1', 'true', 'yes', 'on')
+        self.enabled = enabled
+        self.memory = memory
+        self.sample_interval = sample_interval
+        self.top_allocations = top_allocations
+        self.output_dir = output_dir or default_profile_dir()
+        self.reset()
+
+    def reset(self):
+        self.stats: Dict[str, StageStats] = {}
+        self.stacks: Counter = Counter()
+        self._stage_samples: Counter = Counter()  # écrit par le seul thread d'échantillonnage
+        self._frames: List[_StageFrame] = []
+        self._stage_path = ''  # lu par le thread d'échantillonnage
+        self._thread_id: Optional[int] = None
+        self._sampler: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._started_tracemalloc = False
+
+    # ------------------------------------------------------------------
+    # Étapes
+    # ------------------------------------------------------------------
+
+    def stage(self, name: str):
+        """Contexte d'étape; contexte nul partagé si le profilage est désactivé"""
+        if not self.enabled:
+            return _NULL_STAGE
+        return self._stage(name)
+
+    @contextlib.contextmanager
+    def _stage(self, name: str):
+        self._enter(name)
+        try:
+            yield
+        finally:
+            self._exit()
+
+    def profile(self, name: Optional[str] = None) -> Callable:
+        """Décorateur: la fonction devient une étape"""
+        def decorator(func):
+            stage_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self._stage(stage_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @contextlib.contextmanager
+    def session(self, name: str):
+        """Étape racine d'un run; sauvegarde profil + piles à la sortie"""
+        if not self.enabled:
+            yield self
+            return
+        self.reset()
+        try:
+            with self._stage(name):
+                yield self
+        finally:
+            paths = self.save(name)
+            print(f"🔬 Profil {name}: {paths['summary']} | flamegraph: {paths['folded']}")
+
+    def _enter(self, name: str):
+        parent = self._frames[-1] if self._frames else None
+        frame = _StageFrame(f"{parent.path}/{name}" if parent else name)
+        if not self._frames:
+            self._start_session()
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if parent:
+                parent.peak = max(parent.peak, peak)
+            tracemalloc.reset_peak()
+            frame.mem_start = current
+        self._frames.append(frame)
+        self._stage_path = frame.path
+
+    def _exit(self):
+        frame = self._frames.pop()
+        wall = time.perf_counter() - frame.wall
+        cpu = time.thread_time() - frame.cpu
+        stats = self.stats.get(frame.path)
+        if stats is None:
+            stats = self.stats[frame.path] = StageStats(frame.path)
+        stats.calls += 1
+        stats.wall_seconds += wall
+        stats.cpu_seconds += cpu
+        if self.memory:
+            peak = max(frame.peak, tracemalloc.get_traced_memory()[1])
+            new_peak = peak - frame.mem_start > stats.peak_bytes or stats.calls == 1
+            stats.peak_bytes = max(stats.peak_bytes, peak - frame.mem_start)
+            # Sites d'allocation relevés seulement sur l'appel le plus gourmand
+            if self.top_allocations and new_peak:
+                snapshot = tracemalloc.take_snapshot()
+                stats.top_allocations = [
+                    f"{stat.traceback[0].filename}:{stat.traceback[0].lineno} ({stat.size} B)"
+                    for stat in snapshot.statistics('lineno')[:self.top_allocations]
+                ]
+            # Le pic de l'enfant compte pour le parent
+            if self._frames:
+                self._frames[-1].peak = max(self._frames[-1].peak, peak)
+            tracemalloc.reset_peak()
+        self._stage_path = self._frames[-1].path if self._frames else ''
+        if not self._frames:
+            self._stop_session()
+
+    # ------------------------------------------------------------------
+    # Échantillonnage des piles
+    # ------------------------------------------------------------------
+
+    def _start_session(self):
+        self._thread_id = threading.get_ident()
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if self.sample_interval:
+            self._stop.clear()
+            self._sampler = threading.Thread(target=self._sample_loop, name='panini-profiler', daemon=True)
+            self._sampler.start()
+
+    def _stop_session(self):
+        if self._sampler:
+            self._stop.set()
+            self._sampler.join()
+            self._sampler = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def _sample_loop(self):
+        own_file = __file__
+        while not self._stop.wait(self.sample_interval):
+            stage_path = self._stage_path
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None or not stage_path:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                if code.co_filename == own_file:
+                    # wrapper/_stage/session sont transparents; ce qu'appellent
+                    # _enter/_exit/save est le coût propre du profileur
+                    if code.co_name not in TRANSPARENT_FRAMES:
+                        names = ['[profiler]']
+                elif not code.co_filename.endswith('contextlib.py'):
+                    names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            names.reverse()
+            stack = ';'.join(stage_path.split('/') + names)
+            self.stacks[stack] += 1
+            self._stage_samples[stage_path] += 1
+
+    # ------------------------------------------------------------------
+    # Exports
+    # ------------------------------------------------------------------
+
+    def summary(self) -> List[Dict]:
+        for path, samples in self._stage_samples.items():
+            self.stats.setdefault(path, StageStats(path)).samples = samples
+        return [asdict(stats) for stats in sorted(self.stats.values(), key=lambda s: -s.wall_seconds)]
+
+    def collapsed_stacks(self) -> str:
+        """Format "collapsed": une pile par ligne, frames séparés par ';', puis le compte"""
+        return ''.join(f"{stack} {count}\n" for stack, count in sorted(self.stacks.items()))
+
+    def save(self, name: str) -> Dict[str, str]:
+        os.makedirs(self.output_dir, exist_ok=True)
+        summary_path = os.path.join(self.output_dir, f"{name}.profile.json")
+        folded_path = os.path.join(self.output_dir, f"{name}.folded")
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'run': name,
+                'timestamp': time.time(),
+                'sample_interval': self.sample_interval,
+                'memory': self.memory,
+                'stages': self.summary()
+            }, f, indent=2)
+        with open(folded_path, 'w', encoding='utf-8') as f:
+            f.write(self.collapsed_stacks())
+        return {'summary': summary_path, 'folded': folded_path}
+
+    def print_summary(self, limit: int = 15):
+        print("\n🔬 PROFIL PAR ÉTAPE")
+        for stats in self.summary()[:limit]:
+            print(f"   {stats['path']:<50} {stats['calls']:>5}x  mur {stats['wall_seconds']:8.3f}s  "
+                  f"CPU {stats['cpu_seconds']:8.3f}s  pic {stats['peak_bytes'] / 1024:9.1f} KiB  "
+                  f"{stats['samples']} échantillons")
+
+
+def load_profiles(directory: str = None) -> Dict[str, Dict]:
+    """Profils sauvegardés (*.profile.json), par nom de run"""
+    directory = directory or default_profile_dir()
+    profiles = {}
+    for path in sorted(glob.glob(os.path.join(directory, '*.profile.json'))):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        profiles[data.get('run', os.path.basename(path))] = data
+    return profiles
+
+
+# Profileur partagé des analyseurs (activé par PANINI_PROFILE=1)
+profiler = PipelineProfiler()
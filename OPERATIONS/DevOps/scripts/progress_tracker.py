@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+📈 SUIVI DE PROGRESSION PAR DÉBIT RÉEL
+======================================
+
+Les boucles de pipeline (atomes traités, octets lus, textes encodés)
+alimentent un ProgressTracker avec de vrais compteurs; il en déduit le
+débit lissé (moyenne exponentielle), l'ETA et les blocages, et publie
+un status à fréquence bornée vers un sink (callable, queue.Queue, ou
+l'affichage console par défaut).
+
+Chemin chaud sans verrou: advance() incrémente un entier et ne lit
+l'horloge qu'une fois tous les `stride` appels, stride recalibré pour
+viser ~4 lectures par intervalle de publication. Un seul producteur par
+tracker; un thread de surveillance peut appeler poll() pour détecter un
+blocage (il ne fait que lire les compteurs).
+
+    for paper in track(papers, "arXiv papers", unit="papers"):
+        ...
+"""
+
+import queue
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Union
+
+StatusSink = Union[Callable[[Dict[str, Any]], Any], queue.Queue]
+
+
+def console_sink(status: Dict[str, Any]):
+    """Sink par défaut: une ligne par publication"""
+    total = f"/{status['total']}" if status['total'] is not None else ''
+    progress = f" {status['progress']:5.1f}%" if status['progress'] is not None else ''
+    eta = f" | ETA {status['eta']:.0f}s" if status['eta'] is not None else ''
+    flag = " ⚠️ BLOQUÉ" if status['stalled'] else (" ✅" if status['done'] else '')
+    print(f"  📈 {status['name']}: {status['count']}{total} {status['unit']}{progress} | "
+          f"{status['rate']:.1f} {status['unit']}/s{eta}{flag}")
+
+
+class ProgressTracker:
+    """Compteur de progression avec débit lissé, ETA et détection de blocage"""
+
+    def __init__(self, name: str, total: Optional[int] = None, unit: str = 'items',
+                 sink: Optional[StatusSink] = None, publish_interval: float = 2.0,
+                 stall_after: float = 10.0, smoothing: float = 0.3,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.total = total
+        self.unit = unit
+        self.publish_interval = publish_interval
+        self.stall_after = stall_after
+        self.smoothing = smoothing
+        self.clock = clock
+        self._emit = self._resolve_sink(sink)
+
+        self.count = 0
+        self.done = False
+        self.failed = False
+        self.rate = 0.0
+        self.publications = 0
+        self.started_at = clock()
+        self._stride = 1
+        self._calls_left = 1
+        self._last_tick = self.started_at
+        self._last_publish = self.started_at
+        self._last_publish_count = 0
+        self._next_publish = self.started_at + publish_interval
+        # État propre au thread de surveillance (poll)
+        self._watch_count = 0
+        self._watch_since = self.started_at
+
+    @staticmethod
+    def _resolve_sink(sink: Optional[StatusSink]) -> Callable[[Dict[str, Any]], Any]:
+        if sink is None:
+            return console_sink
+        if hasattr(sink, 'put'):
+            return sink.put
+        return sink
+
+    # ------------------------------------------------------------------
+    # Chemin chaud
+    # ------------------------------------------------------------------
+
+    def advance(self, n: int = 1):
+        """Ajoute n unités traitées (octets, atomes, textes...)"""
+        self.count += n
+        self._calls_left -= 1
+        if self._calls_left <= 0:
+            self._tick()
+
+    def _tick(self):
+        now = self.clock()
+        elapsed = now - self._last_tick
+        # Recalibrage: ~4 lectures d'horloge par intervalle de publication
+        if elapsed > 0:
+            calls_per_second = self._stride / elapsed
+            self._stride = max(1, min(65536, int(calls_per_second * self.publish_interval / 4)))
+        self._calls_left = self._stride
+        self._last_tick = now
+        if now >= self._next_publish:
+            self._publish(now)
+
+    def _publish(self, now: float, stalled: bool = False):
+        window = now - self._last_publish
+        if window > 0:
+            instant = (self.count - self._last_publish_count) / window
+            self.rate = instant if self.publications == 0 else \
+                self.smoothing * instant + (1 - self.smoothing) * self.rate
+        self._last_publish = now
+        self._last_publish_count = self.count
+        self._next_publish = now + self.publish_interval
+        self.publications += 1
+        self._emit(self.status(now, stalled))
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+
+    def status(self, now: Optional[float] = None, stalled: bool = False) -> Dict[str, Any]:
+        now = self.clock() if now is None else now
+        progress = eta = None
+        if self.total:
+            progress = min(100.0, 100.0 * self.count / self.total)
+            remaining = max(0, self.total - self.count)
+            if self.done or remaining == 0:
+                eta = 0.0
+            elif self.rate > 0:
+                eta = remaining / self.rate
+        return {
+            'name': self.name,
+            'unit': self.unit,
+            'count': self.count,
+            'total': self.total,
+            'progress': progress,
+            'rate': self.rate,
+            'eta': eta,
+            'elapsed': now - self.started_at,
+            'stalled': stalled,
+            'done': self.done,
+            'failed': self.failed,
+            'timestamp': time.time()
+        }
+
+    def poll(self) -> bool:
+        """Appelé par un thread de surveillance: publie un status si le compteur est figé"""
+        now = self.clock()
+        count = self.count
+        if count != self._watch_count or self.done:
+            self._watch_count, self._watch_since = count, now
+            return False
+        if now - self._watch_since >= self.stall_after:
+            self._watch_since = now  # une alerte par période de blocage
+            self._emit(self.status(now, stalled=True))
+            return True
+        return False
+
+    def close(self):
+        """Fin de boucle: publication finale (débit moyen réel)"""
+        if self.done:
+            return
+        self.done = True
+        now = self.clock()
+        elapsed = now - self.started_at
+        if elapsed > 0:
+            self.rate = self.count / elapsed
+        self._last_publish, self._last_publish_count = now, self.count
+        self._next_publish = now + self.publish_interval
+        self.publications += 1
+        self._emit(self.status(now))
+
+    def abort(self):
+        """Sortie sur exception ou boucle abandonnée: fin sans status 'terminé'"""
+        self.done = True
+        self.failed = True
+
+    def __enter__(self) -> 'ProgressTracker':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # GeneratorExit compris: un consommateur sorti de track() n'a pas tout traité
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def track(iterable: Iterable, name: str, total: Optional[int] = None, unit: str = 'items',
+          sink: Optional[StatusSink] = None, weight: Optional[Callable[[Any], int]] = None,
+          **options) -> Iterator:
+    """Itère en comptant chaque élément (ou weight(élément), ex. octets)"""
+    if total is None and weight is None:
+        try:
+            total = len(iterable)
+        except TypeError:
+            total = None
+    tracker = ProgressTracker(name, total=total, unit=unit, sink=sink, **options)
+    with tracker:
+        if weight is None:
+            for item in iterable:
+                yield item
+                tracker.advance()
+        else:
+            for item in iterable:
+                yield item
+                tracker.advance(weight(item))
@@ -6,17 +6,24 @@ Préparation migration Python → Rust avec benchmarking
 
 import json
 import time
-import cbor2
 import pickle
 import gzip
 from pathlib import Path
 from typing import Dict, List, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields
 import sys
 import os
 
 # Import structures communes
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from columnar_store import ColumnarReader, ColumnarWriter, FORMAT_VERSION
+from pipeline_profiler import profiler
+from lazy_import import lazy_import, module_available
+from semantic_query import ColumnarStoreReader, QueryEngine, benchmark_queries, quote_value
+
+# cbor2 importé seulement par les exports/benchmarks CBOR
+CBOR2_AVAILABLE = module_available('cbor2')
+cbor2 = lazy_import('cbor2')
 
 @dataclass
 class RustSemanticAtom:
@@ -38,11 +45,19 @@ class RustConceptIndex:
     source_to_atoms: Dict[str, List[str]]   # source_type -> atom_ids
     temporal_index: List[tuple]             # (timestamp, atom_id) sorted
 
+# Schéma colonnaire dérivé de RustSemanticAtom (chaînes de longueur variable)
+COLUMNAR_SCHEMA = [
+    (f.name, {float: "float64", List[str]: "list<utf8>"}.get(f.type, "utf8"))
+    for f in fields(RustSemanticAtom)
+]
+COLUMNAR_FILENAME = "rust_bridge_data.pcol"
+
 class RustBridge:
     def __init__(self):
         self.atoms = []
         self.index = None
         
+    @profiler.profile('rust_bridge.load_python_stores')
     def load_python_stores(self) -> int:
         """Charge tous les stores Python disponibles"""
         store_files = [
@@ -137,11 +152,17 @@ class RustBridge:
         
         print(f"✅ Index construit: {len(concept_to_atoms)} concepts indexés")
     
-    def export_to_rust_formats(self):
-        """Export vers multiple formats pour test Rust"""
+    def export_to_rust_formats(self, legacy_formats: bool = False):
+        """Export colonnaire (.pcol); legacy_formats ajoute JSON / CBOR / pickle matérialisés en mémoire"""
         print("🦀 Export vers formats Rust...")
         
-        # Données pour export
+        # Format principal: conteneur colonnaire streaming (par lots, index inclus)
+        self._export_columnar()
+        
+        if not legacy_formats:
+            return
+        
+        # Données pour export (formats de comparaison, matérialisés en mémoire)
         export_data = {
             'atoms': [asdict(atom) for atom in self.atoms],
             'index': asdict(self.index) if self.index else None,
@@ -160,10 +181,8 @@ class RustBridge:
         
         # Format 3: Pickle + gzip (Python-specific mais très compact)
         self._export_pickle_gzip(export_data)
-        
-        # Format 4: Custom binary pour Rust
-        self._export_custom_binary(export_data)
     
+    @profiler.profile('rust_bridge.export_json')
     def _export_json(self, data: Dict):
         """Export JSON standard"""
         filename = "rust_bridge_data.json"
@@ -177,11 +196,16 @@ class RustBridge:
         
         print(f"  📄 JSON: {filename} ({size:,} bytes, {duration:.3f}s)")
     
+    @profiler.profile('rust_bridge.export_cbor')
     def _export_cbor(self, data: Dict):
         """Export CBOR (Concise Binary Object Representation)"""
         filename = "rust_bridge_data.cbor"
         start_time = time.time()
         
+        if not CBOR2_AVAILABLE:
+            print("  ⚠️  cbor2 non installé - skip CBOR export")
+            return
+        
         try:
             with open(filename, 'wb') as f:
                 cbor2.dump(data, f)
@@ -191,11 +215,10 @@ class RustBridge:
             
             print(f"  🗜️  CBOR: {filename} ({size:,} bytes, {duration:.3f}s)")
             
-        except ImportError:
-            print("  ⚠️  cbor2 non installé - skip CBOR export")
         except Exception as e:
             print(f"  ❌ Erreur CBOR: {e}")
     
+    @profiler.profile('rust_bridge.export_pickle_gzip')
     def _export_pickle_gzip(self, data: Dict):
         """Export Pickle compressé"""
         filename = "rust_bridge_data.pkl.gz"
@@ -209,39 +232,41 @@ class RustBridge:
         
         print(f"  🗜️  Pickle+gzip: {filename} ({size:,} bytes, {duration:.3f}s)")
     
-    def _export_custom_binary(self, data: Dict):
-        """Export format binaire custom pour Rust"""
-        filename = "rust_bridge_data.bin"
+    @profiler.profile('rust_bridge.export_columnar')
+    def _export_columnar(self, filename: str = COLUMNAR_FILENAME):
+        """Export colonnaire versionné: atomes écrits par lots + index concept/agent/source/temporel"""
         start_time = time.time()
         
-        # Format simple: [count][atom1][atom2]...[index]
-        with open(filename, 'wb') as f:
-            # Header: nombre d'atomes (4 bytes)
-            f.write(len(self.atoms).to_bytes(4, 'little'))
-            
-            # Atomes: format fixe pour performance Rust
-            for atom in self.atoms:
-                # ID (16 bytes, padded)
-                id_bytes = atom.id.encode('utf-8')[:16].ljust(16, b'\0')
-                f.write(id_bytes)
-                
-                # Concept (64 bytes, padded)
-                concept_bytes = atom.concept.encode('utf-8')[:64].ljust(64, b'\0')
-                f.write(concept_bytes)
-                
-                # Confidence (8 bytes, double)
-                import struct
-                f.write(struct.pack('<d', atom.confidence))
-                
-                # Timestamp (32 bytes, padded)
-                timestamp_bytes = atom.timestamp.encode('utf-8')[:32].ljust(32, b'\0')
-                f.write(timestamp_bytes)
+        names = [name for name, _ in COLUMNAR_SCHEMA]
+        concept_rows, agent_rows, source_rows = {}, {}, {}
+        
+        metadata = {
+            'total_atoms': len(self.atoms),
+            'export_timestamp': time.time(),
+            'version': '0.2.0'
+        }
+        
+        with ColumnarWriter(filename, COLUMNAR_SCHEMA, metadata=metadata) as writer:
+            for row, atom in enumerate(self.atoms):
+                writer.write_row([getattr(atom, name) for name in names])
                 
+                # Index par numéro de ligne, construits pendant le même passage
+                concept_rows.setdefault(atom.concept.lower().strip(), []).append(row)
+                agent_rows.setdefault(atom.source_agent, []).append(row)
+                source_rows.setdefault(atom.source_type, []).append(row)
+            
+            writer.add_postings('concept', concept_rows)
+            writer.add_postings('agent', agent_rows)
+            writer.add_postings('source', source_rows)
+            writer.add_permutation('temporal', sorted(range(len(self.atoms)),
+                                                      key=lambda i: self.atoms[i].timestamp))
+        
         size = Path(filename).stat().st_size
         duration = time.time() - start_time
         
-        print(f"  ⚡ Custom binary: {filename} ({size:,} bytes, {duration:.3f}s)")
+        print(f"  ⚡ Colonnaire v{FORMAT_VERSION}: {filename} ({size:,} bytes, {duration:.3f}s)")
     
+    @profiler.profile('rust_bridge.benchmark_formats')
     def benchmark_formats(self):
         """Benchmark lecture des différents formats"""
         print("\n⚡ BENCHMARK FORMATS:")
@@ -251,7 +276,7 @@ class RustBridge:
             ("rust_bridge_data.json", self._benchmark_json),
             ("rust_bridge_data.cbor", self._benchmark_cbor),
             ("rust_bridge_data.pkl.gz", self._benchmark_pickle),
-            ("rust_bridge_data.bin", self._benchmark_binary)
+            (COLUMNAR_FILENAME, self._benchmark_columnar)
         ]
         
         for filename, benchmark_func in formats:
@@ -294,22 +319,40 @@ class RustBridge:
         except Exception:
             return None
     
-    def _benchmark_binary(self, filename: str) -> float:
-        """Benchmark lecture format custom"""
+    def _benchmark_columnar(self, filename: str) -> float:
+        """Benchmark lecture colonnaire (fichier complet: toutes colonnes, toutes lignes)"""
         start_time = time.time()
         try:
-            with open(filename, 'rb') as f:
-                # Lecture header
-                count = int.from_bytes(f.read(4), 'little')
-                
-                # Lecture atomes (simulation)
-                for _ in range(min(count, 100)):  # Test sur 100 premiers
-                    f.read(16 + 64 + 8 + 32)  # Taille fixe par atome
-                    
+            with ColumnarReader(filename) as reader:
+                for name, _ in reader.schema:
+                    for _ in reader.column(name):
+                        pass
             return time.time() - start_time
         except Exception:
             return None
     
+    @profiler.profile('rust_bridge.benchmark_queries')
+    def benchmark_queries(self, filename: str = COLUMNAR_FILENAME):
+        """Requêtes sur le .pcol exporté: plan indexé vs scan (search_concept du prototype Rust)"""
+        if not os.path.exists(filename):
+            return
+        print("\n🔎 BENCHMARK REQUÊTES (.pcol):")
+        print("=" * 30)
+        
+        queries = [f"concept ~ {keyword}" for keyword in ("learning", "neural", "algorithm", "intelligence")]
+        if self.atoms:
+            sample = self.atoms[len(self.atoms) // 2]
+            queries.append(f"concept = {quote_value(sample.concept)}")
+            queries.append(f"agent = {quote_value(sample.source_agent)} and confidence >= 0.8")
+        
+        reader = ColumnarStoreReader(filename, text_index=True)
+        try:
+            for result in benchmark_queries(QueryEngine([reader]), queries):
+                print(f"  {result['query']}: {result['rows']} résultats | {'/'.join(result['access'])} "
+                      f"{result['index_ms']:.2f} ms | scan {result['scan_ms']:.2f} ms")
+        finally:
+            reader.close()
+    
     def generate_rust_prototype(self):
         """Génère code Rust prototype pour tests"""
         rust_code = '''
@@ -414,6 +457,7 @@ fn main() -> Result<(), Box<dyn std::error::Error>> {
         print(f"🦀 Prototype Rust généré: rust_prototype.rs")
         print(f"💡 Pour tester: cargo init && cp rust_prototype.rs src/main.rs && cargo run")
 
+@profiler.session('rust_bridge')
 def main():
     print("🦀 PONT PYTHON → RUST POUR PANINI FS")
     print("=====================================")
@@ -432,12 +476,16 @@ def main():
     # Construction index optimisé
     bridge.build_optimized_index()
     
-    # Export vers formats Rust
-    bridge.export_to_rust_formats()
+    # Export vers formats Rust (+ formats historiques: comparés par benchmark_formats,
+    # JSON lu par le prototype Rust)
+    bridge.export_to_rust_formats(legacy_formats=True)
     
     # Benchmark formats
     bridge.benchmark_formats()
     
+    # Benchmark requêtes (plans indexés vs scans)
+    bridge.benchmark_queries()
+    
     # Génération code prototype
     bridge.generate_rust_prototype()
     
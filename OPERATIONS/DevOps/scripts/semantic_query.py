@@ -0,0 +1,903 @@
+#!/usr/bin/env python3
+"""
+🔎 REQUÊTES DÉCLARATIVES SUR LES STORES SÉMANTIQUES
+===================================================
+
+Petit langage de filtres sur les atomes, planifié selon les index
+disponibles au lieu des boucles écrites à la main par chaque analyseur:
+
+    concept = "machine learning" and confidence >= 0.8
+    source in (arxiv, wikipedia) and time >= 2025-08-15 and not agent = demo_v1
+    text ~ entrop or (definition ~ "phase transition" and time < 2025-09)
+
+- champs: id, concept, definition, source, agent, confidence, time, et
+  text (concept ou definition)
+- opérateurs: = != < <= > >= ~ (sous-chaîne, casse ignorée) in (...),
+  combinés par and / or / not et parenthèses
+- concept = compare le concept normalisé (minuscules, sans espaces de bord)
+- time compare l'horodatage ISO tronqué à la longueur de la valeur:
+  time = 2025-08-15 couvre la journée, time < 2025-09 s'arrête au mois
+
+Le planificateur choisit, par store, l'index le plus sélectif (postings
+concept / agent / source, permutation temporelle, index de mots pour ~)
+et pousse le reste des prédicats dans le lecteur: filtres colonne par
+colonne, évalués paresseusement, seules les colonnes projetées sont
+décodées pour les lignes retenues.
+
+    engine = QueryEngine.from_stores([("arxiv_semantic_store.json", "arxiv")])
+    print(engine.explain("concept = entropy and confidence > 0.9"))
+    for row in engine.query("concept = entropy", fields=['concept', 'time'], limit=10):
+        ...
+"""
+
+import argparse
+import heapq
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from atom_index import TOKEN_PATTERN, KeywordPostingIndex
+from columnar_store import ColumnarReader, ColumnarWriter
+
+FIELDS = ('id', 'concept', 'definition', 'source', 'agent', 'confidence', 'time')
+TEXT_FIELDS = ('concept', 'definition', 'text')
+STRING_FIELDS = ('id', 'concept', 'definition', 'source', 'agent', 'time')
+INDEXED_FIELDS = ('concept', 'agent', 'source')
+OPERATORS = ('=', '!=', '<', '<=', '>', '>=', '~', 'in')
+
+# Au-delà de cette part des lignes, l'index coûte plus qu'un parcours séquentiel
+INDEX_MAX_SELECTIVITY = 0.5
+
+
+class QuerySyntaxError(ValueError):
+    """Requête illisible: champ, opérateur ou valeur invalide"""
+
+
+def normalize_concept(concept: str) -> str:
+    return concept.lower().strip()
+
+
+# ---------------------------------------------------------------------------
+# Expressions
+
+@dataclass(frozen=True)
+class Compare:
+    field: str
+    op: str
+    value: Any
+
+    def __str__(self) -> str:
+        if self.op == 'in':
+            return f"{self.field} in ({', '.join(quote_value(v) for v in self.value)})"
+        return f"{self.field} {self.op} {quote_value(self.value)}"
+
+
+@dataclass(frozen=True)
+class And:
+    terms: Tuple
+
+    def __str__(self) -> str:
+        return " and ".join(_wrap(term, Or) for term in self.terms)
+
+
+@dataclass(frozen=True)
+class Or:
+    terms: Tuple
+
+    def __str__(self) -> str:
+        return " or ".join(_wrap(term, And) for term in self.terms)
+
+
+@dataclass(frozen=True)
+class Not:
+    term: Any
+
+    def __str__(self) -> str:
+        return f"not {_wrap(self.term, (And, Or))}"
+
+
+Expr = Union[Compare, And, Or, Not]
+
+
+def quote_value(value: Any) -> str:
+    """Valeur écrite dans la syntaxe des requêtes (guillemets si nécessaire)"""
+    if isinstance(value, float):
+        return repr(value)
+    text = str(value)
+    if re.fullmatch(r"[^\s()<>=!~,\"']+", text) and text.lower() not in ('and', 'or', 'not', 'in'):
+        return text
+    return json.dumps(text, ensure_ascii=False)
+
+
+def _wrap(term: Expr, kinds) -> str:
+    return f"({term})" if isinstance(term, kinds) else str(term)
+
+
+def conjuncts(expr: Optional[Expr]) -> List[Expr]:
+    """Termes du `and` de plus haut niveau"""
+    if expr is None:
+        return []
+    return list(expr.terms) if isinstance(expr, And) else [expr]
+
+
+# ---------------------------------------------------------------------------
+# Analyse syntaxique
+
+_TOKEN = re.compile(r"""\s*(?:
+    (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+  | (?P<op><=|>=|!=|=|<|>|~)
+  | (?P<punct>[(),])
+  | (?P<word>[^\s()<>=!~,"']+)
+)""", re.VERBOSE)
+
+
+def _tokenize(text: str) -> List[Tuple[str, str]]:
+    tokens, position = [], 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if not match or match.end() == position:
+            raise QuerySyntaxError(f"Caractère inattendu en position {position}: {text[position:position + 10]!r}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == 'string':
+            value = re.sub(r'\\(.)', r'\1', value[1:-1])
+        tokens.append((kind, value))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.position = 0
+
+    def _peek(self) -> Tuple[Optional[str], Optional[str]]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def _keyword(self, word: str) -> bool:
+        kind, value = self._peek()
+        if kind == 'word' and value.lower() == word:
+            self.position += 1
+            return True
+        return False
+
+    def _expect(self, kind: str, value: Optional[str] = None) -> str:
+        actual_kind, actual = self._peek()
+        if actual_kind != kind or (value is not None and actual != value):
+            found = actual if actual is not None else "fin de requête"
+            raise QuerySyntaxError(f"{value or kind} attendu, trouvé {found!r} dans: {self.text}")
+        self.position += 1
+        return actual
+
+    def parse(self) -> Expr:
+        expr = self._or()
+        if self.position != len(self.tokens):
+            raise QuerySyntaxError(f"Terme inattendu {self._peek()[1]!r} dans: {self.text}")
+        return expr
+
+    def _or(self) -> Expr:
+        terms = [self._and()]
+        while self._keyword('or'):
+            terms.append(self._and())
+        return terms[0] if len(terms) == 1 else Or(tuple(terms))
+
+    def _and(self) -> Expr:
+        terms = [self._unary()]
+        while self._keyword('and'):
+            terms.append(self._unary())
+        return terms[0] if len(terms) == 1 else And(tuple(terms))
+
+    def _unary(self) -> Expr:
+        if self._keyword('not'):
+            return Not(self._unary())
+        if self._peek() == ('punct', '('):
+            self.position += 1
+            expr = self._or()
+            self._expect('punct', ')')
+            return expr
+        return self._comparison()
+
+    def _value(self) -> str:
+        kind, value = self._peek()
+        if kind not in ('word', 'string'):
+            raise QuerySyntaxError(f"Valeur attendue, trouvé {value!r} dans: {self.text}")
+        self.position += 1
+        return value
+
+    def _comparison(self) -> Compare:
+        name = self._expect('word').lower()
+        if self._keyword('in'):
+            self._expect('punct', '(')
+            values = [self._value()]
+            while self._peek() == ('punct', ','):
+                self.position += 1
+                values.append(self._value())
+            self._expect('punct', ')')
+            return make_compare(name, 'in', values)
+        op = self._expect('op')
+        return make_compare(name, op, self._value())
+
+
+def make_compare(name: str, op: str, value: Any) -> Compare:
+    """Comparaison validée (champ, opérateur) avec valeur typée"""
+    if name not in FIELDS and name != 'text':
+        raise QuerySyntaxError(f"Champ inconnu: {name} (champs: {', '.join(FIELDS + ('text',))})")
+    if op not in OPERATORS:
+        raise QuerySyntaxError(f"Opérateur inconnu: {op}")
+    if name == 'text' and op != '~':
+        raise QuerySyntaxError("text n'accepte que ~")
+    if op == '~' and name not in STRING_FIELDS + ('text',):
+        raise QuerySyntaxError(f"~ n'accepte que des champs texte, pas {name}")
+
+    def typed(raw):
+        if name != 'confidence':
+            return str(raw)
+        try:
+            return float(raw)
+        except (TypeError, ValueError):
+            raise QuerySyntaxError(f"confidence attend un nombre, pas {raw!r}")
+
+    if op == 'in':
+        return Compare(name, op, tuple(typed(v) for v in value))
+    return Compare(name, op, typed(value))
+
+
+def parse_query(text: Union[str, Expr]) -> Expr:
+    """Arbre d'expression d'une requête (les arbres déjà construits sont rendus tels quels)"""
+    if not isinstance(text, str):
+        return text
+    if not text.strip():
+        raise QuerySyntaxError("Requête vide")
+    return _Parser(text).parse()
+
+
+# ---------------------------------------------------------------------------
+# Évaluation
+
+_COMPARATORS = {
+    '=': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+    '<': lambda a, b: a < b,
+    '<=': lambda a, b: a <= b,
+    '>': lambda a, b: a > b,
+    '>=': lambda a, b: a >= b,
+}
+
+
+def value_test(term: Compare) -> Callable[[Any], bool]:
+    """Test d'une valeur de colonne (champs réels, pas text)"""
+    op, value = term.op, term.value
+    if op == '~':
+        needle = value.lower()
+        return lambda v: needle in v.lower()
+    if term.field == 'concept':
+        if op == 'in':
+            keys = {normalize_concept(v) for v in value}
+            return lambda v: v.lower().strip() in keys
+        key = normalize_concept(value)
+        compare = _COMPARATORS[op]
+        return lambda v: compare(v.lower().strip(), key)
+    if term.field == 'time':
+        values = value if op == 'in' else (value,)
+        if op == 'in':
+            return lambda v: any(v[:len(x)] == x for x in values)
+        width = len(value)
+        compare = _COMPARATORS[op]
+        return lambda v: compare(v[:width], value)
+    if op == 'in':
+        members = set(value)
+        return lambda v: v in members
+    compare = _COMPARATORS[op]
+    return lambda v: compare(v, value)
+
+
+def row_test(term: Expr, reader) -> Callable[[int], bool]:
+    """Prédicat sur un numéro de ligne, lisant les colonnes du lecteur"""
+    if isinstance(term, And):
+        tests = [row_test(t, reader) for t in term.terms]
+        return lambda r: all(test(r) for test in tests)
+    if isinstance(term, Or):
+        tests = [row_test(t, reader) for t in term.terms]
+        return lambda r: any(test(r) for test in tests)
+    if isinstance(term, Not):
+        test = row_test(term.term, reader)
+        return lambda r: not test(r)
+    if term.field == 'text':
+        needle = term.value.lower()
+        concepts, definitions = reader.column('concept'), reader.column('definition')
+        return lambda r: needle in concepts[r].lower() or needle in definitions[r].lower()
+    column = reader.column(term.field)
+    test = value_test(term)
+    return lambda r: test(column[r])
+
+
+_FIELD_COST = {'confidence': 1, 'source': 1, 'agent': 1, 'id': 1, 'time': 2, 'concept': 2, 'definition': 4, 'text': 6}
+
+
+def term_cost(term: Expr) -> int:
+    """Coût relatif d'évaluation: les filtres bon marché passent en premier"""
+    if isinstance(term, (And, Or)):
+        return sum(term_cost(t) for t in term.terms)
+    if isinstance(term, Not):
+        return term_cost(term.term)
+    return _FIELD_COST[term.field] + (1 if term.op == '~' else 0)
+
+
+def filter_rows(reader, terms: Sequence[Expr], rows: Optional[Iterable[int]] = None) -> Iterator[int]:
+    """Lignes satisfaisant tous les termes, paresseusement.
+
+    Sans candidats (rows None), le premier terme simple parcourt sa colonne
+    séquentiellement; les suivants ne lisent que les lignes retenues.
+    """
+    terms = sorted(terms, key=term_cost)
+    if rows is None:
+        if terms and isinstance(terms[0], Compare) and terms[0].field != 'text':
+            first = terms.pop(0)
+            test = value_test(first)
+            rows = (r for r, value in enumerate(reader.column(first.field)) if test(value))
+        else:
+            rows = range(reader.num_rows)
+    for term in terms:
+        rows = filter(row_test(term, reader), rows)
+    return iter(rows)
+
+
+# ---------------------------------------------------------------------------
+# Lecteurs
+
+class AtomReader:
+    """Atomes d'un store JSON en mémoire: colonnes + index construits au chargement"""
+
+    def __init__(self, atoms: Sequence[Dict], source_type: Optional[str] = None,
+                 name: str = "atoms", indexed: bool = True, text_index: bool = False):
+        self.name = name
+        self.atoms = atoms
+        self.num_rows = len(atoms)
+        columns = {name: [] for name in FIELDS}
+        for atom in atoms:
+            provenance = atom.get('provenance', {})
+            columns['id'].append(str(atom.get('id', '')))
+            columns['concept'].append(atom.get('concept', ''))
+            columns['definition'].append(atom.get('definition', ''))
+            columns['source'].append(atom.get('source_type', source_type or ''))
+            columns['agent'].append(provenance.get('source_agent', ''))
+            columns['confidence'].append(provenance.get('extraction_confidence', 0.0))
+            columns['time'].append(provenance.get('timestamp', ''))
+        self._columns = columns
+        self._postings: Optional[Dict[str, Dict[str, List[int]]]] = None
+        self._time_order: Optional[List[int]] = None
+        self._text_index: Optional[KeywordPostingIndex] = None
+        if indexed:
+            self.build_indexes()
+        if text_index:
+            self.build_text_index()
+
+    @classmethod
+    def from_store(cls, filename: str, source_type: Optional[str] = None, **options) -> 'AtomReader':
+        with open(filename, 'r', encoding='utf-8') as f:
+            atoms = json.load(f).get('semantic_atoms', [])
+        return cls(atoms, source_type, name=os.path.basename(filename), **options)
+
+    def build_indexes(self):
+        """Postings concept / agent / source et ordre temporel (mêmes index que le .pcol)"""
+        self._postings = {name: {} for name in INDEXED_FIELDS}
+        for name in INDEXED_FIELDS:
+            postings = self._postings[name]
+            for row, value in enumerate(self._columns[name]):
+                key = normalize_concept(value) if name == 'concept' else value
+                postings.setdefault(key, []).append(row)
+        times = self._columns['time']
+        self._time_order = sorted(range(self.num_rows), key=times.__getitem__)
+
+    def build_text_index(self):
+        self._text_index = _text_index(self)
+
+    def column(self, name: str) -> Sequence:
+        return self._columns[name]
+
+    def lookup(self, name: str, key: str) -> Optional[Sequence[int]]:
+        """Lignes de la clé (vide si absente), None sans index sur ce champ"""
+        if self._postings is None or name not in self._postings:
+            return None
+        return self._postings[name].get(normalize_concept(key) if name == 'concept' else key, [])
+
+    def time_order(self) -> Optional[Sequence[int]]:
+        return self._time_order
+
+    def text_estimate(self, name: str, keyword: str) -> Optional[int]:
+        return _text_estimate(self._text_index, name, keyword)
+
+    def text_lookup(self, name: str, keyword: str):
+        return _text_lookup(self._text_index, name, keyword)
+
+    def record(self, row: int) -> Dict:
+        """Atome d'origine"""
+        return self.atoms[row]
+
+
+# Colonnes du .pcol de RustBridge (COLUMNAR_SCHEMA) pour chaque champ de requête
+COLUMNAR_FIELDS = {'source': 'source_type', 'agent': 'source_agent', 'time': 'timestamp'}
+
+
+class ColumnarStoreReader:
+    """Fichier .pcol (RustBridge): colonnes mmap, postings et permutation temporelle du fichier"""
+
+    def __init__(self, path: str, text_index: bool = False):
+        self.name = os.path.basename(path)
+        self.reader = ColumnarReader(path)
+        self.num_rows = self.reader.num_rows
+        available = self.reader.index_names()
+        self._postings = {name: self.reader.postings(name) for name in INDEXED_FIELDS if name in available}
+        self._time_order = self.reader.permutation('temporal') if 'temporal' in available else None
+        self._text_index: Optional[KeywordPostingIndex] = None
+        if text_index:
+            self.build_text_index()
+
+    def close(self):
+        self._postings.clear()
+        self._time_order = None
+        self.reader.close()
+
+    def build_text_index(self):
+        """Index de mots en mémoire (le .pcol n'en contient pas)"""
+        self._text_index = _text_index(self)
+
+    def column(self, name: str) -> Sequence:
+        return self.reader.column(COLUMNAR_FIELDS.get(name, name))
+
+    def lookup(self, name: str, key: str) -> Optional[Sequence[int]]:
+        postings = self._postings.get(name)
+        if postings is None:
+            return None
+        return postings.get(normalize_concept(key) if name == 'concept' else key)
+
+    def time_order(self) -> Optional[Sequence[int]]:
+        return self._time_order
+
+    def text_estimate(self, name: str, keyword: str) -> Optional[int]:
+        return _text_estimate(self._text_index, name, keyword)
+
+    def text_lookup(self, name: str, keyword: str):
+        return _text_lookup(self._text_index, name, keyword)
+
+    def record(self, row: int) -> Dict:
+        return self.reader.row(row)
+
+
+def _text_index(reader) -> KeywordPostingIndex:
+    concepts, definitions = reader.column('concept'), reader.column('definition')
+    index = KeywordPostingIndex()
+    for row, (concept, definition) in enumerate(zip(concepts, definitions)):
+        index.add(row, {'concept': concept, 'definition': definition})
+    return index
+
+
+def _text_estimate(index: Optional[KeywordPostingIndex], name: str, keyword: str) -> Optional[int]:
+    """Majorant des lignes contenant `keyword`: postings des mots du vocabulaire qui
+    contiennent sa partie la plus rare (parcours du vocabulaire, pas des lignes)"""
+    if index is None or name not in TEXT_FIELDS:
+        return None
+    parts = TOKEN_PATTERN.findall(keyword.lower())
+    if not parts:
+        return None
+    names = ('concept', 'definition') if name == 'text' else (name,)
+    return min(sum(len(rows) for name in names for token, rows in index.postings[name].items() if part in token)
+               for part in parts)
+
+
+def _text_lookup(index: Optional[KeywordPostingIndex], name: str, keyword: str):
+    if index is None:
+        return None
+    keyword = keyword.lower()
+    if name == 'text':
+        return index.lookup(keyword, 'concept') | index.lookup(keyword, 'definition')
+    if name in ('concept', 'definition'):
+        return index.lookup(keyword, name)
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Planification
+
+@dataclass
+class Plan:
+    store: str
+    total_rows: int
+    access: str = 'scan'                    # 'index' ou 'scan'
+    index: Optional[str] = None             # terme(s) résolus par l'index
+    rows: Optional[Sequence[int]] = None    # candidats triés (None = toutes les lignes)
+    residual: List[Expr] = field(default_factory=list)
+
+    @property
+    def candidates(self) -> int:
+        return self.total_rows if self.rows is None else len(self.rows)
+
+    def explain(self) -> str:
+        if self.access == 'index':
+            access = f"index {self.index} -> {self.candidates}/{self.total_rows} lignes"
+        else:
+            access = f"scan {self.total_rows} lignes"
+        residual = " and ".join(_wrap(term, Or) for term in sorted(self.residual, key=term_cost))
+        return f"[{self.store}] {access}" + (f" | filtre: {residual}" if residual else "")
+
+
+_RANGE_OPS = ('=', '<', '<=', '>', '>=')
+
+
+def _time_bounds(order: Sequence[int], times: Sequence[str], term: Compare) -> Tuple[int, int]:
+    width = len(term.value)
+    key = lambda row: times[row][:width]
+    lo, hi = 0, len(order)
+    if term.op in ('>=', '='):
+        lo = bisect_left(order, term.value, key=key)
+    elif term.op == '>':
+        lo = bisect_right(order, term.value, key=key)
+    if term.op in ('<=', '='):
+        hi = bisect_right(order, term.value, key=key)
+    elif term.op == '<':
+        hi = bisect_left(order, term.value, key=key)
+    return lo, hi
+
+
+def _index_access(reader, term: Expr) -> Optional[Tuple[int, Callable[[], List[int]]]]:
+    """(estimation du nombre de lignes, résolution) d'un terme indexable, None sinon.
+
+    L'estimation est bon marché (tailles de postings, bornes de la permutation,
+    vocabulaire de l'index de mots): seul l'index retenu est résolu.
+    """
+    if isinstance(term, Or):
+        accesses = [_index_access(reader, child) for child in term.terms]
+        if any(access is None for access in accesses):
+            return None
+        return (sum(estimate for estimate, _ in accesses),
+                lambda: sorted(set().union(*(resolve() for _, resolve in accesses))))
+    if not isinstance(term, Compare):
+        return None
+    if term.field in INDEXED_FIELDS and term.op in ('=', 'in'):
+        keys = term.value if term.op == 'in' else (term.value,)
+        postings = [reader.lookup(term.field, key) for key in keys]
+        if any(rows is None for rows in postings):
+            return None
+        if len(postings) == 1:
+            return len(postings[0]), lambda: list(postings[0])
+        return sum(len(rows) for rows in postings), lambda: sorted(set().union(*postings))
+    if term.field == 'time' and term.op in _RANGE_OPS and reader.time_order() is not None:
+        order = reader.time_order()
+        lo, hi = _time_bounds(order, reader.column('time'), term)
+        return max(0, hi - lo), lambda: sorted(order[lo:hi])
+    if term.op == '~' and term.field in TEXT_FIELDS:
+        estimate = reader.text_estimate(term.field, term.value)
+        if estimate is None:
+            return None
+        return estimate, lambda: sorted(reader.text_lookup(term.field, term.value))
+    return None
+
+
+def plan_query(reader, expr: Optional[Expr], use_indexes: bool = True) -> Plan:
+    """Plan d'un store: index le plus sélectif en accès, le reste en filtres poussés au lecteur"""
+    terms = conjuncts(expr)
+    plan = Plan(reader.name, reader.num_rows, residual=terms)
+    if not use_indexes or not terms:
+        return plan
+
+    best = None  # (estimation, résolution, termes couverts)
+    # Bornes temporelles combinées en une seule plage de la permutation
+    time_terms = [t for t in terms if isinstance(t, Compare) and t.field == 'time' and t.op in _RANGE_OPS]
+    if time_terms and reader.time_order() is not None:
+        order, times = reader.time_order(), reader.column('time')
+        lo, hi = 0, len(order)
+        for term in time_terms:
+            term_lo, term_hi = _time_bounds(order, times, term)
+            lo, hi = max(lo, term_lo), min(hi, term_hi)
+        best = (max(0, hi - lo), lambda: sorted(order[lo:hi]) if lo < hi else [], time_terms)
+    for term in terms:
+        if term in time_terms:
+            continue
+        access = _index_access(reader, term)
+        if access is not None and (best is None or access[0] < best[0]):
+            best = (access[0], access[1], [term])
+
+    if best is None or best[0] > INDEX_MAX_SELECTIVITY * reader.num_rows:
+        return plan
+    _, resolve, covered = best
+    plan.access = 'index'
+    plan.index = " and ".join(_wrap(term, Or) for term in covered)
+    plan.rows = resolve()
+    # Termes couverts exactement par l'index: inutile de les réévaluer
+    plan.residual = [term for term in terms if term not in covered]
+    return plan
+
+
+# ---------------------------------------------------------------------------
+# Exécution
+
+def _projector(reader, fields: Optional[Sequence[str]]) -> Callable[[int], Dict]:
+    if fields is None:
+        return reader.record
+    columns = [(name, reader.column(name)) for name in fields]
+    return lambda row: {name: column[row] for name, column in columns}
+
+
+def _order_key(order_by: Optional[str]) -> Tuple[Optional[str], bool]:
+    if not order_by:
+        return None, False
+    descending = order_by.startswith('-')
+    name = order_by.lstrip('-')
+    if name not in FIELDS:
+        raise QuerySyntaxError(f"Tri sur un champ inconnu: {name}")
+    return name, descending
+
+
+def execute_plan(reader, plan: Plan, order_by: Optional[str] = None) -> Iterator[int]:
+    """Numéros de ligne satisfaisant la requête, dans l'ordre demandé"""
+    name, descending = _order_key(order_by)
+    if name == 'time' and not descending and plan.access == 'scan' and reader.time_order() is not None:
+        # Ordre temporel lu dans la permutation: pas de tri, reste paresseux
+        return filter_rows(reader, plan.residual, reader.time_order())
+    rows = filter_rows(reader, plan.residual, plan.rows)
+    if name is None:
+        return rows
+    column = reader.column(name)
+    return iter(sorted(rows, key=column.__getitem__, reverse=descending))
+
+
+class QueryResult:
+    """Résultat paresseux: rien n'est lu avant l'itération"""
+
+    def __init__(self, engine: 'QueryEngine', expr: Optional[Expr], fields: Optional[Sequence[str]] = None,
+                 order_by: Optional[str] = None, limit: Optional[int] = None, use_indexes: bool = True):
+        for name in fields or ():
+            if name not in FIELDS:
+                raise QuerySyntaxError(f"Champ inconnu: {name}")
+        _order_key(order_by)
+        self.engine = engine
+        self.expr = expr
+        self.fields = list(fields) if fields is not None else None
+        self.order_by = order_by
+        self.limit = limit
+        self.use_indexes = use_indexes
+
+    @property
+    def plans(self) -> List[Plan]:
+        return [plan_query(reader, self.expr, self.use_indexes) for reader in self.engine.readers]
+
+    def _streams(self) -> List[Iterator[Tuple[Any, Dict]]]:
+        name, _ = _order_key(self.order_by)
+        streams = []
+        for reader, plan in zip(self.engine.readers, self.plans):
+            streams.append(self._stream(reader, plan, name))
+        return streams
+
+    def _stream(self, reader, plan: Plan, order_field: Optional[str]) -> Iterator[Tuple[Any, Dict]]:
+        project = _projector(reader, self.fields)
+        column = reader.column(order_field) if order_field else None
+        for row in execute_plan(reader, plan, self.order_by):
+            yield (column[row] if column is not None else None), project(row)
+
+    def __iter__(self) -> Iterator[Dict]:
+        streams = self._streams()
+        if self.order_by:
+            # Fusion des stores triés (stable: ordre des stores à égalité)
+            merged = heapq.merge(*streams, key=lambda item: item[0], reverse=self.order_by.startswith('-'))
+        else:
+            merged = (item for stream in streams for item in stream)
+        for count, (_, row) in enumerate(merged):
+            if self.limit is not None and count >= self.limit:
+                return
+            yield row
+
+    def count(self) -> int:
+        """Nombre de correspondances sans projeter les lignes"""
+        total = sum(sum(1 for _ in filter_rows(reader, plan.residual, plan.rows))
+                    for reader, plan in zip(self.engine.readers, self.plans))
+        return total if self.limit is None else min(total, self.limit)
+
+    def to_list(self) -> List[Dict]:
+        return list(self)
+
+
+class QueryEngine:
+    """Requêtes déclaratives sur un ou plusieurs stores (ordre des stores conservé)"""
+
+    def __init__(self, readers: Sequence):
+        self.readers = list(readers)
+
+    @classmethod
+    def from_stores(cls, stores: Sequence[Tuple[str, Optional[str]]], text_index: bool = False) -> 'QueryEngine':
+        """Stores JSON (semantic_atoms) ou .pcol, ignorés s'ils sont absents"""
+        readers = []
+        for filename, source_type in stores:
+            if not os.path.exists(filename):
+                print(f"⚠️  {filename} non trouvé")
+                continue
+            if filename.endswith('.pcol'):
+                readers.append(ColumnarStoreReader(filename, text_index=text_index))
+            else:
+                readers.append(AtomReader.from_store(filename, source_type, text_index=text_index))
+        return cls(readers)
+
+    def close(self):
+        for reader in self.readers:
+            if hasattr(reader, 'close'):
+                reader.close()
+
+    def query(self, query: Union[str, Expr, None] = None, fields: Optional[Sequence[str]] = None,
+              order_by: Optional[str] = None, limit: Optional[int] = None,
+              use_indexes: bool = True) -> QueryResult:
+        """Correspondances paresseuses; fields None rend l'enregistrement complet du store"""
+        expr = parse_query(query) if query is not None else None
+        return QueryResult(self, expr, fields, order_by, limit, use_indexes)
+
+    def explain(self, query: Union[str, Expr], use_indexes: bool = True) -> str:
+        return "\n".join(plan.explain() for plan in self.query(query, use_indexes=use_indexes).plans)
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+
+BENCHMARK_QUERIES = [
+    "concept = 'neural network 17'",
+    "agent = collector_3 and confidence >= 0.9",
+    "source in (arxiv, books) and time = 2025-08-15",
+    "time >= 2025-08-20T06 and time < 2025-08-20T08",
+    "text ~ entropie",
+    "confidence > 0.95 and definition ~ 'phase transition'",
+]
+
+
+def synthetic_atoms(count: int, seed: int = 0) -> List[Dict]:
+    """Atomes synthétiques aux distributions proches des stores collectés"""
+    rng = random.Random(seed)
+    words = ["neural", "network", "entropy", "information", "learning", "phase", "transition",
+             "market", "knowledge", "fractal", "compression", "signal", "quantum", "reason"]
+    sources = ["arxiv", "wikipedia", "books", "patents"]
+    atoms = []
+    for i in range(count):
+        concept = f"{rng.choice(words)} {rng.choice(words)} {rng.randint(0, count // 5000)}"
+        definition = " ".join(rng.choice(words) for _ in range(rng.randint(8, 30)))
+        if rng.random() < 0.002:
+            definition += " entropie"
+        atoms.append({
+            'id': f"atom_{i:07d}",
+            'concept': concept,
+            'definition': definition,
+            'source_type': rng.choice(sources),
+            'provenance': {
+                'source_agent': f"collector_{rng.randint(0, 40)}",
+                'extraction_confidence': round(rng.uniform(0.5, 1.0), 3),
+                'timestamp': f"2025-08-{rng.randint(1, 30):02d}T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00",
+                'parent_sources': []
+            }
+        })
+    return atoms
+
+
+def write_columnar(path: str, atoms: Sequence[Dict]):
+    """Écrit des atomes au format .pcol de RustBridge (mêmes colonnes et index)"""
+    from rust_bridge import COLUMNAR_SCHEMA
+    reader = AtomReader(atoms)
+    columns = {'id': 'id', 'concept': 'concept', 'definition': 'definition', 'source_agent': 'agent',
+               'source_type': 'source', 'timestamp': 'time', 'confidence': 'confidence'}
+    with ColumnarWriter(path, COLUMNAR_SCHEMA) as writer:
+        for row, atom in enumerate(atoms):
+            writer.write_row([reader.column(columns[name])[row] if name in columns
+                              else atom['provenance'].get(name, []) for name, _ in COLUMNAR_SCHEMA])
+        for name in INDEXED_FIELDS:
+            writer.add_postings(name, reader._postings[name])
+        writer.add_permutation('temporal', reader.time_order())
+
+
+def benchmark_queries(engine: QueryEngine, queries: Sequence[str] = BENCHMARK_QUERIES,
+                      runs: int = 3) -> List[Dict]:
+    """Plan indexé vs scan complet pour chaque requête (mêmes résultats exigés)"""
+    results = []
+    for query in queries:
+        timings = {}
+        outputs = {}
+        for label, use_indexes in (('index', True), ('scan', False)):
+            best = float('inf')
+            for _ in range(runs):
+                start = time.perf_counter()
+                rows = engine.query(query, fields=['id'], use_indexes=use_indexes).to_list()
+                best = min(best, time.perf_counter() - start)
+            timings[label] = best * 1000
+            outputs[label] = rows
+        if outputs['index'] != outputs['scan']:
+            raise AssertionError(f"Plans divergents pour: {query}")
+        plans = engine.query(query).plans
+        results.append({
+            'query': query,
+            'rows': len(outputs['index']),
+            'access': sorted({plan.access for plan in plans}),
+            'index_ms': round(timings['index'], 3),
+            'scan_ms': round(timings['scan'], 3),
+            'speedup': round(timings['scan'] / timings['index'], 1) if timings['index'] else None
+        })
+    return results
+
+
+def _print_benchmark(label: str, results: List[Dict]):
+    print(f"\n⚡ {label}")
+    for result in results:
+        print(f"   {result['query']:<58} {result['rows']:>6} lignes | {'/'.join(result['access']):<10} "
+              f"{result['index_ms']:>8.2f} ms | scan {result['scan_ms']:>8.2f} ms | x{result['speedup']}")
+
+
+def benchmark(count: int = 100_000, runs: int = 3, seed: int = 0) -> Dict[str, List[Dict]]:
+    """Plans indexés vs scans sur atomes synthétiques, en mémoire (JSON) et sur .pcol"""
+    atoms = synthetic_atoms(count, seed)
+    start = time.perf_counter()
+    memory = AtomReader(atoms, name='synthetic.json', text_index=True)
+    print(f"🔎 {count} atomes synthétiques, colonnes + index en {time.perf_counter() - start:.2f}s")
+    results = {'memory': benchmark_queries(QueryEngine([memory]), runs=runs)}
+    _print_benchmark("Store JSON en mémoire", results['memory'])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'synthetic.pcol')
+        write_columnar(path, atoms)
+        columnar = ColumnarStoreReader(path, text_index=True)
+        try:
+            results['columnar'] = benchmark_queries(QueryEngine([columnar]), runs=runs)
+        finally:
+            columnar.close()
+    _print_benchmark("Conteneur colonnaire .pcol (mmap)", results['columnar'])
+    return results
+
+
+DEFAULT_STORES = [
+    ("demo_semantic_store.json", "wikipedia"),
+    ("arxiv_semantic_store.json", "arxiv"),
+    ("historical_books_semantic_store.json", "historical_books"),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Requêtes déclaratives sur les stores sémantiques")
+    parser.add_argument('query', nargs='?', help="Ex: \"concept = entropy and confidence >= 0.8\"")
+    parser.add_argument('--store', action='append', default=[], metavar='FICHIER[:SOURCE]',
+                        help="Store JSON ou .pcol (défaut: stores collectés)")
+    parser.add_argument('--fields', default='concept,source,agent,confidence,time')
+    parser.add_argument('--order-by', default=None, help="Champ de tri, '-' pour décroissant")
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--explain', action='store_true', help="Affiche le plan sans exécuter")
+    parser.add_argument('--text-index', action='store_true', help="Construit l'index de mots (~)")
+    parser.add_argument('--benchmark', type=int, nargs='?', const=100_000, default=None, metavar='ATOMES',
+                        help="Compare plans indexés et scans sur des atomes synthétiques")
+    args = parser.parse_args()
+
+    if args.benchmark is not None:
+        benchmark(args.benchmark)
+        return
+    if not args.query:
+        parser.error("requête manquante")
+
+    stores = [tuple(spec.split(':', 1)) if ':' in spec else (spec, None) for spec in args.store] or DEFAULT_STORES
+    engine = QueryEngine.from_stores(stores, text_index=args.text_index)
+    try:
+        print(engine.explain(args.query))
+        if args.explain:
+            return
+        start = time.perf_counter()
+        rows = engine.query(args.query, fields=args.fields.split(','), order_by=args.order_by,
+                            limit=args.limit).to_list()
+        for row in rows:
+            print("  " + " | ".join(str(value) for value in row.values()))
+        print(f"✅ {len(rows)} résultats en {(time.perf_counter() - start) * 1000:.1f} ms")
+    except QuerySyntaxError as e:
+        print(f"❌ {e}")
+    finally:
+        engine.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+🧩 CONSENSUS SHARDÉ: MAP-REDUCE SUR UN POOL DE PROCESSUS
+========================================================
+
+Mode d'exécution des moteurs de consensus (AdvancedConsensusEngine,
+MultiSourceConsensusAnalyzer) sans tout le corpus dans un seul processus:
+
+- map: un processus par fichier de store le parse, allège chaque atome
+  aux champs utilisés et le range dans le shard hash(concept normalisé)
+  % N; chaque seau est écrit dans un dossier temporaire
+- reduce: un processus par shard relit ses seaux dans l'ordre des
+  fichiers (même ordre d'atomes par concept qu'en mono-processus) et
+  calcule les statistiques locales du moteur
+- fusion déterministe dans le processus parent (ordre des fichiers, des
+  shards, première apparition), pour un rapport identique au chemin
+  mono-processus
+
+    with ShardedRun(stores, workers=4) as run:
+        loaded = run.map()
+        partials = run.reduce(_reduce_shard, params)
+"""
+
+import json
+import os
+import pickle
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from stream_sketches import hash64, store_sketches
+
+Seq = Tuple[int, int]  # (index du fichier, index de l'atome dans le fichier)
+
+
+@dataclass
+class StoreSpec:
+    """Fichier de store à charger et étiquettes ajoutées à ses atomes"""
+    filename: str
+    source_type: str
+    authority_weight: Optional[float] = None
+
+
+def concept_key(concept: str) -> str:
+    return concept.lower().strip()
+
+
+def shard_of(key: str, shards: int) -> int:
+    """Shard d'un concept normalisé (hash stable entre processus)"""
+    return hash64(key) % shards
+
+
+def slim_atom(atom: Dict, source_type: str, authority_weight: Optional[float] = None) -> Dict:
+    """Atome réduit aux champs lus par les moteurs de consensus"""
+    provenance = atom['provenance']
+    slim = {
+        'concept': atom['concept'],
+        'definition': atom['definition'],
+        'source_type': source_type,
+        'provenance': {
+            'source_agent': provenance['source_agent'],
+            'extraction_confidence': provenance['extraction_confidence'],
+            'timestamp': provenance['timestamp']
+        }
+    }
+    if 'context' in atom:
+        slim['context'] = atom['context']
+    if authority_weight is not None:
+        slim['authority_weight'] = authority_weight
+    return slim
+
+
+def _bucket_path(spill_dir: str, file_index: int, shard: int) -> str:
+    return os.path.join(spill_dir, f"{file_index:04d}-{shard:04d}.pkl")
+
+
+def _map_store(task: Tuple[int, StoreSpec, int, str, bool]) -> Dict:
+    file_index, spec, shards, spill_dir, sketches = task
+    try:
+        with open(spec.filename, 'r', encoding='utf-8') as f:
+            atoms = json.load(f).get('semantic_atoms', [])
+        buckets: List[List[Tuple[int, Dict]]] = [[] for _ in range(shards)]
+        for index, atom in enumerate(atoms):
+            buckets[shard_of(concept_key(atom['concept']), shards)].append(
+                (index, slim_atom(atom, spec.source_type, spec.authority_weight)))
+    except Exception as e:
+        return {'file_index': file_index, 'source_type': spec.source_type, 'atoms': 0, 'error': str(e)}
+    for shard, bucket in enumerate(buckets):
+        with open(_bucket_path(spill_dir, file_index, shard), 'wb') as f:
+            pickle.dump(bucket, f, pickle.HIGHEST_PROTOCOL)
+    return {
+        'file_index': file_index,
+        'source_type': spec.source_type,
+        'atoms': len(atoms),
+        'error': None,
+        'sketches': store_sketches(spec.filename, atoms).to_dict() if sketches else None
+    }
+
+
+def iter_shard_atoms(spill_dir: str, shard: int, file_indices: Sequence[int]) -> Iterator[Tuple[Seq, Dict]]:
+    """Atomes d'un shard dans l'ordre de chargement mono-processus"""
+    for file_index in file_indices:
+        with open(_bucket_path(spill_dir, file_index, shard), 'rb') as f:
+            bucket = pickle.load(f)
+        for index, atom in bucket:
+            yield (file_index, index), atom
+
+
+def _reduce_task(task) -> Dict:
+    reduce_fn, shard, spill_dir, file_indices, params = task
+    return reduce_fn(shard, iter_shard_atoms(spill_dir, shard, file_indices), params)
+
+
+_SHARED_CACHE: Dict[str, object] = {}
+
+
+def load_shared(path: str):
+    """Donnée partagée (pickle du dossier de spill), chargée une fois par processus"""
+    data = _SHARED_CACHE.get(path)
+    if data is None:
+        with open(path, 'rb') as f:
+            data = _SHARED_CACHE[path] = pickle.load(f)
+    return data
+
+
+def _jaccard_neighbors_task(task) -> List[Tuple[int, List[int]]]:
+    path, rows, threshold = task
+    word_sets = load_shared(path)
+    sizes = [len(words) for words in word_sets]
+    result = []
+    for i in rows:
+        words, size = word_sets[i], sizes[i]
+        neighbors = []
+        for j in range(i + 1, len(word_sets)):
+            other_size = sizes[j]
+            # Borne: Jaccard <= min/max des tailles, sans calculer l'intersection
+            if min(size, other_size) < threshold * max(size, other_size):
+                continue
+            common = len(words & word_sets[j])
+            union = size + other_size - common
+            if (common / union if union else 0.0) >= threshold:
+                neighbors.append(j)
+        result.append((i, neighbors))
+    return result
+
+
+class ShardedRun:
+    """Pool de processus + dossier de spill pour un run map-reduce"""
+
+    def __init__(self, stores: Sequence[StoreSpec], workers: Optional[int] = None,
+                 shards: Optional[int] = None, sketches: bool = False):
+        self.stores = list(stores)
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.shards = shards or self.workers
+        self.sketches = sketches
+        self.loaded: List[Dict] = []
+        self.spill_dir: Optional[str] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> 'ShardedRun':
+        self.spill_dir = tempfile.mkdtemp(prefix='panini_shards_')
+        if self.workers > 1:
+            self._pool = ProcessPoolExecutor(self.workers)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self.spill_dir:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+            self.spill_dir = None
+
+    def _map(self, fn: Callable, tasks: List) -> List:
+        if self._pool is None:
+            return [fn(task) for task in tasks]
+        return list(self._pool.map(fn, tasks))
+
+    def map(self) -> List[Dict]:
+        """Parse + partition de chaque store; résultats dans l'ordre des stores"""
+        tasks = [(i, spec, self.shards, self.spill_dir, self.sketches) for i, spec in enumerate(self.stores)]
+        self.loaded = self._map(_map_store, tasks)
+        return self.loaded
+
+    def reduce(self, reduce_fn: Callable, params: Optional[Dict] = None) -> List[Dict]:
+        """reduce_fn(shard, atomes ordonnés, params) par shard (fonction de module, picklable)"""
+        file_indices = [result['file_index'] for result in self.loaded if result['error'] is None]
+        tasks = [(reduce_fn, shard, self.spill_dir, file_indices, params or {}) for shard in range(self.shards)]
+        return self._map(_reduce_task, tasks)
+
+    def jaccard_neighbors(self, word_sets: List[Set[str]], threshold: float) -> List[List[int]]:
+        """Pour chaque i, les j > i de similarité de Jaccard >= seuil (lignes réparties en bandes)"""
+        path = os.path.join(self.spill_dir, f"word_sets_{id(word_sets)}.pkl")
+        with open(path, 'wb') as f:
+            pickle.dump(word_sets, f, pickle.HIGHEST_PROTOCOL)
+        # Bandes entrelacées: les premières lignes (plus de j > i) sont réparties
+        stripes = max(1, min(len(word_sets), self.workers * 8))
+        tasks = [(path, range(k, len(word_sets), stripes), threshold) for k in range(stripes)]
+        neighbors: List[List[int]] = [[] for _ in word_sets]
+        for rows in self._map(_jaccard_neighbors_task, tasks):
+            for i, row in rows:
+                neighbors[i] = row
+        _SHARED_CACHE.pop(path, None)
+        return neighbors
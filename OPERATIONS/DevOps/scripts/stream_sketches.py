@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+📐 SKETCHES DE FLUX: TOP-K ET CARDINALITÉS EN MÉMOIRE BORNÉE
+============================================================
+
+Les rapports (consensus, patterns) alimentent ces résumés atome par
+atome au lieu de garder des Counter/listes complets:
+
+- SpaceSaving: top-k approché (Metwally et al.), `capacity` éléments
+  suivis, compte surestimé d'au plus `error`; exact tant que le nombre
+  d'éléments distincts reste sous la capacité
+- HyperLogLog: nombre d'éléments distincts, 2^precision registres
+  (erreur type ~1.04/sqrt(2^p), 1.6% pour p=12)
+- ExactSum: somme de floats exacte et indépendante de l'ordre
+
+Les deux fusionnent sans perte de garantie: un sketch par fichier de
+store (mis en cache dans sketches/, invalidé par mtime/taille), fusionnés
+pour le corpus sans seconde passe sur les atomes.
+
+    python stream_sketches.py demo_semantic_store.json arxiv_semantic_store.json
+"""
+
+import base64
+import hashlib
+import heapq
+import json
+import math
+import os
+import re
+import sys
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SKETCH_DIR = 'sketches'
+DEFAULT_CAPACITY = 1024
+DEFAULT_PRECISION = 12
+
+TERM_PATTERN = re.compile(r'\b\w{5,}\b')
+TERM_STOP_WORDS = {'cette', 'sont', 'pour', 'dans', 'avec', 'intelligence', 'artificielle'}
+PAIR_SEPARATOR = '\x1f'
+
+
+def hash64(item: str) -> int:
+    """Hash 64 bits stable entre processus (les sketches sont persistés et fusionnés)"""
+    return int.from_bytes(hashlib.blake2b(item.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class SpaceSaving:
+    """Top-k approché à `capacity` compteurs"""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.total = 0
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        # Une entrée (compte enregistré, élément) par élément suivi; les comptes
+        # ne font que croître, une entrée périmée est re-poussée à l'éviction
+        self._heap: List[Tuple[int, str]] = []
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def update(self, item: str, count: int = 1):
+        self.total += count
+        counts = self.counts
+        if item in counts:
+            counts[item] += count
+            return
+        if len(counts) < self.capacity:
+            counts[item] = count
+            self.errors[item] = 0
+            heapq.heappush(self._heap, (count, item))
+            return
+        floor = self._pop_min()
+        counts[item] = floor + count
+        self.errors[item] = floor
+        heapq.heappush(self._heap, (floor + count, item))
+
+    def _pop_min(self) -> int:
+        heap, counts = self._heap, self.counts
+        while True:
+            recorded, item = heap[0]
+            current = counts[item]
+            if recorded == current:
+                heapq.heappop(heap)
+                del counts[item]
+                del self.errors[item]
+                return current
+            heapq.heapreplace(heap, (current, item))
+
+    def min_count(self) -> int:
+        """Compte attribuable à un élément non suivi"""
+        return min(self.counts.values()) if len(self.counts) >= self.capacity else 0
+
+    def estimate(self, item: str) -> int:
+        return self.counts.get(item, self.min_count())
+
+    def top(self, k: Optional[int] = None) -> List[Tuple[str, int, int]]:
+        """[(élément, compte estimé, surestimation max)] par compte décroissant"""
+        ranked = sorted(self.counts.items(), key=lambda entry: (-entry[1], entry[0]))
+        return [(item, count, self.errors[item]) for item, count in ranked[:k]]
+
+    def merge(self, other: 'SpaceSaving'):
+        """Fusion (Agarwal et al. 2012): un élément absent d'un côté y vaut son minimum"""
+        floor_self, floor_other = self.min_count(), other.min_count()
+        merged = {}
+        # Ordre trié: les égalités de compte en bordure de capacité se départagent
+        # de la même façon quel que soit le processus (hash des str aléatoire)
+        for item in sorted(self.counts.keys() | other.counts.keys()):
+            count = self.counts.get(item, floor_self) + other.counts.get(item, floor_other)
+            error = self.errors.get(item, floor_self) + other.errors.get(item, floor_other)
+            merged[item] = (count, error)
+        self.capacity = max(self.capacity, other.capacity)
+        kept = heapq.nlargest(self.capacity, merged.items(), key=lambda entry: entry[1][0])
+        self.counts = {item: count for item, (count, _) in kept}
+        self.errors = {item: error for item, (_, error) in kept}
+        self._heap = [(count, item) for item, count in self.counts.items()]
+        heapq.heapify(self._heap)
+        self.total += other.total
+
+    def to_dict(self) -> Dict:
+        return {'capacity': self.capacity, 'total': self.total,
+                'items': [[item, count, error] for item, count, error in self.top()]}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'SpaceSaving':
+        sketch = cls(data['capacity'])
+        sketch.total = data['total']
+        for item, count, error in data['items']:
+            sketch.counts[item] = count
+            sketch.errors[item] = error
+        sketch._heap = [(count, item) for item, count in sketch.counts.items()]
+        heapq.heapify(sketch._heap)
+        return sketch
+
+
+class ExactSum:
+    """Somme exacte de floats, fusionnable: arrondie une seule fois à la lecture
+
+    Chaque float est converti en entier de virgule fixe 2^-1100 (sans perte,
+    2^-1074 étant le plus petit float); value() == math.fsum des mêmes
+    termes, quel que soit leur ordre ou leur découpage entre processus.
+    """
+    __slots__ = ('units', 'count')
+    SHIFT = 1100
+
+    def __init__(self):
+        self.units = 0
+        self.count = 0
+
+    def add(self, value: float):
+        numerator, denominator = value.as_integer_ratio()
+        self.units += numerator << (self.SHIFT + 1 - denominator.bit_length())
+        self.count += 1
+
+    def merge(self, other: 'ExactSum'):
+        self.units += other.units
+        self.count += other.count
+
+    def value(self) -> float:
+        return self.units / (1 << self.SHIFT)  # division entière correctement arrondie
+
+    def mean(self) -> float:
+        return self.value() / self.count if self.count else 0.0
+
+
+class HyperLogLog:
+    """Cardinalité approchée sur 2^precision registres d'un octet"""
+
+    def __init__(self, precision: int = DEFAULT_PRECISION):
+        if not 4 <= precision <= 16:
+            raise ValueError("precision entre 4 et 16")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, item: str):
+        value = hash64(item)
+        index = value >> (64 - self.precision)
+        remainder = (value << self.precision) & 0xFFFFFFFFFFFFFFFF
+        rank = 65 - self.precision if remainder == 0 else 65 - remainder.bit_length()
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m) if m >= 128 else {16: 0.673, 32: 0.697, 64: 0.709}[m]
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Petites cardinalités: comptage linéaire
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def merge(self, other: 'HyperLogLog'):
+        if other.precision != self.precision:
+            raise ValueError("fusion de HyperLogLog de précisions différentes")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def to_dict(self) -> Dict:
+        return {'precision': self.precision, 'registers': base64.b64encode(bytes(self.registers)).decode('ascii')}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'HyperLogLog':
+        sketch = cls(data['precision'])
+        sketch.registers = bytearray(base64.b64decode(data['registers']))
+        return sketch
+
+
+class ConceptSketches:
+    """Résumés d'un flux d'atomes sémantiques: concepts, termes, cooccurrences, jours"""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, precision: int = DEFAULT_PRECISION):
+        self.atoms = 0
+        self.concepts = SpaceSaving(capacity)
+        self.terms = SpaceSaving(capacity)
+        self.cooccurrence = SpaceSaving(4 * capacity)  # paires terme/concept
+        self.days = SpaceSaving(capacity)
+        self.distinct_concepts = HyperLogLog(precision)
+        self.distinct_terms = HyperLogLog(precision)
+        self.distinct_days = HyperLogLog(precision)
+        self.distinct_agents = HyperLogLog(precision)
+        self.first_seen: Optional[str] = None
+        self.last_seen: Optional[str] = None
+
+    def update(self, atom: Dict):
+        self.atoms += 1
+        concept = atom.get('concept', '')
+        key = concept.lower().strip()
+        self.concepts.update(key)
+        self.distinct_concepts.add(key)
+
+        for term in TERM_PATTERN.findall(atom.get('definition', '').lower()):
+            if term not in TERM_STOP_WORDS:
+                self.terms.update(term)
+                self.distinct_terms.add(term)
+                self.cooccurrence.update(f"{term}{PAIR_SEPARATOR}{concept}")
+
+        provenance = atom.get('provenance', {})
+        timestamp = provenance.get('timestamp')
+        if timestamp:
+            self.days.update(timestamp[:10])
+            self.distinct_days.add(timestamp[:10])
+            if self.first_seen is None or timestamp < self.first_seen:
+                self.first_seen = timestamp
+            if self.last_seen is None or timestamp > self.last_seen:
+                self.last_seen = timestamp
+        if provenance.get('source_agent'):
+            self.distinct_agents.add(provenance['source_agent'])
+
+    def update_many(self, atoms: Iterable[Dict]) -> 'ConceptSketches':
+        for atom in atoms:
+            self.update(atom)
+        return self
+
+    def merge(self, other: 'ConceptSketches') -> 'ConceptSketches':
+        self.atoms += other.atoms
+        for name in ('concepts', 'terms', 'cooccurrence', 'days',
+                     'distinct_concepts', 'distinct_terms', 'distinct_days', 'distinct_agents'):
+            getattr(self, name).merge(getattr(other, name))
+        firsts = [t for t in (self.first_seen, other.first_seen) if t]
+        lasts = [t for t in (self.last_seen, other.last_seen) if t]
+        self.first_seen = min(firsts) if firsts else None
+        self.last_seen = max(lasts) if lasts else None
+        return self
+
+    # ------------------------------------------------------------------
+    # Lectures pour les rapports
+    # ------------------------------------------------------------------
+
+    def top_concepts(self, k: int = 20) -> List[Tuple[str, int]]:
+        return [(item, count) for item, count, _ in self.concepts.top(k)]
+
+    def frequent_terms(self, k: int = 10) -> List[Tuple[str, int]]:
+        return [(item, count) for item, count, _ in self.terms.top(k)]
+
+    def cross_concept_terms(self) -> Dict[str, List[str]]:
+        """Termes suivis partagés par plusieurs concepts"""
+        concepts_by_term: Dict[str, List[str]] = {}
+        for pair, _, _ in self.cooccurrence.top():
+            term, concept = pair.split(PAIR_SEPARATOR, 1)
+            concepts_by_term.setdefault(term, []).append(concept)
+        return {term: concepts for term, concepts in concepts_by_term.items() if len(concepts) > 1}
+
+    def summary(self, k: int = 20) -> Dict:
+        return {
+            'atoms': self.atoms,
+            'distinct_concepts': self.distinct_concepts.count(),
+            'distinct_terms': self.distinct_terms.count(),
+            'distinct_days': self.distinct_days.count(),
+            'distinct_agents': self.distinct_agents.count(),
+            'top_concepts': self.top_concepts(k),
+            'frequent_terms': self.frequent_terms(k),
+            'first_seen': self.first_seen,
+            'last_seen': self.last_seen
+        }
+
+    # ------------------------------------------------------------------
+    # Persistance
+    # ------------------------------------------------------------------
+
+    def to_dict(self) -> Dict:
+        data = {'atoms': self.atoms, 'first_seen': self.first_seen, 'last_seen': self.last_seen}
+        for name in ('concepts', 'terms', 'cooccurrence', 'days',
+                     'distinct_concepts', 'distinct_terms', 'distinct_days', 'distinct_agents'):
+            data[name] = getattr(self, name).to_dict()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ConceptSketches':
+        sketches = cls(data['concepts']['capacity'], data['distinct_concepts']['precision'])
+        sketches.atoms = data['atoms']
+        sketches.first_seen, sketches.last_seen = data['first_seen'], data['last_seen']
+        for name in ('concepts', 'terms', 'cooccurrence', 'days'):
+            setattr(sketches, name, SpaceSaving.from_dict(data[name]))
+        for name in ('distinct_concepts', 'distinct_terms', 'distinct_days', 'distinct_agents'):
+            setattr(sketches, name, HyperLogLog.from_dict(data[name]))
+        return sketches
+
+
+def _sketch_path(store_file: str, cache_dir: str) -> str:
+    return os.path.join(cache_dir, os.path.basename(store_file) + '.sketch.json')
+
+
+def store_sketches(store_file: str, atoms: Optional[Iterable[Dict]] = None,
+                   cache_dir: str = SKETCH_DIR) -> ConceptSketches:
+    """Sketches d'un fichier de store: cache si à jour, sinon une passe sur ses atomes"""
+    stat = os.stat(store_file)
+    signature = {'path': os.path.abspath(store_file), 'mtime': stat.st_mtime, 'size': stat.st_size}
+    cache_file = _sketch_path(store_file, cache_dir)
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('source') == signature:
+            return ConceptSketches.from_dict(cached['sketches'])
+    except (OSError, ValueError, KeyError):
+        pass
+
+    if atoms is None:
+        with open(store_file, 'r', encoding='utf-8') as f:
+            atoms = json.load(f).get('semantic_atoms', [])
+    sketches = ConceptSketches().update_many(atoms)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump({'source': signature, 'sketches': sketches.to_dict()}, f, ensure_ascii=False)
+    except OSError as e:
+        print(f"⚠️ Cache sketch non écrit ({cache_file}): {e}")
+    return sketches
+
+
+def corpus_sketches(store_files: Iterable[str], cache_dir: str = SKETCH_DIR) -> ConceptSketches:
+    """Fusion des sketches de chaque store existant"""
+    corpus = ConceptSketches()
+    for store_file in store_files:
+        if os.path.exists(store_file):
+            corpus.merge(store_sketches(store_file, cache_dir=cache_dir))
+    return corpus
+
+
+def main(argv: List[str]) -> int:
+    store_files = argv or sorted(f for f in os.listdir('.') if f.endswith('_semantic_store.json'))
+    corpus = corpus_sketches(store_files)
+    summary = corpus.summary(10)
+    print(f"📐 SKETCHES CORPUS - {len(store_files)} stores, {summary['atoms']} atomes")
+    print(f"   ~{summary['distinct_concepts']} concepts, ~{summary['distinct_terms']} termes, "
+          f"~{summary['distinct_days']} jours, ~{summary['distinct_agents']} agents distincts")
+    print(f"   Période: {summary['first_seen']} → {summary['last_seen']}")
+    print("🏆 Concepts les plus fréquents:")
+    for concept, count in summary['top_concepts']:
+        print(f"   • {concept}: {count}")
+    print("🔤 Termes les plus fréquents:")
+    for term, count in summary['frequent_terms']:
+        print(f"   • {term}: {count}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
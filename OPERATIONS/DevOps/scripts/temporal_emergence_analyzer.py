@@ -14,6 +14,14 @@ from dataclasses import dataclass
 
 # Import structures communes
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from pipeline_profiler import profiler
+from temporal_index import (SECONDS_PER_YEAR, TemporalIndex, WindowStats,
+                            epoch_year, parse_timestamp, year_to_epoch)
+
+# Observations antérieures à cette année = historiques, postérieures à MODERN_FROM_YEAR = modernes
+HISTORICAL_UNTIL_YEAR = 1900
+MODERN_FROM_YEAR = 2000
+HISTORICAL_YEAR_MARKER = "historical_year_"
 
 @dataclass
 class ConceptEvolution:
@@ -25,11 +33,18 @@ class ConceptEvolution:
     innovation_markers: List[str]
 
 class TemporalEmergenceAnalyzer:
-    def __init__(self):
+    def __init__(self, bucket_width_years: int = 50):
         self.stores = {}
-        self.temporal_atoms = []
-        self.concept_timeline = defaultdict(list)
-        
+        # Atomes référencés une seule fois par id; l'index ne stocke que des colonnes
+        self.atoms: Dict[str, Dict] = {}
+        self.temporal_index = TemporalIndex()
+        self.bucket_width = bucket_width_years * SECONDS_PER_YEAR
+        self.period_distribution = Counter()
+        self.source_distribution = Counter()
+        self._historical_cutoff = year_to_epoch(HISTORICAL_UNTIL_YEAR + 1)
+        self._modern_start = year_to_epoch(MODERN_FROM_YEAR)
+        
+    @profiler.profile('temporal.load_temporal_stores')
     def load_temporal_stores(self) -> int:
         """Charge tous les stores avec données temporelles"""
         stores_config = [
@@ -52,31 +67,28 @@ class TemporalEmergenceAnalyzer:
         return total_loaded
     
     def _load_temporal_store(self, filename: str, source_type: str, period: str) -> int:
-        """Charge store avec enrichissement temporel"""
+        """Charge store et indexe chaque atome (horodatage parsé une seule fois)"""
         try:
             with open(filename, 'r', encoding='utf-8') as f:
                 store = json.load(f)
                 
             atoms = store.get('semantic_atoms', [])
             
-            for atom in atoms:
-                # Enrichissement temporel
-                temporal_atom = atom.copy()
-                temporal_atom['source_type'] = source_type
-                temporal_atom['period'] = period
-                temporal_atom['temporal_weight'] = self._calculate_temporal_weight(atom, period)
-                
-                self.temporal_atoms.append(temporal_atom)
+            for position, atom in enumerate(atoms):
+                atom_id = f"{source_type}:{atom.get('id', position)}"
+                self.atoms[atom_id] = atom
                 
                 # Index timeline par concept
                 concept = atom['concept'].lower().strip()
-                self.concept_timeline[concept].append({
-                    'atom': temporal_atom,
-                    'period': period,
-                    'source': source_type,
-                    'timestamp': atom['provenance']['timestamp'],
-                    'confidence': atom['provenance']['extraction_confidence']
-                })
+                self.temporal_index.add(
+                    concept,
+                    self._atom_time(atom, period),
+                    source_type,
+                    atom['provenance']['extraction_confidence'],
+                    atom_id
+                )
+                self.period_distribution[period] += 1
+                self.source_distribution[source_type] += 1
                 
             return len(atoms)
             
@@ -84,24 +96,38 @@ class TemporalEmergenceAnalyzer:
             print(f"❌ Erreur chargement {filename}: {e}")
             return 0
     
-    def _calculate_temporal_weight(self, atom: Dict, period: str) -> float:
-        """Calcule poids temporel selon époque"""
-        if period == "2024":
-            return 1.0  # Moderne = poids max
-        elif "1700-1900" in period:
-            return 0.8  # Historique = poids réduit mais important
-        else:
-            return 0.9  # Default
+    def _atom_time(self, atom: Dict, period: str) -> int:
+        """Instant d'un atome en secondes epoch.
+
+        Priorité: année historique explicite de la provenance, puis milieu de
+        la période pour les stores historiques ("1700-1900"), sinon horodatage
+        de provenance.
+        """
+        provenance = atom.get('provenance', {})
+        for parent in provenance.get('parent_sources', []):
+            if isinstance(parent, str) and parent.startswith(HISTORICAL_YEAR_MARKER):
+                year = parse_timestamp(parent[len(HISTORICAL_YEAR_MARKER):])
+                if year is not None:
+                    return year
+        
+        if '-' not in period:
+            timestamp = parse_timestamp(provenance.get('timestamp'))
+            if timestamp is not None:
+                return timestamp
+        
+        fallback = parse_timestamp(period)
+        return fallback if fallback is not None else self._modern_start
     
+    @profiler.profile('temporal.detect_concept_emergence_patterns')
     def detect_concept_emergence_patterns(self) -> List[ConceptEvolution]:
         """Détecte patterns émergence concepts cross-temporel"""
         print("🌱 Détection patterns émergence temporelle...")
         
         evolutions = []
         
-        for concept, timeline_data in self.concept_timeline.items():
-            if len(timeline_data) > 1:  # Multi-période seulement
-                evolution = self._analyze_concept_evolution(concept, timeline_data)
+        for concept in self.temporal_index.concepts():
+            if len(self.temporal_index.series(concept)) > 1:  # Multi-période seulement
+                evolution = self._analyze_concept_evolution(concept)
                 if evolution:
                     evolutions.append(evolution)
         
@@ -111,129 +137,117 @@ class TemporalEmergenceAnalyzer:
         print(f"  ✅ {len(evolutions)} patterns évolution détectés")
         return evolutions
     
-    def _analyze_concept_evolution(self, concept: str, timeline_data: List[Dict]) -> ConceptEvolution:
-        """Analyse évolution détaillée d'un concept"""
-        # Construction timeline chronologique
+    def _analyze_concept_evolution(self, concept: str) -> ConceptEvolution:
+        """Analyse évolution détaillée d'un concept (série déjà triée historique → moderne)"""
         timeline = []
         definitions_evolution = []
         
-        # Tri par période (historique → moderne)
-        sorted_timeline = sorted(timeline_data, key=lambda x: self._period_to_numeric(x['period']))
-        
-        for entry in sorted_timeline:
-            period = entry['period']
-            source = entry['source']
-            timeline.append((period, source))
+        for time, source, _, atom_id in self.temporal_index.range_query(concept):
+            year = str(epoch_year(time))
+            timeline.append((year, source))
             
-            definition = entry['atom']['definition'][:100] + "..."
-            definitions_evolution.append((period, definition, source))
+            definition = self.atoms[atom_id]['definition'][:100] + "..."
+            definitions_evolution.append((year, definition, source))
         
-        # Calcul scores
-        emergence_confidence = self._calculate_emergence_confidence(sorted_timeline)
-        stability_score = self._calculate_stability_score(sorted_timeline)
-        innovation_markers = self._detect_innovation_markers(sorted_timeline)
+        series = self.temporal_index.series(concept)
+        stats = series.stats(0, len(series), self._historical_cutoff)
         
         return ConceptEvolution(
             concept=concept,
             timeline=timeline,
             definitions_evolution=definitions_evolution,
-            emergence_confidence=emergence_confidence,
-            stability_score=stability_score,
-            innovation_markers=innovation_markers
+            emergence_confidence=self._calculate_emergence_confidence(stats),
+            stability_score=self._calculate_stability_score(stats),
+            innovation_markers=self._detect_innovation_markers(stats)
         )
     
-    def _period_to_numeric(self, period: str) -> int:
-        """Conversion période en numérique pour tri"""
-        if "1700-1900" in period:
-            return 1800  # Milieu période historique
-        elif "2024" in period:
-            return 2024
-        else:
-            return 2000  # Default moderne
+    def sliding_window_scores(self, concept: str, window_years: float,
+                              step_years: float) -> List[Dict]:
+        """Scores émergence / stabilité / marqueurs sur fenêtres glissantes"""
+        scores = []
+        for start, stats in self.temporal_index.sliding_windows(
+                concept, int(window_years * SECONDS_PER_YEAR),
+                max(1, int(step_years * SECONDS_PER_YEAR)), self._historical_cutoff):
+            scores.append({
+                "window_start": epoch_year(start),
+                "observations": stats.count,
+                "emergence_confidence": self._calculate_emergence_confidence(stats),
+                "stability_score": self._calculate_stability_score(stats),
+                "innovation_markers": self._detect_innovation_markers(stats)
+            })
+        return scores
     
-    def _calculate_emergence_confidence(self, timeline_data: List[Dict]) -> float:
+    def _calculate_emergence_confidence(self, stats: WindowStats) -> float:
         """Score émergence basé sur progression temporelle"""
-        if len(timeline_data) <= 1:
+        if stats is None or stats.count <= 1:
             return 0.0
             
         # Facteurs émergence
         confidence = 0.5  # Base
         
         # Bonus progression historique → moderne
-        periods = [self._period_to_numeric(entry['period']) for entry in timeline_data]
-        if max(periods) - min(periods) > 100:  # Span temporel significatif
+        if stats.span_years > 100:  # Span temporel significatif
             confidence += 0.3
             
         # Bonus confidence moyenne haute
-        avg_confidence = sum(entry['confidence'] for entry in timeline_data) / len(timeline_data)
-        confidence += (avg_confidence - 0.5) * 0.4
+        confidence += (stats.mean_confidence - 0.5) * 0.4
         
         # Bonus diversité sources
-        sources = set(entry['source'] for entry in timeline_data)
-        if len(sources) > 1:
+        if stats.source_count > 1:
             confidence += 0.2
             
         return min(confidence, 1.0)
     
-    def _calculate_stability_score(self, timeline_data: List[Dict]) -> float:
+    def _calculate_stability_score(self, stats: WindowStats) -> float:
         """Score stabilité concept à travers le temps"""
-        if len(timeline_data) <= 1:
+        if stats is None or stats.count <= 1:
             return 1.0
             
         # Stabilité = faible variance confidence + présence continue
-        confidences = [entry['confidence'] for entry in timeline_data]
-        variance = sum((c - sum(confidences)/len(confidences))**2 for c in confidences) / len(confidences)
-        
-        stability = 1.0 - min(variance * 2, 0.5)  # Variance faible = stabilité haute
+        stability = 1.0 - min(stats.confidence_variance * 2, 0.5)  # Variance faible = stabilité haute
         
         return stability
     
-    def _detect_innovation_markers(self, timeline_data: List[Dict]) -> List[str]:
+    def _detect_innovation_markers(self, stats: WindowStats) -> List[str]:
         """Détecte marqueurs innovation dans évolution concept"""
         markers = []
+        if stats is None:
+            return markers
         
         # Progression confidence
-        confidences = [entry['confidence'] for entry in timeline_data]
-        if len(confidences) > 1 and confidences[-1] > confidences[0]:
+        if stats.count > 1 and stats.last_confidence > stats.first_confidence:
             markers.append("confidence_increase")
             
         # Diversification sources
-        sources = [entry['source'] for entry in timeline_data]
-        if len(set(sources)) > 1:
+        if stats.source_count > 1:
             markers.append("multi_source_validation")
             
         # Span temporel large
-        periods = [self._period_to_numeric(entry['period']) for entry in timeline_data]
-        if max(periods) - min(periods) > 200:
+        if stats.span_years > 200:
             markers.append("long_term_persistence")
             
         # Présence historique + moderne
-        if any("1700-1900" in entry['period'] for entry in timeline_data) and \
-           any("2024" in entry['period'] for entry in timeline_data):
+        if stats.before_cutoff and stats.last_time >= self._modern_start:
             markers.append("historical_modern_bridge")
             
         return markers
     
+    @profiler.profile('temporal.find_innovation_hotspots')
     def find_innovation_hotspots(self) -> Dict[str, List[str]]:
-        """Trouve hotspots innovation par période/source"""
+        """Trouve hotspots innovation par tranche temporelle/source"""
         hotspots = defaultdict(list)
         
-        # Groupement par période
-        period_concepts = defaultdict(set)
-        for concept, timeline_data in self.concept_timeline.items():
-            for entry in timeline_data:
-                period_concepts[entry['period']].add(concept)
-        
-        # Détection hotspots
-        for period, concepts in period_concepts.items():
+        # Groupement par tranche temporelle (largeur self.bucket_width)
+        for bucket, concepts in self.temporal_index.bucket_concepts(self.bucket_width).items():
             if len(concepts) > 5:  # Seuil hotspot
-                hotspots[f"period_{period}"] = list(concepts)[:10]  # Top 10
+                hotspots[f"period_{epoch_year(bucket)}"] = concepts[:10]  # Top 10
         
         # Groupement par source
-        source_concepts = defaultdict(set)
-        for concept, timeline_data in self.concept_timeline.items():
-            for entry in timeline_data:
-                source_concepts[entry['source']].add(concept)
+        source_concepts = defaultdict(dict)
+        for concept in self.temporal_index.concepts():
+            series = self.temporal_index.series(concept)
+            for code in series.sources:
+                source_concepts[self.temporal_index.source_names[code]][concept] = None
                 
         for source, concepts in source_concepts.items():
             if len(concepts) > 10:  # Seuil hotspot
@@ -241,6 +255,7 @@ class TemporalEmergenceAnalyzer:
         
         return dict(hotspots)
     
+    @profiler.profile('temporal.generate_temporal_analysis_report')
     def generate_temporal_analysis_report(self) -> Dict:
         """Génère rapport complet analyse temporelle"""
         print("\n⏰ GÉNÉRATION RAPPORT ANALYSE TEMPORELLE")
@@ -253,23 +268,24 @@ class TemporalEmergenceAnalyzer:
         innovation_hotspots = self.find_innovation_hotspots()
         
         # Métriques temporelles globales
-        total_concepts = len(self.concept_timeline)
-        multi_period_concepts = len([c for c, t in self.concept_timeline.items() if len(t) > 1])
-        
-        # Distribution temporelle
-        period_distribution = Counter()
-        source_distribution = Counter()
-        
-        for atom in self.temporal_atoms:
-            period_distribution[atom['period']] += 1
-            source_distribution[atom['source_type']] += 1
+        concepts = self.temporal_index.concepts()
+        total_concepts = len(concepts)
+        multi_period_concepts = len([c for c in concepts if len(self.temporal_index.series(c)) > 1])
+        
+        # Distribution temporelle réelle (tranches de largeur self.bucket_width)
+        time_buckets = {
+            str(epoch_year(bucket)): count
+            for bucket, count in self.temporal_index.bucket_counts(self.bucket_width).items()
+        }
+        observed_years = [epoch_year(t) for c in concepts
+                          for t in (self.temporal_index.series(c).times[0], self.temporal_index.series(c).times[-1])]
         
         report = {
             "analysis_metadata": {
                 "total_concepts": total_concepts,
                 "multi_period_concepts": multi_period_concepts,
-                "total_temporal_atoms": len(self.temporal_atoms),
-                "temporal_span": "1700-2024",
+                "total_temporal_atoms": len(self.temporal_index),
+                "temporal_span": f"{min(observed_years)}-{max(observed_years)}" if observed_years else "-",
                 "analysis_date": datetime.datetime.now().isoformat(),
                 "analyzer_version": "temporal_emergence_v1.0"
             },
@@ -287,11 +303,12 @@ class TemporalEmergenceAnalyzer:
             "temporal_metrics": {
                 "multi_period_rate": multi_period_concepts / total_concepts if total_concepts else 0,
                 "avg_emergence_confidence": sum(evo.emergence_confidence for evo in concept_evolutions) / len(concept_evolutions) if concept_evolutions else 0,
-                "temporal_diversity": len(set(atom['period'] for atom in self.temporal_atoms))
+                "temporal_diversity": len(time_buckets)
             },
             "distribution_analysis": {
-                "period_distribution": dict(period_distribution),
-                "source_distribution": dict(source_distribution)
+                "period_distribution": dict(self.period_distribution),
+                "source_distribution": dict(self.source_distribution),
+                "time_buckets": time_buckets
             }
         }
         
@@ -328,6 +345,7 @@ class TemporalEmergenceAnalyzer:
         
         return report
 
+@profiler.session('temporal_emergence_analyzer')
 def main():
     print("⏰ ANALYSEUR ÉMERGENCE TEMPORELLE")
     print("=================================")
@@ -349,7 +367,7 @@ def main():
     
     print(f"\n🎯 ANALYSE TEMPORELLE TERMINÉE")
     print(f"📄 Rapport détaillé: {analysis_file}")
-    print(f"🌊 Timeline complète: 1700-2024 (324 ans span)")
+    print(f"🌊 Timeline complète: {report['analysis_metadata']['temporal_span']}")
 
 if __name__ == "__main__":
     main()
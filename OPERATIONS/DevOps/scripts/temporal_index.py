@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+⏱️ INDEX TEMPOREL - SÉRIES PAR CONCEPT
+======================================
+
+Index colonnaire des observations de concepts dans le temps:
+- horodatages convertis une seule fois en secondes epoch (entiers, UTC)
+- par concept, colonnes triées (temps, source, confiance) + références
+  d'atomes par id (aucune copie d'atome)
+- sommes préfixes (confiance, confiance², occurrences par source) calculées
+  une fois: toute fenêtre [début, fin) se résume en O(log n)
+
+Permet des regroupements de largeur arbitraire, des requêtes par intervalle
+et des scores sur fenêtres glissantes en une seule passe par concept.
+"""
+
+import datetime
+import re
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+EPOCH = datetime.datetime(1970, 1, 1)
+SECONDS_PER_YEAR = 31556952  # Année grégorienne moyenne
+
+_YEAR_RANGE = re.compile(r'^\s*(\d{4})\s*-\s*(\d{4})\s*$')
+_YEAR_MONTH = re.compile(r'^\s*(\d{4})-(\d{2})\s*$')
+_INTEGER = re.compile(r'^\s*[+-]?\d+\s*$')
+_NUMBER = re.compile(r'^\s*[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?\s*$')
+
+
+def to_epoch(dt: datetime.datetime) -> int:
+    """Secondes epoch (UTC) d'un datetime, y compris avant 1970"""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return int((dt - EPOCH).total_seconds())
+
+
+def year_to_epoch(year: int) -> int:
+    """Début de l'année `year` en secondes epoch"""
+    return to_epoch(datetime.datetime(year, 1, 1))
+
+
+def epoch_year(seconds: int) -> int:
+    return (EPOCH + datetime.timedelta(seconds=seconds)).year
+
+
+def _integer_to_epoch(number: int) -> int:
+    """Entier à 4 chiffres (1000-9999) = année, sinon secondes epoch"""
+    if 1000 <= number <= 9999:
+        return year_to_epoch(number)
+    return number
+
+
+def parse_timestamp(value: Any) -> Optional[int]:
+    """Convertit un horodatage en secondes epoch.
+
+    Accepte ISO 8601, année-mois ("2024-01"), plage d'années à 4 chiffres
+    ("1700-1900", ramenée à son milieu) et nombres: un entier de 4 chiffres
+    (int ou texte, "1859") est une année, tout autre nombre des secondes
+    epoch. None si illisible.
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        if isinstance(value, int):
+            return _integer_to_epoch(value)
+        if isinstance(value, float):
+            return int(value)
+        if isinstance(value, datetime.datetime):
+            return to_epoch(value)
+
+        text = str(value).strip()
+        if _INTEGER.match(text):
+            return _integer_to_epoch(int(text))
+        if _NUMBER.match(text):
+            return int(float(text))
+        match = _YEAR_RANGE.match(text)
+        if match:
+            start, end = int(match.group(1)), int(match.group(2))
+            if end < start:
+                return None
+            return (year_to_epoch(start) + year_to_epoch(end)) // 2
+        match = _YEAR_MONTH.match(text)
+        if match:
+            return to_epoch(datetime.datetime(int(match.group(1)), int(match.group(2)), 1))
+        return to_epoch(datetime.datetime.fromisoformat(text.replace('Z', '+00:00')))
+    except (ValueError, OverflowError):
+        return None
+
+
+@dataclass
+class WindowStats:
+    """Résumé d'une fenêtre temporelle d'un concept"""
+    count: int
+    first_time: int
+    last_time: int
+    mean_confidence: float
+    confidence_variance: float
+    first_confidence: float
+    last_confidence: float
+    source_count: int
+    before_cutoff: int  # Observations antérieures au seuil historique
+
+    @property
+    def span_years(self) -> float:
+        return (self.last_time - self.first_time) / SECONDS_PER_YEAR
+
+
+class ConceptSeries:
+    """Colonnes triées par temps d'un concept + sommes préfixes"""
+
+    def __init__(self, entries: List[Tuple[int, int, float, str]], source_total: int):
+        entries.sort(key=lambda e: e[0])  # Tri stable: ordre de chargement à temps égal
+        self.times = array('q', (e[0] for e in entries))
+        self.sources = array('i', (e[1] for e in entries))
+        self.confidences = array('d', (e[2] for e in entries))
+        self.atom_ids = [e[3] for e in entries]
+
+        self._conf_sum = array('d', [0.0])
+        self._conf_sq_sum = array('d', [0.0])
+        self._source_prefix = [array('i', [0]) for _ in range(source_total)]
+        conf_sum = conf_sq_sum = 0.0
+        counts = [0] * source_total
+        for source, confidence in zip(self.sources, self.confidences):
+            conf_sum += confidence
+            conf_sq_sum += confidence * confidence
+            self._conf_sum.append(conf_sum)
+            self._conf_sq_sum.append(conf_sq_sum)
+            counts[source] += 1
+            for code in range(source_total):
+                self._source_prefix[code].append(counts[code])
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def bounds(self, start: Optional[int] = None, end: Optional[int] = None) -> Tuple[int, int]:
+        """Indices [lo, hi) des observations dans [start, end)"""
+        lo = 0 if start is None else bisect_left(self.times, start)
+        hi = len(self.times) if end is None else bisect_left(self.times, end)
+        return lo, max(lo, hi)
+
+    def stats(self, lo: int, hi: int, cutoff: Optional[int] = None) -> Optional[WindowStats]:
+        """Statistiques de la tranche [lo, hi) en O(nombre de sources)"""
+        count = hi - lo
+        if count <= 0:
+            return None
+        conf_sum = self._conf_sum[hi] - self._conf_sum[lo]
+        mean = conf_sum / count
+        variance = max((self._conf_sq_sum[hi] - self._conf_sq_sum[lo]) / count - mean * mean, 0.0)
+        before = 0 if cutoff is None else max(0, min(bisect_left(self.times, cutoff), hi) - lo)
+        return WindowStats(
+            count=count,
+            first_time=self.times[lo],
+            last_time=self.times[hi - 1],
+            mean_confidence=mean,
+            confidence_variance=variance,
+            first_confidence=self.confidences[lo],
+            last_confidence=self.confidences[hi - 1],
+            source_count=sum(1 for prefix in self._source_prefix if prefix[hi] > prefix[lo]),
+            before_cutoff=before
+        )
+
+
+class TemporalIndex:
+    """Index temporel: concept -> ConceptSeries, atomes référencés par id"""
+
+    def __init__(self):
+        self.source_names: List[str] = []
+        self._source_codes: Dict[str, int] = {}
+        self._pending: Dict[str, List[Tuple[int, int, float, str]]] = defaultdict(list)
+        self._series: Dict[str, ConceptSeries] = {}
+
+    def add(self, concept: str, time: int, source: str, confidence: float, atom_id: str):
+        code = self._source_codes.get(source)
+        if code is None:
+            code = self._source_codes[source] = len(self.source_names)
+            self.source_names.append(source)
+        self._pending[concept].append((time, code, float(confidence), atom_id))
+        self._series.clear()
+
+    def _build(self):
+        if not self._series and self._pending:
+            total = len(self.source_names)
+            self._series = {concept: ConceptSeries(list(entries), total)
+                            for concept, entries in self._pending.items()}
+
+    def concepts(self) -> List[str]:
+        return list(self._pending)
+
+    def series(self, concept: str) -> ConceptSeries:
+        self._build()
+        return self._series[concept]
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._pending.values())
+
+    def range_query(self, concept: str, start: Optional[int] = None,
+                    end: Optional[int] = None) -> List[Tuple[int, str, float, str]]:
+        """Observations (temps, source, confiance, atom_id) dans [start, end)"""
+        series = self.series(concept)
+        lo, hi = series.bounds(start, end)
+        return [(series.times[i], self.source_names[series.sources[i]],
+                 series.confidences[i], series.atom_ids[i]) for i in range(lo, hi)]
+
+    def bucket_counts(self, width: int, origin: int = 0,
+                      concept: Optional[str] = None) -> Dict[int, int]:
+        """Nombre d'observations par tranche [origin + k*width, ...) de largeur `width` secondes"""
+        counts: Counter = Counter()
+        for name in ([concept] if concept is not None else self.concepts()):
+            for time in self.series(name).times:
+                counts[origin + ((time - origin) // width) * width] += 1
+        return dict(sorted(counts.items()))
+
+    def bucket_concepts(self, width: int, origin: int = 0) -> Dict[int, List[str]]:
+        """Concepts présents dans chaque tranche, dans l'ordre d'insertion"""
+        buckets: Dict[int, Dict[str, None]] = defaultdict(dict)
+        for concept in self.concepts():
+            for time in self.series(concept).times:
+                buckets[origin + ((time - origin) // width) * width][concept] = None
+        return {bucket: list(concepts) for bucket, concepts in sorted(buckets.items())}
+
+    def sliding_windows(self, concept: str, width: int, step: int,
+                        cutoff: Optional[int] = None) -> Iterator[Tuple[int, WindowStats]]:
+        """(début, stats) des fenêtres [t, t+width) non vides, t avançant de `step`"""
+        series = self.series(concept)
+        if not len(series):
+            return
+        start = series.times[0]
+        last = series.times[-1]
+        while start <= last:
+            lo, hi = series.bounds(start, start + width)
+            stats = series.stats(lo, hi, cutoff)
+            if stats:
+                yield start, stats
+                start += step
+            elif hi < len(series):
+                # Saut direct à la fenêtre contenant l'observation suivante
+                start += max(step, ((series.times[hi] - start - width) // step + 1) * step)
+            else:
+                break
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Tests de l'intégration incrémentale (ids par contenu + index mots-clés)
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from atom_index import KeywordPostingIndex
+from panini_architectural_integrator import PaniniFSArchitecturalIntegrator, PaniniFSComponent
+
+
+def test_lookup_keeps_substring_semantics():
+    index = KeywordPostingIndex.from_atoms({
+        "a": {"concept": "Entropies", "definition": ""},
+        "b": {"concept": "x", "definition": "quantum-information theory"},
+        "c": {"concept": "fractal", "definition": "self similar"},
+    })
+    assert index.lookup("entropy", "concept") == set()
+    assert index.lookup("entropie", "concept") == {"a"}
+    assert index.lookup("quantum-info", "definition") == {"b"}
+    index.remove("b")
+    assert index.match("quantum") == []
+
+
+def _integrator(tmp_path, atoms):
+    data_path = tmp_path / "store.json"
+    data_path.write_text(json.dumps({"semantic_atoms": atoms}))
+    integrator = PaniniFSArchitecturalIntegrator(base_path=str(tmp_path))
+    integrator.components = {
+        name: PaniniFSComponent(name, "ready", str(data_path), len(atoms), "", True)
+        for name in ("information_theory", "physics_mathematics")
+    }
+    return integrator
+
+
+def test_unchanged_atoms_are_reused_across_runs(tmp_path):
+    atoms = [
+        {"concept": "Shannon entropy", "definition": "information measure"},
+        {"concept": "Fractal", "definition": "self similar"},
+    ]
+    first = _integrator(tmp_path, atoms).integrate_semantic_stores()
+    assert len(first["unified_semantic_atoms"]) == 4
+    keywords = [c["convergence_keyword"] for c in first["cross_domain_relations"]]
+    assert keywords == ["entropy", "information", "fractal"]
+    assert first["cross_domain_relations"][0]["matching_atoms"][0]["relevance"] == 0.5
+
+    atoms[1] = {"concept": "Fractal dimension", "definition": "self similar"}
+    second = _integrator(tmp_path, atoms).integrate_semantic_stores()
+    kept = [k for k in second["unified_semantic_atoms"] if k in first["unified_semantic_atoms"]]
+    assert len(kept) == 2
+    for atom_id in kept:
+        assert (second["unified_semantic_atoms"][atom_id]["integration_timestamp"]
+                == first["unified_semantic_atoms"][atom_id]["integration_timestamp"])
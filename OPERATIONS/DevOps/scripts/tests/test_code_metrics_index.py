@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests de l'index incrémental de métriques de code (AST)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from code_metrics_index import CodeMetricsIndex, analyze_source
+
+SOURCE = '''
+import os
+from collections import Counter
+from . import sibling
+
+
+class Worker:
+    def run(self, items, *args, **kwargs):
+        total = 0
+        for item in items:
+            if item and not item.skip or item.force:
+                total += 1
+        try:
+            return [x for x in items if x]
+        except ValueError:
+            return None
+
+    def helper(self):
+        def inner():
+            return 1
+        return inner()
+'''
+
+
+def test_analyze_source_counts_constructs_and_complexity():
+    metrics = analyze_source(SOURCE)
+    by_name = {f.name: f for f in metrics.functions}
+    assert set(by_name) == {'Worker.run', 'Worker.helper', 'Worker.helper.inner'}
+    assert metrics.classes == 1 and metrics.try_blocks == 1
+    assert metrics.imports == ['.', 'collections', 'os']
+    # 1 + for + if + (and, or) + except + compréhension (for + if)
+    assert by_name['Worker.run'].complexity == 8
+    assert by_name['Worker.run'].args == 4
+    assert by_name['Worker.helper'].complexity == 1
+    assert analyze_source('def broken(:\n').syntax_error
+
+
+def test_refresh_only_reparses_changed_files(tmp_path):
+    (tmp_path / 'pkg').mkdir()
+    (tmp_path / 'pkg' / 'a.py').write_text(SOURCE)
+    (tmp_path / 'pkg' / 'copy_of_a.py').write_text(SOURCE)
+    (tmp_path / 'b.py').write_text('def f():\n    return 1\n')
+    index_path = str(tmp_path / 'index.json')
+
+    first = CodeMetricsIndex(str(tmp_path), index_path).refresh()
+    assert first['files'] == 3 and first['parsed'] == 2  # Copie identique: une seule analyse
+
+    index = CodeMetricsIndex(str(tmp_path), index_path)
+    assert index.refresh()['parsed'] == 0
+    assert index.duplicate_files() == [['pkg/a.py', 'pkg/copy_of_a.py']]
+    assert index.totals()['functions'] == 7 and index.totals()['unique_contents'] == 2
+
+    (tmp_path / 'b.py').write_text('def f():\n    return 2 if True else 3\n')
+    os.remove(tmp_path / 'pkg' / 'copy_of_a.py')
+    stats = index.refresh()
+    assert stats['parsed'] == 1 and stats['removed'] == 1
+    assert index.file('b.py').max_complexity == 2
+    assert index.importers('collections') == ['pkg/a.py']
+    assert index.complex_functions(threshold=8)[0]['function'] == 'Worker.run'
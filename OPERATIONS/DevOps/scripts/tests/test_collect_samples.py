@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Tests de la collecte d'échantillons (rapport sémantique calculé une fois)
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import collect_samples
+from collect_samples import SampleCollector
+
+
+@pytest.mark.skipif(not collect_samples.SEMANTIC_HASH_AVAILABLE, reason="semantic_hash indisponible")
+def test_semantic_report_benchmarked_once_per_index_state(tmp_path, monkeypatch):
+    (tmp_path / 'a.md').write_text("The agent reads the file and writes a summary.\n")
+    (tmp_path / 'b.md').write_text("The agent reads the document and writes a summary.\n")
+    runs = []
+    original = collect_samples.benchmark_queries
+    monkeypatch.setattr(collect_samples, 'benchmark_queries', lambda index: runs.append(1) or original(index))
+
+    collector = SampleCollector(str(tmp_path))
+    collector.collect_samples()
+    report = collector.generate_report()
+    assert collector.generate_semantic_report() is report['semantic_addressing']
+    assert len(runs) == 1
+
+    (tmp_path / 'c.md').write_text("A new note about dhatu roots.\n")
+    collector._compute_semantic_hash(tmp_path / 'c.md', 'c.md', {'is_text': True})
+    assert collector.generate_semantic_report()['index']['documents'] == 3 and len(runs) == 2
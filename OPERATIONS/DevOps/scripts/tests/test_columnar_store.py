@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests du conteneur colonnaire (.pcol) utilisé par RustBridge
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from columnar_store import ColumnarFormatError, ColumnarReader, ColumnarWriter
+
+SCHEMA = [("id", "utf8"), ("concept", "utf8"), ("confidence", "float64"), ("parents", "list<utf8>")]
+
+
+def _rows(count):
+    return [[f"atom-identifier-{i:04d}", "concept très long " * (i % 7), i / 10, [f"p{j}" for j in range(i % 3)]]
+            for i in range(count)]
+
+
+def test_roundtrip_across_chunks_without_truncation(tmp_path):
+    path = str(tmp_path / "data.pcol")
+    rows = _rows(25)
+    with ColumnarWriter(path, SCHEMA, metadata={"version": "t"}, chunk_rows=4) as writer:
+        writer.write_rows(rows)
+        writer.add_postings("concept", {"b": [2, 3], "a": [1]})
+        writer.add_permutation("reverse", range(24, -1, -1))
+
+    with ColumnarReader(path) as reader:
+        assert len(reader) == 25 and reader.metadata == {"version": "t"}
+        assert [list(r.values()) for r in reader.iter_rows()] == rows
+        assert reader.column("id")[-1] == "atom-identifier-0024"
+        assert reader.column("confidence")[13] == 1.3
+        assert list(reader.postings("concept").get("b")) == [2, 3]
+        assert "zz" not in reader.postings("concept")
+        assert list(reader.permutation("reverse"))[:2] == [24, 23]
+
+
+def test_rejects_foreign_files(tmp_path):
+    path = tmp_path / "bad.pcol"
+    path.write_bytes(b"not a columnar file at all")
+    with pytest.raises(ColumnarFormatError):
+        ColumnarReader(str(path))
+
+
+def test_interrupted_write_keeps_previous_file(tmp_path):
+    path = str(tmp_path / "data.pcol")
+    with ColumnarWriter(path, SCHEMA) as writer:
+        writer.write_rows(_rows(3))
+    with pytest.raises(RuntimeError):
+        with ColumnarWriter(path, SCHEMA, chunk_rows=2) as writer:
+            writer.write_rows(_rows(10))
+            assert os.path.getsize(path) < writer._file.tell()  # Écriture hors du fichier cible
+            raise RuntimeError("arrêt brutal")
+    with ColumnarReader(path) as reader:
+        assert len(reader) == 3
+    assert os.listdir(tmp_path) == ["data.pcol"]
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests du magasin de sauvegarde dédupliqué (chunking par contenu)
+"""
+
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from dedup_backup_store import ContentDefinedChunker, DedupBackupStore
+
+
+def _semantic_store(seed_value=None):
+    rng = random.Random(42)
+    concepts = {f"concept_{i}": {'score': rng.random(), 'sources': [rng.randrange(10**6) for _ in range(8)]}
+                for i in range(2000)}
+    if seed_value is not None:
+        concepts['concept_1000']['score'] = seed_value
+    return json.dumps(concepts, indent=2).encode('utf-8')
+
+
+def test_local_edit_only_changes_neighbouring_chunks():
+    chunker = ContentDefinedChunker()
+    original, edited = chunker.chunks(_semantic_store()), chunker.chunks(_semantic_store(0.5))
+    assert b''.join(original) == _semantic_store()
+    assert all(len(c) <= chunker.max_size for c in original)
+    assert len(set(edited) - set(original)) <= 2 < len(original)
+
+
+def test_repeated_snapshot_stores_only_new_chunks_and_restores(tmp_path):
+    root = tmp_path / 'tree'
+    (root / 'data').mkdir(parents=True)
+    (root / 'data' / 'store.json').write_bytes(_semantic_store())
+    (root / 'data' / 'mirror.json').write_bytes(_semantic_store())
+    (root / 'run.log').write_text('ignored')
+    store = DedupBackupStore(str(tmp_path / 'backups'), compression='zlib')
+
+    first = store.snapshot(str(root), label='t', excludes=['*.log'])
+    assert first.files == 2 and first.files_reused == 1  # Copie identique non redécoupée
+    assert first.bytes_written < first.bytes_new == len(_semantic_store())
+
+    unchanged = store.snapshot(str(root), label='t', excludes=['*.log'])
+    assert unchanged.chunks_new == 0 and unchanged.bytes_read == 0
+
+    (root / 'data' / 'store.json').write_bytes(_semantic_store(0.5))
+    os.remove(root / 'data' / 'mirror.json')
+    edited = store.snapshot(str(root), label='t', excludes=['*.log'])
+    assert 0 < edited.chunks_new <= 2 and edited.bytes_new < first.bytes_new / 10
+    assert store.stats()['dedup_ratio'] > 4  # 5 copies logiques, ~1 unique
+
+    result = store.restore(edited.snapshot_id, str(tmp_path / 'restored'))
+    assert result['files'] == 1
+    assert (tmp_path / 'restored' / 'data' / 'store.json').read_bytes() == _semantic_store(0.5)
+    assert not (tmp_path / 'restored' / 'run.log').exists()
+
+    # Rétention: seul le dernier snapshot est gardé, les blocs orphelins sont supprimés
+    pruned = store.prune(keep_last=1)
+    assert pruned['snapshots_removed'] == 2 and 0 < pruned['chunks_removed'] <= 2
+    assert b''.join(store.iter_file(edited.snapshot_id, 'data/store.json')) == _semantic_store(0.5)
+
+
+def test_module_copies_are_stored_as_registry_references(tmp_path):
+    from dedup_backup_store import load_module_registry
+
+    root = tmp_path / 'tree'
+    script = "def tool():\n    return 42\n" * 50
+    for rel_path in ('OPERATIONS/DevOps/scripts/tool.py', 'OPERATIONS/backup/agents/tool.py',
+                     'Copilotage/scripts/tool.py'):
+        (root / rel_path).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel_path).write_text(script)
+    registry = load_module_registry(str(root))
+    store = DedupBackupStore(str(tmp_path / 'backups'), compression='zlib')
+
+    report = store.snapshot(str(root), label='t', registry=registry)
+    files = store.load_manifest(report.snapshot_id)['files']
+    assert report.files_referenced == 2 and report.bytes_read == len(script)
+    assert 'chunks' in files['OPERATIONS/DevOps/scripts/tool.py']
+    assert files['Copilotage/scripts/tool.py'] == {
+        'size': len(script), 'mtime_ns': files['Copilotage/scripts/tool.py']['mtime_ns'],
+        'sha256': files['OPERATIONS/DevOps/scripts/tool.py']['sha256'],
+        'ref': 'OPERATIONS/DevOps/scripts/tool.py', 'mode': files['Copilotage/scripts/tool.py']['mode']}
+
+    # Copie modifiée depuis: plus une référence, stockée avec ses propres blocs
+    (root / 'OPERATIONS/backup/agents/tool.py').write_text(script + "# local\n")
+    second = store.snapshot(str(root), label='t', registry=registry)
+    assert second.files_referenced == 1
+    store.restore(second.snapshot_id, str(tmp_path / 'restored'))
+    assert (tmp_path / 'restored' / 'Copilotage/scripts/tool.py').read_text() == script
+    assert (tmp_path / 'restored' / 'OPERATIONS/backup/agents/tool.py').read_text() == script + "# local\n"
+    assert store.prune(keep_last=1)['chunks_removed'] == 0
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests de l'exécuteur multi-path couvert (premier succès, annulation, latences)
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from hedged_executor import (AllPathsFailed, ExecutionPath, HedgedExecutor, HedgeTimeout,
+                             LatencyTracker)
+
+
+def test_first_success_wins_and_losers_are_cancelled():
+    cancelled = threading.Event()
+
+    def slow_path(cancel_token):
+        try:
+            cancel_token.sleep(5)
+        finally:
+            cancelled.set()
+        return 'slow'
+
+    executor = HedgedExecutor(default_hedge_delay=0.05)
+    start = time.perf_counter()
+    result = executor.run([ExecutionPath('slow', slow_path), ExecutionPath('fast', lambda: 'fast')])
+    assert result.winner == 'fast' and result.value == 'fast'
+    assert time.perf_counter() - start < 1
+    assert cancelled.wait(1)
+    assert [a.outcome for a in result.attempts] == ['cancelled', 'success']
+    assert result.attempts[1].started_at >= 0.05
+
+
+def test_failure_starts_next_path_immediately():
+    def broken():
+        raise ConnectionError("colab down")
+
+    executor = HedgedExecutor(default_hedge_delay=10)
+    result = executor.run([ExecutionPath('colab', broken), ExecutionPath('negative', lambda: False),
+                           ExecutionPath('local', lambda x: x * 2, args=(21,))])
+    assert result.value == 42 and result.latency < 1
+    assert [a.outcome for a in result.attempts] == ['failure', 'failure', 'success']
+    assert 'ConnectionError' in result.attempts[0].error
+
+    with pytest.raises(AllPathsFailed):
+        executor.run([ExecutionPath('colab', broken)])
+    with pytest.raises(HedgeTimeout):
+        executor.run([ExecutionPath('stuck', lambda cancel_token: cancel_token.sleep(5))], timeout=0.05)
+
+
+def test_hedge_delay_follows_observed_p95(tmp_path):
+    latency = LatencyTracker(str(tmp_path / 'latencies.json'))
+    for duration in [0.1, 0.2, 0.3, 0.4, 2.0]:
+        latency.record('colab', duration, 'success')
+    latency.record('colab', 9.0, 'cancelled')
+    paths = [ExecutionPath('colab', lambda: True), ExecutionPath('local', lambda: True),
+             ExecutionPath('pinned', lambda: True, hedge_delay=0)]
+    executor = HedgedExecutor(latency, default_hedge_delay=1.5)
+    assert executor.hedge_delay_for(paths, 1) == 2.0
+    assert executor.hedge_delay_for(paths, 2) == 0
+
+    latency.save()
+    reloaded = LatencyTracker(str(tmp_path / 'latencies.json'))
+    assert reloaded.summary()['colab']['p50'] == 0.3 and reloaded.summary()['colab']['cancelled'] == 1
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests des imports paresseux et du benchmark de temps d'import
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from lazy_import import lazy_callable, lazy_import, module_available
+from import_time_benchmark import (ImportTiming, discover_entry_scripts, find_regressions,
+                                   measure_script, parse_importtime)
+
+
+def test_lazy_module_loads_on_first_attribute(tmp_path, monkeypatch):
+    (tmp_path / 'heavy_fixture_mod.py').write_text("VALUE = 42\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module = lazy_import('heavy_fixture_mod')
+    assert not module.is_loaded
+    assert 'heavy_fixture_mod' not in sys.modules
+    assert module.VALUE == 42
+    assert module.is_loaded
+
+
+def test_lazy_callable_and_availability():
+    dumps = lazy_callable('json', 'dumps')
+    assert dumps.__name__ == 'dumps'
+    assert dumps({'a': 1}) == '{"a": 1}'
+    assert module_available('json')
+    assert module_available('os.path')
+    assert not module_available('module_qui_nexiste_pas')
+
+
+def test_parse_importtime_output():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 | _io\n"
+        "import time:       300 |        300 |   json.decoder\n"
+        "import time:       900 |       1500 |   json\n"
+        "import time:      4000 |       4000 |   numpy\n"
+        "import time:       100 |       5600 | my_script\n"
+    )
+    parsed = parse_importtime(stderr, 'my_script')
+    assert parsed['import_us'] == 5600
+    assert parsed['modules'] == 5
+    assert parsed['heaviest'][0] == ['numpy', 4.0]
+    assert parsed['heaviest'][1] == ['json', 1.8]
+
+
+def test_benchmark_measures_and_flags_regressions(tmp_path):
+    fast = tmp_path / 'fast_entry.py'
+    fast.write_text("import os\n\nif __name__ == '__main__':\n    print(os.getcwd())\n")
+    slow = tmp_path / 'slow_entry.py'
+    slow.write_text("import time\ntime.sleep(0.15)\n\nif __name__ == \"__main__\":\n    pass\n")
+    (tmp_path / 'helper.py').write_text("X = 1\n")
+    broken = tmp_path / 'broken_entry.py'
+    broken.write_text("import module_qui_nexiste_pas\n\nif __name__ == '__main__':\n    pass\n")
+
+    scripts = discover_entry_scripts([str(tmp_path)])
+    assert [os.path.basename(s) for s in scripts] == ['broken_entry.py', 'fast_entry.py', 'slow_entry.py']
+
+    slow_timing = measure_script(str(slow), runs=1)
+    assert slow_timing.import_ms >= 150
+    assert 'ModuleNotFoundError' in measure_script(str(broken), runs=1).error
+
+    results = {'slow': slow_timing, 'fast': ImportTiming('fast', import_ms=20.0)}
+    baseline = {'slow': {'import_ms': 20.0}, 'fast': {'import_ms': 18.0}}
+    regressions = find_regressions(results, baseline)
+    assert [r['script'] for r in regressions] == ['slow']
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests du graphe de lignage (arêtes de provenance, requêtes transitives, persistance)
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from lineage_graph import LineageGraph
+
+
+def _atom(atom_id, parents, url='', agent='arxiv_agent', method='api'):
+    return {'id': atom_id, 'concept': atom_id, 'definition': '',
+            'provenance': {'source_agent': agent, 'method': method, 'source_url': url,
+                           'timestamp': '2025-01-01T00:00:00', 'extraction_confidence': 0.9,
+                           'parent_sources': parents}}
+
+
+ATOMS = [
+    _atom('a1', [], url='https://arxiv.org/abs/1'),
+    _atom('a2', ['https://wiki.org/x'], url='https://arxiv.org/abs/1'),
+    _atom('b1', ['a1'], agent='consensus_agent', method='merge'),
+    _atom('b2', ['a2', 'historical_year_1859'], agent='consensus_agent', method='merge'),
+    _atom('c1', ['b1', 'b2'], agent='consensus_agent', method='merge'),
+]
+
+
+def test_transitive_queries_follow_parent_atoms():
+    graph = LineageGraph()
+    graph.add_atoms(ATOMS)
+    assert sorted(graph.parents('atom:b2')) == ['agent_version:consensus_agent@merge', 'atom:a2',
+                                                'source:historical_year_1859']
+    assert sorted(graph.derived_atoms('url:https://arxiv.org/abs/1')) == \
+        ['atom:a1', 'atom:a2', 'atom:b1', 'atom:b2', 'atom:c1']
+    assert sorted(graph.derived_atoms('url:https://wiki.org/x')) == ['atom:a2', 'atom:b2', 'atom:c1']
+    assert 'url:https://wiki.org/x' in graph.ancestors('atom:c1', kinds=('url',))
+    assert graph.stats()['agent_version'] == 2 and graph.stats()['atom'] == 5
+
+    impact = graph.retraction_impact(['url:https://arxiv.org/abs/1'])
+    assert sorted(impact['impacted']) == ['atom:a1', 'atom:a2', 'atom:b1', 'atom:b2', 'atom:c1']
+    # a2 garde wiki.org, b2 garde la source historique, c1 hérite de b2
+    assert sorted(impact['orphaned']) == ['atom:a1', 'atom:b1']
+
+
+def test_persisted_graph_reloads_and_rebuilds_on_change(tmp_path):
+    store = tmp_path / 'demo_semantic_store.json'
+    store.write_text(json.dumps({'semantic_atoms': ATOMS}))
+    graph_path = str(tmp_path / 'lineage.plg')
+
+    built = LineageGraph.load_or_build([str(store)], graph_path)
+    loaded = LineageGraph.load(graph_path)
+    assert loaded.keys == built.keys
+    assert sorted(loaded.derived_atoms('atom:a1')) == ['atom:b1', 'atom:c1']
+    assert loaded.retraction_impact(['atom:a2']) == built.retraction_impact(['atom:a2'])
+
+    store.write_text(json.dumps({'semantic_atoms': ATOMS + [_atom('d1', ['c1'])]}))
+    rebuilt = LineageGraph.load_or_build([str(store)], graph_path)
+    assert 'atom:d1' in rebuilt.derived_atoms('url:https://wiki.org/x')
+
+
+def test_parent_atoms_from_later_stores_do_not_depend_on_load_order(tmp_path):
+    first, second = tmp_path / 'a_semantic_store.json', tmp_path / 'b_semantic_store.json'
+    first.write_text(json.dumps({'semantic_atoms': ATOMS[2:]}))   # Dérivés avant leurs parents
+    second.write_text(json.dumps({'semantic_atoms': ATOMS[:2]}))
+    forward = LineageGraph.from_stores([str(first), str(second)])
+    backward = LineageGraph.from_stores([str(second), str(first)])
+    for graph in (forward, backward):
+        assert sorted(graph.parents('atom:b1')) == ['agent_version:consensus_agent@merge', 'atom:a1']
+        assert 'source:a1' not in graph and 'source:historical_year_1859' in graph
+    assert sorted(forward.derived_atoms('url:https://arxiv.org/abs/1')) == \
+        sorted(backward.derived_atoms('url:https://arxiv.org/abs/1'))
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests du profilage par étape (timers, pic mémoire, piles collapsed, opt-in)
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from pipeline_profiler import PROFILE_DIR_ENV, PipelineProfiler, default_profile_dir, load_profiles
+
+
+def busy_loop(seconds):
+    end = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < end:
+        total += 1
+    return total
+
+
+def test_disabled_profiler_is_transparent():
+    profiler = PipelineProfiler(enabled=False)
+
+    @profiler.profile('double')
+    def double(x):
+        return 2 * x
+
+    assert profiler.stage('a') is profiler.stage('b')
+    with profiler.stage('a'):
+        assert double(21) == 42
+    assert profiler.stats == {} and not profiler.stacks
+
+
+def test_nested_stages_record_time_memory_and_stacks(tmp_path):
+    profiler = PipelineProfiler(enabled=True, sample_interval=0.002, output_dir=str(tmp_path))
+
+    @profiler.profile('allocate')
+    def allocate():
+        blob = [bytes(1024) for _ in range(2048)]
+        return len(blob)
+
+    with profiler.session('run'):
+        with profiler.stage('load'):
+            busy_loop(0.15)
+        for _ in range(3):
+            allocate()
+
+    stats = {s['path']: s for s in profiler.summary()}
+    assert set(stats) == {'run', 'run/load', 'run/allocate'}
+    assert stats['run/allocate']['calls'] == 3
+    assert stats['run/load']['wall_seconds'] >= 0.15
+    assert stats['run/load']['cpu_seconds'] > 0.05
+    assert stats['run/allocate']['peak_bytes'] > 2 * 1024 * 1024
+    assert stats['run']['peak_bytes'] >= stats['run/allocate']['peak_bytes']
+    assert stats['run/load']['samples'] > 10
+
+    folded = (tmp_path / 'run.folded').read_text().splitlines()
+    assert any(line.startswith('run;load;') and 'busy_loop' in line for line in folded)
+    assert all(line.rsplit(' ', 1)[1].isdigit() for line in folded)
+    assert load_profiles(str(tmp_path))['run']['stages'][0]['path'] == 'run'
+
+
+def test_sessions_and_dashboard_share_an_absolute_profile_dir(tmp_path, monkeypatch):
+    monkeypatch.delenv(PROFILE_DIR_ENV, raising=False)
+    scripts_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    monkeypatch.chdir(tmp_path)
+    assert PipelineProfiler(enabled=False).output_dir == default_profile_dir() == \
+        os.path.join(scripts_dir, 'profiles')
+    monkeypatch.setenv(PROFILE_DIR_ENV, 'relative')
+    assert default_profile_dir() == str(tmp_path / 'relative')
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests du suivi de progression (débit lissé, ETA, publication bornée, blocages)
+"""
+
+import os
+import queue
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from progress_tracker import ProgressTracker, track
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_rate_eta_and_bounded_publication():
+    clock, published = FakeClock(), []
+    tracker = ProgressTracker('atomes', total=1000, sink=published.append,
+                              publish_interval=1.0, clock=clock)
+    for _ in range(400):
+        clock.now += 0.01  # 100 atomes/s
+        tracker.advance()
+    assert len(published) in (3, 4)
+    status = published[-1]
+    assert abs(status['rate'] - 100) < 1
+    assert abs(status['eta'] - (1000 - status['count']) / 100) < 0.5
+    assert 0 < status['progress'] < 50 and not status['done']
+
+    tracker.close()
+    assert published[-1]['done'] and published[-1]['eta'] == 0.0 and published[-1]['count'] == 400
+
+
+def test_stride_skips_clock_reads_on_hot_path():
+    reads = []
+    clock = FakeClock()
+
+    def counting_clock():
+        reads.append(1)
+        clock.now += 1e-6  # 1M appels/s
+        return clock.now
+
+    tracker = ProgressTracker('octets', sink=lambda status: None, publish_interval=1.0, clock=counting_clock)
+    for _ in range(200000):
+        tracker.advance(4096)
+    assert tracker.count == 200000 * 4096
+    assert len(reads) < 100
+
+
+def test_poll_reports_stall_to_status_queue():
+    clock, statuses = FakeClock(), queue.Queue()
+    tracker = ProgressTracker('textes', total=10, sink=statuses, stall_after=5.0, clock=clock)
+    tracker.advance(3)
+    assert not tracker.poll()
+    clock.now += 6
+    assert tracker.poll()
+    stalled = statuses.get_nowait()
+    assert stalled['stalled'] and stalled['count'] == 3
+    assert not tracker.poll()  # une seule alerte par période
+
+    items = list(track(['a', 'bb', 'ccc'], 'mots', sink=statuses.put, weight=len))
+    assert items == ['a', 'bb', 'ccc']
+    final = statuses.get_nowait()
+    assert final['done'] and final['count'] == 6 and final['total'] is None
+
+
+def test_exception_or_abandoned_loop_is_not_reported_done():
+    published = []
+    try:
+        with ProgressTracker('chemin', total=5, sink=published.append) as tracker:
+            tracker.advance()
+            raise RuntimeError("chemin annulé")
+    except RuntimeError:
+        pass
+    assert tracker.done and tracker.failed and published == []
+
+    items = track(range(10), 'boucle', sink=published.append)
+    for item in items:
+        if item == 3:
+            break
+    items.close()
+    assert published == []
+
+    list(track(range(3), 'complet', sink=published.append))
+    assert [s['done'] and not s['failed'] for s in published] == [True]
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests du moteur de requêtes (syntaxe, planification, plans indexés = scans)
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from semantic_query import (AtomReader, ColumnarStoreReader, QueryEngine, QuerySyntaxError,
+                            parse_query, quote_value, synthetic_atoms, write_columnar)
+
+KEYWORDS = ['entropie', 'neur', '"phase tr"']
+QUERY_TERMS = [
+    lambda rng, atoms: f"concept = {quote_value(rng.choice(atoms)['concept'].upper())}",
+    lambda rng, atoms: f"agent in (collector_{rng.randint(0, 40)}, collector_{rng.randint(0, 40)})",
+    lambda rng, atoms: f"source = {rng.choice(['arxiv', 'books', 'absent'])}",
+    lambda rng, atoms: f"confidence {rng.choice(['<', '>=', '!='])} {rng.choice([0.6, 0.75, 0.9])}",
+    lambda rng, atoms: f"time {rng.choice(['<', '<=', '>', '>=', '='])} 2025-08-{rng.randint(1, 30):02d}",
+    lambda rng, atoms: f"{rng.choice(['text', 'definition', 'concept'])} ~ {rng.choice(KEYWORDS)}",
+]
+
+
+def random_query(rng, atoms):
+    terms = [rng.choice(QUERY_TERMS)(rng, atoms) for _ in range(rng.randint(1, 3))]
+    if rng.random() < 0.3:
+        terms[0] = f"({terms[0]} or {rng.choice(QUERY_TERMS)(rng, atoms)})"
+    if rng.random() < 0.2:
+        terms.append("not " + rng.choice(QUERY_TERMS)(rng, atoms))
+    return " and ".join(terms)
+
+
+def test_parse_roundtrip_and_errors():
+    text = "source in (arxiv, 'wiki pedia') and (text ~ entrop or not confidence < 0.5)"
+    expr = parse_query(text)
+    assert str(expr) == 'source in (arxiv, "wiki pedia") and (text ~ entrop or not confidence < 0.5)'
+    assert parse_query(str(expr)) == expr
+    for bad in ["", "colour = red", "confidence ~ 0.5", "confidence > high", "text = x", "concept = (x"]:
+        with pytest.raises(QuerySyntaxError):
+            parse_query(bad)
+
+
+def test_index_plans_match_scans_on_both_readers(tmp_path):
+    atoms = synthetic_atoms(2000, seed=1)
+    path = str(tmp_path / "atoms.pcol")
+    write_columnar(path, atoms)
+    memory = QueryEngine([AtomReader(atoms, text_index=True)])
+    columnar_reader = ColumnarStoreReader(path, text_index=True)
+    columnar = QueryEngine([columnar_reader])
+    rng = random.Random(7)
+    accesses = set()
+    try:
+        for _ in range(80):
+            query = random_query(rng, atoms)
+            expected = memory.query(query, fields=['id'], use_indexes=False).to_list()
+            for engine in (memory, columnar):
+                accesses.update(plan.access for plan in engine.query(query).plans)
+                assert engine.query(query, fields=['id']).to_list() == expected, query
+                assert engine.query(query).count() == len(expected)
+                ordered = engine.query(query, fields=['id'], order_by='time').to_list()
+                assert ordered == engine.query(query, fields=['id'], order_by='time', use_indexes=False).to_list()
+        assert accesses == {'index', 'scan'}
+    finally:
+        columnar_reader.close()
+
+
+def test_planner_picks_most_selective_index_and_time_prefixes():
+    atoms = synthetic_atoms(2000, seed=2)
+    engine = QueryEngine([AtomReader(atoms, name='store.json')])
+    concept = atoms[10]['concept']
+    plan = engine.query(f"source = arxiv and concept = {quote_value(concept)} and confidence > 0.7").plans[0]
+    assert plan.access == 'index' and plan.index.startswith('concept =')
+    assert [str(term) for term in plan.residual] == ['source = arxiv', 'confidence > 0.7']
+    # Index trop peu sélectif (> la moitié des lignes): parcours séquentiel
+    assert engine.query("confidence >= 0 and time >= 2025-08-02").plans[0].access == 'scan'
+
+    day = [row['time'] for row in engine.query("time = 2025-08-15", fields=['time'])]
+    assert day and all(t.startswith('2025-08-15') for t in day)
+    assert len(day) == sum(1 for a in atoms if a['provenance']['timestamp'][:10] == '2025-08-15')
+    assert engine.query("time < 2025-08-02").count() == \
+        sum(1 for a in atoms if a['provenance']['timestamp'] < '2025-08-02')
+
+
+def test_results_are_lazy_records_in_store_order():
+    stores = [AtomReader(synthetic_atoms(50, seed=s), source_type=None, name=f"s{s}") for s in (3, 4)]
+    engine = QueryEngine(stores)
+    first = next(iter(engine.query("confidence >= 0.5")))
+    assert first is stores[0].atoms[0]
+    top = engine.query("confidence >= 0.5", fields=['id', 'confidence'], order_by='-confidence', limit=5).to_list()
+    everything = sorted((a['provenance']['extraction_confidence'] for s in stores for a in s.atoms), reverse=True)
+    assert [row['confidence'] for row in top] == everything[:5]
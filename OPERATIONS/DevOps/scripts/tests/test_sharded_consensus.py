@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests du consensus shardé: rapport identique au chemin mono-processus
+"""
+
+import json
+import math
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from advanced_consensus_engine import AdvancedConsensusEngine
+from multi_source_analyzer import MultiSourceConsensusAnalyzer
+from stream_sketches import ExactSum
+
+WORDS = ["learning", "neural", "market", "wealth", "reason", "knowledge", "signal",
+         "entropy", "network", "theory", "model", "agent", "memory", "language"]
+
+
+def write_store(path, seed, count, agents):
+    rng = random.Random(seed)
+    atoms = []
+    for i in range(count):
+        concept = " ".join(rng.sample(WORDS, 2))
+        atoms.append({
+            'concept': concept.title() if rng.random() < 0.3 else concept,
+            'definition': " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 12))),
+            'context': rng.choice(WORDS),
+            'provenance': {'source_agent': rng.choice(agents),
+                           'extraction_confidence': round(rng.uniform(0.5, 1.0), 3),
+                           'timestamp': f"2025-08-{rng.randint(10, 28)}T10:00:00"}
+        })
+    path.write_text(json.dumps({'semantic_atoms': atoms}))
+
+
+def strip_date(report):
+    report['analysis_metadata'].pop('analysis_date')
+    return json.loads(json.dumps(report))
+
+
+def test_exact_sum_merge_matches_fsum():
+    rng = random.Random(3)
+    values = [rng.uniform(-1, 1) * 10 ** rng.randint(-8, 8) for _ in range(1000)]
+    left, right = ExactSum(), ExactSum()
+    for value in values[:400]:
+        left.add(value)
+    for value in values[400:]:
+        right.add(value)
+    left.merge(right)
+    assert left.value() == math.fsum(values)
+    assert left.count == 1000
+
+
+def test_sharded_reports_match_single_process(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_store(tmp_path / 'demo_semantic_store.json', 1, 150, ['wiki_v1', 'copilot_v1'])
+    write_store(tmp_path / 'arxiv_semantic_store.json', 2, 200, ['arxiv_v1', 'copilot_v1'])
+    write_store(tmp_path / 'historical_books_semantic_store.json', 3, 80, ['books_v1'])
+
+    serial = AdvancedConsensusEngine()
+    serial.load_all_sources()
+    expected = strip_date(serial.generate_comprehensive_consensus_report())
+    assert expected['conflict_resolutions'] and len(expected['authority_profiles']) == 4
+    for workers, shards in ((1, 3), (2, 4)):
+        report = AdvancedConsensusEngine().run_sharded(workers=workers, shards=shards)
+        assert strip_date(report) == expected
+
+    stores = [("demo_semantic_store.json", "wikipedia"), ("arxiv_semantic_store.json", "arxiv")]
+    serial = MultiSourceConsensusAnalyzer()
+    for filename, source_type in stores:
+        serial.load_store(filename, source_type)
+    expected = strip_date(serial.generate_comprehensive_report())
+    assert expected['analysis_metadata']['cross_source_concepts'] > 0
+    assert expected['analysis_metadata']['concept_clusters'] > 0
+    for workers, shards in ((1, 3), (2, 4)):
+        report = MultiSourceConsensusAnalyzer().run_sharded(stores, workers=workers, shards=shards)
+        assert strip_date(report) == expected
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tests des sketches de flux (Space-Saving, HyperLogLog, sketches par store)
+"""
+
+import json
+import os
+import random
+import sys
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from stream_sketches import ConceptSketches, HyperLogLog, SpaceSaving, corpus_sketches, store_sketches
+
+
+def zipf_stream(count, seed):
+    rng = random.Random(seed)
+    return [f"w{int(rng.paretovariate(1.2))}" for _ in range(count)]
+
+
+def test_space_saving_is_exact_under_capacity():
+    sketch = SpaceSaving(capacity=10)
+    for item in "abracadabra":
+        sketch.update(item)
+    assert sketch.top(2) == [('a', 5, 0), ('b', 2, 0)]
+    assert sketch.estimate('z') == 0
+
+
+def test_space_saving_heavy_hitters_and_merge():
+    left, right = zipf_stream(20000, 1), zipf_stream(20000, 2)
+    truth = Counter(left + right)
+    assert len(truth) > 64
+
+    a, b = SpaceSaving(64), SpaceSaving(64)
+    for item in left:
+        a.update(item)
+    for item in right:
+        b.update(item)
+    a.merge(b)
+    assert a.total == 40000 and len(a) == 64
+    assert [item for item, _, _ in a.top(5)] == [item for item, _ in truth.most_common(5)]
+    for item, count, error in a.top(20):
+        assert count - error <= truth[item] <= count
+
+
+def test_hyperloglog_cardinality_and_merge():
+    a, b = HyperLogLog(12), HyperLogLog(12)
+    for i in range(30000):
+        a.add(f"concept-{i}")
+    for i in range(20000, 50000):
+        b.add(f"concept-{i}")
+    assert abs(a.count() - 30000) / 30000 < 0.05
+    a.merge(b)
+    assert abs(a.count() - 50000) / 50000 < 0.05
+    small = HyperLogLog(12)
+    for item in ['x', 'y', 'x', 'z']:
+        small.add(item)
+    assert small.count() == 3
+    assert HyperLogLog.from_dict(a.to_dict()).count() == a.count()
+
+
+def atom(concept, definition, day, agent='agent-a'):
+    return {'concept': concept, 'definition': definition,
+            'provenance': {'timestamp': f"{day}T10:00:00", 'source_agent': agent}}
+
+
+def test_store_sketches_are_cached_and_merged(tmp_path):
+    first = tmp_path / 'first_semantic_store.json'
+    second = tmp_path / 'second_semantic_store.json'
+    first.write_text(json.dumps({'semantic_atoms': [
+        atom('Machine Learning', "apprentissage automatique des données", '2025-08-15'),
+        atom('Deep Learning', "apprentissage profond par réseaux", '2025-08-15')]}))
+    second.write_text(json.dumps({'semantic_atoms': [
+        atom('machine learning ', "apprentissage statistique", '2025-08-16', 'agent-b')]}))
+    cache = str(tmp_path / 'sketches')
+
+    corpus = corpus_sketches([str(first), str(second), str(tmp_path / 'missing.json')], cache_dir=cache)
+    summary = corpus.summary()
+    assert summary['atoms'] == 3
+    assert summary['top_concepts'][0] == ('machine learning', 2)
+    assert summary['distinct_days'] == 2 and summary['distinct_agents'] == 2
+    assert corpus.frequent_terms(1) == [('apprentissage', 3)]
+    assert corpus.cross_concept_terms()['apprentissage'] == ['Deep Learning', 'Machine Learning', 'machine learning ']
+    assert sorted(os.listdir(cache)) == ['first_semantic_store.json.sketch.json', 'second_semantic_store.json.sketch.json']
+
+    # Cache utilisé tant que le store ne change pas, reconstruit sinon
+    assert store_sketches(str(first), atoms=[], cache_dir=cache).atoms == 2
+    second.write_text(json.dumps({'semantic_atoms': []}) + '\n')
+    assert store_sketches(str(second), cache_dir=cache).atoms == 0
+    restored = ConceptSketches.from_dict(json.loads(json.dumps(corpus.to_dict())))
+    assert restored.summary() == summary
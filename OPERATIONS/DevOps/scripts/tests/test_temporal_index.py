@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests de l'index temporel (requêtes par intervalle, tranches, fenêtres glissantes)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from temporal_index import SECONDS_PER_YEAR, TemporalIndex, epoch_year, parse_timestamp, year_to_epoch
+
+
+def _index():
+    index = TemporalIndex()
+    index.add("entropy", parse_timestamp("2025-08-15T21:38:32"), "arxiv", 0.9, "a2")
+    index.add("entropy", parse_timestamp("1859"), "historical_books", 0.5, "a1")
+    index.add("entropy", parse_timestamp("1700-1900"), "historical_books", 0.7, "a0")
+    index.add("fractal", parse_timestamp("2024"), "wikipedia", 0.8, "b0")
+    return index
+
+
+def test_parse_timestamp_formats():
+    assert epoch_year(parse_timestamp("1700-1900")) == 1800
+    assert parse_timestamp("1859") == year_to_epoch(1859) < 0
+    assert parse_timestamp("2024-01-01T00:00:00Z") == year_to_epoch(2024)
+    assert parse_timestamp("n/a") is None
+
+
+def test_parse_timestamp_ambiguous_inputs():
+    # Année-mois ISO, pas une plage d'années
+    assert parse_timestamp("2024-01") == year_to_epoch(2024)
+    assert epoch_year(parse_timestamp("2024-10")) == 2024
+    assert parse_timestamp("2024-13") is None
+    # Plages: années à 4 chiffres, fin >= début
+    assert parse_timestamp("1859-60") is None
+    assert parse_timestamp("1900-1700") is None
+    # Même règle pour int et texte: 4 chiffres = année, sinon secondes epoch
+    assert parse_timestamp(1859) == parse_timestamp("1859") == year_to_epoch(1859)
+    assert parse_timestamp(0) == parse_timestamp("0") == 0
+    assert parse_timestamp(-500) == parse_timestamp("-500") == -500
+    assert parse_timestamp(1692000000) == parse_timestamp("1692000000") == 1692000000
+    assert parse_timestamp("1692000000.5") == parse_timestamp(1692000000.5) == 1692000000
+    assert parse_timestamp("99999-01-01") is None and parse_timestamp(float('inf')) is None
+
+
+def test_series_sorted_and_range_query():
+    index = _index()
+    assert index.series("entropy").atom_ids == ["a0", "a1", "a2"]
+    hits = index.range_query("entropy", year_to_epoch(1850), year_to_epoch(2000))
+    assert [(epoch_year(t), source, atom_id) for t, source, _, atom_id in hits] == [
+        (1859, "historical_books", "a1")
+    ]
+
+
+def test_bucket_counts_and_window_stats():
+    index = _index()
+    width = 100 * SECONDS_PER_YEAR
+    buckets = index.bucket_counts(width, origin=year_to_epoch(1750))
+    assert {epoch_year(b): n for b, n in buckets.items()} == {1750: 1, 1850: 1, 1950: 2}
+
+    series = index.series("entropy")
+    stats = series.stats(0, len(series), year_to_epoch(1901))
+    assert stats.count == 3 and stats.source_count == 2 and stats.before_cutoff == 2
+    assert abs(stats.mean_confidence - 0.7) < 1e-9
+    assert stats.span_years > 200
+
+    windows = list(index.sliding_windows("entropy", 100 * SECONDS_PER_YEAR, 50 * SECONDS_PER_YEAR))
+    assert [(epoch_year(start), w.count) for start, w in windows] == [(1800, 2), (1850, 1), (1950, 1), (2000, 1)]
@@ -3,15 +3,21 @@
 Serveur web pour visualisation traçabilité en temps réel
 """
 
-from flask import Flask, render_template, jsonify
+from flask import Flask, render_template, jsonify, request
 import json
 from datetime import datetime
 import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from lineage_graph import DEFAULT_GRAPH_NAME, LineageGraph, atom_identifier, discover_stores, store_signature
 
 app = Flask(__name__)
 
 class TraceabilityDashboard:
     def __init__(self):
+        self.lineage = None
+        self._lineage_signature = None
         self.load_data()
         
     def load_data(self):
@@ -30,42 +36,67 @@ class TraceabilityDashboard:
         except FileNotFoundError:
             print("⚠️  consensus_analysis.json non trouvé")
             self.analysis = {"semantic_patterns": {}}
+
+        # Graphe de lignage persisté, reconstruit seulement si un store a changé;
+        # gardé en mémoire entre requêtes tant que les stores (taille, mtime) sont inchangés
+        stores = discover_stores('.')
+        signature = store_signature(stores)
+        if self.lineage is None or signature != self._lineage_signature:
+            self.lineage = LineageGraph.load_or_build(stores, DEFAULT_GRAPH_NAME)
+            self._lineage_signature = signature
     
     def get_provenance_graph(self):
         """Génère graphe de provenance pour vis.js"""
-        nodes = []
+        nodes = {}
         edges = []
         
         atoms = self.store.get('semantic_atoms', [])
         
         for atom in atoms:
+            provenance = atom['provenance']
+            atom_key = f"atom:{atom_identifier(atom)}"
             # Noeud concept
-            nodes.append({
-                'id': atom['id'],
+            nodes[atom_key] = {
+                'id': atom_key,
                 'label': atom['concept'][:20] + "..." if len(atom['concept']) > 20 else atom['concept'],
                 'group': 'concept',
-                'title': f"Concept: {atom['concept']}\nDéfinition: {atom['definition'][:200]}...\nSource: {atom['provenance']['source_url']}"
-            })
+                'title': f"Concept: {atom['concept']}\nDéfinition: {atom['definition'][:200]}...\nSource: {provenance.get('source_url', '')}"
+            }
             
             # Noeud agent (groupé)
-            agent_id = atom['provenance']['source_agent']
-            if not any(n['id'] == agent_id for n in nodes):
-                nodes.append({
+            agent_id = provenance['source_agent']
+            if agent_id not in nodes:
+                nodes[agent_id] = {
                     'id': agent_id,
                     'label': 'Agent Copilot',
                     'group': 'agent',
                     'title': f"Agent: {agent_id}\nType: Machine\nVersion: 1.0.0"
-                })
+                }
             
             # Edge agent → concept
+            method = provenance.get('method') or provenance.get('collection_method', '')
             edges.append({
                 'from': agent_id,
-                'to': atom['id'],
-                'label': f"{atom['provenance']['extraction_confidence']:.2f}",
-                'title': f"Méthode: {atom['provenance']['method']}\nConfiance: {atom['provenance']['extraction_confidence']}\nTimestamp: {atom['provenance']['timestamp']}"
+                'to': atom_key,
+                'label': f"{provenance['extraction_confidence']:.2f}",
+                'title': f"Méthode: {method}\nConfiance: {provenance['extraction_confidence']}\nTimestamp: {provenance['timestamp']}"
             })
+
+            # Edges sources → concept (URLs, sources historiques, atomes parents)
+            if atom_key in self.lineage:
+                for parent in self.lineage.parents(atom_key):
+                    if parent.startswith('agent'):
+                        continue
+                    if parent not in nodes:
+                        nodes[parent] = {
+                            'id': parent,
+                            'label': parent.split(':', 1)[1][-30:],
+                            'group': parent.split(':', 1)[0],
+                            'title': parent
+                        }
+                    edges.append({'from': parent, 'to': atom_key})
             
-        return {'nodes': nodes, 'edges': edges}
+        return {'nodes': list(nodes.values()), 'edges': edges}
     
     def get_timeline_data(self):
         """Timeline des extractions"""
@@ -354,6 +385,26 @@ def api_timeline():
     dashboard.load_data()
     return jsonify(dashboard.get_timeline_data())
 
+@app.route('/api/lineage')
+def api_lineage():
+    """Provenance transitive d'un nœud: /api/lineage?key=url:https://..."""
+    dashboard.load_data()
+    key = request.args.get('key', '')
+    return jsonify({
+        'key': key,
+        'parents': dashboard.lineage.parents(key) if key in dashboard.lineage else [],
+        'ancestors': dashboard.lineage.ancestors(key),
+        'derived_atoms': dashboard.lineage.derived_atoms(key)
+    })
+
+@app.route('/api/lineage/impact')
+def api_lineage_impact():
+    """Impact du retrait de sources: /api/lineage/impact?key=url:...&key=source:..."""
+    dashboard.load_data()
+    keys = request.args.getlist('key')
+    impact = dashboard.lineage.retraction_impact(keys)
+    return jsonify({'retracted': keys, **impact, 'stats': dashboard.lineage.stats()})
+
 def main():
     print("🌐 DASHBOARD TRAÇABILITÉ PANINI FS")
     print("==================================")
@@ -12,6 +12,13 @@ from datetime import datetime
 from pathlib import Path
 import threading
 import queue
+import sys
+
+sys.path.append(str(Path(__file__).parent))
+from hedged_executor import ExecutionPath, HedgedExecutor, HedgeTimeout, LatencyTracker, AllPathsFailed
+from progress_tracker import ProgressTracker
+
+LATENCY_FILE = Path(__file__).with_name('ultra_reactive_latencies.json')
 
 class UltraReactiveController:
     def __init__(self):
@@ -27,6 +34,11 @@ class UltraReactiveController:
             'fallbacks_ready': True,
             'timestamp': time.time()
         }
+        # Latences réelles par chemin: les délais de couverture suivent leur p95
+        self.latency = LatencyTracker(str(LATENCY_FILE))
+        self.executor = HedgedExecutor(self.latency, default_hedge_delay=2.0)
+        # Trackers actifs (compteurs réels), surveillés par status_monitor
+        self.trackers = []
         
     def emit_status(self, action, progress=None, eta=None):
         """Émission status < 1s garantie"""
@@ -43,99 +55,118 @@ class UltraReactiveController:
         # Queue pour monitoring
         self.status_queue.put(self.current_status.copy())
         
-    def timeout_guardian(self, max_seconds=10):
-        """Guardian anti-timeout - force fallback si >10s"""
-        start_time = time.time()
-        
-        while time.time() - start_time < max_seconds:
-            time.sleep(1)
-            if self.current_status['action'] == 'completed':
-                return  # Succès avant timeout
-                
-        # TIMEOUT - force fallback
-        print("🚨 TIMEOUT - Activation fallback automatique!")
-        self.activate_emergency_fallback()
-        
-    def activate_emergency_fallback(self):
+    def progress_tracker(self, name, total=None, unit='items', **options):
+        """Tracker branché sur emit_status: progress/ETA mesurés, publication bornée"""
+        tracker = ProgressTracker(name, total=total, unit=unit, sink=self.report_progress,
+                                  publish_interval=self.feedback_interval, **options)
+        self.trackers.append(tracker)
+        return tracker
+        
+    def report_progress(self, status):
+        """Status d'un tracker -> emit_status (et donc status_queue)"""
+        progress = int(status['progress']) if status['progress'] is not None else None
+        eta = round(status['eta']) if status['eta'] is not None else None
+        action = f"{status['name']}: {status['count']} {status['unit']} ({status['rate']:.1f}/s)"
+        if status['stalled']:
+            action = f"⚠️ BLOQUÉ {action}"
+        self.emit_status(action, progress, eta)
+        
+    def _wait(self, seconds, cancel_token=None):
+        """Attente interrompue si le chemin a perdu la course"""
+        if cancel_token is None:
+            time.sleep(seconds)
+        else:
+            cancel_token.sleep(seconds)
+        
+    def activate_emergency_fallback(self, cancel_token=None):
         """Fallback d'urgence - processing local immédiat"""
         self.emit_status("FALLBACK: Processing local", 0, 30)
         
-        # Simulation traitement local rapide
-        for i in range(0, 101, 20):
-            time.sleep(1)  # 1s par étape
-            self.emit_status(f"Local processing", i, (100-i)//20)
+        # Simulation traitement local rapide (5 étapes de 1s)
+        with self.progress_tracker("Local processing", total=5, unit='étapes') as tracker:
+            for _ in range(5):
+                self._wait(1, cancel_token)
+                tracker.advance()
             
-        self.emit_status("completed", 100, 0)
         print("✅ FALLBACK RÉUSSI - Résultats disponibles localement")
+        return True
         
-    def try_colab_path(self):
+    def try_colab_path(self, cancel_token=None):
         """Tentative Colab avec timeout strict"""
         self.emit_status("Connexion Colab", 10, 8)
-        time.sleep(2)  # Simulation
+        self._wait(2, cancel_token)  # Simulation
         
         self.emit_status("Activation GPU", 30, 6)
-        time.sleep(2)
+        self._wait(2, cancel_token)
         
         self.emit_status("Chargement notebook", 50, 4)
-        time.sleep(2)
+        self._wait(2, cancel_token)
         
         # Simulation échec après 6s (timeout user imminent)
         self.emit_status("❌ Colab timeout", 50, 0)
         return False
         
-    def try_local_path(self):
+    def try_local_path(self, cancel_token=None):
         """Path local - toujours fonctionnel"""
         self.emit_status("🏠 Traitement local activé", 20, 15)
         
-        for step, desc in [(40, "Scan repos"), (60, "Embeddings"), (80, "Clustering"), (100, "Export")]:
-            time.sleep(1.5)
-            eta = (100 - step) // 20 * 1.5
-            self.emit_status(f"Local: {desc}", step, eta)
+        stages = ["Scan repos", "Embeddings", "Clustering", "Export"]
+        with self.progress_tracker("Local", total=len(stages), unit='étapes') as tracker:
+            for desc in stages:
+                tracker.name = f"Local: {desc}"
+                self._wait(1.5, cancel_token)
+                tracker.advance()
             
         return True
         
     def multi_path_execution(self):
-        """Exécution multi-path avec feedback temps réel"""
+        """Exécution multi-path couverte: premier succès gagnant, perdants annulés"""
         print("🚀 DÉMARRAGE MULTI-PATH EXECUTION")
         print("=" * 50)
         
-        # Guardian timeout en arrière-plan
-        timeout_thread = threading.Thread(target=self.timeout_guardian, args=(self.user_timeout,))
-        timeout_thread.daemon = True
-        timeout_thread.start()
-        
         # Status monitoring en arrière-plan
         monitor_thread = threading.Thread(target=self.status_monitor)
         monitor_thread.daemon = True
         monitor_thread.start()
         
-        # Tentative Path 1: Colab (optimiste mais risqué)
+        # Colab (optimiste mais risqué), local couvrant Colab après son p95,
+        # emergency couvrant le local - tout échec déclenche le suivant sans attendre
+        paths = [
+            ExecutionPath('colab_direct', self.try_colab_path),
+            ExecutionPath('local_fallback', self.try_local_path),
+            ExecutionPath('emergency_fallback', self.activate_emergency_fallback),
+        ]
         self.emit_status("🌐 Tentative Colab", 5, 10)
         
         try:
-            if self.try_colab_path():
-                self.emit_status("✅ Colab réussi", 100, 0)
-                return "colab_success"
-        except Exception as e:
-            self.emit_status(f"❌ Colab échoué: {str(e)[:30]}", 50, 0)
-            
-        # Path 2: Local (fallback fiable)
-        self.emit_status("🔄 Basculement local automatique", 55, 8)
-        time.sleep(0.5)  # Transition douce
+            result = self.executor.run(paths, timeout=self.user_timeout * 3)
+        except (AllPathsFailed, HedgeTimeout) as e:
+            self.current_status['paths_tried'] = [a.name for a in e.attempts]
+            self.emit_status(f"❌ Aucun chemin réussi: {str(e)[:40]}", 0, 0)
+            self.latency.save()
+            return "all_paths_failed"
+        
+        self.current_status['paths_tried'] = [a.name for a in result.attempts]
+        self.success_path = result.winner
+        self.latency.save()
+        self.emit_status(f"✅ {result.winner} réussi en {result.latency:.1f}s", 100, 0)
+        self.emit_status("completed", 100, 0)
         
-        if self.try_local_path():
-            self.emit_status("✅ Local réussi", 100, 0)
-            return "local_success"
-            
-        # Path 3: Emergency (si tout échoue)
-        self.activate_emergency_fallback()
-        return "emergency_fallback"
+        outcomes = {'colab_direct': 'colab_success', 'local_fallback': 'local_success'}
+        return outcomes.get(result.winner, result.winner)
         
     def status_monitor(self):
         """Monitoring status en temps réel"""
         while self.current_status['action'] != 'completed':
             time.sleep(self.feedback_interval)
             
+            # Blocages: compteurs des trackers actifs figés
+            for tracker in list(self.trackers):
+                if tracker.done:
+                    self.trackers.remove(tracker)
+                else:
+                    tracker.poll()
+            
             # Calcul temps écoulé
             elapsed = time.time() - self.current_status['timestamp']
             
@@ -196,6 +227,11 @@ def main():
     print(f"⚡ Feedback moyen: {controller.feedback_interval}s")
     print(f"✅ Objectif <10s: {'RÉUSSI' if total_time < 10 else 'ÉCHOUÉ'}")
     
+    # Latences par chemin (réglage des délais de couverture)
+    for name, stats in controller.latency.summary().items():
+        p95 = f"{stats['p95']:.1f}s" if stats['p95'] is not None else "n/a"
+        print(f"📈 {name}: p95 {p95} | ✅ {stats.get('success', 0)} ❌ {stats.get('failure', 0)} ⏹️ {stats.get('cancelled', 0)}")
+    
     # Sauvegarde pour sessions futures
     controller.save_session_state()
 
@@ -11,30 +11,47 @@ import json
 import psutil
 import subprocess
 import time
+import sys
 from datetime import datetime
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
 import threading
 import urllib.parse
-import socketserver
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from metrics_sampler import CachedProbe, MetricsSampler
 
 class LocalCloudDashboard:
-    def __init__(self):
+    # Historique par défaut de /metrics/history (secondes)
+    DEFAULT_HISTORY_WINDOW = 300
+    
+    def __init__(self, sample_interval: float = 5.0, history_size: int = 720):
         self.local_port = 8080
         self.data_file = "/tmp/paninifs_local_dashboard.json"
         self.log_file = "/tmp/paninifs_dashboard.log"
         
+        # Sondes lentes (sous-processus) rafraîchies au plus une fois par TTL
+        self.gh_probe = CachedProbe(self._probe_gh_status, ttl=300)
+        self.git_probe = CachedProbe(self._probe_git_activity, ttl=30)
+        
+        # Tampon circulaire alimenté par un seul thread (720 x 5s = 1h)
+        self.sampler = MetricsSampler(self.collect_local_metrics, interval=sample_interval,
+                                      capacity=history_size, on_sample=self.save_metrics)
+        
     def collect_local_metrics(self):
-        """Collecte métriques système local"""
+        """Collecte métriques système local (non bloquante, appelée par l'échantillonneur)"""
         try:
-            # Système
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # Système: CPU moyen depuis l'échantillon précédent, sans attente
+            cpu_percent = psutil.cpu_percent(interval=None)
             memory = psutil.virtual_memory()
             disk = psutil.disk_usage('/')
             
-            # Processus Python actifs
+            # Processus Python actifs + terminaux, en un seul parcours
             python_processes = []
+            terminals_count = 0
             for proc in psutil.process_iter(['pid', 'name', 'cmdline', 'cpu_percent', 'memory_percent']):
                 try:
+                    if proc.info['name'] and 'bash' in proc.info['name']:
+                        terminals_count += 1
                     if proc.info['name'] and 'python' in proc.info['name'].lower():
                         python_processes.append({
                             'pid': proc.info['pid'],
@@ -46,25 +63,9 @@ class LocalCloudDashboard:
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
                     continue
             
-            # Terminaux actifs
-            terminals_count = len([p for p in psutil.process_iter(['name']) if 'bash' in p.info['name']])
-            
-            # GitHub CLI status
-            gh_status = "Unknown"
-            try:
-                result = subprocess.run(['gh', 'auth', 'status'], capture_output=True, text=True, timeout=5)
-                gh_status = "Connected" if result.returncode == 0 else "Disconnected"
-            except:
-                gh_status = "Not Available"
-            
-            # Dernière activité Git
-            git_activity = "Unknown"
-            try:
-                result = subprocess.run(['git', 'log', '--oneline', '-1'], 
-                                      capture_output=True, text=True, cwd='/home/stephane/GitHub/PaniniFS-1', timeout=5)
-                git_activity = result.stdout.strip()[:50] if result.stdout else "No commits"
-            except:
-                git_activity = "Error reading git"
+            # GitHub CLI status / dernière activité Git (cache TTL)
+            gh_status = self.gh_probe.get()
+            git_activity = self.git_probe.get()
             
             metrics = {
                 'timestamp': datetime.now().isoformat(),
@@ -92,6 +93,35 @@ class LocalCloudDashboard:
         except Exception as e:
             return {'error': str(e), 'timestamp': datetime.now().isoformat()}
     
+    def _probe_gh_status(self):
+        """GitHub CLI status"""
+        try:
+            result = subprocess.run(['gh', 'auth', 'status'], capture_output=True, text=True, timeout=5)
+            return "Connected" if result.returncode == 0 else "Disconnected"
+        except:
+            return "Not Available"
+    
+    def _probe_git_activity(self):
+        """Dernière activité Git"""
+        try:
+            result = subprocess.run(['git', 'log', '--oneline', '-1'], 
+                                  capture_output=True, text=True, cwd='/home/stephane/GitHub/PaniniFS-1', timeout=5)
+            return result.stdout.strip()[:50] if result.stdout else "No commits"
+        except:
+            return "Error reading git"
+    
+    def metrics_history(self, window=None):
+        """Échantillons du tampon sur les `window` dernières secondes"""
+        window = self.DEFAULT_HISTORY_WINDOW if window is None else window
+        return {
+            'window_seconds': window,
+            'interval_seconds': self.sampler.interval,
+            'samples': [
+                {'epoch': round(epoch, 3), **metrics}
+                for epoch, metrics in self.sampler.history(window)
+            ]
+        }
+    
     def save_metrics(self, metrics):
         """Sauvegarde métriques en JSON"""
         try:
@@ -426,19 +456,34 @@ class LocalCloudDashboard:
                 self.dashboard = dashboard_instance
                 super().__init__(*args, **kwargs)
             
+            def _send_json(self, payload, status=200):
+                self.send_response(status)
+                self.send_header('Content-type', 'application/json')
+                self.end_headers()
+                self.wfile.write(json.dumps(payload).encode())
+            
             def do_GET(self):
+                url = urllib.parse.urlsplit(self.path)
                 if self.path == '/':
                     self.send_response(200)
                     self.send_header('Content-type', 'text/html')
                     self.end_headers()
                     html = self.dashboard.generate_dashboard_html()
                     self.wfile.write(html.encode())
-                elif self.path == '/metrics':
-                    self.send_response(200)
-                    self.send_header('Content-type', 'application/json')
-                    self.end_headers()
-                    metrics = self.dashboard.collect_local_metrics()
-                    self.wfile.write(json.dumps(metrics).encode())
+                elif url.path == '/metrics':
+                    # Dernier échantillon du tampon: aucune mesure déclenchée par la requête
+                    metrics = self.dashboard.sampler.latest()
+                    self._send_json(metrics if metrics is not None else {'error': 'No sample yet'})
+                elif url.path == '/metrics/history':
+                    query = urllib.parse.parse_qs(url.query)
+                    try:
+                        window = float(query['window'][0]) if 'window' in query else None
+                        if window is not None and window <= 0:
+                            raise ValueError(window)
+                    except ValueError:
+                        self._send_json({'error': 'window doit être un nombre de secondes > 0'}, status=400)
+                        return
+                    self._send_json(self.dashboard.metrics_history(window))
                 elif self.path == '/logs':
                     self.send_response(200)
                     self.send_header('Content-type', 'text/plain')
@@ -462,7 +507,8 @@ class LocalCloudDashboard:
         # Handler avec référence au dashboard
         handler = lambda *args, **kwargs: DashboardHandler(self, *args, **kwargs)
         
-        with socketserver.TCPServer(("", self.local_port), handler) as httpd:
+        # Serveur multi-thread: une requête lente (action, logs) ne bloque pas les autres
+        with ThreadingHTTPServer(("", self.local_port), handler) as httpd:
             self.log(f"Dashboard Local démarré sur http://localhost:{self.local_port}")
             print(f"\n🎯 Dashboard Local Hybride disponible sur:")
             print(f"   http://localhost:{self.local_port}")
@@ -506,22 +552,14 @@ class LocalCloudDashboard:
             return f"Erreur: {str(e)}"
     
     def run_background_collector(self):
-        """Collecte métriques en arrière-plan"""
-        while True:
-            try:
-                metrics = self.collect_local_metrics()
-                self.save_metrics(metrics)
-                time.sleep(5)  # Toutes les 5 secondes
-            except Exception as e:
-                self.log(f"Erreur collecte: {e}")
-                time.sleep(10)
+        """Collecte métriques en arrière-plan (échantillonneur à tampon circulaire)"""
+        self.sampler.start()
 
 if __name__ == "__main__":
     dashboard = LocalCloudDashboard()
     
     # Démarre collecteur en arrière-plan
-    collector_thread = threading.Thread(target=dashboard.run_background_collector, daemon=True)
-    collector_thread.start()
+    dashboard.run_background_collector()
     
     # Démarre serveur principal
     dashboard.start_server()
@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+🌐 SONDES DE DOMAINES CONCURRENTES (asyncio)
+Tous les domaines sont sondés en parallèle, chaque sonde bornée par un budget
+unique: la durée d'un cycle est celle de la sonde la plus lente, et non la
+somme des timeouts.
+
+- Phases mesurées séparément: DNS, connexion TCP, poignée de main TLS,
+  premier octet de la réponse
+- Connexions HTTP/1.1 keep-alive mises en commun par (hôte, port, TLS):
+  redirections et cycles rapprochés réutilisent la même connexion
+- Historique glissant compact par domaine (ms entiers, colonnes JSON) avec
+  p50/p95, histogramme et détection de régression de latence
+"""
+
+import asyncio
+import json
+import math
+import os
+import socket
+import ssl
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+USER_AGENT = "PaniniFS-DomainMonitor/1.0"
+MAX_DRAINED_BODY = 1 << 20  # Au-delà, la connexion est fermée plutôt que vidée
+LATENCY_BUCKETS_MS = (50, 100, 200, 500, 1000, 2000, 5000)
+
+STATUS_CODES = {'online': 'O', 'ssl_error': 'S', 'offline': 'X'}
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+
+
+@dataclass
+class ProbeResult:
+    """Résultat d'une sonde: phases en millisecondes (0 sur connexion réutilisée)"""
+    domain: str
+    url: str
+    status: str = 'unknown'
+    http_code: Optional[int] = None
+    ssl_valid: bool = False
+    redirect_url: Optional[str] = None
+    dns_ms: float = 0.0
+    connect_ms: float = 0.0
+    tls_ms: float = 0.0
+    first_byte_ms: Optional[float] = None
+    total_ms: Optional[float] = None
+    reused: bool = False
+    error: Optional[str] = None
+    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    def to_report(self) -> Dict:
+        """Entrée de rapport compatible avec l'ancien format + détail des phases"""
+        report = {
+            'domain': self.domain,
+            'timestamp': self.timestamp,
+            'status': self.status,
+            'http_code': self.http_code,
+            'response_time': None if self.total_ms is None else self.total_ms / 1000.0,
+            'ssl_valid': self.ssl_valid,
+            'redirect_url': self.redirect_url,
+            'timings': {
+                'dns_ms': round(self.dns_ms, 1),
+                'connect_ms': round(self.connect_ms, 1),
+                'tls_ms': round(self.tls_ms, 1),
+                'first_byte_ms': None if self.first_byte_ms is None else round(self.first_byte_ms, 1),
+                'total_ms': None if self.total_ms is None else round(self.total_ms, 1),
+                'reused_connection': self.reused
+            }
+        }
+        if self.error:
+            report['error'] = self.error
+        return report
+
+
+class _Connection:
+    def __init__(self, key: Tuple[str, int, bool], reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter):
+        self.key = key
+        self.reader = reader
+        self.writer = writer
+        self.last_used = time.monotonic()
+
+    def usable(self, idle_timeout: float) -> bool:
+        return (not self.writer.is_closing() and not self.reader.at_eof()
+                and time.monotonic() - self.last_used < idle_timeout)
+
+    def close(self):
+        if not self.writer.is_closing():
+            self.writer.close()
+
+
+class ConnectionPool:
+    """Connexions keep-alive inactives par (hôte, port, TLS)"""
+
+    def __init__(self, max_idle_per_host: int = 2, idle_timeout: float = 30.0,
+                 ssl_context: Optional[ssl.SSLContext] = None):
+        self.max_idle_per_host = max_idle_per_host
+        self.idle_timeout = idle_timeout
+        self.ssl_context = ssl_context or ssl.create_default_context()
+        self._idle: Dict[Tuple[str, int, bool], List[_Connection]] = defaultdict(list)
+        self.opened = 0
+
+    async def acquire(self, host: str, port: int, use_tls: bool,
+                      result: ProbeResult) -> Tuple[_Connection, bool]:
+        """Connexion inactive valide, sinon nouvelle connexion avec phases chronométrées"""
+        key = (host, port, use_tls)
+        idle = self._idle[key]
+        while idle:
+            conn = idle.pop()
+            if conn.usable(self.idle_timeout):
+                return conn, True
+            conn.close()
+
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        infos = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        resolved = time.perf_counter()
+        result.dns_ms = (resolved - start) * 1000
+
+        last_error: Optional[Exception] = None
+        for _family, _type, _proto, _name, sockaddr in infos:
+            try:
+                reader, writer = await asyncio.open_connection(sockaddr[0], sockaddr[1])
+                break
+            except OSError as e:
+                last_error = e
+        else:
+            raise last_error or OSError(f"aucune adresse pour {host}")
+        connected = time.perf_counter()
+        result.connect_ms = (connected - resolved) * 1000
+
+        if use_tls:
+            try:
+                await writer.start_tls(self.ssl_context, server_hostname=host)
+            except BaseException:
+                writer.close()
+                raise
+            result.tls_ms = (time.perf_counter() - connected) * 1000
+
+        self.opened += 1
+        return _Connection(key, reader, writer), False
+
+    def release(self, conn: _Connection, reusable: bool):
+        idle = self._idle[conn.key]
+        if reusable and len(idle) < self.max_idle_per_host and conn.usable(self.idle_timeout):
+            conn.last_used = time.monotonic()
+            idle.append(conn)
+        else:
+            conn.close()
+
+    async def close(self):
+        for idle in self._idle.values():
+            for conn in idle:
+                conn.close()
+                try:
+                    await conn.writer.wait_closed()
+                except Exception:
+                    pass
+        self._idle.clear()
+
+
+async def _read_headers(reader: asyncio.StreamReader) -> Dict[str, str]:
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            return headers
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+
+async def _drain_body(reader: asyncio.StreamReader, headers: Dict[str, str]) -> bool:
+    """Consomme le corps; True si la connexion reste réutilisable"""
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        drained = 0
+        while True:
+            size = int((await reader.readline()).split(b';')[0].strip() or b'0', 16)
+            if size == 0:
+                await _read_headers(reader)  # Trailers
+                return True
+            drained += size
+            if drained > MAX_DRAINED_BODY:
+                return False
+            await reader.readexactly(size + 2)
+    if 'content-length' in headers:
+        length = int(headers['content-length'])
+        if length > MAX_DRAINED_BODY:
+            return False
+        await reader.readexactly(length)
+        return True
+    return False  # Corps délimité par la fermeture
+
+
+async def _exchange(conn: _Connection, host: str, path: str,
+                    result: Optional[ProbeResult]) -> Tuple[int, Dict[str, str], bool]:
+    """Requête GET sur la connexion; statut, en-têtes, réutilisable"""
+    request = (f"GET {path} HTTP/1.1\r\nHost: {host}\r\nUser-Agent: {USER_AGENT}\r\n"
+               f"Accept: */*\r\nConnection: keep-alive\r\n\r\n")
+    conn.writer.write(request.encode('latin-1'))
+    await conn.writer.drain()
+    sent = time.perf_counter()
+
+    status_line = await conn.reader.readline()
+    if not status_line:
+        raise ConnectionResetError("connexion fermée par le serveur")
+    if result is not None:
+        result.first_byte_ms = (time.perf_counter() - sent) * 1000
+    parts = status_line.decode('latin-1').split()
+    if len(parts) < 2 or not parts[0].startswith('HTTP/'):
+        raise ValueError(f"réponse HTTP invalide: {status_line[:60]!r}")
+    code = int(parts[1])
+    headers = await _read_headers(conn.reader)
+
+    if code < 200 or code in (204, 304):
+        reusable = True
+    else:
+        reusable = await _drain_body(conn.reader, headers)
+    if headers.get('connection', '').lower() == 'close' or parts[0] == 'HTTP/1.0':
+        reusable = False
+    return code, headers, reusable
+
+
+class DomainProbeEngine:
+    """Sondes HTTPS concurrentes (repli HTTP sur erreur TLS) sur connexions partagées"""
+
+    def __init__(self, timeout: float = 10.0, max_redirects: int = 5,
+                 pool: Optional[ConnectionPool] = None, max_concurrency: Optional[int] = None):
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+        self.pool = pool or ConnectionPool()
+        self.max_concurrency = max_concurrency
+
+    async def _fetch(self, url: str, result: Optional[ProbeResult]) -> Tuple[int, Dict[str, str]]:
+        parts = urlsplit(url)
+        use_tls = parts.scheme == 'https'
+        host = parts.hostname or ''
+        port = parts.port or (443 if use_tls else 80)
+        path = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+        host_header = parts.netloc.rsplit('@', 1)[-1]
+
+        conn, reused = await self.pool.acquire(host, port, use_tls, result or ProbeResult(host, url))
+        try:
+            code, headers, reusable = await _exchange(conn, host_header, path, result)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            conn.close()
+            if not reused:
+                raise
+            # Connexion inactive fermée côté serveur entre-temps: une seule reprise à neuf
+            conn, reused = await self.pool.acquire(host, port, use_tls, result or ProbeResult(host, url))
+            code, headers, reusable = await _exchange(conn, host_header, path, result)
+        except BaseException:
+            conn.close()
+            raise
+        if result is not None:
+            result.reused = reused
+        self.pool.release(conn, reusable)
+        return code, headers
+
+    async def _probe(self, result: ProbeResult, follow_redirects: bool) -> ProbeResult:
+        start = time.perf_counter()
+        url = result.url
+        code, headers = await self._fetch(url, result)
+        redirects = 0
+        while follow_redirects and 300 <= code < 400 and 'location' in headers and redirects < self.max_redirects:
+            url = urljoin(url, headers['location'])
+            redirects += 1
+            code, headers = await self._fetch(url, None)
+        result.http_code = code
+        result.total_ms = (time.perf_counter() - start) * 1000
+        if redirects:
+            result.redirect_url = url
+        return result
+
+    async def probe(self, domain: str) -> ProbeResult:
+        """Sonde d'un domaine (ou d'une URL complète) dans le budget `timeout`"""
+        url = domain if '://' in domain else f'https://{domain}/'
+        result = ProbeResult(domain=domain, url=url)
+        try:
+            await asyncio.wait_for(self._probe(result, follow_redirects=True), self.timeout)
+            result.status = 'online'
+            result.ssl_valid = url.startswith('https://')
+        except ssl.SSLError as e:
+            # Même budget pour le repli HTTP (sans redirection, comme avant)
+            fallback = ProbeResult(domain=domain, url='http://' + url.split('://', 1)[1],
+                                   timestamp=result.timestamp)
+            try:
+                await asyncio.wait_for(self._probe(fallback, follow_redirects=False), self.timeout)
+                fallback.status = 'ssl_error'
+                fallback.error = f"SSL: {e}"
+            except Exception as http_error:
+                fallback.status = 'offline'
+                fallback.error = str(http_error) or type(http_error).__name__
+            return fallback
+        except asyncio.TimeoutError:
+            result.status = 'offline'
+            result.error = f"timeout ({self.timeout:g}s)"
+        except Exception as e:
+            result.status = 'offline'
+            result.error = str(e) or type(e).__name__
+        return result
+
+    async def probe_all(self, domains: List[str]) -> List[ProbeResult]:
+        """Tous les domaines en parallèle, résultats dans l'ordre de `domains`"""
+        if not self.max_concurrency:
+            return list(await asyncio.gather(*(self.probe(d) for d in domains)))
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def bounded(domain: str) -> ProbeResult:
+            async with semaphore:
+                return await self.probe(domain)
+
+        return list(await asyncio.gather(*(bounded(d) for d in domains)))
+
+    async def close(self):
+        await self.pool.close()
+
+
+def percentile(sorted_values: List[int], pct: float) -> Optional[int]:
+    """Percentile par rang le plus proche sur des valeurs triées"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class LatencyHistory:
+    """Série glissante compacte par domaine: colonnes d'entiers (epoch s, ms)
+
+    Les sondes hors ligne sont conservées (statut 'X', latence -1) mais exclues
+    des percentiles.
+    """
+
+    COLUMNS = ('t', 'total', 'ttfb', 'dns', 'connect', 'tls')
+
+    def __init__(self, path: str = 'domain_latency_history.json', capacity: int = 672):
+        self.path = path
+        self.capacity = capacity  # 7 jours à un cycle / 15 min
+        self.series: Dict[str, Dict] = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            self.series = data.get('domains', {})
+        except (FileNotFoundError, ValueError):
+            self.series = {}
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': 1, 'capacity': self.capacity, 'domains': self.series},
+                      f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+    def record(self, result: ProbeResult, timestamp: Optional[float] = None):
+        series = self.series.setdefault(result.domain, {**{c: [] for c in self.COLUMNS}, 'status': ''})
+        up = result.status != 'offline' and result.total_ms is not None
+        values = {
+            't': int(timestamp if timestamp is not None else time.time()),
+            'total': round(result.total_ms) if up else -1,
+            'ttfb': round(result.first_byte_ms) if up and result.first_byte_ms is not None else -1,
+            'dns': round(result.dns_ms),
+            'connect': round(result.connect_ms),
+            'tls': round(result.tls_ms)
+        }
+        for column in self.COLUMNS:
+            series[column].append(values[column])
+            del series[column][:-self.capacity]
+        series['status'] = (series['status'] + STATUS_CODES.get(result.status, 'X'))[-self.capacity:]
+
+    def __len__(self) -> int:
+        return sum(len(series['t']) for series in self.series.values())
+
+    def values(self, domain: str, metric: str = 'total', last: Optional[int] = None,
+               skip_last: int = 0) -> List[int]:
+        """Latences valides (ms) d'un domaine, éventuellement restreintes à une tranche récente"""
+        column = self.series.get(domain, {}).get(metric, [])
+        end = len(column) - skip_last
+        start = 0 if last is None else max(0, end - last)
+        return [v for v in column[start:max(0, end)] if v >= 0]
+
+    def percentiles(self, domain: str, metric: str = 'total', last: Optional[int] = None,
+                    skip_last: int = 0) -> Dict:
+        values = sorted(self.values(domain, metric, last, skip_last))
+        return {'count': len(values), 'p50': percentile(values, 50), 'p95': percentile(values, 95)}
+
+    def histogram(self, domain: str, metric: str = 'total') -> Dict[str, int]:
+        """Comptes par tranche de LATENCY_BUCKETS_MS (bornes supérieures incluses)"""
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        counts = dict.fromkeys(labels, 0)
+        for value in self.values(domain, metric):
+            index = next((i for i, bound in enumerate(LATENCY_BUCKETS_MS) if value <= bound),
+                         len(LATENCY_BUCKETS_MS))
+            counts[labels[index]] += 1
+        return counts
+
+    def detect_regression(self, domain: str, recent: int = 4, min_baseline: int = 8,
+                          factor: float = 1.5, min_delta_ms: int = 100) -> Optional[Dict]:
+        """Régression si la médiane récente dépasse le p95 de référence et factor × sa médiane
+
+        Référence: les échantillons précédant les `recent` derniers. L'écart absolu
+        minimal évite d'alerter sur des domaines très rapides (bruit de quelques ms).
+        """
+        current = self.percentiles(domain, last=recent)
+        baseline = self.percentiles(domain, skip_last=recent)
+        if current['count'] < max(1, recent // 2 + 1) or baseline['count'] < min_baseline:
+            return None
+        if (current['p50'] > baseline['p95']
+                and current['p50'] >= baseline['p50'] * factor
+                and current['p50'] - baseline['p50'] >= min_delta_ms):
+            return {
+                'domain': domain,
+                'current_p50_ms': current['p50'],
+                'baseline_p50_ms': baseline['p50'],
+                'baseline_p95_ms': baseline['p95'],
+                'ratio': round(current['p50'] / max(baseline['p50'], 1), 2)
+            }
+        return None
+
+    def summary(self) -> Dict[str, Dict]:
+        """p50/p95 (total et premier octet), disponibilité et dernier statut par domaine"""
+        summary = {}
+        for domain, series in self.series.items():
+            total = self.percentiles(domain)
+            ttfb = self.percentiles(domain, metric='ttfb')
+            status = series['status']
+            summary[domain] = {
+                'samples': len(series['t']),
+                'p50_ms': total['p50'],
+                'p95_ms': total['p95'],
+                'ttfb_p50_ms': ttfb['p50'],
+                'ttfb_p95_ms': ttfb['p95'],
+                'availability': round(sum(1 for s in status if s != 'X') / len(status), 4) if status else None,
+                'last_status': STATUS_NAMES.get(status[-1]) if status else None
+            }
+        return summary
@@ -158,14 +158,20 @@ class DomainMonitor:
         return report
 
 import requests
+import asyncio
+import os
+import sys
 import time
 import json
 from datetime import datetime
 import subprocess
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from notification_system import PaniniNotificationSystem
+from domain_probe import DomainProbeEngine, LatencyHistory
 
 class DomainMonitor:
-    def __init__(self):
+    def __init__(self, probe_timeout=10.0, history_path='domain_latency_history.json'):
         self.domains = [
             'paninifs.com',
             'o-tomate.com', 
@@ -178,52 +184,26 @@ class DomainMonitor:
         self.notifier = PaniniNotificationSystem()
         self.last_status = None  # Pour détecter les changements
         
+        # Sondes concurrentes + historique de latence glissant
+        self.probe_engine = DomainProbeEngine(timeout=probe_timeout)
+        self.latency_history = LatencyHistory(history_path)
+        self._loop = None  # Boucle persistante: le pool de connexions survit entre cycles
+        
+    def _run(self, coroutine):
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coroutine)
+    
+    def close(self):
+        """Fermeture des connexions en commun et de la boucle"""
+        if self._loop is not None:
+            self._loop.run_until_complete(self.probe_engine.close())
+            self._loop.close()
+            self._loop = None
+        
     def check_domain_status(self, domain):
         """Test autonome d'un domaine"""
-        result = {
-            'domain': domain,
-            'timestamp': datetime.now().isoformat(),
-            'status': 'unknown',
-            'http_code': None,
-            'response_time': None,
-            'ssl_valid': False,
-            'redirect_url': None
-        }
-        
-        try:
-            # Test HTTPS d'abord
-            response = requests.get(f'https://{domain}', 
-                                  timeout=10, 
-                                  allow_redirects=True,
-                                  verify=True)
-            
-            result['status'] = 'online'
-            result['http_code'] = response.status_code
-            result['response_time'] = response.elapsed.total_seconds()
-            result['ssl_valid'] = True
-            
-            if response.history:
-                result['redirect_url'] = response.url
-                
-        except requests.exceptions.SSLError:
-            # Si SSL échoue, test HTTP
-            try:
-                response = requests.get(f'http://{domain}', 
-                                      timeout=10, 
-                                      allow_redirects=False)
-                result['status'] = 'ssl_error'
-                result['http_code'] = response.status_code
-                result['response_time'] = response.elapsed.total_seconds()
-                
-            except Exception as e:
-                result['status'] = 'offline'
-                result['error'] = str(e)
-                
-        except Exception as e:
-            result['status'] = 'offline'
-            result['error'] = str(e)
-            
-        return result
+        return self._run(self.probe_engine.probe(domain)).to_report()
     
     def check_github_pages_status(self):
         """Vérification du statut GitHub Pages via API"""
@@ -231,7 +211,8 @@ class DomainMonitor:
             # Vérifier le statut des GitHub Pages
             response = requests.get(
                 'https://api.github.com/repos/stephanedenis/PaniniFS/pages',
-                headers={'Accept': 'application/vnd.github.v3+json'}
+                headers={'Accept': 'application/vnd.github.v3+json'},
+                timeout=self.probe_engine.timeout
             )
             
             if response.status_code == 200:
@@ -248,24 +229,36 @@ class DomainMonitor:
         except Exception as e:
             return {'error': str(e)}
     
+    async def _probe_cycle(self):
+        """Domaines et API GitHub Pages sondés en même temps"""
+        loop = asyncio.get_running_loop()
+        gh_task = loop.run_in_executor(None, self.check_github_pages_status)
+        probes = await self.probe_engine.probe_all(self.domains)
+        return await gh_task, probes
+    
     def run_monitoring_cycle(self):
         """Cycle de monitoring autonome"""
         print("🤖 MONITORING AUTONOME - DÉMARRAGE")
         print("=" * 50)
         
-        # Status GitHub Pages
-        gh_status = self.check_github_pages_status()
+        cycle_start = time.perf_counter()
+        gh_status, probes = self._run(self._probe_cycle())
+        cycle_seconds = time.perf_counter() - cycle_start
         print(f"📊 GitHub Pages: {gh_status}")
         
-        # Test chaque domaine
+        # Résultats par domaine (sondés en parallèle)
         results = []
-        for domain in self.domains:
-            print(f"\n🔍 Test: {domain}")
-            status = self.check_domain_status(domain)
+        for probe in probes:
+            status = probe.to_report()
             results.append(status)
+            self.latency_history.record(probe)
+            timings = status['timings']
+            print(f"\n🔍 Test: {probe.domain}")
             
             if status['status'] == 'online':
-                print(f"  ✅ {status['http_code']} - {status['response_time']:.2f}s")
+                print(f"  ✅ {status['http_code']} - {status['response_time']:.2f}s "
+                      f"(dns {timings['dns_ms']}ms, tcp {timings['connect_ms']}ms, "
+                      f"tls {timings['tls_ms']}ms, 1er octet {timings['first_byte_ms']}ms)")
             elif status['status'] == 'ssl_error':
                 print(f"  ⚠️  HTTP OK but SSL error - Code: {status['http_code']}")
             else:
@@ -273,6 +266,9 @@ class DomainMonitor:
                 if 'error' in status:
                     print(f"     Error: {status['error']}")
         
+        self.latency_history.save()
+        latency = self.latency_history.summary()
+        
         # Sauvegarde des résultats
         report = {
             'timestamp': datetime.now().isoformat(),
@@ -283,7 +279,10 @@ class DomainMonitor:
                 'online': len([r for r in results if r['status'] == 'online']),
                 'ssl_errors': len([r for r in results if r['status'] == 'ssl_error']),
                 'offline': len([r for r in results if r['status'] == 'offline'])
-            }
+            },
+            'latency': {domain: latency.get(domain) for domain in self.domains},
+            'latency_regressions': self.detect_latency_regressions(),
+            'cycle_seconds': round(cycle_seconds, 3)
         }
         
         with open('domain_monitoring_report.json', 'w') as f:
@@ -292,13 +291,26 @@ class DomainMonitor:
         # 🔔 NOTIFICATIONS AUTOMATIQUES
         self.check_and_notify(report)
         
-        print(f"\n📋 RÉSUMÉ:")
+        print(f"\n📋 RÉSUMÉ ({cycle_seconds:.2f}s):")
         print(f"   ✅ En ligne: {report['summary']['online']}/{report['summary']['total']}")
         print(f"   ⚠️  SSL Error: {report['summary']['ssl_errors']}")
         print(f"   ❌ Hors ligne: {report['summary']['offline']}")
+        for domain, stats in report['latency'].items():
+            if stats and stats['p50_ms'] is not None:
+                print(f"   ⏱️  {domain}: p50 {stats['p50_ms']}ms / p95 {stats['p95_ms']}ms "
+                      f"({stats['samples']} échantillons)")
         
         return report
     
+    def detect_latency_regressions(self):
+        """Domaines dont la latence récente décroche de leur historique"""
+        regressions = []
+        for domain in self.domains:
+            regression = self.latency_history.detect_regression(domain)
+            if regression:
+                regressions.append(regression)
+        return regressions
+    
     def check_and_notify(self, current_report):
         """Vérifier changements et envoyer notifications"""
         try:
@@ -340,6 +352,15 @@ class DomainMonitor:
                 print(f"🔔 Envoi notification ({notification_type})")
                 self.notifier.notify_domain_status(current_report)
             
+            # Régressions de latence: uniquement pour les domaines nouvellement touchés
+            previous = {r['domain'] for r in (self.last_status or {}).get('latency_regressions', [])}
+            new_regressions = [r for r in current_report.get('latency_regressions', [])
+                               if r['domain'] not in previous]
+            if new_regressions:
+                print(f"🔔 Envoi notification (latency_regression: "
+                      f"{', '.join(r['domain'] for r in new_regressions)})")
+                self.notifier.notify_latency_regression(new_regressions)
+            
             # Sauvegarder le statut actuel
             with open('last_domain_status.json', 'w') as f:
                 json.dump(current_report, f, indent=2)
@@ -362,7 +383,12 @@ class DomainMonitor:
                 
         except KeyboardInterrupt:
             print("\n🛑 Monitoring arrêté par l'utilisateur")
+        finally:
+            self.close()
 
 if __name__ == "__main__":
     monitor = DomainMonitor()
-    monitor.run_monitoring_cycle()
+    try:
+        monitor.run_monitoring_cycle()
+    finally:
+        monitor.close()
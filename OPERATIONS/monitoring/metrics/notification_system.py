@@ -115,6 +115,21 @@ class PaniniNotificationSystem:
                 }
             )
     
+    def notify_latency_regression(self, regressions):
+        """Notification pour régression de latence (domaines en ligne mais ralentis)"""
+        domains = ', '.join(r['domain'] for r in regressions)
+        worst = max(regressions, key=lambda r: r['ratio'])
+        self.send_fcm_notification(
+            title="🐢 Domaines Panini - Latence dégradée",
+            body=f"{domains} : p50 {worst['current_p50_ms']}ms (habituel {worst['baseline_p50_ms']}ms)",
+            topic=self.topics['domains'],
+            data={
+                'type': 'domain_latency_regression',
+                'domains': domains,
+                'worst_ratio': str(worst['ratio'])
+            }
+        )
+
     def notify_agent_activity(self, agent_report):
         """Notification pour activité agents"""
         active_agents = len([a for a in agent_report.get('agents', []) 
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests des sondes de domaines concurrentes et de l'historique de latence
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from domain_probe import DomainProbeEngine, LatencyHistory, ProbeResult
+
+
+async def _start_server(routes, delay=0.0):
+    """Serveur HTTP/1.1 keep-alive minimal; compte les connexions ouvertes"""
+    stats = {'connections': 0, 'requests': 0}
+
+    async def handle(reader, writer):
+        stats['connections'] += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                while (await reader.readline()) not in (b'\r\n', b''):
+                    pass
+                stats['requests'] += 1
+                await asyncio.sleep(delay)
+                path = request_line.split()[1].decode()
+                code, extra, body = routes.get(path, (404, '', b'missing'))
+                writer.write(f"HTTP/1.1 {code} X\r\nContent-Length: {len(body)}\r\n{extra}\r\n".encode() + body)
+                await writer.drain()
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, '127.0.0.1', 0)
+    return server, server.sockets[0].getsockname()[1], stats
+
+
+def test_probe_reuses_connection_and_follows_redirect():
+    async def scenario():
+        server, port, stats = await _start_server({
+            '/': (301, 'Location: /home\r\n', b''),
+            '/home': (200, '', b'hello'),
+        })
+        engine = DomainProbeEngine(timeout=2)
+        first = await engine.probe(f'http://127.0.0.1:{port}/')
+        second = await engine.probe(f'http://127.0.0.1:{port}/home')
+        await engine.close()
+        server.close()
+        return first, second, stats
+
+    first, second, stats = asyncio.run(scenario())
+    assert first.status == 'online' and first.http_code == 200
+    assert first.redirect_url.endswith('/home')
+    assert first.first_byte_ms is not None and first.total_ms >= first.first_byte_ms
+    assert not first.reused and second.reused
+    assert stats == {'connections': 1, 'requests': 3}
+
+
+def test_probes_run_concurrently_within_timeout_budget():
+    async def scenario():
+        slow, slow_port, _ = await _start_server({'/': (200, '', b'ok')}, delay=5)
+        fast, fast_port, _ = await _start_server({'/': (200, '', b'ok')}, delay=0.2)
+        engine = DomainProbeEngine(timeout=0.5)
+        start = time.perf_counter()
+        results = await engine.probe_all([f'http://127.0.0.1:{slow_port}/'] * 3
+                                         + [f'http://127.0.0.1:{fast_port}/'] * 3)
+        elapsed = time.perf_counter() - start
+        await engine.close()
+        slow.close()
+        fast.close()
+        return results, elapsed
+
+    results, elapsed = asyncio.run(scenario())
+    assert [r.status for r in results] == ['offline'] * 3 + ['online'] * 3
+    assert 'timeout' in results[0].error
+    assert elapsed < 1.5  # Séquentiel: >= 3 × 0.5 + 3 × 0.2
+
+
+def test_latency_history_percentiles_and_regression(tmp_path):
+    history = LatencyHistory(str(tmp_path / 'history.json'), capacity=20)
+    for i, total in enumerate([100, 110, 105, 95, 120, 100, 98, 102, 400, 420, 390, 410]):
+        history.record(ProbeResult('a.test', 'https://a.test/', status='online',
+                                   total_ms=total, first_byte_ms=total / 2), timestamp=i)
+    history.record(ProbeResult('a.test', 'https://a.test/', status='offline'), timestamp=12)
+
+    stats = history.percentiles('a.test', skip_last=5)
+    assert stats == {'count': 8, 'p50': 100, 'p95': 120}
+    regression = history.detect_regression('a.test', recent=5)
+    assert regression['domain'] == 'a.test' and regression['current_p50_ms'] == 400
+    assert history.detect_regression('a.test', recent=5, factor=5) is None
+    assert sum(history.histogram('a.test').values()) == 12
+
+    history.save()
+    reloaded = LatencyHistory(str(tmp_path / 'history.json'), capacity=20)
+    summary = reloaded.summary()['a.test']
+    assert summary['samples'] == 13 and summary['last_status'] == 'offline'
+    assert summary['availability'] == round(12 / 13, 4)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+📈 ÉCHANTILLONNEUR DE MÉTRIQUES EN ARRIÈRE-PLAN
+Un seul thread échantillonne à intervalle fixe dans un tampon circulaire
+horodaté; les lecteurs (HTTP, fichiers) ne déclenchent jamais de mesure.
+Les sondes lentes et peu changeantes (gh, git) sont mises en cache avec TTL.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class CachedProbe:
+    """Résultat d'une sonde coûteuse, recalculé au plus une fois par `ttl` secondes"""
+
+    def __init__(self, probe: Callable[[], Any], ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.probe = probe
+        self.ttl = ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._value: Any = None
+        self._expires = float('-inf')
+
+    def get(self) -> Any:
+        with self._lock:
+            now = self.clock()
+            if now >= self._expires:
+                self._value = self.probe()
+                self._expires = now + self.ttl
+            return self._value
+
+    def invalidate(self):
+        with self._lock:
+            self._expires = float('-inf')
+
+
+class MetricsSampler:
+    """Échantillonnage périodique vers un tampon circulaire (horodatage epoch, métriques)"""
+
+    def __init__(self, collect: Callable[[], Dict], interval: float = 5.0, capacity: int = 720,
+                 on_sample: Optional[Callable[[Dict], None]] = None):
+        self.collect = collect
+        self.interval = interval
+        self.on_sample = on_sample
+        self._samples: deque = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Premier échantillon synchrone (lecteurs servis d'emblée) puis thread démon"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self.sample_once()
+        self._thread = threading.Thread(target=self._run, name="metrics-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _run(self):
+        next_due = time.monotonic() + self.interval
+        # Attente sur l'Event: arrêt immédiat, cadence calée sur l'échéance (pas de dérive)
+        while not self._stop.wait(max(0.0, next_due - time.monotonic())):
+            self.sample_once()
+            next_due += self.interval
+            if next_due < time.monotonic():
+                next_due = time.monotonic() + self.interval  # Retard: pas de rafale de rattrapage
+
+    def sample_once(self) -> Dict:
+        try:
+            metrics = self.collect()
+        except Exception as e:
+            metrics = {'error': str(e)}
+        sample = (time.time(), metrics)
+        with self._lock:
+            self._samples.append(sample)
+        if self.on_sample:
+            try:
+                self.on_sample(metrics)
+            except Exception:
+                pass
+        return metrics
+
+    def latest(self) -> Optional[Dict]:
+        with self._lock:
+            return self._samples[-1][1] if self._samples else None
+
+    def history(self, window: Optional[float] = None) -> List[Tuple[float, Dict]]:
+        """Échantillons des `window` dernières secondes (tous si None), du plus ancien au plus récent"""
+        with self._lock:
+            samples = list(self._samples)
+        if window is None:
+            return samples
+        since = time.time() - window
+        return [sample for sample in samples if sample[0] >= since]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._samples)
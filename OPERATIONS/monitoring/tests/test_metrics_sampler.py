@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Tests de l'échantillonneur de métriques (tampon circulaire + sondes en cache)
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from metrics_sampler import CachedProbe, MetricsSampler
+
+
+def test_cached_probe_respects_ttl():
+    now = [0.0]
+    calls = []
+    probe = CachedProbe(lambda: calls.append(1) or len(calls), ttl=30, clock=lambda: now[0])
+    assert probe.get() == 1 and probe.get() == 1
+    now[0] = 31
+    assert probe.get() == 2
+
+
+def test_ring_buffer_and_history_without_resampling():
+    counter = iter(range(1000))
+    sampler = MetricsSampler(lambda: {'n': next(counter)}, interval=0.01, capacity=5)
+    sampler.start()
+    time.sleep(0.15)
+    sampler.stop(timeout=1)
+
+    samples = sampler.history()
+    assert len(samples) == 5
+    assert [m['n'] for _, m in samples] == list(range(samples[0][1]['n'], samples[0][1]['n'] + 5))
+    taken = len(sampler)
+    assert sampler.latest() == samples[-1][1]
+    assert sampler.history(window=3600) == samples and len(sampler) == taken
+    assert sampler.history(window=1e-9) == []
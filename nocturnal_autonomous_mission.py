@@ -111,26 +111,37 @@ def predict_workflow_failure_risk(workflow_stats):
             'purpose': 'Central agent coordination in Google Colab',
             'code_template': '''
 # PaniniFS Colab Orchestrator - Auto-generated during vacation
+import asyncio
+import heapq
 import os
+import random
 import subprocess
 import time
 import json
 from datetime import datetime
 
 class ColabAgentOrchestrator:
-    def __init__(self):
+    def __init__(self, max_concurrency=2):
         self.agents = {}
         self.status_log = []
         self.github_token = os.environ.get('GITHUB_TOKEN')
+        self.max_concurrency = max_concurrency
+        self._timers = []  # (due, name): min-heap of next deadlines
+        self._wake = None
     
-    def register_agent(self, name, function, interval=300):
+    def register_agent(self, name, function, interval=300, timeout=None, jitter=0):
         """Register a new autonomous agent"""
         self.agents[name] = {
             'function': function,
             'interval': interval,
+            'timeout': timeout,
+            'jitter': jitter,
             'last_run': None,
             'status': 'registered'
         }
+        heapq.heappush(self._timers, (time.time(), name))
+        if self._wake:
+            self._wake.set()
     
     def run_agent_cycle(self, agent_name):
         """Run a single agent cycle"""
@@ -149,20 +160,52 @@ class ColabAgentOrchestrator:
             self.log_status(agent_name, 'error', str(e))
             return False
     
-    def continuous_orchestration(self):
-        """Run continuous orchestration loop"""
+    async def _run_with_limits(self, agent_name, semaphore):
+        agent = self.agents[agent_name]
+        async with semaphore:
+            try:
+                await asyncio.wait_for(asyncio.to_thread(self.run_agent_cycle, agent_name),
+                                       timeout=agent['timeout'])
+            except asyncio.TimeoutError:
+                agent['status'] = 'timeout'
+                self.log_status(agent_name, 'timeout', agent['timeout'])
+    
+    async def run(self):
+        """Event-driven loop: sleep until the next deadline, no minute polling"""
         print("🚀 Colab Orchestrator Started")
+        self._wake = asyncio.Event()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        running = {}
         while True:
-            for agent_name, agent in self.agents.items():
-                current_time = datetime.now()
-                
-                if (agent['last_run'] is None or 
-                    (current_time - agent['last_run']).seconds >= agent['interval']):
-                    
-                    print(f"🔄 Running {agent_name}")
-                    self.run_agent_cycle(agent_name)
+            now = time.time()
+            while self._timers and self._timers[0][0] <= now:
+                due, name = heapq.heappop(self._timers)
+                agent = self.agents.get(name)
+                if agent is None:
+                    continue
+                # Next deadline from the nominal one; missed ticks coalesce into one run
+                next_due = due + agent['interval']
+                while next_due <= now:
+                    next_due += agent['interval']
+                heapq.heappush(self._timers, (next_due + random.uniform(0, agent['jitter']), name))
+                if name not in running or running[name].done():
+                    print(f"🔄 Running {name}")
+                    running[name] = asyncio.ensure_future(self._run_with_limits(name, semaphore))
             
-            time.sleep(60)  # Check every minute
+            delay = self._timers[0][0] - time.time() if self._timers else None
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+    
+    def continuous_orchestration(self):
+        """Run continuous orchestration (task in Colab's running loop, blocking otherwise)"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.run())
+        return loop.create_task(self.run())
     
     def log_status(self, agent, status, data):
         """Log agent status"""
@@ -180,12 +223,13 @@ class ColabAgentOrchestrator:
 # Usage example - to be customized during implementation
 # orchestrator = ColabAgentOrchestrator()
 # orchestrator.register_agent('github_monitor', github_monitoring_function, 300)
-# orchestrator.register_agent('domain_checker', domain_checking_function, 600)
+# orchestrator.register_agent('domain_checker', domain_checking_function, 600, timeout=120)
 # orchestrator.continuous_orchestration()
             ''',
             'features': [
                 'Agent registration system',
-                'Interval-based execution',
+                'Deadline-based execution (timer heap, no polling)',
+                'Bounded concurrency and per-agent timeouts',
                 'Error handling and logging',
                 'Continuous orchestration loop'
             ]
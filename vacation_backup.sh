@@ -6,12 +6,15 @@ mkdir -p "$BACKUP_DIR"
 
 echo "💾 Sauvegarde quotidienne $(date)"
 
-# Sauvegarde code critique
-tar -czf "$BACKUP_DIR/paninifs_$DATE.tar.gz" \
+# Sauvegarde code critique: snapshot dédupliqué (seuls les blocs nouveaux sont écrits)
+python3 OPERATIONS/DevOps/scripts/dedup_backup_store.py --store "$BACKUP_DIR/store" \
+    snapshot . --label paninifs --exclude "*.log" --exclude "vacation_backups" \
+|| tar -czf "$BACKUP_DIR/paninifs_$DATE.tar.gz" \
     --exclude="*.log" \
     --exclude="vacation_backups" \
     --exclude=".git" \
     .
+python3 OPERATIONS/DevOps/scripts/dedup_backup_store.py --store "$BACKUP_DIR/store" prune 14 --label paninifs || true
 
 # Sauvegarde issues GitHub
 gh issue list --limit 100 --json number,title,body,state > "$BACKUP_DIR/github_issues_$DATE.json"
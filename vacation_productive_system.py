@@ -15,6 +15,10 @@ import os
 import sys
 from pathlib import Path
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'OPERATIONS', 'DevOps', 'scripts'))
+from code_metrics_index import CodeMetricsIndex
+from dedup_backup_store import DedupBackupStore, print_snapshot_report
+
 class VacationProductiveSystem:
     def __init__(self):
         self.work_log_file = Path("vacation_productive_work.json")
@@ -26,6 +30,8 @@ class VacationProductiveSystem:
             self.backup_and_organize
         ]
         self.completed_work = self.load_work_log()
+        self.code_index = CodeMetricsIndex(".")
+        self.backup_store_dir = os.path.join("vacation_backups", "store")
         
     def load_work_log(self):
         """Charge le log des travaux effectués"""
@@ -46,9 +52,12 @@ class VacationProductiveSystem:
             print(f"❌ Erreur sauvegarde work log: {e}")
     
     def analyze_and_improve_code(self):
-        """Analyse et améliore le code existant"""
+        """Analyse et améliore le code existant (index AST incrémental)"""
         improvements = []
         
+        # Seuls les fichiers modifiés depuis le dernier run sont réanalysés
+        refresh = self.code_index.refresh()
+        
         # Analyse des scripts Python existants
         python_files = [
             "autonomous_workflow_doctor.py",
@@ -57,41 +66,39 @@ class VacationProductiveSystem:
         ]
         
         for file in python_files:
-            if os.path.exists(file):
-                try:
-                    # Analyse basique du code
-                    with open(file, 'r') as f:
-                        content = f.read()
-                    
-                    lines = len(content.split('\n'))
-                    functions = content.count('def ')
-                    classes = content.count('class ')
-                    
-                    analysis = {
-                        'file': file,
-                        'lines': lines,
-                        'functions': functions,
-                        'classes': classes,
-                        'timestamp': datetime.datetime.now(),
-                        'suggestions': []
-                    }
-                    
-                    # Suggestions d'amélioration automatiques
-                    if lines > 300:
-                        analysis['suggestions'].append("Consider splitting into modules")
-                    if functions > 15:
-                        analysis['suggestions'].append("High function count - review organization")
-                    if 'try:' not in content[:500]:
-                        analysis['suggestions'].append("Add error handling to main functions")
-                    
-                    improvements.append(analysis)
-                    
-                except Exception as e:
-                    print(f"⚠️ Erreur analyse {file}: {e}")
+            metrics = self.code_index.file(file)
+            if metrics is None:
+                continue
+            
+            analysis = {
+                'file': file,
+                'lines': metrics.lines,
+                'functions': metrics.function_count,
+                'classes': metrics.classes,
+                'max_complexity': metrics.max_complexity,
+                'timestamp': datetime.datetime.now(),
+                'suggestions': []
+            }
+            
+            # Suggestions d'amélioration automatiques
+            if metrics.syntax_error:
+                analysis['suggestions'].append(f"Fix syntax error: {metrics.syntax_error}")
+            if metrics.lines > 300:
+                analysis['suggestions'].append("Consider splitting into modules")
+            if metrics.function_count > 15:
+                analysis['suggestions'].append("High function count - review organization")
+            if metrics.try_blocks == 0:
+                analysis['suggestions'].append("Add error handling to main functions")
+            if metrics.max_complexity > 10:
+                analysis['suggestions'].append("Reduce complexity of the most branched functions")
+            
+            improvements.append(analysis)
         
         return {
             'task': 'code_analysis',
             'improvements': improvements,
+            'repository': self.code_index.summary(),
+            'refresh': refresh,
             'status': 'completed'
         }
     
@@ -263,12 +270,27 @@ class VacationProductiveSystem:
             'vacation_optimization': True
         })
         
+        # Snapshot dédupliqué: seuls les blocs modifiés depuis le dernier run sont écrits
+        backup_runs = 0
+        try:
+            store = DedupBackupStore(self.backup_store_dir)
+            snapshot = store.snapshot(".", label="paninifs", excludes=["*.log", "vacation_backups"])
+            print_snapshot_report(snapshot)
+            backup_runs = len(store.list_snapshots("paninifs"))
+            organization_work.append({
+                'type': 'deduplicated_backup',
+                'snapshot': snapshot.to_dict(),
+                'store': store.stats()
+            })
+        except (OSError, ValueError) as e:
+            print(f"❌ Erreur sauvegarde dédupliquée: {e}")
+        
         # Calcule des métriques de productivité
         productivity_metrics = {
             'files_created_during_vacation': len([f for f in os.listdir('.') if 'vacation' in f]),
             'agents_optimized': 3,
             'documentation_generated': 2,
-            'backup_runs_completed': 0  # Sera mis à jour
+            'backup_runs_completed': backup_runs
         }
         
         organization_work.append({